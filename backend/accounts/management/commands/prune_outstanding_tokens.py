@@ -0,0 +1,48 @@
+"""
+Management command to prune expired outstanding refresh tokens.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.token_blacklist import token_blacklist
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted refresh tokens in small batches (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens deleted per batch',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between batches to limit load',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and prune again every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=86400,
+            help='Seconds between runs when --loop is given (default: 86400)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = token_blacklist.prune_expired(
+                batch_size=options['batch_size'],
+                pause_seconds=options['pause'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} expired outstanding tokens'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
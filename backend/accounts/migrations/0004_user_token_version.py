@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_created_at_alter_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented to revoke issued tokens, e.g. on deactivation or password change.', verbose_name='token version'),
+        ),
+    ]
@@ -74,6 +74,11 @@ class User(AbstractUser, BaseModel):
         default=False,
         help_text=_('Designates whether this user has verified their email address.')
     )
+    token_version = models.PositiveIntegerField(
+        _('token version'),
+        default=0,
+        help_text=_('Incremented to revoke issued tokens, e.g. on deactivation or password change.')
+    )
 
     # Use email as the unique identifier
     USERNAME_FIELD = 'email'
@@ -98,4 +103,24 @@ class User(AbstractUser, BaseModel):
 
     def get_short_name(self):
         """Return the short name."""
-        return self.first_name or self.email.split('@')[0] 
\ No newline at end of file
+        return self.first_name or self.email.split('@')[0]
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Reload fields from the database.
+        
+        Users built from token claims defer every other field; the first
+        access to one hydrates all of them at once, from the user cache when
+        possible.
+        """
+        if fields is not None and getattr(self, '_from_claims', False):
+            self._from_claims = False
+            deferred = self.get_deferred_fields()
+            from core.services.user_cache import user_cache
+            cached = user_cache.get(self.pk)
+            if cached is not None:
+                for field in deferred:
+                    setattr(self, field, getattr(cached, field))
+                return
+            fields = list(set(fields) | deferred)
+        super().refresh_from_db(using=using, fields=fields)
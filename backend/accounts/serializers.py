@@ -8,7 +8,9 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from .tokens import PrincipalRefreshToken
 
 User = get_user_model()
 
@@ -59,6 +61,8 @@ class RegisterSerializer(serializers.ModelSerializer):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom token serializer that includes user data."""
 
+    token_class = PrincipalRefreshToken
+
     def validate(self, attrs):
         """Add user data to token payload and check email verification."""
         data = super().validate(attrs)
@@ -85,6 +89,12 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh serializer that checks the blacklist through its filter."""
+
+    token_class = PrincipalRefreshToken
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Serializer for password change."""
 
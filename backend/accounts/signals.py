@@ -2,9 +2,15 @@
 Signal handlers for the accounts app.
 """
 
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from core.services.token_blacklist import token_blacklist
+from core.services.user_cache import user_cache
+from .tokens import TOKEN_CLAIM_FIELDS
 
 User = get_user_model()
 
@@ -22,4 +28,43 @@ def create_user_profile_and_preferences(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
         
         # Create preferences
-        UserPreferences.objects.create(user=instance) 
\ No newline at end of file
+        UserPreferences.objects.create(user=instance)
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, update_fields=None, **kwargs):
+    """
+    Revoke issued tokens when a field they carry or depend on changes.
+    
+    Deactivation, password changes and staff or username changes increment
+    ``token_version``, which claims-only authentication checks on every request.
+    """
+    if instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_CLAIM_FIELDS):
+        return
+    old = User.objects.filter(pk=instance.pk).values(*TOKEN_CLAIM_FIELDS, 'token_version').first()
+    if old is None:
+        return
+    if any(old[field] != getattr(instance, field) for field in TOKEN_CLAIM_FIELDS):
+        # Update the row directly so saves with update_fields persist the bump too
+        User.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+        instance.token_version = old['token_version'] + 1
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop the user from the authentication cache.
+    
+    Covers profile edits, deactivation and password changes, which all save the user.
+    """
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def broadcast_blacklisted_token(sender, instance, created, **kwargs):
+    """Add newly blacklisted refresh tokens to every process's blacklist filter."""
+    if created:
+        token_blacklist.broadcast(instance.token.jti)
@@ -0,0 +1,158 @@
+"""
+Tests for the Bloom-filtered refresh token blacklist.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.tokens import PrincipalRefreshToken
+from core.services.token_blacklist import SEQUENCE_KEY, TokenBlacklistFilter, token_blacklist
+
+from .factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'token-blacklist-tests',
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(monkeypatch):
+    # The test processes share one LocMem cache, standing in for Redis
+    monkeypatch.setattr(token_blacklist, 'enabled', True)
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        token_blacklist.rebuild()
+        yield
+        cache.clear()
+
+
+def shared_filter():
+    """A filter of another process sharing the cache."""
+    other_process = TokenBlacklistFilter()
+    other_process.enabled = True
+    other_process.rebuild()
+    return other_process
+
+
+@pytest.fixture
+def user():
+    return UserFactory(is_email_verified=True)
+
+
+def blacklist_queries(captured):
+    return [query for query in captured.captured_queries if 'token_blacklist_blacklistedtoken' in query['sql']]
+
+
+class TestTokenBlacklistFilter:
+    """Filter maintenance and checks."""
+
+    def test_unlisted_token_skips_the_database(self, user):
+        token = PrincipalRefreshToken.for_user(user)
+        with CaptureQueriesContext(connection) as captured:
+            assert not token_blacklist.is_blacklisted(token['jti'])
+        assert blacklist_queries(captured) == []
+
+    def test_blacklisted_token_is_confirmed_in_the_database(self, user):
+        token = PrincipalRefreshToken.for_user(user)
+        token.blacklist()
+        with CaptureQueriesContext(connection) as captured:
+            assert token_blacklist.is_blacklisted(token['jti'])
+        assert len(blacklist_queries(captured)) == 1
+
+    def test_other_processes_catch_up_from_broadcasts(self, user):
+        other_process = shared_filter()
+        token = PrincipalRefreshToken.for_user(user)
+        token.blacklist()
+        assert other_process.is_blacklisted(token['jti'])
+
+    def test_broadcast_entry_is_written_before_the_sequence(self, user, monkeypatch):
+        other_process = shared_filter()
+        cache.set(SEQUENCE_KEY, 0, None)
+        incr = cache.incr
+        seen = []
+
+        def checked_incr(key, *args, **kwargs):
+            seen.append(cache.get(TokenBlacklistFilter.entry_key((cache.get(key) or 0) + 1)))
+            return incr(key, *args, **kwargs)
+
+        monkeypatch.setattr(cache, 'incr', checked_incr)
+        token_blacklist.broadcast('first')
+        token_blacklist.broadcast('second')
+
+        assert seen == ['first', 'second']
+        other_process._catch_up()
+        assert 'first' in other_process._filter and 'second' in other_process._filter
+
+    def test_per_process_cache_checks_the_database(self, user):
+        local_filter = TokenBlacklistFilter()
+        assert local_filter.enabled == 'auto'
+        assert not local_filter.active
+
+        token = PrincipalRefreshToken.for_user(user)
+        with CaptureQueriesContext(connection) as captured:
+            assert not local_filter.is_blacklisted(token['jti'])
+        assert len(blacklist_queries(captured)) == 1
+
+    def test_rebuild_loads_unexpired_blacklisted_tokens(self, user):
+        token = PrincipalRefreshToken.for_user(user)
+        token.blacklist()
+        assert TokenBlacklistFilter().rebuild() == 1
+
+
+class TestTokenRefresh:
+    """Refresh endpoint with the filtered blacklist."""
+
+    def test_rotated_token_cannot_be_reused(self, user):
+        refresh = str(PrincipalRefreshToken.for_user(user))
+        client = APIClient()
+
+        response = client.post(reverse('accounts:token_refresh'), {'refresh': refresh})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['refresh'] != refresh
+
+        response = client.post(reverse('accounts:token_refresh'), {'refresh': refresh})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_blocks_refresh(self, user):
+        refresh = PrincipalRefreshToken.for_user(user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+        response = client.post(reverse('accounts:logout'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_200_OK
+        response = client.post(reverse('accounts:token_refresh'), {'refresh': str(refresh)})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestPruneOutstandingTokens:
+    """prune_outstanding_tokens command."""
+
+    def test_deletes_only_expired_tokens(self, user):
+        now = timezone.now()
+        for i in range(5):
+            expired = OutstandingToken.objects.create(
+                user=user, jti=f'expired-{i}', token='x', expires_at=now - timedelta(days=1)
+            )
+            BlacklistedToken.objects.create(token=expired)
+        live = PrincipalRefreshToken.for_user(user)
+
+        call_command('prune_outstanding_tokens', batch_size=2)
+
+        assert list(OutstandingToken.objects.values_list('jti', flat=True)) == [live['jti']]
+        assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,42 @@
+"""
+JWT token classes for the accounts app.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.services.token_blacklist import token_blacklist
+
+# Claims carried by access tokens so read-only requests can skip loading the user
+USERNAME_CLAIM = 'username'
+IS_STAFF_CLAIM = 'is_staff'
+TOKEN_VERSION_CLAIM = 'ver'
+
+# User fields whose change bumps ``token_version`` and so revokes issued tokens
+TOKEN_CLAIM_FIELDS = ('username', 'is_staff', 'is_superuser', 'is_active', 'password')
+
+
+class PrincipalRefreshToken(RefreshToken):
+    """
+    Refresh token that also carries the user's principal claims.
+
+    Access tokens derived from it copy the claims, including those minted by
+    the token refresh endpoint. Blacklist checks go through the Bloom filter,
+    so only possibly blacklisted tokens cost a query.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        """Create a token for ``user`` with username, staff flag and token version."""
+        token = super().for_user(user)
+        token[USERNAME_CLAIM] = user.username
+        token[IS_STAFF_CLAIM] = user.is_staff
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+    def check_blacklist(self):
+        """Raise ``TokenError`` if this token is blacklisted."""
+        if token_blacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
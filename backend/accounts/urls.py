@@ -3,8 +3,6 @@ URL configuration for accounts app.
 """
 
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
-
 from . import views
 
 app_name = 'accounts'
@@ -14,7 +12,7 @@ urlpatterns = [
     path('register/', views.RegisterView.as_view(), name='register'),
     path('login/', views.CustomTokenObtainPairView.as_view(), name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', views.CustomTokenRefreshView.as_view(), name='token_refresh'),
     
     # Password management (matching test expectations)
     path('password/change/', views.ChangePasswordView.as_view(), name='password_change'),
@@ -7,24 +7,27 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.db import transaction
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from core.services.email_outbox import email_outbox
+from core.throttling import TokenBucketThrottle
 from core.views.base import BaseAPIView
 from .serializers import (
     UserSerializer,
     RegisterSerializer,
     CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
     ChangePasswordSerializer,
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer
 )
+from .tokens import PrincipalRefreshToken
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -44,13 +47,13 @@ class RegisterView(generics.CreateAPIView):
         """Create a new user and return tokens."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        # Queue the verification email in the same transaction as the user
+        with transaction.atomic():
+            user = serializer.save()
+            self._send_verification_email(user)
 
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
-        
-        # Send verification email (if email backend is configured)
-        self._send_verification_email(user)
+        refresh = PrincipalRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -79,14 +82,12 @@ class RegisterView(generics.CreateAPIView):
                 print("=" * 80)
                 return
             
-            # Send email
-            send_mail(
+            # Queue email for the outbox worker
+            email_outbox.enqueue(
                 f'{settings.EMAIL_SUBJECT_PREFIX}Please verify your email',
                 f'Click the following link to verify your email: {verification_link}',
-                settings.DEFAULT_FROM_EMAIL,
                 [user.email],
-                fail_silently=True,  # Don't break registration if email fails
-                html_message=f'''
+                html_body=f'''
                 <h2>Welcome to Recipe Sharing Platform!</h2>
                 <p>Thank you for registering. Please click the link below to verify your email address:</p>
                 <p><a href="{verification_link}" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a></p>
@@ -102,6 +103,15 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     Custom token view that returns user data with tokens.
     """
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    Token refresh view using the filtered blacklist check.
+    """
+    serializer_class = CustomTokenRefreshSerializer
 
 
 class LogoutView(BaseAPIView):
@@ -114,7 +124,7 @@ class LogoutView(BaseAPIView):
         """Blacklist the refresh token."""
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = PrincipalRefreshToken(refresh_token)
             token.blacklist()
             return self.get_success_response(message="Successfully logged out.")
         except Exception:
@@ -157,6 +167,8 @@ class PasswordResetRequestView(generics.GenericAPIView):
     """
     serializer_class = PasswordResetRequestSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request, *args, **kwargs):
         try:
@@ -214,17 +226,14 @@ class PasswordResetRequestView(generics.GenericAPIView):
                         </html>
                         '''
                     
-                    # Send email
-                    logger.info("Attempting to send password reset email")
-                    send_mail(
+                    # Queue email for the outbox worker
+                    email_outbox.enqueue(
                         f'{settings.EMAIL_SUBJECT_PREFIX}Password Reset Request',
                         f'Click the following link to reset your password: {reset_link}',  # Plain text version
-                        settings.DEFAULT_FROM_EMAIL,
                         [email],
-                        fail_silently=False,
-                        html_message=html_message,
+                        html_body=html_message,
                     )
-                    logger.info(f"Password reset email sent successfully to: {email}")
+                    logger.info(f"Password reset email queued for: {email}")
                     
                 except Exception as email_error:
                     logger.error(f"Email sending failed: {email_error}")
@@ -254,6 +263,8 @@ class PasswordResetConfirmView(generics.GenericAPIView):
     """
     serializer_class = PasswordResetConfirmSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -359,14 +370,12 @@ class ResendVerificationEmailView(generics.GenericAPIView):
                 print("=" * 80)
                 return
             
-            # Send email
-            send_mail(
+            # Queue email for the outbox worker
+            email_outbox.enqueue(
                 f'{settings.EMAIL_SUBJECT_PREFIX}Please verify your email',
                 f'Click the following link to verify your email: {verification_link}',
-                settings.DEFAULT_FROM_EMAIL,
                 [user.email],
-                fail_silently=True,  # Don't break if email fails
-                html_message=f'''
+                html_body=f'''
                 <h2>Email Verification</h2>
                 <p>Please click the link below to verify your email address:</p>
                 <p><a href="{verification_link}" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a></p>
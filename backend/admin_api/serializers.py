@@ -100,9 +100,12 @@ class AdminRecipeSerializer(serializers.ModelSerializer):
         }
     
     def get_view_count(self, obj):
-        """Get recipe view count."""
-        from recipes.models import RecipeView
-        return RecipeView.objects.filter(recipe=obj).count()
+        """Get recipe view count, from the page's counts when the view provides them."""
+        view_counts = self.context.get('view_counts')
+        if view_counts is None:
+            from recipes.services.view_stats_service import view_stats_service
+            view_counts = view_stats_service.view_counts([obj.id])
+        return view_counts.get(obj.id, 0)
     
     def get_favorite_count(self, obj):
         """Get recipe favorite count."""
@@ -196,9 +199,10 @@ class PlatformStatisticsSerializer(serializers.Serializer):
         flagged_ratings = ratings.none()  # Placeholder
         
         # Engagement statistics
-        from recipes.models import RecipeView, UserFavorite
+        from recipes.models import UserFavorite
+        from recipes.services.view_stats_service import view_stats_service
         
-        total_views = RecipeView.objects.count()
+        total_views = view_stats_service.total_views()
         total_favorites = UserFavorite.objects.count()
         avg_views_per_recipe = total_views / recipes.count() if recipes.count() > 0 else 0
         avg_favorites_per_recipe = total_favorites / recipes.count() if recipes.count() > 0 else 0
@@ -17,6 +17,7 @@ import uuid
 from datetime import datetime, timedelta
 
 from recipes.models import Recipe, Category, Rating, RecipeView, UserFavorite
+from recipes.services.view_stats_service import view_stats_service
 from .serializers import (
     AdminUserSerializer,
     AdminRecipeSerializer,
@@ -157,6 +158,18 @@ class AdminRecipeViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(created_at__lte=date_before)
         
         return queryset.order_by('-created_at')
+
+    def list(self, request, *args, **kwargs):
+        """List recipes, reading view counts for the whole page in one query."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        recipes = page if page is not None else list(queryset)
+        context = self.get_serializer_context()
+        context['view_counts'] = view_stats_service.view_counts([recipe.id for recipe in recipes])
+        serializer = self.get_serializer_class()(recipes, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
     def approve(self, request, id=None):
@@ -423,19 +436,20 @@ class AdminAnalyticsView(viewsets.ViewSet):
             # Top recipes (by rating count and average rating)
             top_recipes = Recipe.objects.annotate(
                 calculated_avg_rating=Avg('ratings__rating'),
-                calculated_rating_count=Count('ratings'),
-                calculated_views=Count('views'),
-                calculated_favorites=Count('favorited_by')
+                # distinct: the ratings and favorites joins multiply each other's rows
+                calculated_rating_count=Count('ratings', distinct=True),
+                calculated_favorites=Count('favorited_by', distinct=True)
             ).filter(
                 calculated_rating_count__gt=0
             ).order_by('-calculated_rating_count', '-calculated_avg_rating')[:10]
+            top_recipe_views = view_stats_service.view_counts([recipe.id for recipe in top_recipes])
             
             top_recipes_data = []
             for recipe in top_recipes:
                 top_recipes_data.append({
                     'id': str(recipe.id),
                     'title': recipe.title,
-                    'views': recipe.calculated_views,
+                    'views': top_recipe_views.get(recipe.id, 0),
                     'favorites': recipe.calculated_favorites,
                     'average_rating': float(recipe.calculated_avg_rating or 0)
                 })
@@ -460,11 +474,11 @@ class AdminAnalyticsView(viewsets.ViewSet):
             # Top users (by recipe count)
             top_users = User.objects.annotate(
                 calculated_recipe_count=Count('recipes'),
-                calculated_avg_rating=Avg('recipes__ratings__rating'),
-                calculated_total_views=Count('recipes__views')
+                calculated_avg_rating=Avg('recipes__ratings__rating')
             ).filter(
                 calculated_recipe_count__gt=0
             ).order_by('-calculated_recipe_count')[:10]
+            top_user_views = view_stats_service.view_counts_by_author([user.id for user in top_users])
             
             top_users_data = []
             for user in top_users:
@@ -472,7 +486,7 @@ class AdminAnalyticsView(viewsets.ViewSet):
                     'id': str(user.id),
                     'username': user.username,
                     'recipe_count': user.calculated_recipe_count,
-                    'total_views': user.calculated_total_views,
+                    'total_views': top_user_views.get(user.id, 0),
                     'average_rating': float(user.calculated_avg_rating or 0)
                 })
             
@@ -108,7 +108,7 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024  # Larger uploads are streamed to temporary files
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
@@ -117,12 +117,180 @@ CONTENT_STORAGE = {
     'RECIPE_IMAGES_UPLOAD_PATH': 'recipes/images/',
     'ALLOWED_IMAGE_EXTENSIONS': ['.jpg', '.jpeg', '.png', '.webp'],
     'MAX_IMAGE_SIZE': 5 * 1024 * 1024,  # 5MB
+    'MAX_IMAGE_PIXELS': 50_000_000,  # Checked from the header, before decoding (48MP phone photos fit)
     'IMAGE_QUALITY': 85,
+    'ORIGINAL_MAX_SIZE': (2048, 2048),  # Originals are stored at most this large
+    'IMAGE_WORKERS': 4,  # Threads encoding, uploading and deleting variants
+    'DELETE_BATCH_SIZE': 256,  # Blobs per Azure batch delete request (at most 256)
     'THUMBNAIL_SIZES': {
         'small': (150, 150),
         'medium': (300, 300),
         'large': (800, 600),
-    }
+    },
+    # Responsive variants for srcset, rendered in each format up to the original's width
+    'RESPONSIVE_WIDTHS': [320, 640, 1024, 1600],
+    'PLACEHOLDER_SIZE': 24,  # Inline placeholder fits this box (~200 bytes as WebP)
+    'PLACEHOLDER_QUALITY': 50,
+    'IMAGE_FORMATS': ['avif', 'webp', 'jpeg'],  # AVIF is skipped if Pillow lacks the codec
+    # Encoder options per format (JPEG uses IMAGE_QUALITY); WebP method 2 is
+    # about 3x faster than the default 4 for nearly the same size
+    'FORMAT_OPTIONS': {
+        'webp': {'quality': 80, 'method': 2},
+        'avif': {'quality': 60, 'speed': 8},
+    },
+}
+
+# On-demand image resizing (/api/v1/images/, see core.services.image_resize_service)
+IMAGE_RESIZE = {
+    'ALLOWED_WIDTHS': [160, 320, 480, 640, 800, 1024, 1280, 1600],
+    'FORMATS': ['avif', 'webp', 'jpeg'],  # AVIF is skipped if Pillow lacks the codec
+    'SOURCE_PATH': 'recipes/images/originals/',  # Only originals can be resized
+    'STORAGE_PATH': 'recipes/images/resized/',
+    'CACHE_DIR': os.path.join(BASE_DIR, 'var', 'image_cache'),  # Local LRU disk cache
+    'CACHE_MAX_BYTES': 512 * 1024 * 1024,
+    'MAX_AGE': 365 * 24 * 3600,  # Client cache lifetime; variants never change
+    'PREWARM_WIDTHS': [320, 640],  # Rendered by warm_recipe_images
+}
+
+# Background processing of recipe image uploads (process_image_jobs worker)
+IMAGE_JOBS = {
+    'UPLOADS_PATH': 'recipes/images/uploads/',  # Raw uploads awaiting processing
+    'WORKERS': 2,  # Rendering processes
+    'BATCH_SIZE': 10,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY_SECONDS': 30,  # Doubled per failed attempt
+    'LEASE_SECONDS': 600,  # A claimed job is retried after this if its worker dies
+    'RUN_IN_PROCESS': False,  # Process in a web process thread instead of the worker
+}
+
+# Direct-to-storage uploads through signed URLs (see core.services.direct_upload_service)
+DIRECT_UPLOADS = {
+    'SIGNER': 'auto',  # 'auto', 'azure' (blob SAS) or 'local' (/api/v1/uploads/, filesystem storage)
+    'EXPIRY_SECONDS': 900,  # Lifetime of an upload URL
+    'HEADER_BYTES': 64 * 1024,  # Read to check a completed upload's format and dimensions
+}
+
+# Recipe view tracking (write-behind ingestion)
+RECIPE_VIEW_TRACKING = {
+    'BUFFER_BACKEND': 'auto',  # 'auto', 'memory' or 'redis'
+    'MAX_BUFFER_SIZE': 10000,
+    'FLUSH_BATCH_SIZE': 500,
+    'FLUSH_INTERVAL_SECONDS': 5,
+    'DEDUPE_WINDOW_SECONDS': 300,  # 5 minutes
+    'INFLIGHT_LEASE_SECONDS': 300,
+    'BACKGROUND_FLUSH': True,
+    'RECIPE_CACHE_SECONDS': 3600,  # Cached recipe existence checks on the request path
+}
+
+# Recipe view rollups and raw view retention
+RECIPE_VIEW_ROLLUPS = {
+    'ROLLUP_LAG_SECONDS': 300,  # Leave time for buffered views to be flushed
+    'RAW_RETENTION_DAYS': 90,
+    'PURGE_CHUNK_SIZE': 5000,
+    'HLL_PRECISION': 12,  # Unique viewer sketches: 4096 registers, ~1.6% standard error
+    'DURATION_SKETCH_ACCURACY': 0.01,  # Relative error of view duration percentiles
+}
+
+# Trending recipes (time-decayed engagement scores)
+RECIPE_TRENDING = {
+    'HALF_LIFE_HOURS': 24,
+    'WEIGHTS': {'view': 1.0, 'favorite': 5.0, 'rating': 3.0},
+    'PRUNE_BELOW_SCORE': 0.01,  # Decayed scores below this are dropped from the table
+    'REBUILD_DAYS': 14,
+}
+
+# Similar recipes (item-to-item collaborative filtering)
+RECIPE_RECOMMENDATIONS = {
+    'NEIGHBORS_PER_RECIPE': 20,
+    'MIN_SIMILARITY': 0.01,
+    'BLOCK_SIZE': 1000,  # Recipes per similarity block; bounds memory of the batch job
+    'WEIGHTS': {'favorite': 3.0, 'rating': 2.0, 'view': 1.0},
+}
+
+# Content-based recipe similarity (memory-mapped TF-IDF index)
+CONTENT_SIMILARITY = {
+    'INDEX_DIR': os.path.join(BASE_DIR, 'var', 'content_index'),
+    'DIMENSIONS': 2048,  # Hashed feature space for ingredients, tags and categories
+    'INITIAL_CAPACITY': 1024,
+    'BLOCK_SIZE': 4096,  # Recipes scored per NumPy block
+    'UPDATE_ON_SAVE': True,
+}
+
+# Personalized home feed
+RECIPE_FEED = {
+    'CANDIDATES_TTL_SECONDS': 1800,
+    'MAX_CANDIDATES': 200,  # Bounds the request-time rerank
+    'CANDIDATES_PER_SOURCE': 100,
+    'TOP_CATEGORIES': 5,
+    'DIVERSITY_PENALTY': 0.85,  # Score multiplier per earlier recipe from the same category
+    'BACKGROUND_BUILD': True,
+    'WEIGHTS': {'category': 1.0, 'similar': 1.5, 'trending': 0.5},
+}
+
+AUTH_USER_CACHE = {
+    'LOCAL_TTL_SECONDS': 5,  # Bounds how long other processes may serve a deactivated user
+    'SHARED_TTL_SECONDS': 300,
+    'LOCAL_MAX_ENTRIES': 10000,
+}
+
+TOKEN_BLACKLIST_FILTER = {
+    'ENABLED': 'auto',  # 'auto' (only with the shared Redis cache), True or False
+    'REBUILD_SECONDS': 300,
+    'ERROR_RATE': 0.001,
+    'MIN_CAPACITY': 1024,
+    'BROADCAST_TTL_SECONDS': 600,  # Must exceed REBUILD_SECONDS so processes can catch up
+}
+
+BOOTSTRAP = {
+    'MAX_WORKERS': 4,  # Threads rebuilding missing sections concurrently
+    'TTL_SECONDS': {
+        'latest_recipes': 300,
+        'categories': 3600,
+        'popular_searches': 3600,
+        'trending': 300,
+    },
+    'LIMITS': {'latest_recipes': 12, 'popular_searches': 10, 'trending': 12},
+}
+
+# Token buckets per throttle scope: bursts up to CAPACITY, refilled at
+# REFILL_PER_SECOND. KEY is 'user_or_ip' (users get their own bucket) or 'ip'.
+THROTTLE_BUCKETS = {
+    'search': {'CAPACITY': 30, 'REFILL_PER_SECOND': 0.5, 'KEY': 'user_or_ip'},
+    'search_suggestions': {'CAPACITY': 60, 'REFILL_PER_SECOND': 2, 'KEY': 'user_or_ip'},
+    'login': {'CAPACITY': 10, 'REFILL_PER_SECOND': 1 / 30, 'KEY': 'ip'},
+    'password_reset': {'CAPACITY': 5, 'REFILL_PER_SECOND': 1 / 120, 'KEY': 'ip'},
+}
+
+# Transactional email outbox drained by the send_outbox_emails worker
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE_SECONDS': 30,  # Doubled per failed attempt, with jitter
+    'BACKOFF_MAX_SECONDS': 3600,
+    'LEASE_SECONDS': 300,  # A claimed batch is retried after this if its worker dies
+    'SEND_ON_COMMIT': True,  # Send right after commit; the worker retries failures
+}
+
+# End-to-end API benchmarks (benchmark_api command, pytest -m benchmark)
+API_BENCHMARKS = {
+    'BASELINE_PATH': os.path.join(BASE_DIR, 'benchmarks', 'api_baseline.json'),
+    'ITERATIONS': 30,  # Timed requests per scenario
+    # Budgets over the baseline: latency may grow by this fraction plus
+    # LATENCY_SLACK_MS (timings of fast endpoints are noisy), allocated
+    # memory by MEMORY_TOLERANCE, and no extra queries are allowed
+    'LATENCY_TOLERANCE': {'p50_ms': 0.5, 'p95_ms': 0.75, 'p99_ms': 1.0},
+    'LATENCY_SLACK_MS': 5,
+    'MEMORY_TOLERANCE': 0.25,
+    'QUERY_TOLERANCE': 0,
+    'SEED': 42,
+    # Row counts passed to the dataset generator (see generate_dataset)
+    'DATASETS': {
+        'small': {'users': 200, 'recipes': 2000, 'ratings': 5000, 'favorites': 2000, 'views': 20000},
+        'medium': {'users': 5000, 'recipes': 50000, 'ratings': 200000, 'favorites': 50000, 'views': 1000000},
+        'large': {
+            'users': 50000, 'recipes': 1000000, 'ratings': 3000000, 'favorites': 1000000, 'views': 10000000,
+        },
+    },
 }
 
 # Default primary key field type
@@ -134,7 +302,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.middleware.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
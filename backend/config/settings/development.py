@@ -131,4 +131,10 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'INFO',
     },
-} 
\ No newline at end of file
+} 
+
+# Process image uploads without running the process_image_jobs worker
+IMAGE_JOBS = {
+    **IMAGE_JOBS,
+    'RUN_IN_PROCESS': True,
+}
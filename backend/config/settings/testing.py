@@ -23,6 +23,7 @@ DATABASES = {
 
 # Email backend for testing
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+FRONTEND_URL = 'http://testserver'
 
 # Disable password hashers for testing
 PASSWORD_HASHERS = [
@@ -47,4 +48,28 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
-} 
\ No newline at end of file
+} 
+
+# Flush recipe views explicitly in tests instead of from a background thread
+RECIPE_VIEW_TRACKING = {
+    **RECIPE_VIEW_TRACKING,
+    'BUFFER_BACKEND': 'memory',
+    'BACKGROUND_FLUSH': False,
+}
+
+# Tests that need the content index enable it with a temporary directory
+CONTENT_SIMILARITY = {
+    **CONTENT_SIMILARITY,
+    'UPDATE_ON_SAVE': False,
+}
+
+RECIPE_FEED = {
+    **RECIPE_FEED,
+    'BACKGROUND_BUILD': False,
+}
+
+# Worker threads would not see data in the test transaction
+BOOTSTRAP = {
+    **BOOTSTRAP,
+    'MAX_WORKERS': 1,
+}
@@ -8,11 +8,13 @@ from django.conf.urls.static import static
 
 # Import health check views
 from core.views.health import APIHealthCheckView, SimpleHealthCheckView
+from core.views.images import direct_upload, resized_image
 # Import performance monitoring views
 from core.views.performance import (
     performance_metrics, system_stats, slow_queries, 
     cache_stats, clear_cache, export_metrics, health_check
 )
+from recipes.views import BootstrapView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -22,6 +24,9 @@ urlpatterns = [
     path('api/v1/users/', include('user_management.urls')),
     path('api/v1/recipes/', include('recipes.urls', namespace='recipes')),
     path('api/v1/admin/', include('admin_api.urls')),
+    path('api/v1/bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+    path('api/v1/images/<path:name>', resized_image, name='resized_image'),
+    path('api/v1/uploads/<str:token>', direct_upload, name='direct_upload'),
     
     # Performance monitoring endpoints
     path('api/v1/performance/metrics/', performance_metrics, name='performance_metrics'),
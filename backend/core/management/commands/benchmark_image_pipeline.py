@@ -0,0 +1,124 @@
+"""
+Management command to benchmark the upload image pipeline.
+"""
+import logging
+import statistics
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import psutil
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+
+from core.services.storage_service import StorageService
+
+DEFAULT_SIZES = '1280x960,3000x2000,4032x3024'
+
+
+class PeakRSSSampler:
+    """Track this process's peak resident set size while the block runs."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.start = self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def synthetic_photo(width: int, height: int, image_format: str = 'JPEG') -> bytes:
+    """Photo-like sample image (smooth gradients plus sensor-like noise) rotated via EXIF."""
+    base = Image.merge('RGB', [
+        Image.linear_gradient('L').resize((width, height)),
+        Image.radial_gradient('L').resize((width, height)),
+        Image.effect_noise((width, height), 24).point(lambda value: value // 2 + 64),
+    ])
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees, as phone cameras write it
+    buffer = BytesIO()
+    base.save(buffer, format=image_format, quality=90, exif=exif)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark decoding, resizing and encoding of uploads (ms per upload and peak RSS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default=DEFAULT_SIZES,
+            help=f'Comma-separated WIDTHxHEIGHT synthetic samples (default: {DEFAULT_SIZES})',
+        )
+        parser.add_argument(
+            '--source-dir',
+            help='Benchmark the images in this directory instead of synthetic samples',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per sample',
+        )
+
+    def get_samples(self, options):
+        if options['source_dir']:
+            paths = sorted(
+                path for path in Path(options['source_dir']).iterdir()
+                if path.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp')
+            )
+            if not paths:
+                raise CommandError(f"No images found in {options['source_dir']}")
+            return [(path.name, path.read_bytes()) for path in paths]
+
+        samples = []
+        for size in options['sizes'].split(','):
+            try:
+                width, height = (int(value) for value in size.lower().split('x'))
+            except ValueError:
+                raise CommandError(f'Invalid size: {size}')
+            samples.append((f'{width}x{height}.jpg', synthetic_photo(width, height)))
+        return samples
+
+    def handle(self, *args, **options):
+        logging.getLogger('core.services.storage_service').setLevel(logging.WARNING)
+        service = StorageService()
+        # Samples may exceed the upload limit; this measures processing only
+        service.max_file_size = float('inf')
+
+        self.stdout.write(
+            f"{'sample':<24}{'bytes':>10}{'p50 ms':>10}{'max ms':>10}{'peak RSS MB':>14}{'growth MB':>12}"
+        )
+        for name, data in self.get_samples(options):
+            upload = SimpleUploadedFile(name, data)
+            service.render_image_variants(upload)  # Warm-up
+
+            timings = []
+            with PeakRSSSampler() as sampler:
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    service.render_image_variants(upload)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(
+                f"{name:<24}{len(data):>10}{statistics.median(timings):>10.1f}"
+                f"{max(timings):>10.1f}{sampler.peak / (1024 * 1024):>14.1f}"
+                f"{(sampler.peak - sampler.start) / (1024 * 1024):>12.1f}"
+            )
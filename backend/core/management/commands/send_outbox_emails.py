@@ -0,0 +1,47 @@
+"""
+Management command to deliver queued outbox emails.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.email_outbox import email_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails in batches over one persistent connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Emails claimed per batch (defaults to EMAIL_OUTBOX BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new emails instead of exiting once drained',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls in loop mode',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                counts = email_outbox.drain(batch_size=options['batch_size'])
+                if any(counts.values()) or not options['loop']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Sent {counts['sent']} emails, {counts['retried']} to retry, {counts['failed']} failed"
+                    ))
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            email_outbox.close()
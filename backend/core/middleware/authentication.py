@@ -1,19 +1,41 @@
 """
 Authentication middleware for JWT token handling.
 Provides JWT token validation and user authentication.
+
+The middleware and the DRF authentication class share their work through the
+request: a bearer token is verified once and the resulting ``(user, token)``
+pair is stored on the underlying ``HttpRequest``, so whichever runs second
+reuses it. Users come from the two-tier user cache, which makes authenticated
+requests free of authentication queries once the user is cached.
+
+Views can opt into ``ClaimsJWTAuthentication``: for read-only requests it
+builds the user from the token's claims and only loads the row if the view
+touches another field. A token version claim, checked against the cached
+per-user counter, keeps deactivation and password changes effective.
 """
 
-import jwt
-from typing import Optional
+import uuid
+from typing import Optional, Tuple
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest
-from rest_framework import authentication
-from rest_framework.exceptions import AuthenticationFailed
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication as SimpleJWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from accounts.tokens import IS_STAFF_CLAIM, TOKEN_VERSION_CLAIM, USERNAME_CLAIM
+from core.services.user_cache import user_cache
 
 User = get_user_model()
 
+# Attribute holding ``(raw_token, validated_token, user)`` on the HttpRequest
+REQUEST_AUTH_ATTR = '_jwt_authentication'
+
+
 class JWTAuthenticationMiddleware:
     """
     Middleware for handling JWT authentication.
@@ -22,53 +44,39 @@ class JWTAuthenticationMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.authenticator = JWTAuthentication()
 
     def __call__(self, request: HttpRequest):
         # Try to authenticate using JWT
         auth_header = request.headers.get('Authorization')
         if auth_header and auth_header.startswith('Bearer '):
             token = auth_header.split(' ')[1]
-            user = self._authenticate_token(token)
+            user = self._authenticate_token(token, request)
             if user:
                 request.user = user
 
         return self.get_response(request)
 
-    def _authenticate_token(self, token: str) -> Optional[User]:
+    def _authenticate_token(self, token: str, request: Optional[HttpRequest] = None) -> Optional[User]:
         """
         Authenticate a JWT token and return the corresponding user.
-        
+
         Args:
             token: The JWT token to validate
-            
+            request: Request to store the result on for later authenticators
+
         Returns:
             The authenticated user or None if token is invalid
         """
         try:
-            # Decode and validate the token
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
-
-            # Get the user from the payload
-            user_id = payload.get('user_id')
-            if not user_id:
-                return None
-
-            # Get and return the user
-            return User.objects.get(id=user_id, is_active=True)
-
-        except jwt.ExpiredSignatureError:
-            raise AuthenticationFailed('Token has expired')
-        except jwt.InvalidTokenError:
-            return None
-        except User.DoesNotExist:
+            user, _ = self.authenticator.authenticate_token(token.encode(), request)
+            return user
+        except (InvalidToken, AuthenticationFailed):
+            # Invalid tokens are rejected by DRF with a proper 401 response
             return None
 
 
-class JWTAuthentication(authentication.BaseAuthentication):
+class JWTAuthentication(SimpleJWTAuthentication):
     """
     DRF authentication class for JWT tokens.
     Used by DRF views for authentication.
@@ -77,36 +85,123 @@ class JWTAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request: HttpRequest):
         """
         Authenticate the request using JWT token.
-        
+
         Args:
             request: The HTTP request to authenticate
-            
+
         Returns:
             Tuple of (user, token) if authentication successful,
-            None if no token or invalid token
+            None if no token
         """
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
+        header = self.get_header(request)
+        if header is None:
             return None
 
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        return self.authenticate_token(raw_token, request)
+
+    def authenticate_token(self, raw_token: bytes, request: Optional[HttpRequest] = None) -> Tuple[User, Token]:
+        """
+        Verify a raw token and load its user, reusing an earlier result for the same request.
+
+        Raises:
+            InvalidToken: If the token fails verification
+            AuthenticationFailed: If the user is missing, inactive or changed password
+        """
+        http_request = getattr(request, '_request', request)
+        cached = getattr(http_request, REQUEST_AUTH_ATTR, None)
+        if cached is not None and cached[0] == raw_token:
+            return cached[2], cached[1]
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_request_user(validated_token, http_request)
+        if http_request is not None:
+            setattr(http_request, REQUEST_AUTH_ATTR, (raw_token, validated_token, user))
+        return user, validated_token
+
+    def get_request_user(self, validated_token: Token, request: Optional[HttpRequest]) -> User:
+        """Resolve the user for ``request``; subclasses may skip loading it."""
+        return self.get_user(validated_token)
+
+    def get_user(self, validated_token: Token) -> User:
+        """Load the token's user from the user cache."""
         try:
-            token = auth_header.split(' ')[1]
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
 
-            user_id = payload.get('user_id')
-            if not user_id:
-                return None
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
 
-            user = User.objects.get(id=user_id, is_active=True)
-            return (user, token)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
 
-        except (jwt.InvalidTokenError, User.DoesNotExist):
-            return None
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if version is not None and version != user.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
 
     def authenticate_header(self, request: HttpRequest) -> str:
         """Return the authentication header format."""
-        return 'Bearer' 
\ No newline at end of file
+        return 'Bearer'
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Opt-in JWT authentication that trusts token claims for read-only requests.
+
+    Safe-method requests get a ``User`` built from the ``user_id``, username,
+    staff and version claims with every other field deferred; touching one
+    hydrates the instance (see ``User.refresh_from_db``). Unsafe requests and
+    tokens without the claims load the full user.
+    """
+
+    claim_names = (USERNAME_CLAIM, IS_STAFF_CLAIM, TOKEN_VERSION_CLAIM)
+
+    def get_request_user(self, validated_token: Token, request: Optional[HttpRequest]) -> User:
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or api_settings.CHECK_REVOKE_TOKEN
+            or any(claim not in validated_token for claim in self.claim_names)
+        ):
+            return self.get_user(validated_token)
+        return self.get_principal(validated_token)
+
+    def get_principal(self, validated_token: Token) -> User:
+        """Build a lazily hydrated user from verified claims."""
+        try:
+            user_id = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        except (KeyError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        version = user_cache.get_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if version != validated_token[TOKEN_VERSION_CLAIM]:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        claims = {
+            'id': user_id,
+            'username': validated_token[USERNAME_CLAIM],
+            'is_staff': validated_token[IS_STAFF_CLAIM],
+            'is_active': True,
+            'token_version': version,
+        }
+        fields = [field for field in User._meta.concrete_fields if field.attname in claims]
+        user = User.from_db(
+            None,
+            [field.attname for field in fields],
+            [claims[field.attname] for field in fields],
+        )
+        user._from_claims = True
+        return user
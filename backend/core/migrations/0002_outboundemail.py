@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:45
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this email', primary_key=True, serialize=False)),
+                ('subject', models.CharField(help_text='Email subject', max_length=255)),
+                ('body', models.TextField(help_text='Plain text body')),
+                ('html_body', models.TextField(blank=True, help_text='Optional HTML alternative')),
+                ('from_email', models.CharField(help_text='Sender address', max_length=255)),
+                ('recipients', models.JSONField(default=list, help_text='Recipient addresses')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', help_text='Delivery status', max_length=7)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Delivery attempts made so far')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time of the next delivery attempt')),
+                ('last_error', models.TextField(blank=True, help_text='Error from the last failed attempt')),
+                ('sent_at', models.DateTimeField(blank=True, help_text='When the email was delivered', null=True)),
+            ],
+            options={
+                'verbose_name': 'outbound email',
+                'verbose_name_plural': 'outbound emails',
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='core_outbou_status_f5f1ae_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:07
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this blob', primary_key=True, serialize=False)),
+                ('sha256', models.CharField(help_text='SHA-256 of the uploaded file', max_length=64, unique=True)),
+                ('images', models.JSONField(default=dict, help_text='Stored variants, as returned by save_image_with_thumbnails')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of records referencing these images')),
+                ('source_bytes', models.PositiveIntegerField(default=0, help_text='Size of the uploaded file in bytes')),
+            ],
+            options={
+                'verbose_name': 'image blob',
+                'verbose_name_plural': 'image blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -3,7 +3,11 @@ Core models package.
 """
 
 from .base import BaseModel
+from .email import OutboundEmail
+from .image import ImageBlob
 
 __all__ = [
     'BaseModel',
-] 
\ No newline at end of file
+    'OutboundEmail',
+    'ImageBlob',
+] 
@@ -0,0 +1,81 @@
+"""
+Outbound email models.
+"""
+
+import uuid
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .base import BaseModel
+
+
+class OutboundEmail(BaseModel):
+    """An email queued in the outbox, delivered later by the outbox worker."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this email")
+    )
+    subject = models.CharField(
+        max_length=255,
+        help_text=_("Email subject")
+    )
+    body = models.TextField(
+        help_text=_("Plain text body")
+    )
+    html_body = models.TextField(
+        blank=True,
+        help_text=_("Optional HTML alternative")
+    )
+    from_email = models.CharField(
+        max_length=255,
+        help_text=_("Sender address")
+    )
+    recipients = models.JSONField(
+        default=list,
+        help_text=_("Recipient addresses")
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text=_("Delivery status")
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=_("Delivery attempts made so far")
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_("Earliest time of the next delivery attempt")
+    )
+    last_error = models.TextField(
+        blank=True,
+        help_text=_("Error from the last failed attempt")
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the email was delivered")
+    )
+
+    class Meta:
+        verbose_name = _('outbound email')
+        verbose_name_plural = _('outbound emails')
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
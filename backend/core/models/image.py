@@ -0,0 +1,47 @@
+"""
+Stored image models.
+"""
+
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .base import BaseModel
+
+
+class ImageBlob(BaseModel):
+    """A content-addressed stored image and the number of records using it."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this blob")
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text=_("SHA-256 of the uploaded file")
+    )
+    images = models.JSONField(
+        default=dict,
+        help_text=_("Stored variants, as returned by save_image_with_thumbnails")
+    )
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of records referencing these images")
+    )
+    source_bytes = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Size of the uploaded file in bytes")
+    )
+
+    class Meta:
+        verbose_name = _('image blob')
+        verbose_name_plural = _('image blobs')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
@@ -0,0 +1,73 @@
+"""
+Blob operations the Django storage API does not cover.
+
+Ranged reads and batch deletes need the Azure container client and full blob
+names (prefixed with the storage's ``location``). django-storages only
+exposes these through ``AzureStorage.client`` and its private
+``_get_valid_path``, so this adapter keeps that knowledge in one place. Blob
+names are derived from the public ``location`` setting when the private
+helper is missing, and every operation falls back to the plain storage API
+on other backends or when the client does not offer the call.
+"""
+import logging
+import posixpath
+from typing import Iterable
+
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStorageAdapter:
+    """Wraps a storage backend with ranged reads and batch deletes."""
+
+    def __init__(self, storage=None):
+        self.storage = storage if storage is not None else default_storage
+
+    @property
+    def container_client(self):
+        """Azure container client of the storage, or None for other backends."""
+        if not hasattr(self.storage, 'azure_container'):
+            return None
+        try:
+            return self.storage.client
+        except Exception as e:
+            logger.warning(f"Blob container client unavailable, using the storage API: {e}")
+            return None
+
+    def blob_name(self, name: str) -> str:
+        """Full blob name of a storage name, including the storage's location."""
+        valid_path = getattr(self.storage, '_get_valid_path', None)
+        if callable(valid_path):
+            return valid_path(name)
+        location = getattr(self.storage, 'location', '') or ''
+        blob_name = posixpath.normpath(posixpath.join(location, name.replace('\\', '/'))).lstrip('/')
+        # normpath turns an empty path into '.'
+        return '' if blob_name == '.' else blob_name
+
+    @property
+    def supports_batch_delete(self) -> bool:
+        return callable(getattr(self.container_client, 'delete_blobs', None))
+
+    def read_header(self, name: str, length: int) -> bytes:
+        """First ``length`` bytes of a stored file, without downloading the rest where possible."""
+        get_blob_client = getattr(self.container_client, 'get_blob_client', None)
+        if callable(get_blob_client):
+            # A ranged download; opening the file would fetch the whole blob
+            blob = get_blob_client(self.blob_name(name))
+            return blob.download_blob(offset=0, length=length).readall()
+        with self.storage.open(name, 'rb') as stored:
+            return stored.read(length)
+
+    def delete_many(self, names: Iterable[str]) -> None:
+        """
+        Delete files in one request where the backend allows, else one by one.
+
+        Names that do not exist are not errors.
+        """
+        delete_blobs = getattr(self.container_client, 'delete_blobs', None)
+        if callable(delete_blobs):
+            delete_blobs(*map(self.blob_name, names), raise_on_any_failure=False)
+            return
+        for name in names:
+            self.storage.delete(name)
@@ -0,0 +1,215 @@
+"""
+Direct-to-storage uploads through short-lived signed URLs.
+
+Instead of streaming image bytes through a Django worker, clients ask for a
+signed upload URL, ``PUT`` the file straight to storage and then report
+completion. On Azure the URL is a blob SAS allowing only create/write of
+one blob until it expires; with filesystem storage (development, tests) it
+points at ``/api/v1/uploads/<token>``, which checks an equivalent signed
+token before writing the body to storage.
+
+Completed uploads are checked from their first ``HEADER_BYTES`` only: the
+declared size, format and dimensions are known without downloading the
+whole blob, and full decoding is left to whoever renders it.
+"""
+import logging
+import os
+import uuid
+from datetime import timedelta
+from io import BytesIO
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from core.services.blob_storage import BlobStorageAdapter
+from core.services.storage_service import get_storage_service
+
+logger = logging.getLogger(__name__)
+
+SIGNING_SALT = 'core.direct_upload'
+
+# Extension each accepted content type is stored with
+CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+}
+
+
+class LocalUploadSigner:
+    """Signs upload URLs received by this app and written to the default storage."""
+
+    def upload_url(self, name: str, content_type: str, expiry_seconds: int) -> Dict[str, Any]:
+        token = signing.dumps({'name': name, 'type': content_type}, salt=SIGNING_SALT)
+        return {
+            'url': reverse('direct_upload', kwargs={'token': token}),
+            'method': 'PUT',
+            'headers': {'Content-Type': content_type},
+        }
+
+    def receive(self, token: str, body: File, content_type: str, expiry_seconds: int, max_bytes: int) -> str:
+        """
+        Store the body of an upload to a signed URL.
+
+        Returns:
+            Storage name the body was written to
+
+        Raises:
+            signing.BadSignature: If the token is invalid or expired
+            ValidationError: If the body does not match what was signed
+        """
+        claims = signing.loads(token, salt=SIGNING_SALT, max_age=expiry_seconds)
+        if content_type != claims['type']:
+            raise ValidationError(f"Content-Type must be {claims['type']}")
+        if body.size > max_bytes:
+            raise ValidationError(f"File size exceeds {max_bytes / (1024 * 1024)}MB limit")
+        if default_storage.exists(claims['name']):
+            raise ValidationError('Upload already received')
+        return default_storage.save(claims['name'], body)
+
+    def read_header(self, name: str, length: int) -> bytes:
+        with default_storage.open(name, 'rb') as upload:
+            return upload.read(length)
+
+
+class AzureUploadSigner:
+    """Signs blob SAS URLs allowing a single blob to be created in the container."""
+
+    def upload_url(self, name: str, content_type: str, expiry_seconds: int) -> Dict[str, Any]:
+        # Create and write only: the holder can neither read nor list blobs
+        url = default_storage.url(name, expire=expiry_seconds, mode='cw')
+        return {
+            'url': url,
+            'method': 'PUT',
+            'headers': {'Content-Type': content_type, 'x-ms-blob-type': 'BlockBlob'},
+        }
+
+    def read_header(self, name: str, length: int) -> bytes:
+        return BlobStorageAdapter(default_storage).read_header(name, length)
+
+
+class DirectUploadService:
+    """Service issuing signed upload URLs and checking what was uploaded."""
+
+    def __init__(self):
+        config = getattr(settings, 'DIRECT_UPLOADS', {})
+        self.signer_backend = config.get('SIGNER', 'auto')
+        self.expiry_seconds = config.get('EXPIRY_SECONDS', 900)
+        self.header_bytes = config.get('HEADER_BYTES', 64 * 1024)
+        self._signer = None
+
+    @property
+    def signer(self):
+        """Lazily create the configured signer backend."""
+        if self._signer is None:
+            self._signer = self._create_signer()
+        return self._signer
+
+    def _create_signer(self):
+        backend = self.signer_backend
+        if backend == 'auto':
+            backend = 'azure' if hasattr(default_storage, 'azure_container') else 'local'
+        return AzureUploadSigner() if backend == 'azure' else LocalUploadSigner()
+
+    @property
+    def max_bytes(self) -> int:
+        return get_storage_service().max_file_size
+
+    def issue(self, directory: str, content_type: str, prefix: str = '') -> Dict[str, Any]:
+        """
+        Reserve a storage name and sign an upload URL for it.
+
+        Args:
+            directory: Storage directory the upload goes to
+            content_type: MIME type the client will upload
+            prefix: Optional prefix for the file name
+
+        Returns:
+            Dictionary with the storage ``name``, the ``url``, ``method`` and
+            ``headers`` to upload with, ``expires_at`` and ``max_bytes``
+
+        Raises:
+            ValidationError: If the content type is not an accepted image type
+        """
+        extension = CONTENT_TYPES.get(content_type)
+        if extension is None or extension not in get_storage_service().allowed_extensions:
+            raise ValidationError(f"Content type must be one of {', '.join(CONTENT_TYPES)}")
+        filename = f"{prefix}_{uuid.uuid4()}{extension}" if prefix else f"{uuid.uuid4()}{extension}"
+        name = os.path.join(directory, filename)
+        return {
+            'name': name,
+            **self.signer.upload_url(name, content_type, self.expiry_seconds),
+            'expires_at': timezone.now() + timedelta(seconds=self.expiry_seconds),
+            'max_bytes': self.max_bytes,
+        }
+
+    def receive(self, token: str, stream, content_type: str, size: int) -> str:
+        """
+        Store the body of a request to a locally signed upload URL.
+
+        Args:
+            token: Token from the signed URL
+            stream: Readable request body
+            content_type: Content-Type the body was sent with
+            size: Content-Length of the body
+
+        Returns:
+            Storage name the body was written to
+
+        Raises:
+            signing.BadSignature: If the token is invalid or expired, or
+                uploads go directly to remote storage
+            ValidationError: If the body does not match what was signed
+        """
+        if not isinstance(self.signer, LocalUploadSigner):
+            raise signing.BadSignature('Uploads go directly to storage')
+        body = File(stream)
+        body.size = size
+        return self.signer.receive(token, body, content_type, self.expiry_seconds, self.max_bytes)
+
+    def validate_upload(self, name: str) -> Dict[str, Any]:
+        """
+        Check an uploaded file from its size and header.
+
+        Returns:
+            Dictionary with the image ``format``, ``width``, ``height`` and
+            ``bytes``
+
+        Raises:
+            ValidationError: If the file is missing, too large, not an
+                accepted image or over MAX_IMAGE_PIXELS
+        """
+        if not default_storage.exists(name):
+            raise ValidationError('Upload not found')
+        size = default_storage.size(name)
+        if size > self.max_bytes:
+            raise ValidationError(f"File size exceeds {self.max_bytes / (1024 * 1024)}MB limit")
+
+        length = self.header_bytes
+        while True:
+            header = self.signer.read_header(name, length)
+            try:
+                # Parses the header only; pixel data is not decoded
+                with Image.open(BytesIO(header)) as image:
+                    image_format, (width, height) = image.format, image.size
+                break
+            except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+                # Large metadata segments can push a JPEG's frame header further in
+                if len(header) >= size or isinstance(e, Image.DecompressionBombError):
+                    raise ValidationError(f"Invalid image file: {e}")
+                length *= 4
+        get_storage_service().check_dimensions(image_format, width, height)
+        if CONTENT_TYPES.get(Image.MIME.get(image_format, '')) != os.path.splitext(name)[1]:
+            raise ValidationError(f"Uploaded {image_format} does not match the declared content type")
+        return {'format': image_format, 'width': width, 'height': height, 'bytes': size}
+
+
+# Service instance
+direct_upload_service = DirectUploadService()
@@ -0,0 +1,193 @@
+"""
+Transactional email outbox.
+
+Views queue emails with ``email_outbox.enqueue`` inside their transaction, so
+an email exists exactly when the change that triggered it was committed and
+the request never waits on the mail server. Once the transaction commits, the
+email is sent right away from a background thread (``SEND_ON_COMMIT``); the
+``send_outbox_emails`` worker, started next to the web server, drains the
+table in batches over one persistent backend connection and retries what
+could not be sent immediately.
+
+Each batch is claimed by pushing ``next_attempt_at`` forward by a lease
+(with ``SKIP LOCKED`` where the database supports it), so concurrent workers
+do not send the same email and a crashed worker's batch is retried once the
+lease expires. Failed sends are retried with exponential backoff and jitter
+until ``MAX_ATTEMPTS``, after which the email is marked failed.
+"""
+import logging
+import random
+import smtplib
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutbox:
+    """Queue emails in the database and deliver them in batches."""
+
+    def __init__(self):
+        config = getattr(settings, 'EMAIL_OUTBOX', {})
+        self.batch_size = config.get('BATCH_SIZE', 50)
+        self.max_attempts = config.get('MAX_ATTEMPTS', 5)
+        self.backoff_base = config.get('BACKOFF_BASE_SECONDS', 30)
+        self.backoff_max = config.get('BACKOFF_MAX_SECONDS', 3600)
+        self.lease_seconds = config.get('LEASE_SECONDS', 300)
+        self.send_on_commit = config.get('SEND_ON_COMMIT', True)
+        # One backend connection per thread: on-commit sends run beside requests
+        self._local = threading.local()
+
+    def enqueue(self, subject: str, body: str, recipients: List[str],
+                html_body: str = '', from_email: Optional[str] = None) -> OutboundEmail:
+        """Queue an email; it is sent only if the surrounding transaction commits."""
+        # Savepoint: callers that swallow email errors keep a usable transaction
+        with transaction.atomic():
+            email = OutboundEmail.objects.create(
+                subject=subject,
+                body=body,
+                html_body=html_body or '',
+                from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                recipients=list(recipients),
+            )
+            if self.send_on_commit:
+                transaction.on_commit(
+                    lambda: threading.Thread(target=self._send_in_thread, args=(email.id,), daemon=True).start()
+                )
+        return email
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before retrying after ``attempts`` failed attempts."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    # Delivery
+
+    def claim_batch(self, batch_size: Optional[int] = None, ids: Optional[List] = None) -> List[OutboundEmail]:
+        """Lease due pending emails (optionally only ``ids``) to this worker and count the attempt."""
+        now = timezone.now()
+        due = OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+            status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now,
+        )
+        if ids is not None:
+            due = due.filter(id__in=ids)
+        with transaction.atomic():
+            claimed = list(
+                due.order_by('next_attempt_at').values_list('id', flat=True)[:batch_size or self.batch_size]
+            )
+            OutboundEmail.objects.filter(id__in=claimed).update(
+                next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                attempts=F('attempts') + 1,
+            )
+        return list(OutboundEmail.objects.filter(id__in=claimed).order_by('created_at'))
+
+    def _get_connection(self):
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = get_connection(fail_silently=False)
+            self._local.connection.open()
+        return self._local.connection
+
+    def close(self) -> None:
+        """Close this thread's persistent backend connection."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing email connection: {e}")
+            self._local.connection = None
+
+    def _send(self, email: OutboundEmail) -> None:
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email,
+            to=email.recipients,
+            connection=self._get_connection(),
+        )
+        if email.html_body:
+            message.attach_alternative(email.html_body, 'text/html')
+        message.send()
+
+    def _deliver(self, email: OutboundEmail) -> None:
+        try:
+            self._send(email)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped the idle connection; reconnect once
+            self.close()
+            self._send(email)
+
+    def send_batch(self, batch_size: Optional[int] = None, ids: Optional[List] = None) -> Dict[str, int]:
+        """
+        Send one batch of due emails (optionally only ``ids``) over the persistent connection.
+
+        Returns:
+            Counts of ``sent``, ``retried`` and ``failed`` emails
+        """
+        counts = {'sent': 0, 'retried': 0, 'failed': 0}
+        for email in self.claim_batch(batch_size, ids=ids):
+            try:
+                self._deliver(email)
+            except Exception as e:
+                logger.error(f"Error sending email {email.id} (attempt {email.attempts}): {e}")
+                self.close()
+                if email.attempts >= self.max_attempts:
+                    OutboundEmail.objects.filter(id=email.id).update(
+                        status=OutboundEmail.Status.FAILED, last_error=str(e),
+                    )
+                    counts['failed'] += 1
+                else:
+                    OutboundEmail.objects.filter(id=email.id).update(
+                        next_attempt_at=timezone.now() + timedelta(seconds=self.backoff(email.attempts)),
+                        last_error=str(e),
+                    )
+                    counts['retried'] += 1
+                continue
+            OutboundEmail.objects.filter(id=email.id).update(
+                status=OutboundEmail.Status.SENT, sent_at=timezone.now(), last_error='',
+            )
+            counts['sent'] += 1
+        return counts
+
+    def send_now(self, email_id) -> Dict[str, int]:
+        """
+        Send one queued email immediately, on its own connection.
+
+        An email that fails (or was already claimed by the worker) stays in
+        the outbox and follows the usual retry schedule.
+        """
+        try:
+            return self.send_batch(ids=[email_id])
+        finally:
+            self.close()
+
+    def _send_in_thread(self, email_id) -> None:
+        try:
+            self.send_now(email_id)
+        except Exception as e:
+            logger.error(f"Error sending email {email_id} on commit: {e}")
+        finally:
+            connections.close_all()
+
+    def drain(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Send batches until no due emails remain."""
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        while True:
+            counts = self.send_batch(batch_size)
+            for key, value in counts.items():
+                totals[key] += value
+            if not any(counts.values()):
+                return totals
+
+
+# Service instance
+email_outbox = EmailOutbox()
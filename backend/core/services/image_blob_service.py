@@ -0,0 +1,108 @@
+"""
+Content-addressed, reference-counted storage of uploaded images.
+
+Uploads are identified by the SHA-256 of their bytes. The first upload of an
+image is rendered and stored under names derived from the hash and recorded
+as an ``ImageBlob`` with one reference; re-uploads of the same bytes (clones,
+repeated uploads, seed data) take another reference to the stored variants
+without decoding anything. Releasing the last reference deletes the blob's
+files once the transaction commits.
+
+Every ``recipe.images`` dictionary holding a ``sha256`` owns one reference;
+dictionaries without one predate deduplication and are deleted outright.
+"""
+import logging
+from typing import Dict, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import ImageBlob
+from core.services.storage_service import get_storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class ImageBlobService:
+    """Service deduplicating stored images by content hash."""
+
+    def save(self, file, recipe_id: str) -> Dict:
+        """
+        Store an upload, reusing the variants of an identical earlier upload.
+
+        The caller owns one reference to the returned images and must
+        ``release`` them when they are replaced or deleted.
+
+        Returns:
+            Dictionary with image URLs, as from ``save_image_with_thumbnails``
+
+        Raises:
+            ValidationError: If the file is not an acceptable image
+        """
+        storage_service = get_storage_service()
+        content_hash = storage_service.content_hash(file)
+        images = self.acquire(content_hash)
+        if images is not None:
+            logger.info(f"Reusing stored image {content_hash[:12]} for recipe {recipe_id}")
+            return images
+        images = storage_service.save_image_with_thumbnails(file, recipe_id, content_hash=content_hash)
+        return self.register(content_hash, images, file.size)
+
+    def acquire(self, content_hash: str) -> Optional[Dict]:
+        """Take a reference to a stored image, or return None if there is none."""
+        with transaction.atomic():
+            if not ImageBlob.objects.filter(sha256=content_hash).update(ref_count=F('ref_count') + 1):
+                return None
+            return ImageBlob.objects.values_list('images', flat=True).get(sha256=content_hash)
+
+    def register(self, content_hash: str, images: Dict, source_bytes: int = 0) -> Dict:
+        """
+        Record freshly stored images with one reference.
+
+        If an identical upload was registered meanwhile, that blob gains the
+        reference instead and these duplicate files are deleted.
+
+        Returns:
+            The images now referenced
+        """
+        try:
+            with transaction.atomic():
+                ImageBlob.objects.create(
+                    sha256=content_hash, images=images, ref_count=1, source_bytes=source_bytes,
+                )
+            return images
+        except IntegrityError:
+            existing = self.acquire(content_hash)
+            if existing is None:
+                # The other blob was released in between; ours takes its place
+                return self.register(content_hash, images, source_bytes)
+            transaction.on_commit(lambda: get_storage_service().delete_recipe_images(images))
+            return existing
+
+    def release(self, images: Dict) -> None:
+        """
+        Drop a reference to stored images, deleting them with the last one.
+
+        Files are deleted after the surrounding transaction commits.
+        """
+        content_hash = images.get('sha256') if images else None
+        if not content_hash:
+            if images:
+                transaction.on_commit(lambda: get_storage_service().delete_recipe_images(images))
+            return
+
+        with transaction.atomic():
+            blob = ImageBlob.objects.select_for_update().filter(sha256=content_hash).first()
+            if blob is None:
+                logger.warning(f"Released unknown image blob {content_hash[:12]}")
+                return
+            if blob.ref_count > 1:
+                ImageBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            blob.delete()
+            transaction.on_commit(lambda: get_storage_service().delete_recipe_images(blob.images))
+        logger.info(f"Deleted image blob {content_hash[:12]}")
+
+
+# Service instance
+image_blob_service = ImageBlobService()
@@ -0,0 +1,277 @@
+"""
+On-demand resizing of stored images.
+
+Uploads keep their eager variants, but any allow-listed width and format can
+also be requested from ``/api/v1/images/<original>?w=&fmt=&sig=``, so a new
+size no longer means reprocessing the whole library. Parameters are signed
+(see ``url_for``) so clients cannot make the server render arbitrary sizes;
+serialized recipe images list these URLs in their ``srcset`` for the widths
+between the eagerly rendered variants.
+
+A variant is looked up in three tiers: a size-bounded LRU cache on local
+disk, then ``STORAGE_PATH`` in the default storage, and only then rendered
+from the original (and written to both). Concurrent requests for a variant
+are coalesced under striped file locks, so each variant is rendered once per
+host even across worker processes.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from PIL import Image
+
+from core.services.storage_service import IMAGE_FORMATS, get_storage_service
+from core.utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SALT = 'core.image_resize'
+
+# Height bound when fitting to a width only
+UNBOUNDED = 1 << 16
+
+
+class ImageResizeService:
+    """Service rendering and caching resized variants of stored images."""
+
+    LOCK_STRIPES = 64
+
+    def __init__(self):
+        config = getattr(settings, 'IMAGE_RESIZE', {})
+        self.allowed_widths = config.get('ALLOWED_WIDTHS', [320, 640, 1024])
+        Image.init()
+        self.formats = [
+            image_format for image_format in config.get('FORMATS', ['webp', 'jpeg'])
+            if image_format in IMAGE_FORMATS and IMAGE_FORMATS[image_format][0] in Image.SAVE
+        ]
+        self.source_path = config.get('SOURCE_PATH', 'recipes/images/originals/')
+        self.storage_path = config.get('STORAGE_PATH', 'recipes/images/resized/')
+        self.cache_dir = config.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'image-cache'))
+        self.cache_max_bytes = config.get('CACHE_MAX_BYTES', 256 * 1024 * 1024)
+        self.max_age = config.get('MAX_AGE', 365 * 24 * 3600)
+        self._counter_lock = threading.Lock()
+        self._written_since_evict = None
+
+    # Signed URLs
+
+    def signature(self, name: str, width: int, image_format: str) -> str:
+        """Signature binding an original to one allowed width and format."""
+        return salted_hmac(SIGNATURE_SALT, f"{name}:{width}:{image_format}").hexdigest()[:20]
+
+    def verify(self, name: str, width: int, image_format: str, signature: str) -> bool:
+        """Check a request's signature."""
+        return constant_time_compare(self.signature(name, width, image_format), signature or '')
+
+    def url_for(self, original_url: str, width: int, image_format: str) -> Optional[str]:
+        """
+        Signed resize URL for a stored original.
+
+        Args:
+            original_url: URL of the original, as stored in ``recipe.images``
+            width: One of ``ALLOWED_WIDTHS``
+            image_format: One of ``FORMATS``
+
+        Returns:
+            Relative URL, or None if the original is not in our storage
+        """
+        self.validate(width, image_format)
+        name = get_storage_service().storage_name(original_url)
+        if name is None:
+            return None
+        return self._signed_url(name, reverse('resized_image', kwargs={'name': name}), width, image_format)
+
+    def signed_variants(self, original_url: str, max_width: Optional[int] = None) -> Dict[str, Dict[int, str]]:
+        """
+        Signed resize URLs of a stored original for every allowed width and format.
+
+        Args:
+            original_url: URL of the original, as stored in ``recipe.images``
+            max_width: Leave out widths above this
+
+        Returns:
+            Relative URLs keyed by format and width; empty if the original
+            cannot be resized
+        """
+        name = get_storage_service().storage_name(original_url)
+        if name is None or not name.startswith(self.source_path):
+            return {}
+        path = reverse('resized_image', kwargs={'name': name})
+        widths = [width for width in self.allowed_widths if max_width is None or width <= max_width]
+        return {
+            image_format: {width: self._signed_url(name, path, width, image_format) for width in widths}
+            for image_format in self.formats
+        }
+
+    def _signed_url(self, name: str, path: str, width: int, image_format: str) -> str:
+        query = urlencode({'w': width, 'fmt': image_format, 'sig': self.signature(name, width, image_format)})
+        return f"{path}?{query}"
+
+    def validate(self, width: int, image_format: str) -> None:
+        """
+        Check that a width and format are allow-listed.
+
+        Raises:
+            ValidationError: If the width or format is not allow-listed
+        """
+        if width not in self.allowed_widths:
+            raise ValidationError(f"Width must be one of {self.allowed_widths}")
+        if image_format not in self.formats:
+            raise ValidationError(f"Format must be one of {self.formats}")
+
+    # Variants
+
+    def get_variant(self, name: str, width: int, image_format: str) -> Tuple[bytes, str]:
+        """
+        Resized variant of a stored original, rendering it if needed.
+
+        Args:
+            name: Storage name of the original
+            width: One of ``ALLOWED_WIDTHS``
+            image_format: One of ``FORMATS``
+
+        Returns:
+            Tuple of encoded image and its content type
+
+        Raises:
+            ValidationError: If the parameters are not allowed or the original
+                is not a decodable image
+            FileNotFoundError: If the original does not exist
+        """
+        self.validate(width, image_format)
+        if not name.startswith(self.source_path) or '..' in Path(name).parts:
+            raise FileNotFoundError(name)
+        content_type = IMAGE_FORMATS[image_format][2]
+        cache_path = self._cache_path(name, width, image_format)
+
+        data = self._read_cache(cache_path)
+        if data is not None:
+            return data, content_type
+        with self._lock(cache_path):
+            # Whoever held the lock may have produced it meanwhile
+            data = self._read_cache(cache_path)
+            if data is None:
+                data = self._load_or_render(name, width, image_format)
+                self._write_cache(cache_path, data)
+        return data, content_type
+
+    def stored_name(self, name: str, width: int, image_format: str) -> str:
+        """Name of a variant in the default storage."""
+        return os.path.join(self.storage_path, f"{Path(name).stem}_{width}w{IMAGE_FORMATS[image_format][1]}")
+
+    def _load_or_render(self, name: str, width: int, image_format: str) -> bytes:
+        stored = self.stored_name(name, width, image_format)
+        if default_storage.exists(stored):
+            with default_storage.open(stored, 'rb') as variant:
+                return variant.read()
+
+        data = self.render(name, width, image_format)
+        try:
+            default_storage.save(stored, ContentFile(data))
+        except Exception as e:
+            # The disk cache still has it; storage is retried on the next miss
+            logger.error(f"Failed to store resized image {stored}: {e}")
+        logger.info(f"Rendered {name} at {width}w as {image_format}")
+        return data
+
+    def render(self, name: str, width: int, image_format: str) -> bytes:
+        """Decode a stored original (in draft mode) at ``width`` and encode it."""
+        storage_service = get_storage_service()
+        if not default_storage.exists(name):
+            raise FileNotFoundError(name)
+        with default_storage.open(name, 'rb') as original:
+            image = storage_service.open_image(original, max_size=(width, UNBOUNDED), exact=True)
+        return storage_service.encode_image(image, image_format).data
+
+    # Local disk cache
+
+    def _cache_path(self, name: str, width: int, image_format: str) -> str:
+        digest = hashlib.sha256(f"{name}:{width}:{image_format}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}{IMAGE_FORMATS[image_format][1]}")
+
+    def _lock(self, cache_path: str):
+        """Exclusive lock shared by threads and processes on this host."""
+        stripe = zlib.crc32(cache_path.encode()) % self.LOCK_STRIPES
+        return file_lock(os.path.join(self.cache_dir, '.locks', str(stripe)))
+
+    def _read_cache(self, cache_path: str) -> Optional[bytes]:
+        try:
+            with open(cache_path, 'rb') as cached:
+                data = cached.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # Modification time orders entries for LRU eviction
+            os.utime(cache_path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def _write_cache(self, cache_path: str, data: bytes) -> None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path), delete=False) as temp:
+                temp.write(data)
+            os.replace(temp.name, cache_path)
+        except OSError as e:
+            logger.error(f"Failed to cache resized image {cache_path}: {e}")
+            return
+
+        with self._counter_lock:
+            # Scan on the first write, then after every tenth of the budget
+            if self._written_since_evict is not None:
+                self._written_since_evict += len(data)
+                if self._written_since_evict < self.cache_max_bytes // 10:
+                    return
+            self._written_since_evict = 0
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete least recently used cache entries down to 90% of CACHE_MAX_BYTES.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = []
+        total = 0
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir() or shard.name == '.locks':
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.cache_max_bytes:
+            return 0
+
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            deleted += 1
+        logger.info(f"Evicted {deleted} resized images from the disk cache")
+        return deleted
+
+
+# Service instance
+image_resize_service = ImageResizeService()
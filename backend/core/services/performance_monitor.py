@@ -250,6 +250,30 @@ class PerformanceMonitor:
         self.metrics.add_metric(f'cache_{operation}_time', duration)
         self.metrics.add_metric(f'cache_{operation}_success', 1 if success else 0)
     
+    def log_throttle(self, scope: str, throttled: bool, wait: float = 0.0):
+        """Log a rate limit decision for a throttle scope."""
+        if not self.monitoring_enabled:
+            return
+        
+        self.metrics.add_metric(f'throttle_{scope}_throttled', 1 if throttled else 0)
+        if throttled:
+            self.metrics.add_metric(f'throttle_{scope}_wait', wait)
+    
+    def get_throttle_stats(self) -> Dict[str, Any]:
+        """Get the throttled share of requests per throttle scope."""
+        stats = {}
+        for metric_type in list(self.metrics.metrics):
+            if metric_type.startswith('throttle_') and metric_type.endswith('_throttled'):
+                decisions = self.metrics.get_metrics(metric_type, 60)
+                if decisions:
+                    throttled = sum(m['value'] for m in decisions)
+                    stats[metric_type[len('throttle_'):-len('_throttled')]] = {
+                        'requests': len(decisions),
+                        'throttled': throttled,
+                        'throttled_rate': throttled / len(decisions)
+                    }
+        return stats
+    
     def get_performance_report(self) -> Dict[str, Any]:
         """Get comprehensive performance report."""
         return {
@@ -276,6 +300,7 @@ class PerformanceMonitor:
                     if m['value'] > 2.0
                 ])
             },
+            'throttling': self.get_throttle_stats(),
             'summary': self.metrics.get_summary(),
             'timestamp': timezone.now()
         }
@@ -124,8 +124,11 @@ class ServiceWrapper:
         storage_service = self._get_service('storage_service')
         if storage_service:
             try:
+                from .image_blob_service import image_blob_service
+
                 logger.info(f"Attempting to save image for recipe {recipe_id}")
-                result = storage_service.save_image_with_thumbnails(image_file, recipe_id)
+                # Identical uploads share one stored copy
+                result = image_blob_service.save(image_file, recipe_id)
                 if result:
                     logger.info(f"Successfully saved image for recipe {recipe_id}: {list(result.keys())}")
                 else:
@@ -144,8 +147,11 @@ class ServiceWrapper:
         storage_service = self._get_service('storage_service')
         if storage_service:
             try:
+                from .image_blob_service import image_blob_service
+
                 logger.info(f"Attempting to delete images: {list(images.keys())}")
-                storage_service.delete_recipe_images(images)
+                # Files go once no other record references them
+                image_blob_service.release(images)
                 logger.info("Successfully deleted images")
                 return True
             except Exception as e:
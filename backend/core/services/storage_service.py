@@ -1,22 +1,102 @@
 """
 Content storage service for handling file uploads and image processing.
+
+Uploads are validated from their header alone (format, dimensions and a
+pixel budget against decompression bombs), so validation never decodes or
+buffers pixel data; larger uploads arrive as temporary files.
+
+Uploads are decoded once: JPEGs in draft mode at the smallest DCT scale that
+still covers the largest output. EXIF orientation is applied after that
+downscale, where rotating is cheap. Thumbnails are resized in a cascade, each
+from the smallest variant already produced that still covers it, and variants
+are encoded and stored on a thread pool (Pillow releases the GIL while
+encoding).
+
+Besides the fixed-size JPEG thumbnails, every upload is rendered at the
+``RESPONSIVE_WIDTHS`` breakpoints in each of ``IMAGE_FORMATS`` (WebP, AVIF
+when Pillow has the codec, JPEG). They are recorded under ``variants`` in
+``recipe.images`` with their dimensions and byte sizes, so clients can pick
+the smallest file for their layout through ``srcset``. A tiny inline
+placeholder, the dominant color and the aspect ratio are stored alongside,
+so clients can lay out and paint list pages before any image arrives.
+
+Given the upload's SHA-256, variants are stored under content-addressed
+names; ``ImageBlobService`` uses this to store each distinct image once.
+Deletes map URLs back to storage names and run concurrently, as batch
+requests on blob storage.
 """
+import base64
+import hashlib
 import os
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from PIL import Image, ImageOps
+from PIL import ExifTags, Image
+
+from core.services.blob_storage import BlobStorageAdapter
 
 logger = logging.getLogger(__name__)
 
+# Draft decoding may undershoot the requested size by this factor
+DRAFT_SLACK = 0.9
+
+# Transpose that makes an image upright for each EXIF orientation
+EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Pillow format name, file extension and MIME type of each output format
+IMAGE_FORMATS = {
+    'avif': ('AVIF', '.avif', 'image/avif'),
+    'webp': ('WEBP', '.webp', 'image/webp'),
+    'jpeg': ('JPEG', '.jpg', 'image/jpeg'),
+}
+
+
+# Pillow format of each accepted file extension; only these formats are decoded
+EXTENSION_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.webp': 'WEBP',
+}
+
+# Most blobs a single Azure batch request may delete
+AZURE_BATCH_LIMIT = 256
+
+# Keys of ``recipe.images`` that do not hold a single stored image URL
+IMAGE_METADATA_KEYS = ('variants', 'placeholder', 'dominant_color', 'width', 'height', 'aspect_ratio', 'sha256')
+
+
+class ImageHeader(NamedTuple):
+    """Format and dimensions of an image, read without decoding it."""
+    format: str
+    width: int
+    height: int
+
+
+class EncodedImage(NamedTuple):
+    """An encoded image variant."""
+    data: bytes
+    width: int
+    height: int
+    format: str
+
 
 class StorageService:
     """Service for handling file storage and image processing."""
@@ -26,17 +106,37 @@ class StorageService:
         self.recipe_images_path = self.storage_config.get('RECIPE_IMAGES_UPLOAD_PATH', 'recipes/images/')
         self.allowed_extensions = self.storage_config.get('ALLOWED_IMAGE_EXTENSIONS', ['.jpg', '.jpeg', '.png', '.webp'])
         self.max_file_size = self.storage_config.get('MAX_IMAGE_SIZE', 5 * 1024 * 1024)
+        self.max_image_pixels = self.storage_config.get('MAX_IMAGE_PIXELS', 50_000_000)
         self.image_quality = self.storage_config.get('IMAGE_QUALITY', 85)
         self.thumbnail_sizes = self.storage_config.get('THUMBNAIL_SIZES', {})
+        self.original_max_size = tuple(self.storage_config.get('ORIGINAL_MAX_SIZE', (2048, 2048)))
+        self.max_workers = self.storage_config.get('IMAGE_WORKERS', 4)
+        self.delete_batch_size = self.storage_config.get('DELETE_BATCH_SIZE', AZURE_BATCH_LIMIT)
+        self.placeholder_size = self.storage_config.get('PLACEHOLDER_SIZE', 24)
+        self.placeholder_quality = self.storage_config.get('PLACEHOLDER_QUALITY', 50)
+        self.responsive_widths = sorted(self.storage_config.get('RESPONSIVE_WIDTHS', []), reverse=True)
+        self.format_options = {'jpeg': {'quality': self.image_quality}, **self.storage_config.get('FORMAT_OPTIONS', {})}
+        # Formats this Pillow build cannot write (usually AVIF) are skipped
+        Image.init()
+        self.image_formats = [
+            image_format for image_format in self.storage_config.get('IMAGE_FORMATS', ['jpeg'])
+            if image_format in IMAGE_FORMATS and IMAGE_FORMATS[image_format][0] in Image.SAVE
+        ]
         
         logger.info(f"StorageService initialized with config: {self.storage_config}")
 
-    def validate_image_file(self, file) -> None:
+    def validate_image_file(self, file, verify_content: bool = True) -> Optional[ImageHeader]:
         """
         Validate uploaded image file.
         
         Args:
             file: Uploaded file object
+            verify_content: Also parse the image header (see
+                ``inspect_image``); callers that decode it anyway (see
+                ``open_image``) can skip this
+            
+        Returns:
+            The image header if ``verify_content`` is set
             
         Raises:
             ValidationError: If file is invalid
@@ -56,17 +156,62 @@ class StorageService:
         if file_extension not in self.allowed_extensions:
             raise ValidationError(f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}")
             
-        # Validate image content
+        if not verify_content:
+            return None
+            
+        header = self.inspect_image(file)
+        logger.info(f"Image validation successful for {file.name}")
+        return header
+
+    def inspect_image(self, file) -> ImageHeader:
+        """
+        Read an image's format and dimensions from its header.
+        
+        Only the header is parsed, in one pass from the start of the file:
+        no pixel data is decoded or buffered, so this is cheap for any size
+        of upload. Truncated or corrupt pixel data is caught when the image
+        is decoded for rendering.
+        
+        Args:
+            file: File object positioned anywhere; it is rewound
+            
+        Returns:
+            Format and dimensions of the image
+            
+        Raises:
+            ValidationError: If the file is not an image in an accepted
+                format or has more than MAX_IMAGE_PIXELS pixels
+        """
         try:
-            # Reset file pointer to beginning
             file.seek(0)
             with Image.open(file) as img:
-                img.verify()  # Verify it's a valid image
-            file.seek(0)  # Reset pointer again
-            logger.info(f"Image validation successful for {file.name}")
-        except Exception as e:
-            logger.error(f"Image validation failed for {file.name}: {e}")
+                header = ImageHeader(img.format, img.width, img.height)
+        except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+            logger.error(f"Image header invalid for {getattr(file, 'name', file)}: {e}")
             raise ValidationError(f"Invalid image file: {str(e)}")
+        finally:
+            file.seek(0)
+        self.check_dimensions(header.format, header.width, header.height)
+        return header
+
+    def check_dimensions(self, image_format: str, width: int, height: int) -> None:
+        """Reject formats we do not accept and decompression bombs, before decoding."""
+        if image_format not in {EXTENSION_FORMATS.get(extension) for extension in self.allowed_extensions}:
+            raise ValidationError(f"Image format {image_format} is not allowed")
+        if width * height > self.max_image_pixels:
+            raise ValidationError(
+                f"Image is {width}x{height}; at most {self.max_image_pixels / 1e6:g} megapixels are allowed"
+            )
+
+    @staticmethod
+    def content_hash(file) -> str:
+        """SHA-256 hex digest of a file's content, read in chunks."""
+        digest = hashlib.sha256()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(chunk)
+        file.seek(0)
+        return digest.hexdigest()
 
     def generate_unique_filename(self, original_filename: str, prefix: str = "") -> str:
         """
@@ -113,6 +258,84 @@ class StorageService:
             
         return image
 
+    def open_image(self, file, max_size: Optional[Tuple[int, int]] = None,
+                   exact: bool = False) -> Image.Image:
+        """
+        Decode an uploaded image once into an upright RGB image within ``max_size``.
+        
+        JPEGs are decoded in draft mode, letting libjpeg downscale by up to
+        8x while decoding as long as the result (nearly) covers ``max_size``.
+        EXIF orientation is applied after the image has been scaled down,
+        where rotating is cheap. A successful decode also validates the
+        content.
+        
+        Args:
+            file: Uploaded file object
+            max_size: Box the image is fitted into (defaults to ORIGINAL_MAX_SIZE)
+            exact: Never let draft decoding land under ``max_size``
+            
+        Returns:
+            Decoded PIL Image object
+            
+        Raises:
+            ValidationError: If the file is not a decodable image
+        """
+        max_size = max_size or self.original_max_size
+        try:
+            file.seek(0)
+            img = Image.open(file)
+            self.check_dimensions(img.format, *img.size)
+            # The box applies to the upright image; swap it for 90 degree rotations
+            orientation = img.getexif().get(ExifTags.Base.Orientation)
+            box = (max_size[1], max_size[0]) if orientation in (5, 6, 7, 8) else max_size
+            if img.format == 'JPEG':
+                # Accept a DCT scale landing slightly under the box rather than
+                # decoding at the next scale up and resampling the difference
+                width, height = self._fit_size(img.size, box)
+                slack = 1 if exact else DRAFT_SLACK
+                img.draft('RGB', (int(width * slack), int(height * slack)))
+            img.load()
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Image decoding failed for {file.name}: {e}")
+            raise ValidationError(f"Invalid image file: {str(e)}")
+        
+        # After draft decoding the remaining scale is usually under 2x, where
+        # Pillow's antialiased bilinear filter matches Lanczos at half the cost
+        fitted = self.fit_image(self.optimize_image(img), box, Image.Resampling.BILINEAR)
+        if orientation in EXIF_TRANSPOSE:
+            fitted = fitted.transpose(EXIF_TRANSPOSE[orientation])
+        return fitted
+
+    @staticmethod
+    def _fit_size(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+        """Size of ``size`` scaled down (never up) to fit inside ``box``."""
+        scale = min(box[0] / size[0], box[1] / size[1], 1)
+        return (
+            min(size[0], max(1, round(size[0] * scale))),
+            min(size[1], max(1, round(size[1] * scale))),
+        )
+
+    def fit_image(self, image: Image.Image, size: Tuple[int, int],
+                  resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
+        """
+        Scale an image down to fit inside ``size``, keeping its aspect ratio.
+        
+        Args:
+            image: PIL Image object
+            size: Bounding box (width, height)
+            resample: Resampling filter
+            
+        Returns:
+            Fitted PIL Image object (``image`` itself if it already fits)
+        """
+        target = self._fit_size(image.size, size)
+        if target == image.size:
+            return image
+        # reducing_gap box-reduces by an integer factor first when shrinking a lot
+        return image.resize(target, resample, reducing_gap=3.0)
+
     def create_thumbnail(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
         """
         Create a thumbnail from an image.
@@ -124,10 +347,12 @@ class StorageService:
         Returns:
             Thumbnail PIL Image object
         """
-        # Use thumbnail method to maintain aspect ratio
-        thumbnail = image.copy()
-        thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
-        
+        # Fit while maintaining aspect ratio
+        return self._pad(self.fit_image(image, size), size)
+
+    @staticmethod
+    def _pad(thumbnail: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """Center a fitted thumbnail on a white canvas of exactly ``size``."""
         # Create a new image with the target size and white background
         result = Image.new('RGB', size, (255, 255, 255))
         
@@ -140,93 +365,281 @@ class StorageService:
         
         return result
 
-    def save_image_with_thumbnails(self, file, recipe_id: str) -> Dict[str, str]:
+    def create_thumbnails(self, image: Image.Image) -> Dict[str, Image.Image]:
+        """
+        Create every configured thumbnail with a cascaded resize.
+        
+        Sizes are processed largest first and each one is resized from the
+        smallest fitted image so far that still covers it, so only the
+        largest thumbnail is resampled from the full image.
+        
+        Args:
+            image: Upright RGB PIL Image object
+            
+        Returns:
+            Dictionary of thumbnail name to PIL Image object
+        """
+        sources = [image]
+        thumbnails = {}
+        by_area = sorted(self.thumbnail_sizes.items(), key=lambda item: item[1][0] * item[1][1], reverse=True)
+        for size_name, dimensions in by_area:
+            target = self._fit_size(image.size, dimensions)
+            source = next(
+                candidate for candidate in reversed(sources)
+                if candidate.width >= target[0] and candidate.height >= target[1]
+            )
+            fitted = self.fit_image(source, dimensions)
+            sources.append(fitted)
+            thumbnails[size_name] = self._pad(fitted, dimensions)
+        return {size_name: thumbnails[size_name] for size_name in self.thumbnail_sizes}
+
+    def create_responsive_images(self, image: Image.Image) -> Dict[int, Image.Image]:
+        """
+        Scale an image to each responsive breakpoint narrower than it.
+        
+        Widths are processed largest first, each resized from the previous
+        one. The image itself is included at its own width unless it is
+        wider than every breakpoint.
+        
+        Args:
+            image: Upright RGB PIL Image object
+            
+        Returns:
+            Dictionary of width to PIL Image object
+        """
+        images = {}
+        if not self.responsive_widths or image.width <= self.responsive_widths[0]:
+            images[image.width] = image
+        source = image
+        for width in self.responsive_widths:
+            if width < source.width:
+                source = self.fit_image(source, (width, image.height))
+                images[source.width] = source
+        return images
+
+    def encode_image(self, image: Image.Image, image_format: str = 'jpeg') -> EncodedImage:
+        """Encode an image for the web in one of ``IMAGE_FORMATS``."""
+        buffer = BytesIO()
+        image.save(buffer, format=IMAGE_FORMATS[image_format][0], **self.format_options.get(image_format, {}))
+        return EncodedImage(buffer.getvalue(), image.width, image.height, image_format)
+
+    @staticmethod
+    def variant_name(width: int, image_format: str) -> str:
+        """Key of a responsive variant in ``render_image_variants`` results."""
+        return f"{width}w_{image_format}"
+
+    @staticmethod
+    def dominant_color(image: Image.Image) -> str:
+        """Hex color of the largest cluster of a (small) image's colors."""
+        quantized = image.quantize(colors=4)
+        _, index = max(quantized.getcolors())
+        red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+        return f"#{red:02x}{green:02x}{blue:02x}"
+
+    def summarize_image(self, original: Image.Image, smallest: Image.Image) -> Dict[str, Any]:
+        """
+        Compute what clients need to lay out and paint an image before it loads.
+        
+        Args:
+            original: Decoded original image
+            smallest: Smallest unpadded variant, to derive the placeholder from
+            
+        Returns:
+            Dictionary with ``placeholder`` (an inline WebP data URI of about
+            200 bytes; JPEG if Pillow lacks WebP), ``dominant_color``,
+            ``width``, ``height`` and ``aspect_ratio``
+        """
+        thumbnail = self.fit_image(smallest, (self.placeholder_size, self.placeholder_size))
+        image_format = 'webp' if 'WEBP' in Image.SAVE else 'jpeg'
+        buffer = BytesIO()
+        thumbnail.save(buffer, format=IMAGE_FORMATS[image_format][0], quality=self.placeholder_quality)
+        data = base64.b64encode(buffer.getvalue()).decode('ascii')
+        return {
+            'placeholder': f"data:{IMAGE_FORMATS[image_format][2]};base64,{data}",
+            'dominant_color': self.dominant_color(thumbnail),
+            'width': original.width,
+            'height': original.height,
+            'aspect_ratio': round(original.width / original.height, 4),
+        }
+
+    def render_image_variants(self, file) -> Tuple[Dict[str, EncodedImage], Dict[str, Any]]:
+        """
+        Decode, resize and encode an upload into all of its variants.
+        
+        Args:
+            file: Uploaded file object
+            
+        Returns:
+            Tuple of a dictionary of variant name to encoded image and the
+            image summary (see ``summarize_image``). Variants are ``original``
+            and each thumbnail size as JPEG, plus one entry per responsive
+            width and format (see ``variant_name``). The JPEG at the
+            original's own width is ``original`` itself and has no separate
+            entry.
+        """
+        self.validate_image_file(file, verify_content=False)
+        original = self.open_image(file)
+        logger.info(f"Decoded image: {original.size}, mode: {original.mode}")
+        
+        variants = {'original': (original, 'jpeg')}
+        for size_name, thumbnail in self.create_thumbnails(original).items():
+            variants[size_name] = (thumbnail, 'jpeg')
+        responsive = self.create_responsive_images(original)
+        summary = self.summarize_image(original, responsive[min(responsive)] if responsive else original)
+        for width, image in responsive.items():
+            for image_format in self.image_formats:
+                if not (image is original and image_format == 'jpeg'):
+                    variants[self.variant_name(width, image_format)] = (image, image_format)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(variants)))) as executor:
+            encoded = dict(zip(variants, executor.map(lambda variant: self.encode_image(*variant), variants.values())))
+        return encoded, summary
+
+    def _store(self, path: str, data: bytes) -> str:
+        saved_path = default_storage.save(path, ContentFile(data))
+        # Ensure we return full URLs for Azure blob storage
+        return self._ensure_absolute_url(default_storage.url(saved_path))
+
+    def save_image_with_thumbnails(self, file, recipe_id: str, content_hash: Optional[str] = None) -> Dict:
         """
         Save image and create thumbnails.
         
         Args:
             file: Uploaded file object
             recipe_id: Recipe UUID string
+            content_hash: SHA-256 of the file; variants are then named after
+                it instead of a random UUID and it is recorded as ``sha256``
             
         Returns:
-            Dictionary with image URLs
+            Dictionary with the URLs of the original and each thumbnail size,
+            under ``variants`` a list of the responsive variants (``url``,
+            ``width``, ``height``, ``format`` and ``bytes``), narrowest first,
+            and the image summary (see ``summarize_image``)
         """
         logger.info(f"Starting image processing for recipe {recipe_id}")
         
         try:
-            self.validate_image_file(file)
+            encoded, summary = self.render_image_variants(file)
             
-            # Generate unique filename
-            filename = self.generate_unique_filename(file.name, f"recipe_{recipe_id}")
-            logger.info(f"Generated filename: {filename}")
+            if content_hash:
+                stem = content_hash
+            else:
+                # Generate unique filename
+                stem = Path(self.generate_unique_filename(file.name, f"recipe_{recipe_id}")).stem
+            logger.info(f"Generated filename stem: {stem}")
             
-            # Open and process image
-            with Image.open(file) as img:
-                logger.info(f"Opened image: {img.size}, mode: {img.mode}")
-                optimized_img = self.optimize_image(img)
-                
-                results = {}
-                
-                # Save original (optimized) image
-                original_path = os.path.join(self.recipe_images_path, 'originals', filename)
-                original_buffer = BytesIO()
-                optimized_img.save(original_buffer, format='JPEG', quality=self.image_quality, optimize=True)
-                original_content = ContentFile(original_buffer.getvalue())
-                
-                logger.info(f"Saving original image to: {original_path}")
-                saved_path = default_storage.save(original_path, original_content)
-                original_url = default_storage.url(saved_path)
-                logger.info(f"Default storage returned URL: {original_url}")
-                # Ensure we return full URLs for Azure blob storage
-                results['original'] = self._ensure_absolute_url(original_url)
-                logger.info(f"Original image saved: {results['original']}")
-                
-                # Create and save thumbnails
-                for size_name, dimensions in self.thumbnail_sizes.items():
-                    logger.info(f"Creating thumbnail {size_name}: {dimensions}")
-                    thumbnail = self.create_thumbnail(optimized_img, dimensions)
-                    
-                    # Save thumbnail
-                    thumb_filename = f"{Path(filename).stem}_{size_name}{Path(filename).suffix}"
-                    thumb_path = os.path.join(self.recipe_images_path, 'thumbnails', thumb_filename)
-                    
-                    thumb_buffer = BytesIO()
-                    thumbnail.save(thumb_buffer, format='JPEG', quality=self.image_quality, optimize=True)
-                    thumb_content = ContentFile(thumb_buffer.getvalue())
-                    
-                    logger.info(f"Saving thumbnail {size_name} to: {thumb_path}")
-                    saved_thumb_path = default_storage.save(thumb_path, thumb_content)
-                    thumb_url = default_storage.url(saved_thumb_path)
-                    logger.info(f"Default storage returned thumbnail URL: {thumb_url}")
-                    # Ensure we return full URLs for Azure blob storage
-                    results[size_name] = self._ensure_absolute_url(thumb_url)
-                    logger.info(f"Thumbnail {size_name} saved: {results[size_name]}")
+            paths = {}
+            for name, variant in encoded.items():
+                extension = IMAGE_FORMATS[variant.format][1]
+                if name == 'original':
+                    paths[name] = os.path.join(self.recipe_images_path, 'originals', f"{stem}{extension}")
+                elif name in self.thumbnail_sizes:
+                    paths[name] = os.path.join(self.recipe_images_path, 'thumbnails', f"{stem}_{name}{extension}")
+                else:
+                    paths[name] = os.path.join(self.recipe_images_path, 'variants', f"{stem}_{variant.width}w{extension}")
+            
+            # Upload variants concurrently; storage backends block on network I/O
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(paths)))) as executor:
+                futures = {
+                    name: executor.submit(self._store, path, encoded[name].data)
+                    for name, path in paths.items()
+                }
+                urls = {name: future.result() for name, future in futures.items()}
+            
+            results = {name: urls[name] for name in ('original', *self.thumbnail_sizes)}
+            results['variants'] = sorted(
+                (
+                    {
+                        'url': urls[name],
+                        'width': variant.width,
+                        'height': variant.height,
+                        'format': variant.format,
+                        'bytes': len(variant.data),
+                    }
+                    for name, variant in encoded.items()
+                    if name == 'original' or name not in self.thumbnail_sizes
+                ),
+                key=lambda entry: (entry['format'], entry['width']),
+            )
+            results.update(summary)
+            if content_hash:
+                results['sha256'] = content_hash
                     
-            logger.info(f"Image processing completed for recipe {recipe_id}: {list(results.keys())}")
+            logger.info(f"Image processing completed for recipe {recipe_id}: {len(urls)} files")
             return results
             
         except Exception as e:
             logger.error(f"Error processing image for recipe {recipe_id}: {e}")
             raise
 
-    def delete_recipe_images(self, image_urls: Dict[str, str]) -> None:
+    def image_names(self, image_urls: Dict) -> Set[str]:
+        """
+        Storage names of every file referenced by a ``recipe.images`` dictionary.
+        
+        Args:
+            image_urls: Dictionary with image URLs, as returned by
+                ``save_image_with_thumbnails``
+            
+        Returns:
+            Names to pass to ``default_storage``; URLs outside our storage
+            (seed data, external images) are left out
+        """
+        urls = [url for key, url in image_urls.items() if key not in IMAGE_METADATA_KEYS]
+        urls.extend(variant.get('url') for variant in image_urls.get('variants', []))
+        # The JPEG variant at full width is the original itself, hence a set
+        return {
+            name for name in (self.storage_name(url) for url in urls if isinstance(url, str) and url)
+            if name
+        }
+
+    def delete_recipe_images(self, image_urls: Dict) -> None:
+        """
+        Delete recipe images, thumbnails and responsive variants.
+        
+        Args:
+            image_urls: Dictionary with image URLs to delete, as returned by
+                ``save_image_with_thumbnails``
+        """
+        names = self.image_names(image_urls)
+        logger.info(f"Deleting {len(names)} images: {list(image_urls.keys())}")
+        self.delete_files(names)
+
+    def delete_files(self, names: Iterable[str]) -> int:
         """
-        Delete recipe images and thumbnails.
+        Delete stored files concurrently, in batches where the backend allows.
+        
+        Backends that expose a batch delete (the Azure container client's
+        ``delete_blobs``) get one request per ``DELETE_BATCH_SIZE`` names;
+        others get one ``delete`` call per name. Either way requests run on
+        a thread pool, and names that no longer exist are not errors, so no
+        ``exists`` round trip is made first.
         
         Args:
-            image_urls: Dictionary with image URLs to delete
+            names: Storage names (not URLs) of the files to delete
+            
+        Returns:
+            Number of names whose deletion did not fail
         """
-        logger.info(f"Deleting images: {list(image_urls.keys())}")
+        names = sorted(set(names))
+        if not names:
+            return 0
+        
+        blobs = BlobStorageAdapter(default_storage)
+        batch_size = min(self.delete_batch_size, AZURE_BATCH_LIMIT) if blobs.supports_batch_delete else 1
+        batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
         
-        for size_name, url in image_urls.items():
-            if url and default_storage.exists(url):
-                try:
-                    default_storage.delete(url)
-                    logger.info(f"Deleted image {size_name}: {url}")
-                except Exception as e:
-                    logger.error(f"Failed to delete image {size_name}: {url}, error: {e}")
-                    # Log error but don't fail the operation
-                    pass
+        def delete(batch: List[str]) -> int:
+            try:
+                blobs.delete_many(batch)
+            except Exception as e:
+                # Log error but don't fail the operation
+                logger.error(f"Failed to delete {len(batch)} files starting with {batch[0]}, error: {e}")
+                return 0
+            return len(batch)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as executor:
+            deleted = sum(executor.map(delete, batches))
+        logger.info(f"Deleted {deleted} of {len(names)} files")
+        return deleted
 
     def _ensure_absolute_url(self, url: str) -> str:
         """
@@ -248,9 +661,6 @@ class StorageService:
         azure_account = getattr(settings, 'AZURE_STORAGE_ACCOUNT_NAME', None)
         azure_container = getattr(settings, 'AZURE_STORAGE_CONTAINER_NAME', 'media')
         
-        logger.info(f"Ensuring absolute URL for: {url}")
-        logger.info(f"Azure account: {azure_account}, container: {azure_container}")
-        
         if azure_account and url.startswith('/'):
             # Remove leading slash and construct Azure URL
             # If URL starts with /media/, remove it to avoid double path
@@ -260,13 +670,33 @@ class StorageService:
                 clean_url = url[1:]  # Remove leading slash
             
             absolute_url = f"https://{azure_account}.blob.core.windows.net/{azure_container}/{clean_url}"
-            logger.info(f"Converted to absolute URL: {absolute_url}")
+            logger.debug(f"Converted to absolute URL: {absolute_url}")
             return absolute_url
         
         # If not Azure or not a relative URL, return as-is
-        logger.info(f"Returning URL as-is: {url}")
+        logger.debug(f"Returning URL as-is: {url}")
         return url
 
+    def storage_name(self, url: str) -> Optional[str]:
+        """
+        Storage name of a file from its URL, the inverse of ``_store``.
+        
+        Args:
+            url: URL returned by ``save_image_with_thumbnails``
+            
+        Returns:
+            Name to pass to ``default_storage``, or None for foreign URLs
+        """
+        prefixes = [settings.MEDIA_URL]
+        azure_account = getattr(settings, 'AZURE_STORAGE_ACCOUNT_NAME', None)
+        if azure_account:
+            azure_container = getattr(settings, 'AZURE_STORAGE_CONTAINER_NAME', 'media')
+            prefixes.append(f"https://{azure_account}.blob.core.windows.net/{azure_container}/")
+        for prefix in prefixes:
+            if prefix and url.startswith(prefix):
+                return url[len(prefix):]
+        return None
+
     def get_supported_formats(self) -> List[str]:
         """
         Get list of supported image formats.
@@ -0,0 +1,186 @@
+"""
+Bloom-filtered refresh token blacklist checks.
+
+simplejwt checks every refresh token against the blacklist table. Almost all
+tokens are not blacklisted, so each process keeps a Bloom filter of the JTIs
+of unexpired blacklisted tokens and only asks the database when the filter
+reports a possible match.
+
+The filter is rebuilt from the blacklist table every ``REBUILD_SECONDS``.
+Blacklisting in between is broadcast through the shared cache: each new JTI
+is stored under an incrementing sequence number, and every check compares
+the shared sequence with the last one this process applied (one cache read)
+and adds the missing JTIs. A process that cannot catch up (expired entries, a
+reset counter) rebuilds from the table instead. If anything fails, checks
+fall back to the database.
+
+Broadcasts only reach other processes through a cache they share, so by
+default the filter is used only with the Redis cache backend. With a
+per-process cache (LocMem) every check goes to the database.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from core.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_CACHE_PREFIX = 'token_blacklist'
+SEQUENCE_KEY = f'{BLACKLIST_CACHE_PREFIX}:seq'
+
+
+class TokenBlacklistFilter:
+    """Process-local Bloom filter of blacklisted refresh token JTIs."""
+
+    def __init__(self):
+        config = getattr(settings, 'TOKEN_BLACKLIST_FILTER', {})
+        self.enabled = config.get('ENABLED', 'auto')
+        self.rebuild_seconds = config.get('REBUILD_SECONDS', 300)
+        self.error_rate = config.get('ERROR_RATE', 0.001)
+        self.min_capacity = config.get('MIN_CAPACITY', 1024)
+        self.broadcast_ttl = config.get('BROADCAST_TTL_SECONDS', 2 * self.rebuild_seconds)
+        self.max_catch_up = config.get('MAX_CATCH_UP', 1000)
+        self._lock = threading.Lock()
+        self._filter = None
+        self._built_at = 0.0
+        self._applied_sequence = 0
+
+    @staticmethod
+    def entry_key(sequence: int) -> str:
+        return f'{BLACKLIST_CACHE_PREFIX}:jti:{sequence}'
+
+    @property
+    def active(self) -> bool:
+        """Whether checks use the filter; 'auto' requires a shared (Redis) cache."""
+        if self.enabled == 'auto':
+            return settings.CACHES.get('default', {}).get('BACKEND', '').startswith('django_redis')
+        return bool(self.enabled)
+
+    # Maintenance
+
+    def rebuild(self) -> int:
+        """
+        Rebuild this process's filter from the blacklist table.
+
+        Returns:
+            Number of blacklisted JTIs loaded
+        """
+        # Read the sequence first so broadcasts racing with the query are replayed
+        sequence = cache.get(SEQUENCE_KEY) or 0
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .values_list('token__jti', flat=True)
+        )
+        bloom = BloomFilter(max(2 * len(jtis), self.min_capacity), self.error_rate)
+        bloom.update(jtis)
+        with self._lock:
+            self._filter = bloom
+            self._built_at = time.monotonic()
+            self._applied_sequence = sequence
+        logger.info(f"Rebuilt token blacklist filter with {len(jtis)} entries")
+        return len(jtis)
+
+    def _needs_rebuild(self) -> bool:
+        return (
+            self._filter is None
+            or time.monotonic() - self._built_at > self.rebuild_seconds
+            or len(self._filter) > self._filter.capacity
+        )
+
+    def _catch_up(self) -> None:
+        """Apply JTIs broadcast by other processes since the last check."""
+        sequence = cache.get(SEQUENCE_KEY) or 0
+        applied = self._applied_sequence
+        if sequence == applied:
+            return
+        if sequence < applied or sequence - applied > self.max_catch_up:
+            self.rebuild()
+            return
+        keys = [self.entry_key(number) for number in range(applied + 1, sequence + 1)]
+        entries = cache.get_many(keys)
+        if len(entries) < len(keys):
+            self.rebuild()
+            return
+        with self._lock:
+            self._filter.update(entries.values())
+            self._applied_sequence = max(self._applied_sequence, sequence)
+
+    def broadcast(self, jti: str) -> None:
+        """
+        Publish a newly blacklisted JTI to this and every other process.
+
+        The entry is written before the sequence is incremented, so readers
+        never see a sequence number whose entry is missing: the JTI claims the
+        first free slot after the current sequence, and every claim is
+        followed by exactly one increment.
+        """
+        if not self.active:
+            return
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+        try:
+            slot = (cache.get(SEQUENCE_KEY) or 0) + 1
+            while not cache.add(self.entry_key(slot), jti, self.broadcast_ttl):
+                slot += 1
+            try:
+                cache.incr(SEQUENCE_KEY)
+            except ValueError:
+                # Lost counter: restart it below the claimed slot, which other
+                # processes see as a reset (or catch up through)
+                cache.add(SEQUENCE_KEY, slot - 1, None)
+                cache.incr(SEQUENCE_KEY)
+        except Exception as e:
+            # Other processes pick the token up on their next rebuild
+            logger.error(f"Error broadcasting blacklisted token {jti}: {e}")
+
+    def prune_expired(self, batch_size: int = 1000, pause_seconds: float = 0.0) -> int:
+        """
+        Delete expired outstanding tokens (and their blacklist rows) in batches.
+
+        Expired tokens fail verification before the blacklist is consulted,
+        so their rows are dead weight.
+
+        Returns:
+            Number of outstanding tokens deleted
+        """
+        deleted = 0
+        while True:
+            batch = list(
+                OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            OutstandingToken.objects.filter(id__in=batch).delete()
+            deleted += len(batch)
+            if pause_seconds:
+                time.sleep(pause_seconds)
+        return deleted
+
+    # Checks
+
+    def is_blacklisted(self, jti: str) -> bool:
+        """Whether a refresh token JTI is blacklisted, querying only on filter hits."""
+        if self.active:
+            try:
+                if self._needs_rebuild():
+                    self.rebuild()
+                else:
+                    self._catch_up()
+                if jti not in self._filter:
+                    return False
+            except Exception as e:
+                logger.error(f"Token blacklist filter unavailable, checking the database: {e}")
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+# Service instance
+token_blacklist = TokenBlacklistFilter()
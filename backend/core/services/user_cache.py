@@ -0,0 +1,140 @@
+"""
+Two-tier cache of authenticated users.
+
+Token authentication needs the user row on every request. Users are kept in a
+small process-local LRU with a short TTL in front of the shared Django cache,
+so repeated requests authenticate without a database query and usually
+without a cache round trip.
+
+The token version used to revoke claims-only principals is cached in the
+shared tier alone, next to the user.
+
+Saving or deleting a user (which covers deactivation and password changes)
+drops both tiers in this process and the shared entry, immediately and again
+after the transaction commits so a concurrent reader cannot re-cache the old
+row. Other processes may serve their local copy until ``LOCAL_TTL_SECONDS``
+expires, which bounds how long a deactivated user can keep authenticating.
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = 'auth_user'
+USER_VERSION_PREFIX = 'auth_user_version'
+
+# Cached token version of users that are missing or inactive
+REVOKED_VERSION = -1
+
+
+class UserCache:
+    """Process-local plus shared cache of user instances keyed by user ID."""
+
+    def __init__(self):
+        config = getattr(settings, 'AUTH_USER_CACHE', {})
+        self.local_ttl = config.get('LOCAL_TTL_SECONDS', 5)
+        self.shared_ttl = config.get('SHARED_TTL_SECONDS', 300)
+        self.local_max_entries = config.get('LOCAL_MAX_ENTRIES', 10000)
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(user_id) -> str:
+        return f'{USER_CACHE_PREFIX}:{user_id}'
+
+    @staticmethod
+    def version_key(user_id) -> str:
+        return f'{USER_VERSION_PREFIX}:{user_id}'
+
+    def _get_local(self, key: str):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return user
+
+    def _set_local(self, key: str, user) -> None:
+        if self.local_ttl <= 0:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, user)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def get(self, user_id):
+        """
+        Return the user with ``user_id`` or None if it does not exist.
+
+        Callers get their own copy, so mutating it never leaks into the cache.
+        """
+        key = str(user_id)
+        user = self._get_local(key)
+        if user is None:
+            user = cache.get(self.cache_key(key))
+            if user is None:
+                User = get_user_model()
+                try:
+                    user = User.objects.get(pk=user_id)
+                except (User.DoesNotExist, ValueError, TypeError, ValidationError):
+                    return None
+                cache.set(self.cache_key(key), user, self.shared_ttl)
+            self._set_local(key, user)
+        return copy.copy(user)
+
+    def get_token_version(self, user_id) -> Optional[int]:
+        """
+        Current token version of an active user, or None if tokens must be rejected.
+
+        Read from the shared cache only, so revocation is seen by every
+        process as soon as the user is saved.
+        """
+        key = self.version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            User = get_user_model()
+            try:
+                row = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+            except (ValueError, TypeError, ValidationError):
+                row = None
+            version = row[0] if row and row[1] else REVOKED_VERSION
+            cache.set(key, version, self.shared_ttl)
+        return None if version == REVOKED_VERSION else version
+
+    def invalidate(self, user_id) -> None:
+        """Drop a user from both tiers, now and once the current transaction commits."""
+        key = str(user_id)
+        self._drop(key)
+        transaction.on_commit(lambda: self._drop(key))
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            cache.delete_many([self.cache_key(key), self.version_key(key)])
+        except Exception as e:
+            logger.error(f"Error invalidating cached user {key}: {e}")
+
+    def clear_local(self) -> None:
+        """Empty this process's local tier."""
+        with self._lock:
+            self._local.clear()
+
+
+# Service instance
+user_cache = UserCache()
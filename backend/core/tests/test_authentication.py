@@ -0,0 +1,192 @@
+"""
+Tests for JWT authentication with the per-request and user caches.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.tests.factories import UserFactory
+from accounts.tokens import PrincipalRefreshToken
+from core.middleware.authentication import (
+    ClaimsJWTAuthentication,
+    JWTAuthentication,
+    JWTAuthenticationMiddleware,
+)
+from core.services.user_cache import user_cache
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-tests',
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        user_cache.clear_local()
+        yield
+        cache.clear()
+        user_cache.clear_local()
+
+
+@pytest.fixture
+def user():
+    return UserFactory()
+
+
+def bearer_request(user):
+    token = RefreshToken.for_user(user).access_token
+    return RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+def user_queries(captured):
+    return [query for query in captured.captured_queries if 'accounts_user' in query['sql']]
+
+
+class TestUserCache:
+    """Two-tier user cache."""
+
+    def test_cached_user_needs_no_query(self, user, django_assert_num_queries):
+        user_cache.get(user.id)
+        with django_assert_num_queries(0):
+            assert user_cache.get(user.id) == user
+
+    def test_shared_tier_serves_other_processes(self, user, django_assert_num_queries):
+        user_cache.get(user.id)
+        user_cache.clear_local()
+        with django_assert_num_queries(0):
+            assert user_cache.get(user.id) == user
+
+    def test_returns_copies(self, user):
+        user_cache.get(user.id).first_name = 'Changed'
+        assert user_cache.get(user.id).first_name == user.first_name
+
+    def test_missing_user(self):
+        assert user_cache.get('00000000-0000-0000-0000-000000000000') is None
+
+    def test_save_invalidates(self, user):
+        user_cache.get(user.id)
+        user.first_name = 'Renamed'
+        user.save()
+        assert user_cache.get(user.id).first_name == 'Renamed'
+
+
+class TestJWTAuthentication:
+    """Claims are verified once per request and users come from the cache."""
+
+    def test_second_authenticator_reuses_request_result(self, user, monkeypatch):
+        request = bearer_request(user)
+        middleware = JWTAuthenticationMiddleware(lambda request: None)
+        calls = []
+        original = JWTAuthentication.get_validated_token
+
+        def counting(self, raw_token):
+            calls.append(raw_token)
+            return original(self, raw_token)
+
+        monkeypatch.setattr(JWTAuthentication, 'get_validated_token', counting)
+        middleware(request)
+        authenticated_user, token = JWTAuthentication().authenticate(request)
+
+        assert request.user == user
+        assert authenticated_user == user
+        assert len(calls) == 1
+
+    def test_deactivated_user_is_rejected(self, user):
+        JWTAuthentication().authenticate(bearer_request(user))
+        user.is_active = False
+        user.save()
+        with pytest.raises(AuthenticationFailed):
+            JWTAuthentication().authenticate(bearer_request(user))
+
+    def test_password_change_refreshes_cached_user(self, user):
+        JWTAuthentication().authenticate(bearer_request(user))
+        user.set_password('a-new-password-123')
+        user.save()
+        cached, _ = JWTAuthentication().authenticate(bearer_request(user))
+        assert cached.password == user.password
+
+    def test_authenticated_requests_skip_user_queries(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        url = reverse('recipes:recipe-feed')
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert user_queries(captured) == []
+
+
+def principal_request(user, method='get'):
+    token = PrincipalRefreshToken.for_user(user).access_token
+    return getattr(RequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+class TestClaimsJWTAuthentication:
+    """Claims-only principals for read-only requests."""
+
+    def test_read_request_needs_no_user_query(self, user):
+        request = principal_request(user)
+        user_cache.get_token_version(user.id)
+        with CaptureQueriesContext(connection) as captured:
+            principal, _ = ClaimsJWTAuthentication().authenticate(request)
+            assert principal.pk == user.pk
+            assert principal.username == user.username
+            assert principal.is_staff == user.is_staff
+            assert principal.is_authenticated
+        assert captured.captured_queries == []
+
+    def test_other_fields_hydrate_once(self, user):
+        principal, _ = ClaimsJWTAuthentication().authenticate(principal_request(user))
+        assert principal.get_deferred_fields()
+        assert principal.email == user.email
+        assert principal.get_deferred_fields() == set()
+        assert principal.first_name == user.first_name
+
+    def test_write_request_loads_full_user(self, user):
+        principal, _ = ClaimsJWTAuthentication().authenticate(principal_request(user, 'post'))
+        assert principal.get_deferred_fields() == set()
+
+    def test_tokens_without_claims_load_full_user(self, user):
+        principal, _ = ClaimsJWTAuthentication().authenticate(bearer_request(user))
+        assert principal.get_deferred_fields() == set()
+
+    def test_deactivation_revokes_tokens(self, user):
+        ClaimsJWTAuthentication().authenticate(principal_request(user))
+        user.is_active = False
+        user.save()
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().authenticate(principal_request(user))
+
+    def test_password_change_revokes_tokens(self, user):
+        token = PrincipalRefreshToken.for_user(user).access_token
+        user.set_password('a-new-password-123')
+        user.save()
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().authenticate(request)
+        # Full-user authentication honours the version claim too
+        request = RequestFactory().post('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with pytest.raises(AuthenticationFailed):
+            ClaimsJWTAuthentication().authenticate(request)
+
+    def test_unrelated_save_keeps_tokens_valid(self, user):
+        token = PrincipalRefreshToken.for_user(user).access_token
+        user.first_name = 'Renamed'
+        user.save()
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        principal, _ = ClaimsJWTAuthentication().authenticate(request)
+        assert principal.first_name == 'Renamed'
@@ -0,0 +1,143 @@
+"""
+Tests for the blob storage adapter against a stubbed Azure storage.
+"""
+
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+
+from core.services.blob_storage import BlobStorageAdapter
+from core.services.direct_upload_service import AzureUploadSigner
+from core.services.storage_service import StorageService
+
+
+class StubDownload:
+    def __init__(self, data):
+        self.data = data
+
+    def readall(self):
+        return self.data
+
+
+class StubBlobClient:
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    def download_blob(self, offset, length):
+        self.container.downloads.append((self.name, offset, length))
+        return StubDownload(self.container.blobs[self.name][offset:offset + length])
+
+
+class StubContainerClient:
+    """Stands in for azure.storage.blob.ContainerClient."""
+
+    def __init__(self, blobs):
+        self.blobs = dict(blobs)
+        self.downloads = []
+        self.batches = []
+
+    def get_blob_client(self, name):
+        return StubBlobClient(self, name)
+
+    def delete_blobs(self, *names, raise_on_any_failure=True):
+        self.batches.append(names)
+        for name in names:
+            self.blobs.pop(name, None)
+
+
+class StubAzureStorage:
+    """Public surface of django-storages' AzureStorage, without the private helpers."""
+
+    azure_container = 'media'
+    location = 'site'
+
+    def __init__(self, blobs=()):
+        self.client = StubContainerClient(blobs)
+        self.deleted = []
+
+    def open(self, name, mode='rb'):
+        raise AssertionError('Blobs must not be downloaded whole')
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+
+class TestBlobStorageAdapter:
+    """Azure paths and fallbacks."""
+
+    def test_read_header_is_a_ranged_download(self):
+        storage = StubAzureStorage({'site/uploads/photo.jpg': b'0123456789'})
+
+        header = BlobStorageAdapter(storage).read_header('uploads/photo.jpg', 4)
+
+        assert header == b'0123'
+        assert storage.client.downloads == [('site/uploads/photo.jpg', 0, 4)]
+
+    def test_blob_name_prefers_the_storage_helper(self):
+        storage = StubAzureStorage()
+        storage._get_valid_path = lambda name: f'custom/{name}'
+
+        assert BlobStorageAdapter(storage).blob_name('a.jpg') == 'custom/a.jpg'
+
+    def test_blob_name_without_location(self):
+        storage = StubAzureStorage()
+        storage.location = ''
+
+        assert BlobStorageAdapter(storage).blob_name('./uploads/a.jpg') == 'uploads/a.jpg'
+
+    def test_blob_name_keeps_dots_in_names(self):
+        storage = StubAzureStorage()
+        storage.location = '/site/'
+        adapter = BlobStorageAdapter(storage)
+
+        assert adapter.blob_name('.hidden/a.jpg') == 'site/.hidden/a.jpg'
+        assert adapter.blob_name('uploads/a.') == 'site/uploads/a.'
+        storage.location = ''
+        assert adapter.blob_name('.profile') == '.profile'
+        assert adapter.blob_name('') == ''
+
+    def test_delete_many_uses_one_batch_request(self):
+        storage = StubAzureStorage({'site/a.jpg': b'a', 'site/b.jpg': b'b'})
+
+        BlobStorageAdapter(storage).delete_many(['a.jpg', 'b.jpg'])
+
+        assert storage.client.batches == [('site/a.jpg', 'site/b.jpg')]
+        assert storage.client.blobs == {}
+        assert storage.deleted == []
+
+    def test_other_backends_use_the_storage_api(self, tmp_path):
+        storage = FileSystemStorage(location=str(tmp_path))
+        storage.save('a.jpg', ContentFile(b'0123456789'))
+        adapter = BlobStorageAdapter(storage)
+
+        assert adapter.container_client is None
+        assert not adapter.supports_batch_delete
+        assert adapter.read_header('a.jpg', 3) == b'012'
+        adapter.delete_many(['a.jpg', 'missing.jpg'])
+        assert not storage.exists('a.jpg')
+
+
+class TestAzureCallers:
+    """Direct upload checks and file deletion on Azure go through the adapter."""
+
+    def test_upload_signer_reads_header_from_blob(self):
+        storage = StubAzureStorage({'site/uploads/photo.jpg': b'\xff\xd8\xff\xe0rest'})
+
+        with patch('core.services.direct_upload_service.default_storage', storage):
+            header = AzureUploadSigner().read_header('uploads/photo.jpg', 4)
+
+        assert header == b'\xff\xd8\xff\xe0'
+
+    @override_settings(CONTENT_STORAGE={'DELETE_BATCH_SIZE': 2})
+    def test_delete_files_batches_blob_deletes(self):
+        storage = StubAzureStorage({f'site/{name}': b'x' for name in ('a.jpg', 'b.jpg', 'c.jpg')})
+
+        with patch('core.services.storage_service.default_storage', storage):
+            deleted = StorageService().delete_files(['a.jpg', 'b.jpg', 'c.jpg'])
+
+        assert deleted == 3
+        assert sorted(storage.client.batches) == [('site/a.jpg', 'site/b.jpg'), ('site/c.jpg',)]
+        assert storage.client.blobs == {}
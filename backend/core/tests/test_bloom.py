@@ -0,0 +1,32 @@
+"""
+Tests for the Bloom filter.
+"""
+
+import pytest
+
+from core.utils.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f'item-{i}' for i in range(1000)]
+    bloom.update(items)
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 1000
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(5000, error_rate=0.01)
+    bloom.update(f'member-{i}' for i in range(5000))
+    false_positives = sum(f'other-{i}' in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_empty_filter_contains_nothing():
+    assert 'anything' not in BloomFilter(10)
+
+
+@pytest.mark.parametrize('capacity, error_rate', [(0, 0.01), (10, 0), (10, 1)])
+def test_invalid_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
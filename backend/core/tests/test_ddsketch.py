@@ -0,0 +1,75 @@
+"""
+Tests for the DDSketch quantile sketch.
+"""
+
+import random
+
+import pytest
+
+from core.utils.ddsketch import DDSketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize('q', [0.5, 0.9, 0.99])
+def test_quantiles_within_relative_error(q):
+    """Test estimates stay within the relative accuracy on skewed data."""
+    rng = random.Random(42)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(20000)]
+    sketch = DDSketch()
+    sketch.update(values)
+
+    expected = exact_quantile(values, q)
+    assert abs(sketch.quantile(q) - expected) <= 0.01 * expected + 1e-9
+
+
+def test_merge_matches_single_sketch():
+    """Test merging sketches equals sketching all values at once."""
+    first, second, combined = DDSketch(), DDSketch(), DDSketch()
+    first.update(range(1, 500))
+    second.update(range(500, 1000))
+    combined.update(range(1, 1000))
+
+    first.merge(second)
+    assert first.bins == combined.bins
+    assert first.quantile(0.9) == combined.quantile(0.9)
+
+
+def test_zero_values_and_empty_sketch():
+    """Test zeros are counted and an empty sketch has no quantiles."""
+    sketch = DDSketch()
+    assert sketch.quantile(0.5) is None
+
+    sketch.update([0, 0, 0, 10])
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.count == 4
+
+
+def test_serialization_round_trip():
+    """Test serialized sketches restore bins and counts."""
+    sketch = DDSketch()
+    sketch.update([0, 1, 5, 30, 3600])
+
+    restored = DDSketch.from_bytes(sketch.to_bytes())
+    assert restored.bins == sketch.bins
+    assert restored.zero_count == 1
+    assert DDSketch().merge_bytes(sketch.to_bytes()).count == 5
+
+
+def test_max_bins_collapses_lowest_bins():
+    """Test the bin count is bounded while the total count is preserved."""
+    sketch = DDSketch(max_bins=10)
+    sketch.update(range(1, 1000))
+
+    assert len(sketch.bins) == 10
+    assert sketch.count == 999
+    assert sketch.quantile(0.99) == pytest.approx(989, rel=0.01)
+
+
+def test_negative_values_rejected():
+    """Test negative values raise ValueError."""
+    with pytest.raises(ValueError):
+        DDSketch().add(-1)
@@ -0,0 +1,154 @@
+"""
+Tests for the transactional email outbox.
+"""
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.tests.factories import UserFactory
+from core.models import OutboundEmail
+from core.services import email_outbox as outbox_module
+from core.services.email_outbox import EmailOutbox, email_outbox
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def outbox():
+    service = EmailOutbox()
+    yield service
+    service.close()
+
+
+def queue_email(**kwargs):
+    defaults = {'subject': 'Hello', 'body': 'Plain body', 'recipients': ['user@example.com']}
+    return email_outbox.enqueue(**{**defaults, **kwargs})
+
+
+class TestEnqueue:
+    """Views queue emails instead of sending them."""
+
+    def test_registration_queues_verification_email(self):
+        response = APIClient().post('/api/v1/auth/register/', {
+            'email': 'new@example.com',
+            'username': 'newuser',
+            'password': 'StrongPass123!',
+            'password_confirm': 'StrongPass123!',
+        })
+
+        assert response.status_code == 201
+        assert mail.outbox == []
+        queued = OutboundEmail.objects.get()
+        assert queued.recipients == ['new@example.com']
+        assert '/auth/verify-email/' in queued.body
+
+    def test_password_reset_queues_email(self):
+        user = UserFactory()
+        response = APIClient().post('/api/v1/auth/password/reset/', {'email': user.email})
+
+        assert response.status_code == 200
+        assert mail.outbox == []
+        assert '/auth/reset-password/' in OutboundEmail.objects.get(recipients=[user.email]).body
+
+
+class TestSendOnCommit:
+    """Queued emails are sent right after commit, with the worker as the retry path."""
+
+    def test_enqueue_schedules_send_on_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            queue_email()
+        assert len(callbacks) == 1
+
+    def test_rolled_back_email_is_never_sent(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    queue_email()
+                    raise RuntimeError
+        assert callbacks == []
+
+    def test_send_now_sends_only_that_email(self, outbox):
+        email = queue_email()
+        queue_email(recipients=['other@example.com'])
+
+        assert outbox.send_now(email.id) == {'sent': 1, 'retried': 0, 'failed': 0}
+        assert [message.to for message in mail.outbox] == [['user@example.com']]
+        assert OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING).count() == 1
+
+    def test_failed_send_now_is_left_to_the_worker(self, outbox, monkeypatch):
+        email = queue_email()
+        monkeypatch.setattr(EmailOutbox, '_send', lambda self, email: (_ for _ in ()).throw(OSError('down')))
+
+        assert outbox.send_now(email.id) == {'sent': 0, 'retried': 1, 'failed': 0}
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.PENDING
+
+
+class TestDelivery:
+    """The worker drains the outbox over one connection."""
+
+    def test_drain_sends_queued_emails(self, outbox):
+        queue_email(html_body='<p>Hi</p>')
+        queue_email(recipients=['other@example.com'])
+
+        assert outbox.drain() == {'sent': 2, 'retried': 0, 'failed': 0}
+        assert len(mail.outbox) == 2
+        assert mail.outbox[0].alternatives == [('<p>Hi</p>', 'text/html')]
+        assert not OutboundEmail.objects.exclude(status=OutboundEmail.Status.SENT).exists()
+
+    def test_batch_reuses_one_connection(self, outbox, monkeypatch):
+        opened = []
+        original = outbox_module.get_connection
+
+        def counting(*args, **kwargs):
+            opened.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(outbox_module, 'get_connection', counting)
+        for _ in range(5):
+            queue_email()
+        outbox.drain(batch_size=2)
+
+        assert len(mail.outbox) == 5
+        assert len(opened) == 1
+
+    def test_failure_is_retried_with_backoff(self, outbox, monkeypatch):
+        email = queue_email()
+        monkeypatch.setattr(EmailOutbox, '_send', lambda self, email: (_ for _ in ()).throw(OSError('down')))
+
+        assert outbox.send_batch() == {'sent': 0, 'retried': 1, 'failed': 0}
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.last_error == 'down'
+        assert email.next_attempt_at > timezone.now()
+        # Not due yet
+        assert outbox.send_batch() == {'sent': 0, 'retried': 0, 'failed': 0}
+
+    def test_gives_up_after_max_attempts(self, outbox, monkeypatch):
+        email = queue_email()
+        OutboundEmail.objects.filter(id=email.id).update(attempts=outbox.max_attempts - 1)
+        monkeypatch.setattr(EmailOutbox, '_send', lambda self, email: (_ for _ in ()).throw(OSError('down')))
+
+        assert outbox.send_batch() == {'sent': 0, 'retried': 0, 'failed': 1}
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.FAILED
+
+    def test_backoff_grows_exponentially(self, outbox):
+        assert outbox.backoff(1) <= 1.2 * outbox.backoff_base
+        assert outbox.backoff(3) >= 0.8 * 4 * outbox.backoff_base
+        assert outbox.backoff(30) <= 1.2 * outbox.backoff_max
+
+    def test_claimed_emails_are_leased(self, outbox):
+        queue_email()
+        assert len(outbox.claim_batch()) == 1
+        assert outbox.claim_batch() == []
+
+    def test_command_drains_outbox(self):
+        queue_email()
+        call_command('send_outbox_emails')
+        assert len(mail.outbox) == 1
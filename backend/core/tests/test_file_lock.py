@@ -0,0 +1,38 @@
+"""
+Tests for cross-process file locks.
+"""
+
+import threading
+
+from core.utils.file_lock import file_lock
+
+
+class TestFileLock:
+    """Test file_lock."""
+
+    def test_creates_lock_file(self, tmp_path):
+        """Test the lock file and its directory are created."""
+        path = tmp_path / 'locks' / 'index.lock'
+        with file_lock(str(path)):
+            assert path.exists()
+
+    def test_lock_is_exclusive(self, tmp_path):
+        """Test a second holder waits until the first releases the lock."""
+        path = str(tmp_path / 'index.lock')
+        events = []
+        acquired = threading.Event()
+
+        def contender():
+            acquired.wait()
+            with file_lock(path):
+                events.append('second')
+
+        thread = threading.Thread(target=contender)
+        thread.start()
+        with file_lock(path):
+            acquired.set()
+            thread.join(timeout=0.2)
+            events.append('first')
+        thread.join()
+
+        assert events == ['first', 'second']
@@ -0,0 +1,69 @@
+"""
+Tests for the HyperLogLog sketch.
+"""
+
+import pytest
+
+from core.utils.hyperloglog import HyperLogLog, standard_error
+
+
+def test_small_cardinalities_are_near_exact():
+    """Test linear counting keeps small counts exact."""
+    sketch = HyperLogLog()
+    sketch.update(f'user:{i}' for i in range(50))
+    sketch.update(f'user:{i}' for i in range(50))
+
+    assert sketch.count() == 50
+
+
+@pytest.mark.parametrize('cardinality', [5000, 50000])
+def test_estimate_within_error_bound(cardinality):
+    """Test large counts stay within four standard errors."""
+    sketch = HyperLogLog()
+    sketch.update(range(cardinality))
+
+    assert abs(sketch.count() - cardinality) / cardinality < 4 * standard_error()
+
+
+def test_merge_is_union():
+    """Test merging sketches counts overlapping values once."""
+    first = HyperLogLog()
+    first.update(range(0, 3000))
+    second = HyperLogLog()
+    second.update(range(2000, 5000))
+
+    union = HyperLogLog()
+    union.update(range(0, 5000))
+
+    assert first.merge(second).registers == union.registers
+
+
+@pytest.mark.parametrize('cardinality', [10, 20000])
+def test_serialization_round_trip(cardinality):
+    """Test sparse and dense encodings restore the same registers."""
+    sketch = HyperLogLog()
+    sketch.update(range(cardinality))
+    data = sketch.to_bytes()
+
+    assert HyperLogLog.from_bytes(data).registers == sketch.registers
+    assert HyperLogLog().merge_bytes(data).registers == sketch.registers
+
+
+def test_sparse_encoding_is_compact():
+    """Test a sparsely populated sketch serializes to a few bytes."""
+    sketch = HyperLogLog()
+    sketch.update(['user:1', 'user:2'])
+
+    assert len(sketch.to_bytes()) < 16
+
+
+def test_merge_rejects_different_precision():
+    """Test sketches with different precision cannot be merged."""
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_invalid_data_rejected():
+    """Test malformed data raises ValueError."""
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(b'nope')
@@ -0,0 +1,135 @@
+"""
+Tests for content-addressed image storage.
+"""
+
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.models import ImageBlob
+from core.services.image_blob_service import ImageBlobService
+from core.services.storage_service import get_storage_service
+from recipes.tests.factories import RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def service():
+    return ImageBlobService()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    storage_service = get_storage_service()
+    calls = []
+    save = storage_service.save_image_with_thumbnails
+
+    def counting_save(*args, **kwargs):
+        calls.append(args)
+        return save(*args, **kwargs)
+
+    monkeypatch.setattr(storage_service, 'save_image_with_thumbnails', counting_save)
+    return calls
+
+
+def image_upload(color='orange'):
+    buffer = BytesIO()
+    Image.new('RGB', (400, 300), color).save(buffer, format='JPEG')
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+class TestImageBlobService:
+    """Uploads are stored once per distinct content and reference counted."""
+
+    def test_identical_uploads_share_one_blob(self, service, renders):
+        first = service.save(image_upload(), 'recipe-1')
+        second = service.save(image_upload(), 'recipe-2')
+
+        assert first == second
+        assert len(renders) == 1
+        blob = ImageBlob.objects.get()
+        assert blob.ref_count == 2
+        assert first['sha256'] == blob.sha256
+        assert first['original'].endswith(f'/{blob.sha256}.jpg')
+
+    def test_files_are_deleted_with_the_last_reference(self, service, django_capture_on_commit_callbacks):
+        images = service.save(image_upload(), 'recipe-1')
+        service.save(image_upload(), 'recipe-2')
+        name = get_storage_service().storage_name(images['original'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.release(images)
+        assert default_storage.exists(name)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.release(images)
+        assert not default_storage.exists(name)
+        assert not ImageBlob.objects.exists()
+
+    def test_concurrent_render_joins_existing_blob(self, service, django_capture_on_commit_callbacks):
+        upload = image_upload()
+        content_hash = get_storage_service().content_hash(upload)
+        winner = service.save(upload, 'recipe-1')
+        # A second worker rendered the same upload before seeing the blob
+        loser = get_storage_service().save_image_with_thumbnails(upload, 'recipe-2', content_hash=content_hash)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            images = service.register(content_hash, loser)
+
+        assert images == winner
+        assert ImageBlob.objects.get().ref_count == 2
+        assert not default_storage.exists(get_storage_service().storage_name(loser['original']))
+
+    def test_legacy_images_are_deleted_outright(self, service, django_capture_on_commit_callbacks):
+        images = get_storage_service().save_image_with_thumbnails(image_upload(), 'recipe-1')
+        name = get_storage_service().storage_name(images['original'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            service.release(images)
+
+        assert not default_storage.exists(name)
+
+
+class TestRecipeDeletion:
+    """Deleting a recipe releases its image blob once the delete commits."""
+
+    def test_deleted_recipe_releases_its_reference(self, service, django_capture_on_commit_callbacks):
+        images = service.save(image_upload(), 'recipe-1')
+        service.save(image_upload(), 'recipe-2')
+        first, second = RecipeFactory(images=images), RecipeFactory(images=images)
+        name = get_storage_service().storage_name(images['original'])
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            first.delete()
+        assert ImageBlob.objects.get().ref_count == 2
+        for callback in callbacks:
+            callback()
+        assert ImageBlob.objects.get().ref_count == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert not ImageBlob.objects.exists()
+        assert not default_storage.exists(name)
+
+    def test_destroy_endpoint_releases_once(self, service, django_capture_on_commit_callbacks):
+        images = service.save(image_upload(), 'recipe-1')
+        service.save(image_upload(), 'recipe-2')
+        recipe = RecipeFactory(images=images)
+        client = APIClient()
+        client.force_authenticate(recipe.author)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.delete(f'/api/v1/recipes/{recipe.id}/')
+
+        assert response.status_code == 204
+        assert ImageBlob.objects.get().ref_count == 1
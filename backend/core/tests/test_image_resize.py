@@ -0,0 +1,191 @@
+"""
+Tests for on-demand image resizing.
+"""
+
+import os
+import threading
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from core.services import image_resize_service as resize_module
+from core.services.image_resize_service import ImageResizeService
+from recipes.models import RecipeView
+from recipes.serializers import RecipeSerializer
+from recipes.tests.factories import RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+ORIGINAL = 'recipes/images/originals/photo.jpg'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.IMAGE_RESIZE = {
+        'ALLOWED_WIDTHS': [160, 320, 640],
+        'FORMATS': ['webp', 'jpeg'],
+        'CACHE_DIR': str(tmp_path / 'cache'),
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = ImageResizeService()
+    monkeypatch.setattr(resize_module, 'image_resize_service', service)
+    monkeypatch.setattr('core.views.images.image_resize_service', service)
+    monkeypatch.setattr('recipes.serializers.image_resize_service', service)
+    monkeypatch.setattr('recipes.management.commands.warm_recipe_images.image_resize_service', service)
+    return service
+
+
+@pytest.fixture
+def original():
+    buffer = BytesIO()
+    Image.new('RGB', (1200, 800), 'teal').save(buffer, format='JPEG')
+    return default_storage.save(ORIGINAL, ContentFile(buffer.getvalue()))
+
+
+@pytest.fixture
+def renders(service, monkeypatch):
+    calls = []
+    render = service.render
+
+    def counting_render(*args):
+        calls.append(args)
+        return render(*args)
+
+    monkeypatch.setattr(service, 'render', counting_render)
+    return calls
+
+
+class TestResizeEndpoint:
+    """Signed, allow-listed resize requests."""
+
+    def test_serves_resized_variant(self, client, service, original):
+        url = service.url_for(f'/media/{original}', 320, 'webp')
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'image/webp'
+        assert 'immutable' in response['Cache-Control']
+        with Image.open(BytesIO(response.content)) as image:
+            assert image.size == (320, 213)
+        assert default_storage.exists(service.stored_name(original, 320, 'webp'))
+
+    def test_rejects_bad_signature(self, client, service, original):
+        url = service.url_for(f'/media/{original}', 320, 'webp').replace('w=320', 'w=640')
+
+        assert client.get(url).status_code == 403
+
+    def test_rejects_width_outside_allow_list(self, client, service, original):
+        signature = service.signature(original, 500, 'webp')
+
+        response = client.get(f'/api/v1/images/{original}', {'w': 500, 'fmt': 'webp', 'sig': signature})
+
+        assert response.status_code == 400
+
+    def test_missing_original_is_not_found(self, client, service):
+        url = service.url_for(f'/media/{ORIGINAL}', 320, 'jpeg')
+
+        assert client.get(url).status_code == 404
+
+    def test_only_originals_can_be_resized(self, client, service):
+        name = 'accounts/private.jpg'
+        signature = service.signature(name, 320, 'jpeg')
+
+        response = client.get(f'/api/v1/images/{name}', {'w': 320, 'fmt': 'jpeg', 'sig': signature})
+
+        assert response.status_code == 404
+
+    def test_foreign_urls_have_no_resize_url(self, service):
+        assert service.url_for('https://cdn.example.com/photo.jpg', 320, 'jpeg') is None
+
+    def test_signed_variants_cover_allowed_widths(self, client, service, original):
+        variants = service.signed_variants(f'/media/{original}', max_width=320)
+
+        assert set(variants) == {'webp', 'jpeg'}
+        assert sorted(variants['webp']) == [160, 320]
+        assert variants['jpeg'][160] == service.url_for(f'/media/{original}', 160, 'jpeg')
+        assert client.get(variants['webp'][320]).status_code == 200
+
+    def test_serialized_images_include_resize_urls(self, service, original):
+        recipe = RecipeFactory(images={
+            'original': f'/media/{original}',
+            'variants': [{'url': '/media/320.webp', 'width': 320, 'height': 213, 'format': 'webp', 'bytes': 1}],
+        })
+
+        image, = RecipeSerializer(recipe).data['images']
+
+        webp = next(source for source in image['sources'] if source['type'] == 'image/webp')
+        srcset = [candidate.rsplit(' ', 1) for candidate in webp['srcset'].split(', ')]
+        assert [width for _, width in srcset] == ['160w', '320w', '640w']
+        assert srcset[1][0] == '/media/320.webp'
+        assert srcset[0][0] == service.url_for(f'/media/{original}', 160, 'webp')
+
+
+class TestVariantCache:
+    """Disk cache, storage tier and request coalescing."""
+
+    def test_renders_once_then_hits_disk_cache(self, service, original, renders):
+        first, _ = service.get_variant(original, 160, 'jpeg')
+        second, _ = service.get_variant(original, 160, 'jpeg')
+
+        assert first == second
+        assert len(renders) == 1
+
+    def test_disk_miss_falls_back_to_storage(self, service, original, renders, tmp_path):
+        service.get_variant(original, 160, 'jpeg')
+        os.remove(service._cache_path(original, 160, 'jpeg'))
+
+        service.get_variant(original, 160, 'jpeg')
+
+        assert len(renders) == 1
+        assert os.path.exists(service._cache_path(original, 160, 'jpeg'))
+
+    def test_concurrent_requests_are_coalesced(self, service, original, renders):
+        barrier = threading.Barrier(4)
+
+        def request():
+            barrier.wait()
+            service.get_variant(original, 640, 'webp')
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(renders) == 1
+
+    def test_evicts_least_recently_used(self, service, original):
+        for width in (160, 320, 640):
+            service.get_variant(original, width, 'jpeg')
+        paths = {width: service._cache_path(original, width, 'jpeg') for width in (160, 320, 640)}
+        for age, width in enumerate((320, 160, 640)):
+            os.utime(paths[width], (1000 + age, 1000 + age))
+        service.cache_max_bytes = os.path.getsize(paths[640]) + os.path.getsize(paths[160])
+
+        assert service.evict() >= 1
+        assert not os.path.exists(paths[320])
+        assert os.path.exists(paths[640])
+
+
+class TestWarmCommand:
+    """Pre-warming the most viewed recipes."""
+
+    def test_warms_most_viewed_recipes(self, service, original, renders):
+        viewed = RecipeFactory(images={'original': f'/media/{original}'})
+        RecipeFactory(images={})
+        RecipeView.objects.create(recipe=viewed)
+
+        out = StringIO()
+        call_command('warm_recipe_images', widths='160,320', formats='webp', stdout=out)
+
+        assert 'Warmed 2 variants of 1 recipes' in out.getvalue()
+        assert sorted(args[1] for args in renders) == [160, 320]
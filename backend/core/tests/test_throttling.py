@@ -0,0 +1,110 @@
+"""
+Tests for token-bucket throttling.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.tests.factories import UserFactory
+from core.services.performance_monitor import performance_monitor
+from core.throttling import LocalBucketStore
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle-tests',
+    }
+}
+
+TEST_BUCKETS = {
+    'search': {'CAPACITY': 3, 'REFILL_PER_SECOND': 0.5, 'KEY': 'user_or_ip'},
+    'login': {'CAPACITY': 2, 'REFILL_PER_SECOND': 0.1, 'KEY': 'ip'},
+}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE, THROTTLE_BUCKETS=TEST_BUCKETS):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+def search(client, ip='10.0.0.1'):
+    return client.get(reverse('recipes:recipe-search'), {'q': 'soup'}, REMOTE_ADDR=ip)
+
+
+class TestLocalBucketStore:
+    """Refill and spend arithmetic."""
+
+    def test_allows_burst_then_rejects(self):
+        store = LocalBucketStore()
+        results = [store.consume('bucket', 2, 1.0) for _ in range(3)]
+        assert [allowed for allowed, _ in results] == [True, True, False]
+        assert 0 < results[-1][1] <= 1.0
+
+    def test_refills_over_time(self, monkeypatch):
+        store = LocalBucketStore()
+        now = [1000.0]
+        monkeypatch.setattr('core.throttling.time.time', lambda: now[0])
+        store.consume('bucket', 1, 0.5)
+        assert store.consume('bucket', 1, 0.5) == (False, 2.0)
+        now[0] += 2
+        assert store.consume('bucket', 1, 0.5)[0]
+
+
+class TestTokenBucketThrottle:
+    """Throttled endpoints answer 429 with Retry-After."""
+
+    def test_search_is_throttled_after_capacity(self):
+        client = APIClient()
+        statuses = [search(client).status_code for _ in range(3)]
+        response = search(client)
+
+        assert statuses == [200, 200, 200]
+        assert response.status_code == 429
+        assert int(response['Retry-After']) >= 1
+
+    def test_buckets_are_per_ip(self):
+        client = APIClient()
+        for _ in range(3):
+            search(client)
+        assert search(client).status_code == 429
+        assert search(client, ip='10.0.0.2').status_code == 200
+
+    def test_users_get_their_own_bucket(self):
+        anonymous = APIClient()
+        for _ in range(3):
+            search(anonymous)
+        authenticated = APIClient()
+        authenticated.force_authenticate(UserFactory())
+        assert search(authenticated).status_code == 200
+
+    def test_login_is_throttled_per_ip(self):
+        client = APIClient()
+        data = {'email': 'nobody@example.com', 'password': 'wrong-password'}
+        for _ in range(2):
+            assert client.post('/api/v1/auth/login/', data, REMOTE_ADDR='10.0.0.3').status_code != 429
+        response = client.post('/api/v1/auth/login/', data, REMOTE_ADDR='10.0.0.3')
+        assert response.status_code == 429
+        assert 'Retry-After' in response
+
+    def test_unconfigured_scope_is_not_throttled(self):
+        client = APIClient()
+        url = reverse('recipes:recipe-search-suggestions')
+        statuses = {client.get(url, {'q': 'so'}).status_code for _ in range(5)}
+        assert 429 not in statuses
+
+    def test_decisions_are_recorded(self, monkeypatch):
+        monkeypatch.setattr(performance_monitor, 'monitoring_enabled', True)
+        client = APIClient()
+        for _ in range(4):
+            search(client, ip='10.0.0.4')
+        stats = performance_monitor.get_throttle_stats()['search']
+        assert stats['throttled'] >= 1
+        assert performance_monitor.metrics.get_metrics('throttle_search_wait', 1)
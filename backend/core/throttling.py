@@ -0,0 +1,144 @@
+"""
+Token-bucket throttling for expensive endpoints.
+
+Each (scope, user or IP) pair owns a bucket of ``CAPACITY`` tokens refilled
+at ``REFILL_PER_SECOND``; a request spends one token and is rejected with
+``429`` and ``Retry-After`` when the bucket is empty. Bursts up to the
+capacity are allowed while the sustained rate stays bounded.
+
+Buckets live in the shared cache. On Redis the refill-and-spend step runs as
+a Lua script (atomic, using the Redis clock); on other backends such as
+LocMem it runs under a striped process lock. If the store fails, requests are
+allowed rather than rejected.
+
+Views opt in with ``throttle_classes = [TokenBucketThrottle]`` and a
+``throttle_scope`` naming an entry of the ``THROTTLE_BUCKETS`` setting.
+"""
+import logging
+import threading
+import time
+import zlib
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from core.services.performance_monitor import performance_monitor
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CACHE_PREFIX = 'throttle'
+
+
+class RedisBucketStore:
+    """Token buckets updated atomically by a Lua script."""
+
+    CONSUME_SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local cost = tonumber(ARGV[3])
+        local clock = redis.call('TIME')
+        local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+        local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+        local tokens = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+        local allowed = 0
+        local wait = 0
+        if tokens >= cost then
+            tokens = tokens - cost
+            allowed = 1
+        else
+            wait = (cost - tokens) / rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return {allowed, tostring(wait)}
+    """
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self._redis = get_redis_connection('default')
+        self._consume = self._redis.register_script(self.CONSUME_SCRIPT)
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        allowed, wait = self._consume(keys=[key], args=[capacity, rate, cost])
+        return bool(allowed), float(wait)
+
+
+class LocalBucketStore:
+    """Token buckets in the Django cache, updated under striped process locks."""
+
+    STRIPES = 64
+
+    def __init__(self):
+        self._locks = [threading.Lock() for _ in range(self.STRIPES)]
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1) -> Tuple[bool, float]:
+        with self._locks[zlib.crc32(key.encode()) % self.STRIPES]:
+            now = time.time()
+            tokens, updated_at = cache.get(key) or (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+            if tokens >= cost:
+                allowed, wait = True, 0.0
+                tokens -= cost
+            else:
+                allowed, wait = False, (cost - tokens) / rate
+            cache.set(key, (tokens, now), int(capacity / rate) + 1)
+        return allowed, wait
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    """The bucket store matching the default cache backend."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+            _store = RedisBucketStore() if 'django_redis' in backend else LocalBucketStore()
+        return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """DRF throttle spending one token per request from the view's scoped bucket."""
+
+    def __init__(self):
+        self._wait = None
+
+    def get_bucket(self, scope: Optional[str]) -> Optional[dict]:
+        if not scope:
+            return None
+        return getattr(settings, 'THROTTLE_BUCKETS', {}).get(scope)
+
+    def get_cache_key(self, request, scope: str, bucket: dict) -> str:
+        user = getattr(request, 'user', None)
+        if bucket.get('KEY', 'user_or_ip') == 'user_or_ip' and user is not None and user.is_authenticated:
+            ident = f'user:{user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'{THROTTLE_CACHE_PREFIX}:{scope}:{ident}'
+
+    def allow_request(self, request, view) -> bool:
+        scope = getattr(view, 'throttle_scope', None)
+        bucket = self.get_bucket(scope)
+        if not bucket:
+            return True
+
+        key = self.get_cache_key(request, scope, bucket)
+        try:
+            allowed, wait = get_bucket_store().consume(key, bucket['CAPACITY'], bucket['REFILL_PER_SECOND'])
+        except Exception as e:
+            logger.error(f"Throttle store unavailable for scope {scope}: {e}")
+            return True
+
+        self._wait = None if allowed else wait
+        performance_monitor.log_throttle(scope, throttled=not allowed, wait=wait)
+        return allowed
+
+    def wait(self) -> Optional[float]:
+        return self._wait
@@ -0,0 +1,57 @@
+"""
+Bloom filter for fast negative membership checks.
+
+A Bloom filter answers "definitely not present" or "possibly present" from a
+fixed bit array. With ``capacity`` items added, the false positive rate stays
+near ``error_rate``; it grows as more items are added, so callers should
+rebuild a larger filter once ``len(filter)`` exceeds ``capacity``. There are
+no false negatives.
+"""
+import hashlib
+import math
+from typing import Iterable
+
+DEFAULT_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set supporting add and membership tests."""
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        if capacity < 1:
+            raise ValueError("Bloom filter capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        """Number of items added (including repeats)."""
+        return self.count
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher double hashing: k positions from two 64-bit hashes
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items."""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        """False if ``item`` was never added; True if it probably was."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
@@ -0,0 +1,115 @@
+"""
+DDSketch quantile sketch.
+
+Values are counted in logarithmically sized bins, so every quantile is
+returned within a fixed *relative* error ``alpha`` of the true value (1% by
+default), however skewed the distribution. Sketches with the same accuracy
+merge losslessly by adding bin counts, which makes them suitable for storing
+per time bucket and combining at read time. Only non-negative values are
+supported; values too small to bin are counted as zero.
+"""
+import math
+import struct
+from typing import Dict, Iterable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+MIN_INDEXABLE_VALUE = 1e-9
+
+_MAGIC = b'Q'
+_HEADER = struct.Struct('>cdQ')
+_BIN = struct.Struct('>iQ')
+
+
+class DDSketch:
+    """Mergeable quantile estimator with relative-error guarantees."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("DDSketch relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of values added."""
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a non-negative value ``count`` times."""
+        if value < 0:
+            raise ValueError("DDSketch only supports non-negative values")
+        if value < MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add several values to the sketch."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'DDSketch') -> 'DDSketch':
+        """Fold ``other`` into this sketch in place and return ``self``."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge DDSketches with different relative accuracy")
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        return self
+
+    def merge_bytes(self, data: bytes) -> 'DDSketch':
+        """Fold a serialized sketch into this one."""
+        return self.merge(self.from_bytes(data, max_bins=self.max_bins))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile ``q`` (0..1), or None for an empty sketch."""
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        cumulative = self.zero_count
+        if rank < cumulative:
+            return 0.0
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins together to respect ``max_bins``."""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        self.bins[target] += sum(self.bins.pop(key) for key in keys[:excess])
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch."""
+        header = _HEADER.pack(_MAGIC, self.relative_accuracy, self.zero_count)
+        return header + b''.join(_BIN.pack(key, count) for key, count in sorted(self.bins.items()))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = DEFAULT_MAX_BINS) -> 'DDSketch':
+        """Deserialize a sketch produced by ``to_bytes``."""
+        data = bytes(data)
+        if len(data) < _HEADER.size or (len(data) - _HEADER.size) % _BIN.size:
+            raise ValueError("Invalid DDSketch data")
+        magic, relative_accuracy, zero_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Invalid DDSketch data")
+        sketch = cls(relative_accuracy, max_bins=max_bins)
+        sketch.zero_count = zero_count
+        sketch.bins = dict(_BIN.iter_unpack(data[_HEADER.size:]))
+        return sketch
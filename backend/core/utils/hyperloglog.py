@@ -0,0 +1,134 @@
+"""
+HyperLogLog cardinality sketch.
+
+A sketch with precision ``p`` keeps ``m = 2**p`` one-byte registers and
+estimates the number of distinct values added to it with a relative standard
+error of ``1.04 / sqrt(m)`` (1.6% for the default ``p = 12``; roughly 95% of
+estimates fall within twice that). Small cardinalities use linear counting and
+are close to exact. Sketches with the same precision merge losslessly: the
+union of two sketches is the register-wise maximum.
+
+Sketches serialize compactly: sparsely populated sketches are stored as
+``(index, rank)`` pairs, so a recipe with a handful of viewers on a day costs a
+few bytes rather than ``m``.
+"""
+import hashlib
+import math
+import struct
+from typing import Iterable, Optional
+
+DEFAULT_PRECISION = 12
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+_MAGIC = b'H'
+_DENSE = b'D'
+_SPARSE = b'S'
+_SPARSE_ENTRY = struct.Struct('>HB')
+
+
+def standard_error(precision: int = DEFAULT_PRECISION) -> float:
+    """Relative standard error of a sketch with the given precision."""
+    return 1.04 / math.sqrt(1 << precision)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimator."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"HyperLogLog precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) != self.m:
+            raise ValueError("Register count does not match precision")
+        self.registers = registers if registers is not None else bytearray(self.m)
+
+    @property
+    def error_rate(self) -> float:
+        """Relative standard error of this sketch's estimates."""
+        return standard_error(self.precision)
+
+    def add(self, value) -> None:
+        """Add a value (converted to ``str``) to the sketch."""
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable) -> None:
+        """Add several values to the sketch."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold ``other`` into this sketch in place and return ``self``."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def merge_bytes(self, data: bytes) -> 'HyperLogLog':
+        """Fold a serialized sketch into this one without building a second sketch."""
+        precision, mode, payload = self._parse_header(data)
+        if precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        if mode == _SPARSE:
+            registers = self.registers
+            for index, rank in _SPARSE_ENTRY.iter_unpack(payload):
+                if rank > registers[index]:
+                    registers[index] = rank
+        else:
+            self.registers = bytearray(map(max, self.registers, payload))
+        return self
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = self.m
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def to_bytes(self) -> bytes:
+        """Serialize, using the sparse encoding when it is smaller."""
+        header = _MAGIC + bytes([self.precision])
+        populated = [(i, r) for i, r in enumerate(self.registers) if r]
+        if len(populated) * _SPARSE_ENTRY.size < self.m:
+            return header + _SPARSE + b''.join(_SPARSE_ENTRY.pack(i, r) for i, r in populated)
+        return header + _DENSE + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        """Deserialize a sketch produced by ``to_bytes``."""
+        precision, mode, payload = cls._parse_header(data)
+        sketch = cls(precision)
+        if mode == _SPARSE:
+            for index, rank in _SPARSE_ENTRY.iter_unpack(payload):
+                sketch.registers[index] = rank
+        else:
+            sketch.registers = bytearray(payload)
+        return sketch
+
+    @staticmethod
+    def _parse_header(data: bytes):
+        data = bytes(data)
+        if len(data) < 3 or data[:1] != _MAGIC or data[2:3] not in (_DENSE, _SPARSE):
+            raise ValueError("Invalid HyperLogLog data")
+        precision = data[1]
+        payload = data[3:]
+        if data[2:3] == _DENSE and len(payload) != 1 << precision:
+            raise ValueError("Invalid HyperLogLog data")
+        return precision, data[2:3], payload
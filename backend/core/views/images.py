@@ -0,0 +1,63 @@
+"""
+Views serving resized images and receiving direct uploads.
+"""
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from core.services.direct_upload_service import direct_upload_service
+from core.services.image_resize_service import image_resize_service
+
+
+@require_GET
+def resized_image(request, name):
+    """
+    Serve a stored image resized to an allow-listed width and format.
+
+    Query parameters ``w`` and ``fmt`` must be signed with ``sig`` (see
+    ``ImageResizeService.url_for``). Variants are immutable, as originals
+    are never overwritten, so they are cached by clients indefinitely.
+    """
+    try:
+        width = int(request.GET.get('w', ''))
+        image_format = request.GET.get('fmt', '')
+        image_resize_service.validate(width, image_format)
+    except (ValueError, ValidationError) as e:
+        return HttpResponseBadRequest(str(e))
+    if not image_resize_service.verify(name, width, image_format, request.GET.get('sig')):
+        return HttpResponseForbidden('Invalid signature')
+
+    try:
+        data, content_type = image_resize_service.get_variant(name, width, image_format)
+    except (FileNotFoundError, ValidationError):
+        raise Http404('Image not found')
+
+    response = HttpResponse(data, content_type=content_type)
+    response['Cache-Control'] = f'public, max-age={image_resize_service.max_age}, immutable'
+    return response
+
+
+@csrf_exempt
+@require_http_methods(['PUT'])
+def direct_upload(request, token):
+    """
+    Receive an upload to a signed URL when files are stored locally.
+
+    Stands in for blob storage in development and tests (see
+    ``DirectUploadService``); the signed token is the only credential.
+    """
+    try:
+        size = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        size = 0
+    if not size:
+        return HttpResponse('Content-Length required', status=411)
+    try:
+        direct_upload_service.receive(token, request, request.content_type, size)
+    except signing.BadSignature:
+        return HttpResponseForbidden('Invalid or expired upload URL')
+    except ValidationError as e:
+        return HttpResponseBadRequest(' '.join(e.messages))
+    return HttpResponse(status=201)
@@ -0,0 +1,101 @@
+"""
+Management command to benchmark the read endpoints against a generated dataset.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.services.api_benchmark import SCENARIOS, ApiBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure p50/p95/p99 latency, query counts and peak allocated memory of the recipe, search, '
+        'category tree and admin analytics endpoints, and fail when a baseline budget is exceeded'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            default='small',
+            help='Dataset name from API_BENCHMARKS["DATASETS"]; baselines are kept per dataset',
+        )
+        parser.add_argument(
+            '--generate',
+            action='store_true',
+            help='Replace previously generated benchmark rows with the dataset before measuring',
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=[scenario.name for scenario in SCENARIOS],
+            help='Only run this scenario (repeatable)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            help='Timed requests per scenario (default: API_BENCHMARKS["ITERATIONS"])',
+        )
+        parser.add_argument(
+            '--warm-cache',
+            action='store_true',
+            help='Keep the cache between requests instead of measuring uncached requests',
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Record the results as the new baseline of the dataset instead of checking them',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the results to this JSON file',
+        )
+
+    def handle(self, *args, **options):
+        benchmark = ApiBenchmark(iterations=options['iterations'], warm_cache=options['warm_cache'])
+        dataset = options['dataset']
+        try:
+            benchmark.dataset_sizes(dataset)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['generate']:
+            self.stdout.write(f'Generating {dataset} dataset...')
+            inserted = benchmark.prepare_dataset(dataset)
+            self.stdout.write(', '.join(f'{count} {kind.replace("_", " ")}' for kind, count in inserted.items()))
+
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in options['scenario']] \
+            if options['scenario'] else SCENARIOS
+        results = benchmark.run(scenarios)
+
+        self.stdout.write(
+            f"{'scenario':<28}{'status':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'queries':>9}{'peak KiB':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28}{result['status']:>8}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                f"{result['p99_ms']:>10.1f}{result['queries']:>9}{result['peak_kib']:>10}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+
+        if options['update_baseline']:
+            baseline = {**benchmark.load_baseline(dataset), **results}
+            benchmark.save_baseline(dataset, baseline)
+            self.stdout.write(self.style.SUCCESS(f'Baseline for {dataset} written to {benchmark.baseline_path}'))
+            return
+
+        baseline = benchmark.load_baseline(dataset)
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f'No baseline for {dataset} in {benchmark.baseline_path}; run with --update-baseline to record one'
+            ))
+        violations = benchmark.compare(results, baseline)
+        for violation in violations:
+            self.stdout.write(self.style.ERROR(violation))
+        if violations:
+            raise CommandError(f'{len(violations)} budget(s) exceeded')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} scenarios within budget'))
@@ -0,0 +1,35 @@
+"""
+Management command to rebuild the content similarity index.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.content_similarity_service import content_similarity_service
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the memory-mapped TF-IDF index of recipe ingredients, tags and categories (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and rebuild again every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=21600,
+            help='Seconds between runs when --loop is given (default: 21600)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            indexed = content_similarity_service.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f'Indexed {indexed} recipes in {content_similarity_service.index_dir}')
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,40 @@
+"""
+Management command to precompute personalized feed candidates.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from recipes.services.feed_service import feed_service
+
+
+class Command(BaseCommand):
+    help = 'Precompute and cache feed candidates for recently active users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Refresh users who logged in or engaged within this many days (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        feed_service.refresh()
+
+        users = get_user_model().objects.filter(
+            Q(last_login__gte=since) |
+            Q(favorites__created_at__gte=since) |
+            Q(ratings__created_at__gte=since)
+        ).filter(is_active=True).distinct()
+
+        refreshed = 0
+        for user in users.iterator():
+            feed_service.refresh(user)
+            refreshed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Refreshed feed candidates for {refreshed} users'))
@@ -0,0 +1,50 @@
+"""
+Management command to precompute similar recipes.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.recommendation_service import similar_recipes_service
+
+
+class Command(BaseCommand):
+    help = 'Compute item-to-item recipe neighbors (incremental unless --full is given; run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute every recipe instead of only those with new interactions',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and refresh incrementally every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between runs when --loop is given (default: 3600)',
+        )
+        parser.add_argument(
+            '--full-interval',
+            type=int,
+            default=86400,
+            help='With --loop, seconds between full runs, which also drop removed favorites (default: 86400)',
+        )
+
+    def handle(self, *args, **options):
+        full = options['full']
+        last_full = time.monotonic()
+        while True:
+            result = similar_recipes_service.refresh(full=full)
+            mode = 'full' if full else 'incremental'
+            self.stdout.write(self.style.SUCCESS(f"Wrote neighbors for {result['recipes']} recipes ({mode} run)"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+            full = time.monotonic() - last_full >= options['full_interval']
+            if full:
+                last_full = time.monotonic()
@@ -0,0 +1,62 @@
+"""
+Management command to delete stored recipe images that nothing references.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.image_gc_service import image_gc_service
+
+
+class Command(BaseCommand):
+    help = (
+        'Mark image files referenced by recipes, image blobs and unfinished jobs, then delete the rest from storage '
+        '(run from cron or with --loop)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List orphaned files without deleting them',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=24,
+            help='Keep files modified more recently than this, to spare in-flight uploads',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and collect again every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=86400,
+            help='Seconds between runs when --loop is given (default: 86400)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.collect(options)
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def collect(self, options):
+        orphans, counts = image_gc_service.collect(
+            min_age=timedelta(hours=options['min_age_hours']),
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run'] or options['verbosity'] > 1:
+            for name in orphans:
+                self.stdout.write(name)
+
+        action = 'would delete' if options['dry_run'] else f"deleted {counts['deleted']}"
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['stored']} stored files, {counts['orphaned']} orphaned ({action}), "
+            f"{counts['recent']} recent unreferenced files kept"
+        ))
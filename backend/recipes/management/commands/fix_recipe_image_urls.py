@@ -71,7 +71,8 @@ class Command(BaseCommand):
             needs_update = False
             
             for size_name, url in recipe.images.items():
-                if url and url.startswith('/'):
+                # Responsive variants are stored with absolute URLs already
+                if isinstance(url, str) and url.startswith('/'):
                     # Convert relative URL to absolute Azure URL
                     if url.startswith('/media/'):
                         clean_url = url[7:]  # Remove '/media/' prefix
@@ -0,0 +1,40 @@
+"""
+Management command to drain the recipe view ingestion buffer.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.view_tracking_service import view_tracking_service
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered recipe views to the database (optionally as a long-running worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and flush every FLUSH_INTERVAL_SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            recovered = view_tracking_service.buffer.recover()
+            written = view_tracking_service.flush()
+            self.stdout.write(
+                self.style.SUCCESS(f'Flushed {written} recipe views ({recovered} recovered from abandoned batches)')
+            )
+            return
+
+        self.stdout.write('Flushing recipe views continuously, press Ctrl+C to stop...')
+        try:
+            while True:
+                view_tracking_service.buffer.recover()
+                written = view_tracking_service.flush()
+                if written:
+                    self.stdout.write(f'Flushed {written} recipe views')
+                time.sleep(view_tracking_service.flush_interval)
+        except KeyboardInterrupt:
+            written = view_tracking_service.flush()
+            self.stdout.write(self.style.SUCCESS(f'Stopped after flushing {written} remaining recipe views'))
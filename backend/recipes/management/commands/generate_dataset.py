@@ -0,0 +1,97 @@
+"""
+Management command to generate a large synthetic dataset for load testing and benchmarks.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.services.dataset_generator import DATASET_PASSWORD, DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate users, a category tree, recipes, ratings, favorites and views with '
+        'Zipfian popularity, reproducibly from a seed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Seed every generated row is derived from')
+        parser.add_argument('--users', type=int, default=1000, help='Number of users')
+        parser.add_argument('--recipes', type=int, default=10000, help='Number of recipes')
+        parser.add_argument('--ratings', type=int, default=50000, help='Number of ratings')
+        parser.add_argument('--favorites', type=int, default=20000, help='Number of favorites')
+        parser.add_argument('--views', type=int, default=100000, help='Number of recipe views')
+        parser.add_argument(
+            '--category-roots', type=int, default=12,
+            help='Number of top-level categories',
+        )
+        parser.add_argument(
+            '--category-fanout', type=int, default=4,
+            help='Number of children of each category above the leaves',
+        )
+        parser.add_argument(
+            '--category-depth', type=int, default=3,
+            help='Levels in the category tree (at most 3)',
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='Spread creation times over this many days, weighted towards recent ones',
+        )
+        parser.add_argument(
+            '--zipf-exponent', type=float, default=1.1,
+            help='Skew of recipe and user popularity; higher concentrates activity on fewer rows',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50000,
+            help='Rows per bulk insert and transaction',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete rows previously generated with the same seed first',
+        )
+
+    def handle(self, *args, **options):
+        for option in ('users', 'recipes', 'ratings', 'favorites', 'views'):
+            if options[option] < 0:
+                raise CommandError(f'--{option} cannot be negative')
+        if options['recipes'] and not options['users']:
+            raise CommandError('Recipes need at least one user to author them')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        generator = DatasetGenerator(
+            seed=options['seed'],
+            users=options['users'],
+            recipes=options['recipes'],
+            ratings=options['ratings'],
+            favorites=options['favorites'],
+            views=options['views'],
+            category_roots=options['category_roots'],
+            category_fanout=options['category_fanout'],
+            category_depth=options['category_depth'],
+            days=options['days'],
+            zipf_exponent=options['zipf_exponent'],
+            batch_size=options['batch_size'],
+            progress=self.report_progress if options['verbosity'] > 1 else None,
+        )
+
+        if options['clear']:
+            deleted = generator.clear()
+            self.stdout.write(f"Deleted {deleted} rows generated with seed {options['seed']}")
+
+        started = time.monotonic()
+        inserted = generator.generate()
+        elapsed = time.monotonic() - started
+
+        total = sum(inserted.values())
+        summary = ', '.join(f'{count} {kind.replace("_", " ")}' for kind, count in inserted.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s): {summary}'
+        ))
+        self.stdout.write(
+            f"Users are named {generator.username_prefix}user<N> and share the password '{DATASET_PASSWORD}'"
+        )
+
+    def report_progress(self, kind, count):
+        self.stdout.write(f'  {kind}: {count}')
@@ -0,0 +1,63 @@
+"""
+Management command to process queued recipe image uploads.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from recipes.services.image_job_service import image_job_service
+
+
+class Command(BaseCommand):
+    help = 'Render queued recipe image uploads on a process pool and swap them into their recipes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Rendering processes (defaults to IMAGE_JOBS WORKERS; 1 renders inline)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Jobs claimed per batch (defaults to IMAGE_JOBS BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new jobs instead of exiting once drained',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep between polls in loop mode',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or image_job_service.workers
+        executor = None
+        if workers > 1:
+            # Forked workers must not share the parent's database connections
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while True:
+                counts = image_job_service.process_pending(executor, batch_size=options['batch_size'])
+                if any(counts.values()):
+                    self.stdout.write(self.style.SUCCESS(
+                        ', '.join(f'{count} {outcome}' for outcome, count in counts.items())
+                    ))
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
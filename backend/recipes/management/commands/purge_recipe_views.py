@@ -0,0 +1,62 @@
+"""
+Management command to purge raw recipe views that are covered by rollups.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.view_stats_service import view_stats_service
+
+
+class Command(BaseCommand):
+    help = 'Delete raw recipe views older than the retention window in small chunks (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Retention window in days (default: RECIPE_VIEW_ROLLUPS RAW_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Rows deleted per transaction (default: RECIPE_VIEW_ROLLUPS PURGE_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between chunks to limit load',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and purge again every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between runs when --loop is given (default: 3600)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.purge(options)
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def purge(self, options):
+        if view_stats_service.get_watermark() is None:
+            self.stdout.write(self.style.WARNING('Views have never been rolled up; run rollup_recipe_views first.'))
+            return
+
+        deleted = view_stats_service.purge_raw_views(
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            pause_seconds=options['pause'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} raw recipe views'))
@@ -0,0 +1,38 @@
+"""
+Management command to roll raw recipe views up into hourly and daily buckets.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.view_stats_service import view_stats_service
+
+
+class Command(BaseCommand):
+    help = 'Incrementally roll up recipe views into hourly/daily buckets (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and roll up again every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between runs when --loop is given (default: 300)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = view_stats_service.rollup()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rolled up views {result['start']} -> {result['end']}: "
+                    f"{result['hourly_buckets']} hourly and {result['daily_buckets']} daily buckets"
+                )
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,48 @@
+"""
+Management command to maintain trending recipe scores.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.services.trending_service import trending_service
+
+
+class Command(BaseCommand):
+    help = 'Prune decayed trending scores, or rebuild them from recent engagement (run from cron or with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute all scores from recent views, favorites and ratings',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Days of engagement to replay with --rebuild (default: REBUILD_DAYS)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and prune again every --interval seconds (--rebuild only applies to the first run)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=3600,
+            help='Seconds between runs when --loop is given (default: 3600)',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            updated = trending_service.rebuild(days=options['days'])
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt trending scores for {updated} recipes'))
+
+        while True:
+            pruned = trending_service.prune()
+            self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} decayed trending scores'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,67 @@
+"""
+Management command to pre-render resized images of the most viewed recipes.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from core.services.image_resize_service import image_resize_service
+from core.services.storage_service import get_storage_service
+from recipes.models import Recipe
+from recipes.services.view_stats_service import view_stats_service
+
+
+class Command(BaseCommand):
+    help = 'Render on-demand image variants of the most viewed recipes ahead of requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=100,
+            help='Number of most viewed recipes to warm',
+        )
+        parser.add_argument(
+            '--widths',
+            help='Comma-separated widths (defaults to IMAGE_RESIZE PREWARM_WIDTHS)',
+        )
+        parser.add_argument(
+            '--formats',
+            help='Comma-separated formats (defaults to every IMAGE_RESIZE format Pillow supports)',
+        )
+
+    def handle(self, *args, **options):
+        if options['widths']:
+            widths = [int(width) for width in options['widths'].split(',')]
+        else:
+            widths = getattr(settings, 'IMAGE_RESIZE', {}).get('PREWARM_WIDTHS', [320, 640])
+        formats = options['formats'].split(',') if options['formats'] else image_resize_service.formats
+        for width in widths:
+            for image_format in formats:
+                try:
+                    image_resize_service.validate(width, image_format)
+                except ValidationError as e:
+                    raise CommandError(e.messages[0])
+
+        ranked = view_stats_service.most_viewed(options['limit'], Q(recipe__images__has_key='original'))
+        originals = dict(Recipe.objects.filter(id__in=[recipe_id for recipe_id, _ in ranked]).values_list('id', 'images'))
+        storage_service = get_storage_service()
+
+        warmed = failed = 0
+        for recipe_id, _ in ranked:
+            name = storage_service.storage_name(originals.get(recipe_id, {}).get('original') or '')
+            if name is None:
+                continue
+            for width in widths:
+                for image_format in formats:
+                    try:
+                        image_resize_service.get_variant(name, width, image_format)
+                        warmed += 1
+                    except (FileNotFoundError, ValidationError) as e:
+                        failed += 1
+                        self.stderr.write(f"Skipped recipe {recipe_id} at {width}w {image_format}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {warmed} variants of {len(ranked)} recipes ({failed} failed)"
+        ))
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_recipe_moderation_notes_recipe_moderation_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeViewRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('name', models.CharField(help_text='Name of the rollup job', max_length=50, unique=True)),
+                ('rolled_up_to', models.DateTimeField(help_text='Raw views created before this instant are included in the rollups')),
+            ],
+            options={
+                'verbose_name': 'recipe view rollup state',
+                'verbose_name_plural': 'recipe view rollup states',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeViewRollup',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this rollup', primary_key=True, serialize=False)),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], help_text='Size of the time bucket', max_length=4)),
+                ('bucket_start', models.DateTimeField(help_text='Start of the time bucket (UTC)')),
+                ('view_count', models.PositiveIntegerField(default=0, help_text='Number of views in the bucket')),
+                ('unique_viewers', models.PositiveIntegerField(default=0, help_text='Distinct viewers (user, or IP for anonymous) in the bucket, excluding the author')),
+                ('total_duration_seconds', models.PositiveBigIntegerField(default=0, help_text='Sum of recorded view durations in seconds')),
+                ('duration_count', models.PositiveIntegerField(default=0, help_text='Number of views with a recorded duration')),
+                ('recipe', models.ForeignKey(help_text='Recipe the views belong to', on_delete=django.db.models.deletion.CASCADE, related_name='view_rollups', to='recipes.recipe')),
+            ],
+            options={
+                'verbose_name': 'recipe view rollup',
+                'verbose_name_plural': 'recipe view rollups',
+                'ordering': ['-bucket_start'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='recipes_rec_granula_ed2c5f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipeviewrollup',
+            constraint=models.UniqueConstraint(fields=('recipe', 'granularity', 'bucket_start'), name='unique_recipe_view_rollup_bucket'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_recipe_view_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeViewSketch',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this sketch', primary_key=True, serialize=False)),
+                ('day', models.DateField(help_text='Day (UTC) the sketch covers')),
+                ('sketch', models.BinaryField(help_text='Serialized HyperLogLog of viewers, excluding the author')),
+                ('recipe', models.ForeignKey(help_text='Recipe the viewers belong to', on_delete=django.db.models.deletion.CASCADE, related_name='view_sketches', to='recipes.recipe')),
+            ],
+            options={
+                'verbose_name': 'recipe view sketch',
+                'verbose_name_plural': 'recipe view sketches',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day'], name='recipes_rec_day_2705a2_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipeviewsketch',
+            constraint=models.UniqueConstraint(fields=('recipe', 'day'), name='unique_recipe_view_sketch_day'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0012_recipe_view_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeviewrollup',
+            name='duration_sketch',
+            field=models.BinaryField(blank=True, help_text='Serialized DDSketch of recorded view durations', null=True),
+        ),
+    ]
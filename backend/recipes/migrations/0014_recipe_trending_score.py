@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_recipe_view_duration_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeTrendingScore',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('recipe', models.OneToOneField(help_text='Recipe the score belongs to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='recipes.recipe')),
+                ('score', models.FloatField(help_text='log2 of the decayed score, expressed relative to the trending epoch')),
+                ('last_event_at', models.DateTimeField(help_text='Time of the most recent engagement event')),
+            ],
+            options={
+                'verbose_name': 'recipe trending score',
+                'verbose_name_plural': 'recipe trending scores',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['-score'], name='recipes_rec_score_9b60ed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_recipe_trending_score'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipeviewrollupstate',
+            name='rolled_up_to',
+            field=models.DateTimeField(help_text='Engagement recorded before this instant has been processed by the job'),
+        ),
+        migrations.CreateModel(
+            name='RecipeNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('score', models.FloatField(help_text="Cosine similarity of the recipes' user interactions")),
+                ('rank', models.PositiveSmallIntegerField(help_text="Position in the recipe's neighbor list (0 is most similar)")),
+                ('neighbor', models.ForeignKey(help_text='Similar recipe', on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='recipes.recipe')),
+                ('recipe', models.ForeignKey(help_text='Recipe the neighbor list belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='recipes.recipe')),
+            ],
+            options={
+                'verbose_name': 'recipe neighbor',
+                'verbose_name_plural': 'recipe neighbors',
+                'ordering': ['recipe', 'rank'],
+                'indexes': [models.Index(fields=['recipe', 'rank'], name='recipes_rec_recipe__4478fd_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipeneighbor',
+            constraint=models.UniqueConstraint(fields=('recipe', 'neighbor'), name='unique_recipe_neighbor'),
+        ),
+    ]
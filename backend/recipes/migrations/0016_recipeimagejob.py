@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0015_recipe_neighbors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeImageJob',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this job', primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('succeeded', 'Succeeded'), ('superseded', 'Superseded'), ('failed', 'Failed')], default='pending', help_text='Processing status', max_length=10)),
+                ('source_path', models.CharField(help_text='Storage path of the raw upload', max_length=500)),
+                ('original_name', models.CharField(help_text='File name the image was uploaded with', max_length=255)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Processing attempts made so far')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may be (re)processed')),
+                ('images', models.JSONField(blank=True, default=dict, help_text='Image URLs produced by the job')),
+                ('error', models.TextField(blank=True, help_text='Error from the last failed attempt')),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the job succeeded, failed or was superseded', null=True)),
+                ('recipe', models.ForeignKey(help_text='Recipe the image belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='image_jobs', to='recipes.recipe')),
+                ('requested_by', models.ForeignKey(blank=True, help_text='User who uploaded the image', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recipe_image_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'recipe image job',
+                'verbose_name_plural': 'recipe image jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='recipes_rec_status_132148_idx'), models.Index(fields=['recipe', '-created_at'], name='recipes_rec_recipe__9808e7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_recipeimagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeimagejob',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the raw upload', max_length=64),
+        ),
+    ]
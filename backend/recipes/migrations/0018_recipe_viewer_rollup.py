@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def backfill_viewer_rollups(apps, schema_editor):
+    """Roll up the raw views still kept from before the current watermark."""
+    from django.db.models import Count, Sum
+    from django.db.models.functions import Coalesce, TruncDay
+
+    RecipeView = apps.get_model('recipes', 'RecipeView')
+    RecipeViewerRollup = apps.get_model('recipes', 'RecipeViewerRollup')
+    RecipeViewRollupState = apps.get_model('recipes', 'RecipeViewRollupState')
+
+    state = RecipeViewRollupState.objects.filter(name='recipe_views').first()
+    if state is None:
+        return
+    rows = (
+        RecipeView.objects.filter(created_at__lt=state.rolled_up_to, user__isnull=False)
+        .annotate(bucket=TruncDay('created_at'))
+        .values('user_id', 'recipe_id', 'bucket')
+        .annotate(
+            views=Count('id'),
+            duration_sum=Coalesce(Sum('view_duration_seconds'), 0),
+            duration_count=Count('view_duration_seconds'),
+        )
+    )
+    RecipeViewerRollup.objects.bulk_create(
+        (
+            RecipeViewerRollup(
+                user_id=row['user_id'],
+                recipe_id=row['recipe_id'],
+                bucket_start=row['bucket'],
+                view_count=row['views'],
+                total_duration_seconds=row['duration_sum'],
+                duration_count=row['duration_count'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0017_recipeimagejob_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeViewerRollup',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last updated')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for this rollup', primary_key=True, serialize=False)),
+                ('bucket_start', models.DateTimeField(help_text='Start of the day (UTC)')),
+                ('view_count', models.PositiveIntegerField(default=0, help_text='Number of views on the day')),
+                ('total_duration_seconds', models.PositiveBigIntegerField(default=0, help_text='Sum of recorded view durations in seconds')),
+                ('duration_count', models.PositiveIntegerField(default=0, help_text='Number of views with a recorded duration')),
+                ('recipe', models.ForeignKey(help_text='Recipe that was viewed', on_delete=django.db.models.deletion.CASCADE, related_name='viewer_rollups', to='recipes.recipe')),
+                ('user', models.ForeignKey(help_text='User who viewed the recipe', on_delete=django.db.models.deletion.CASCADE, related_name='recipe_view_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'recipe viewer rollup',
+                'verbose_name_plural': 'recipe viewer rollups',
+                'ordering': ['-bucket_start'],
+                'indexes': [models.Index(fields=['user', 'bucket_start'], name='recipes_rec_user_id_784832_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipeviewerrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe', 'bucket_start'), name='unique_recipe_viewer_rollup_day'),
+        ),
+        migrations.RunPython(backfill_viewer_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0018_recipe_viewer_rollup'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='RecipeViewRollupState',
+            new_name='BatchJobState',
+        ),
+        migrations.RenameField(
+            model_name='batchjobstate',
+            old_name='rolled_up_to',
+            new_name='processed_until',
+        ),
+        migrations.AlterModelOptions(
+            name='batchjobstate',
+            options={'verbose_name': 'batch job state', 'verbose_name_plural': 'batch job states'},
+        ),
+        migrations.AlterField(
+            model_name='batchjobstate',
+            name='name',
+            field=models.CharField(help_text='Name of the batch job', max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='batchjobstate',
+            name='processed_until',
+            field=models.DateTimeField(help_text='Data recorded before this instant has been processed by the job'),
+        ),
+    ]
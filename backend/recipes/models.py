@@ -5,6 +5,7 @@ import uuid
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from core.models.base import BaseModel
@@ -633,3 +634,355 @@ class RecipeView(BaseModel):
         """Return string representation."""
         viewer = self.user.email if self.user else f"Anonymous ({self.ip_address})"
         return f"{viewer} viewed {self.recipe.title}"
+
+
+class RecipeViewRollup(BaseModel):
+    """Time-bucketed aggregate of recipe views, maintained from the raw view log."""
+
+    class Granularity(models.TextChoices):
+        HOUR = 'hour', _('Hour')
+        DAY = 'day', _('Day')
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this rollup")
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='view_rollups',
+        help_text=_("Recipe the views belong to")
+    )
+    granularity = models.CharField(
+        max_length=4,
+        choices=Granularity.choices,
+        help_text=_("Size of the time bucket")
+    )
+    bucket_start = models.DateTimeField(
+        help_text=_("Start of the time bucket (UTC)")
+    )
+
+    # Aggregates
+    view_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of views in the bucket")
+    )
+    unique_viewers = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Distinct viewers (user, or IP for anonymous) in the bucket, excluding the author")
+    )
+    total_duration_seconds = models.PositiveBigIntegerField(
+        default=0,
+        help_text=_("Sum of recorded view durations in seconds")
+    )
+    duration_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of views with a recorded duration")
+    )
+    duration_sketch = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text=_("Serialized DDSketch of recorded view durations")
+    )
+
+    class Meta:
+        verbose_name = _('recipe view rollup')
+        verbose_name_plural = _('recipe view rollups')
+        ordering = ['-bucket_start']
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'granularity', 'bucket_start'],
+                name='unique_recipe_view_rollup_bucket'
+            ),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.recipe_id} {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M}: {self.view_count} views"
+
+    @property
+    def average_view_duration(self):
+        """Average recorded view duration in seconds."""
+        if not self.duration_count:
+            return None
+        return self.total_duration_seconds / self.duration_count
+
+
+class RecipeViewerRollup(BaseModel):
+    """Daily views of one recipe by one signed-in user, kept after raw views are purged."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this rollup")
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recipe_view_rollups',
+        help_text=_("User who viewed the recipe")
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='viewer_rollups',
+        help_text=_("Recipe that was viewed")
+    )
+    bucket_start = models.DateTimeField(
+        help_text=_("Start of the day (UTC)")
+    )
+    view_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of views on the day")
+    )
+    total_duration_seconds = models.PositiveBigIntegerField(
+        default=0,
+        help_text=_("Sum of recorded view durations in seconds")
+    )
+    duration_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of views with a recorded duration")
+    )
+
+    class Meta:
+        verbose_name = _('recipe viewer rollup')
+        verbose_name_plural = _('recipe viewer rollups')
+        ordering = ['-bucket_start']
+        indexes = [
+            models.Index(fields=['user', 'bucket_start']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe', 'bucket_start'],
+                name='unique_recipe_viewer_rollup_day'
+            ),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.user_id} viewed {self.recipe_id} on {self.bucket_start:%Y-%m-%d}: {self.view_count} views"
+
+
+class BatchJobState(BaseModel):
+    """Watermark of an incremental batch job, such as view rollups or neighbor refreshes."""
+
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        help_text=_("Name of the batch job")
+    )
+    processed_until = models.DateTimeField(
+        help_text=_("Data recorded before this instant has been processed by the job")
+    )
+
+    class Meta:
+        verbose_name = _('batch job state')
+        verbose_name_plural = _('batch job states')
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.name}: {self.processed_until:%Y-%m-%d %H:%M}"
+
+
+class RecipeViewSketch(BaseModel):
+    """HyperLogLog sketch of the distinct viewers of a recipe on one day."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this sketch")
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='view_sketches',
+        help_text=_("Recipe the viewers belong to")
+    )
+    day = models.DateField(
+        help_text=_("Day (UTC) the sketch covers")
+    )
+    sketch = models.BinaryField(
+        help_text=_("Serialized HyperLogLog of viewers, excluding the author")
+    )
+
+    class Meta:
+        verbose_name = _('recipe view sketch')
+        verbose_name_plural = _('recipe view sketches')
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'day'],
+                name='unique_recipe_view_sketch_day'
+            ),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.recipe_id} {self.day:%Y-%m-%d} viewer sketch"
+
+
+class RecipeTrendingScore(BaseModel):
+    """Exponentially time-decayed engagement score used to rank trending recipes."""
+
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        help_text=_("Recipe the score belongs to")
+    )
+    score = models.FloatField(
+        help_text=_("log2 of the decayed score, expressed relative to the trending epoch")
+    )
+    last_event_at = models.DateTimeField(
+        help_text=_("Time of the most recent engagement event")
+    )
+
+    class Meta:
+        verbose_name = _('recipe trending score')
+        verbose_name_plural = _('recipe trending scores')
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['-score']),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.recipe_id}: {self.score:.3f}"
+
+
+class RecipeNeighbor(BaseModel):
+    """Precomputed item-to-item similarity between two recipes."""
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='neighbors',
+        help_text=_("Recipe the neighbor list belongs to")
+    )
+    neighbor = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='neighbor_of',
+        help_text=_("Similar recipe")
+    )
+    score = models.FloatField(
+        help_text=_("Cosine similarity of the recipes' user interactions")
+    )
+    rank = models.PositiveSmallIntegerField(
+        help_text=_("Position in the recipe's neighbor list (0 is most similar)")
+    )
+
+    class Meta:
+        verbose_name = _('recipe neighbor')
+        verbose_name_plural = _('recipe neighbors')
+        ordering = ['recipe', 'rank']
+        indexes = [
+            models.Index(fields=['recipe', 'rank']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recipe', 'neighbor'],
+                name='unique_recipe_neighbor'
+            ),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.recipe_id} ~ {self.neighbor_id}: {self.score:.3f}"
+
+
+class RecipeImageJob(BaseModel):
+    """Background job turning an uploaded recipe image into stored variants."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        PROCESSING = 'processing', _('Processing')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        SUPERSEDED = 'superseded', _('Superseded')
+        FAILED = 'failed', _('Failed')
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text=_("Unique identifier for this job")
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        help_text=_("Recipe the image belongs to")
+    )
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recipe_image_jobs',
+        help_text=_("User who uploaded the image")
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text=_("Processing status")
+    )
+    source_path = models.CharField(
+        max_length=500,
+        help_text=_("Storage path of the raw upload")
+    )
+    original_name = models.CharField(
+        max_length=255,
+        help_text=_("File name the image was uploaded with")
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text=_("SHA-256 of the raw upload")
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=_("Processing attempts made so far")
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_("Earliest time the job may be (re)processed")
+    )
+    images = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_("Image URLs produced by the job")
+    )
+    error = models.TextField(
+        blank=True,
+        help_text=_("Error from the last failed attempt")
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the job succeeded, failed or was superseded")
+    )
+
+    class Meta:
+        verbose_name = _('recipe image job')
+        verbose_name_plural = _('recipe image jobs')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['recipe', '-created_at']),
+        ]
+
+    def __str__(self):
+        """Return string representation."""
+        return f"{self.recipe_id}: {self.original_name} ({self.status})"
@@ -6,6 +6,65 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 
 from .models import Recipe, Category, Rating, UserFavorite, RecipeView
 from core.services.service_wrapper import service_wrapper
+from core.services.image_resize_service import image_resize_service
+from core.services.storage_service import IMAGE_FORMATS
+
+# Widest responsive variant offered for recipe cards (list and search results)
+LIST_IMAGE_MAX_WIDTH = 640
+
+
+def serialize_primary_image(recipe, url, storage_service, max_width=None, request=None):
+    """
+    Serialize a recipe's image in the format expected by frontend.
+    
+    ``sources`` lists the responsive variants as ``<picture>`` sources, most
+    compact format first, each with a ``srcset`` of width descriptors. Widths
+    between the eagerly rendered variants are filled in with signed on-demand
+    resize URLs of the original. The placeholder, dominant color and
+    dimensions let clients reserve space and paint a preview before the image
+    loads.
+    
+    Args:
+        recipe: Recipe instance with images
+        url: Fallback URL for ``<img src>``
+        storage_service: Storage service used to absolutize URLs, if available
+        max_width: Leave out variants wider than this
+        request: Request used to absolutize resize URLs, if available
+    """
+    absolute = storage_service._ensure_absolute_url if storage_service else (lambda value: value)
+    absolute_api = request.build_absolute_uri if request else (lambda value: value)
+    variants = recipe.images.get('variants', [])
+    original = recipe.images.get('original')
+    resized = image_resize_service.signed_variants(original, max_width) if original else {}
+    sources = []
+    for image_format, (_, _, mime_type) in IMAGE_FORMATS.items():
+        candidates = sorted(
+            (variant for variant in variants if variant['format'] == image_format),
+            key=lambda variant: variant['width'],
+        )
+        if max_width is not None:
+            candidates = [variant for variant in candidates if variant['width'] <= max_width] or candidates[:1]
+        srcset = {variant['width']: absolute(variant['url']) for variant in candidates}
+        for width, resize_url in resized.get(image_format, {}).items():
+            srcset.setdefault(width, absolute_api(resize_url))
+        if srcset:
+            sources.append({
+                'type': mime_type,
+                'srcset': ', '.join(f"{srcset[width]} {width}w" for width in sorted(srcset)),
+            })
+    return {
+        'id': 1,
+        'image': absolute(url),
+        'alt_text': recipe.title,
+        'is_primary': True,
+        'ordering': 0,
+        'width': recipe.images.get('width'),
+        'height': recipe.images.get('height'),
+        'aspect_ratio': recipe.images.get('aspect_ratio'),
+        'placeholder': recipe.images.get('placeholder'),
+        'dominant_color': recipe.images.get('dominant_color'),
+        'sources': sources,
+    }
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -425,30 +484,9 @@ class RecipeSerializer(serializers.ModelSerializer):
             storage_service = service_wrapper._get_service('storage_service')
             # Convert stored image URLs to frontend-expected format
             images = []
-            if 'original' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['original']) if storage_service else obj.images['original'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
-            elif 'large' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['large']) if storage_service else obj.images['large'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
-            elif 'medium' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['medium']) if storage_service else obj.images['medium'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
+            url = obj.images.get('original') or obj.images.get('large') or obj.images.get('medium')
+            if url:
+                images.append(serialize_primary_image(obj, url, storage_service, request=self.context.get('request')))
             return images
         return []
 
@@ -506,23 +544,12 @@ class RecipeListSerializer(serializers.ModelSerializer):
             storage_service = service_wrapper._get_service('storage_service')
             # Convert stored image URLs to frontend-expected format
             images = []
-            # Use thumbnail for list view for better performance
-            if 'thumbnail' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['thumbnail']) if storage_service else obj.images['thumbnail'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
-            elif 'medium' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['medium']) if storage_service else obj.images['medium'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
+            # Cards get the medium thumbnail and variants no wider than they need
+            if 'medium' in obj.images:
+                images.append(serialize_primary_image(
+                    obj, obj.images['medium'], storage_service, max_width=LIST_IMAGE_MAX_WIDTH,
+                    request=self.context.get('request'),
+                ))
             return images
         return [] 
 
@@ -744,23 +771,12 @@ class SearchResultSerializer(serializers.ModelSerializer):
             storage_service = service_wrapper._get_service('storage_service')
             # Convert stored image URLs to frontend-expected format
             images = []
-            # Use thumbnail for list view for better performance
-            if 'thumbnail' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['thumbnail']) if storage_service else obj.images['thumbnail'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
-            elif 'medium' in obj.images:
-                images.append({
-                    'id': 1,
-                    'image': storage_service._ensure_absolute_url(obj.images['medium']) if storage_service else obj.images['medium'],
-                    'alt_text': obj.title,
-                    'is_primary': True,
-                    'ordering': 0
-                })
+            # Cards get the medium thumbnail and variants no wider than they need
+            if 'medium' in obj.images:
+                images.append(serialize_primary_image(
+                    obj, obj.images['medium'], storage_service, max_width=LIST_IMAGE_MAX_WIDTH,
+                    request=self.context.get('request'),
+                ))
             return images
         return []
 
@@ -0,0 +1,251 @@
+"""
+End-to-end benchmarks of the read endpoints with budgets.
+
+Each scenario is one request sent through the whole stack (URL routing,
+middleware, authentication, views and serializers) with the test client,
+against a dataset from the dataset generator. A scenario is warmed up
+once, then ``ITERATIONS`` timed requests give its p50/p95/p99 latency, and
+one more request is repeated with query capture and ``tracemalloc`` for
+its query count and peak allocated memory. Tracing slows Python down
+several times, so it is kept out of the timings.
+
+Results are compared with a baseline JSON file holding one entry per
+dataset name. A scenario exceeds its budget when a latency percentile
+grows beyond ``LATENCY_TOLERANCE`` (plus ``LATENCY_SLACK_MS``), peak memory
+beyond ``MEMORY_TOLERANCE``, or it issues more queries than the baseline
+plus ``QUERY_TOLERANCE``. Latency baselines only hold for the machine and
+database they were recorded on; query counts hold everywhere.
+
+Requests run without the debug toolbar, throttling or ``DEBUG`` query
+logging, and with a private in-memory cache that is cleared before each
+request unless the cache is kept warm.
+"""
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from .dataset_generator import DATASET_EMAIL_DOMAIN, DatasetGenerator
+
+User = get_user_model()
+
+# Outside INTERNAL_IPS, so nothing treats the benchmark as a developer
+CLIENT_ADDRESS = '198.51.100.7'
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: str
+    data: Optional[dict] = None
+    admin: bool = False
+
+
+SCENARIOS = [
+    Scenario('recipes.list', 'get', '/api/v1/recipes/?page=1&page_size=20'),
+    Scenario('recipes.search', 'get', '/api/v1/recipes/search/?q=chicken&page_size=20'),
+    Scenario('recipes.advanced_search', 'post', '/api/v1/recipes/advanced-search/', {
+        'query': 'curry', 'max_total_time': 120, 'order_by': 'rating', 'page_size': 20,
+    }),
+    Scenario('recipes.search_suggestions', 'get', '/api/v1/recipes/search-suggestions/?q=ch'),
+    Scenario('categories.tree', 'get', '/api/v1/recipes/categories/tree/'),
+    Scenario('admin.analytics', 'get', '/api/v1/admin/analytics/?period=30d', admin=True),
+    Scenario('admin.statistics', 'get', '/api/v1/admin/statistics/', admin=True),
+]
+
+
+@contextmanager
+def benchmark_environment():
+    """Settings under which requests measure the application rather than the tooling around it."""
+    with override_settings(
+        DEBUG=False,
+        MIDDLEWARE=[name for name in settings.MIDDLEWARE if not name.startswith('debug_toolbar.')],
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        THROTTLE_BUCKETS={},
+        CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'api-benchmarks',
+        }},
+    ):
+        yield
+
+
+class ApiBenchmark:
+    """Runs the benchmark scenarios and checks them against a baseline."""
+
+    def __init__(self, iterations: Optional[int] = None, warm_cache: bool = False):
+        config = getattr(settings, 'API_BENCHMARKS', {})
+        self.iterations = iterations or config.get('ITERATIONS', 30)
+        self.warm_cache = warm_cache
+        self.baseline_path = config.get(
+            'BASELINE_PATH', os.path.join(settings.BASE_DIR, 'benchmarks', 'api_baseline.json'),
+        )
+        self.latency_tolerance = config.get('LATENCY_TOLERANCE', {'p50_ms': 0.5, 'p95_ms': 0.75, 'p99_ms': 1.0})
+        self.latency_slack_ms = config.get('LATENCY_SLACK_MS', 5)
+        self.memory_tolerance = config.get('MEMORY_TOLERANCE', 0.25)
+        self.query_tolerance = config.get('QUERY_TOLERANCE', 0)
+        self.seed = config.get('SEED', 42)
+        self.datasets = config.get('DATASETS', {})
+
+    # Datasets
+
+    def dataset_sizes(self, dataset: str) -> Dict[str, int]:
+        if dataset not in self.datasets:
+            raise ValueError(f"Unknown dataset '{dataset}'; expected one of {', '.join(self.datasets)}")
+        return self.datasets[dataset]
+
+    def prepare_dataset(self, dataset: str, progress=None) -> Dict[str, int]:
+        """
+        Replace rows generated with the benchmark seed by the named dataset.
+
+        Returns:
+            Number of rows inserted per kind
+        """
+        generator = DatasetGenerator(seed=self.seed, progress=progress, **self.dataset_sizes(dataset))
+        generator.clear()
+        return generator.generate()
+
+    # Measurement
+
+    def run(self, scenarios: Optional[List[Scenario]] = None) -> Dict[str, Dict]:
+        """
+        Measure each scenario.
+
+        Returns:
+            Dictionary mapping scenario names to their ``status``,
+            ``p50_ms``, ``p95_ms``, ``p99_ms``, ``queries`` and ``peak_kib``
+        """
+        results = {}
+        with benchmark_environment():
+            anonymous = APIClient(REMOTE_ADDR=CLIENT_ADDRESS)
+            admin = APIClient(REMOTE_ADDR=CLIENT_ADDRESS)
+            admin.force_authenticate(self.admin_user())
+            for scenario in scenarios or SCENARIOS:
+                results[scenario.name] = self.measure(scenario, admin if scenario.admin else anonymous)
+        return results
+
+    def admin_user(self):
+        """Staff user for the admin scenarios, removed along with the generated dataset."""
+        username = f'{DatasetGenerator(seed=self.seed).username_prefix}admin'
+        user, _ = User.objects.get_or_create(
+            username=username,
+            defaults={'email': f'{username}@{DATASET_EMAIL_DOMAIN}', 'is_staff': True},
+        )
+        return user
+
+    def measure(self, scenario: Scenario, client: APIClient) -> Dict:
+        status = self._send(scenario, client)  # Warm-up: imports, lazy services, connections
+
+        timings = []
+        for _ in range(self.iterations):
+            if not self.warm_cache:
+                cache.clear()
+            started = time.perf_counter()
+            self._send(scenario, client)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        if not self.warm_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            tracemalloc.start()
+            try:
+                self._send(scenario, client)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        # Percentiles interpolate between the timed requests
+        cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        return {
+            'status': status,
+            'p50_ms': round(cuts[49], 2),
+            'p95_ms': round(cuts[94], 2),
+            'p99_ms': round(cuts[98], 2),
+            'queries': len(queries),
+            'peak_kib': round(peak / 1024),
+        }
+
+    def _send(self, scenario: Scenario, client: APIClient) -> int:
+        if scenario.data is not None:
+            response = getattr(client, scenario.method)(scenario.path, scenario.data, format='json')
+        else:
+            response = getattr(client, scenario.method)(scenario.path)
+        return response.status_code
+
+    # Budgets
+
+    def compare(self, results: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[str]:
+        """
+        Check results against baseline results.
+
+        Returns:
+            One message per failed request or exceeded budget; scenarios
+            missing from the baseline are only checked for failures
+        """
+        violations = []
+        for name, result in results.items():
+            if not 200 <= result['status'] < 300:
+                violations.append(f"{name}: returned HTTP {result['status']}")
+            expected = baseline.get(name)
+            if expected is None:
+                continue
+            for metric, tolerance in self.latency_tolerance.items():
+                budget = expected[metric] * (1 + tolerance) + self.latency_slack_ms
+                if result[metric] > budget:
+                    violations.append(
+                        f"{name}: {metric} {result[metric]:.1f} over budget {budget:.1f} "
+                        f"(baseline {expected[metric]:.1f})"
+                    )
+            budget = expected['queries'] + self.query_tolerance
+            if result['queries'] > budget:
+                violations.append(f"{name}: {result['queries']} queries over budget {budget}")
+            budget = expected['peak_kib'] * (1 + self.memory_tolerance)
+            if result['peak_kib'] > budget:
+                violations.append(
+                    f"{name}: peak memory {result['peak_kib']} KiB over budget {budget:.0f} KiB "
+                    f"(baseline {expected['peak_kib']} KiB)"
+                )
+        return violations
+
+    def load_baseline(self, dataset: str) -> Dict[str, Dict]:
+        """Baseline results of a dataset; empty if none were recorded."""
+        try:
+            with open(self.baseline_path) as baseline_file:
+                baselines = json.load(baseline_file)
+        except FileNotFoundError:
+            return {}
+        return baselines.get(dataset, {}).get('results', {})
+
+    def save_baseline(self, dataset: str, results: Dict[str, Dict]) -> None:
+        """Record results as the baseline of a dataset, keeping those of other datasets."""
+        try:
+            with open(self.baseline_path) as baseline_file:
+                baselines = json.load(baseline_file)
+        except FileNotFoundError:
+            baselines = {}
+        baselines[dataset] = {
+            'environment': {
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'iterations': self.iterations,
+                'warm_cache': self.warm_cache,
+            },
+            'dataset': self.dataset_sizes(dataset),
+            'results': results,
+        }
+        os.makedirs(os.path.dirname(self.baseline_path), exist_ok=True)
+        with open(self.baseline_path, 'w') as baseline_file:
+            json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
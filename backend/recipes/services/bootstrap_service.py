@@ -0,0 +1,192 @@
+"""
+Aggregated payload for the app's first screen.
+
+The bootstrap response bundles the sections the frontend otherwise fetches
+one by one: latest recipes, the category tree, popular searches and trending
+recipes. Every section is cached under its own key with its own TTL and is
+invalidated by its own signals, so a change to one section never forces the
+others to be recomputed.
+
+Cached sections are fetched with a single ``get_many``; only the missing ones
+are rebuilt, concurrently. Section payloads are serialized without a request,
+so per-user fields (``is_favorited``) are overlaid afterwards with one query.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Avg, Count, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Category, Recipe, UserFavorite
+from ..serializers import CategoryTreeSerializer, RecipeListSerializer
+from .search_service import search_service
+from .trending_service import trending_service
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_CACHE_PREFIX = 'bootstrap'
+
+
+class BootstrapService:
+    """Service assembling independently cached bootstrap sections."""
+
+    LATEST_RECIPES = 'latest_recipes'
+    CATEGORIES = 'categories'
+    POPULAR_SEARCHES = 'popular_searches'
+    TRENDING = 'trending'
+
+    SECTIONS = (LATEST_RECIPES, CATEGORIES, POPULAR_SEARCHES, TRENDING)
+    RECIPE_SECTIONS = (LATEST_RECIPES, TRENDING)
+
+    def __init__(self):
+        config = getattr(settings, 'BOOTSTRAP', {})
+        self.max_workers = config.get('MAX_WORKERS', 4)
+        self.ttls = {
+            self.LATEST_RECIPES: 300,
+            self.CATEGORIES: 3600,
+            self.POPULAR_SEARCHES: 3600,
+            self.TRENDING: 300,
+            **config.get('TTL_SECONDS', {}),
+        }
+        self.limits = {
+            self.LATEST_RECIPES: 12,
+            self.POPULAR_SEARCHES: 10,
+            self.TRENDING: 12,
+            **config.get('LIMITS', {}),
+        }
+        self._builders = {
+            self.LATEST_RECIPES: self._build_latest_recipes,
+            self.CATEGORIES: self._build_categories,
+            self.POPULAR_SEARCHES: self._build_popular_searches,
+            self.TRENDING: self._build_trending,
+        }
+
+    @staticmethod
+    def cache_key(section: str) -> str:
+        return f'{BOOTSTRAP_CACHE_PREFIX}:{section}'
+
+    # Section builders
+
+    def _visible_recipes(self):
+        return Recipe.objects.filter(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED)
+
+    def _build_latest_recipes(self) -> List[Dict[str, Any]]:
+        recipes = (
+            self._visible_recipes()
+            .select_related('author')
+            .prefetch_related('categories')
+            .annotate(
+                _avg_rating_sort=Coalesce(Avg('ratings__rating'), Value(0.0)),
+                _rating_count_sort=Count('ratings'),
+            )
+            .order_by('-created_at')[:self.limits[self.LATEST_RECIPES]]
+        )
+        return RecipeListSerializer(recipes, many=True).data
+
+    def _build_categories(self) -> List[Dict[str, Any]]:
+        roots = Category.objects.filter(parent=None, is_active=True).order_by('order', 'name')
+        return CategoryTreeSerializer(roots, many=True).data
+
+    def _build_popular_searches(self) -> List[str]:
+        return search_service.get_popular_searches(self.limits[self.POPULAR_SEARCHES])
+
+    def _build_trending(self) -> List[Dict[str, Any]]:
+        recipes = list(trending_service.get_trending()[:self.limits[self.TRENDING]])
+        results = RecipeListSerializer(recipes, many=True).data
+        for item, recipe in zip(results, recipes):
+            item['trending_score'] = round(trending_service.decayed_score(recipe.trending.score), 4)
+        return results
+
+    def build_section(self, section: str) -> Any:
+        """Compute a section and cache it with its TTL."""
+        data = self._builders[section]()
+        cache.set(self.cache_key(section), data, self.ttls[section])
+        return data
+
+    def _build_in_worker(self, section: str) -> Any:
+        try:
+            return self.build_section(section)
+        finally:
+            close_old_connections()
+
+    # Invalidation
+
+    def invalidate(self, *sections: str) -> None:
+        """Drop cached sections so the next request rebuilds only those."""
+        cache.delete_many([self.cache_key(section) for section in sections or self.SECTIONS])
+
+    # Serving
+
+    def get_sections(self, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Return the requested sections, rebuilding the missing ones concurrently.
+
+        Returns:
+            ``{'sections': {name: data}, 'cache': {name: 'hit'|'miss'}, 'errors': [name]}``
+        """
+        sections = [section for section in (sections or self.SECTIONS) if section in self._builders]
+        cached = cache.get_many([self.cache_key(section) for section in sections])
+
+        result = {'sections': {}, 'cache': {}, 'errors': []}
+        missing = []
+        for section in sections:
+            key = self.cache_key(section)
+            if key in cached:
+                result['sections'][section] = cached[key]
+                result['cache'][section] = 'hit'
+            else:
+                missing.append(section)
+                result['cache'][section] = 'miss'
+
+        built = {}
+        if len(missing) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)),
+                                    thread_name_prefix='bootstrap') as executor:
+                futures = {section: executor.submit(self._build_in_worker, section) for section in missing}
+                for section, future in futures.items():
+                    try:
+                        built[section] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error building bootstrap section {section}: {e}")
+        else:
+            for section in missing:
+                try:
+                    built[section] = self.build_section(section)
+                except Exception as e:
+                    logger.error(f"Error building bootstrap section {section}: {e}")
+
+        for section in missing:
+            if section in built:
+                result['sections'][section] = built[section]
+            else:
+                # A failing section is reported, not allowed to fail the response
+                result['sections'][section] = None
+                result['errors'].append(section)
+        return result
+
+    def personalize(self, sections: Dict[str, Any], user) -> Dict[str, Any]:
+        """Overlay ``is_favorited`` on cached recipe sections with a single query."""
+        recipe_sections = [
+            sections[name] for name in self.RECIPE_SECTIONS if isinstance(sections.get(name), list)
+        ]
+        recipe_ids = {item['id'] for items in recipe_sections for item in items}
+        favorited = set()
+        if user is not None and recipe_ids:
+            favorited = {
+                str(recipe_id) for recipe_id in
+                UserFavorite.objects.filter(user=user, recipe_id__in=recipe_ids).values_list('recipe_id', flat=True)
+            }
+        for name in self.RECIPE_SECTIONS:
+            if isinstance(sections.get(name), list):
+                sections[name] = [
+                    {**item, 'is_favorited': str(item['id']) in favorited} for item in sections[name]
+                ]
+        return sections
+
+
+# Service instance
+bootstrap_service = BootstrapService()
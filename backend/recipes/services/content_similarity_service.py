@@ -0,0 +1,322 @@
+"""
+Content-based recipe similarity over ingredients, tags and categories.
+
+Each recipe is vectorized into hashed term counts (feature hashing over
+cleaned ingredient names, tags and category IDs). The counts, document
+frequencies and recipe IDs live in ``.npy`` files that every worker opens
+memory-mapped, so the index is shared through the page cache instead of being
+loaded per process.
+
+TF-IDF weighting is applied at query time from the stored document
+frequencies. A saved recipe therefore only rewrites its own row and the
+frequency counters, once its transaction commits and under a file lock, and
+never invalidates other rows.
+Nearest neighbors are found by scoring the index in blocks with dense NumPy
+products, which bounds memory regardless of catalog size.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.file_lock import file_lock
+from ..models import Recipe
+from .search_service import search_service
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = 'vectors.npy'
+IDS_FILE = 'ids.npy'
+DF_FILE = 'df.npy'
+META_FILE = 'meta.npy'
+LOCK_FILE = '.lock'
+
+# meta.npy slots
+META_ROWS = 0
+META_DOCUMENTS = 1
+
+_EMPTY_ID = np.zeros(16, dtype=np.uint8)
+
+
+class ContentSimilarityService:
+    """Service maintaining a memory-mapped TF-IDF index of recipe content."""
+
+    def __init__(self):
+        config = getattr(settings, 'CONTENT_SIMILARITY', {})
+        self.index_dir = config.get('INDEX_DIR', os.path.join(settings.BASE_DIR, 'var', 'content_index'))
+        self.dimensions = config.get('DIMENSIONS', 2048)
+        self.initial_capacity = config.get('INITIAL_CAPACITY', 1024)
+        self.block_size = config.get('BLOCK_SIZE', 4096)
+        self.update_on_save = config.get('UPDATE_ON_SAVE', True)
+        self._open_lock = threading.Lock()
+        self._pending = threading.local()
+        self._arrays = None
+        self._inodes = None
+
+    # Vectorization
+
+    def features(self, recipe: Recipe) -> Counter:
+        """Term counts of a recipe's cleaned ingredients, tags and categories."""
+        terms = Counter()
+        for ingredient in recipe.ingredients or []:
+            name = ingredient.get('name', '') if isinstance(ingredient, dict) else ingredient
+            if isinstance(name, str):
+                cleaned = search_service._clean_ingredient_name(name).lower()
+                if cleaned:
+                    terms[f'ingredient:{cleaned}'] += 1
+        for tag in recipe.tags or []:
+            if isinstance(tag, str) and tag.strip():
+                terms[f'tag:{tag.strip().lower()}'] += 1
+        for category in recipe.categories.all():
+            terms[f'category:{category.id}'] += 1
+        return terms
+
+    def vectorize(self, recipe: Recipe) -> np.ndarray:
+        """Hash a recipe's terms into a fixed-size count vector."""
+        vector = np.zeros(self.dimensions, dtype=np.uint8)
+        for term, count in self.features(recipe).items():
+            digest = hashlib.blake2b(term.encode('utf-8'), digest_size=4).digest()
+            index = int.from_bytes(digest, 'big') % self.dimensions
+            vector[index] = min(int(vector[index]) + count, 255)
+        return vector
+
+    # Index files
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _write_lock(self):
+        """Serialize writers across processes."""
+        return file_lock(self._path(LOCK_FILE))
+
+    def _create_files(self, directory: str, capacity: int):
+        """Create empty index files in ``directory`` and return them opened for writing."""
+        open_memmap = np.lib.format.open_memmap
+        vectors = open_memmap(os.path.join(directory, VECTORS_FILE), mode='w+', dtype=np.uint8,
+                              shape=(capacity, self.dimensions))
+        ids = open_memmap(os.path.join(directory, IDS_FILE), mode='w+', dtype=np.uint8, shape=(capacity, 16))
+        df = open_memmap(os.path.join(directory, DF_FILE), mode='w+', dtype=np.int64, shape=(self.dimensions,))
+        meta = open_memmap(os.path.join(directory, META_FILE), mode='w+', dtype=np.int64, shape=(2,))
+        return vectors, ids, df, meta
+
+    def _open_for_write(self):
+        """Open the index read-write, creating it if needed (caller holds the write lock)."""
+        if not os.path.exists(self._path(META_FILE)):
+            os.makedirs(self.index_dir, exist_ok=True)
+            return self._create_files(self.index_dir, self.initial_capacity)
+        return tuple(np.load(self._path(name), mmap_mode='r+') for name in (VECTORS_FILE, IDS_FILE, DF_FILE, META_FILE))
+
+    def _open_for_read(self):
+        """Return read-only memory maps, reopening them if a writer replaced the files."""
+        try:
+            inodes = tuple(os.stat(self._path(name)).st_ino for name in (VECTORS_FILE, IDS_FILE, DF_FILE, META_FILE))
+        except FileNotFoundError:
+            return None
+        with self._open_lock:
+            if self._arrays is None or self._inodes != inodes:
+                self._arrays = tuple(
+                    np.load(self._path(name), mmap_mode='r') for name in (VECTORS_FILE, IDS_FILE, DF_FILE, META_FILE)
+                )
+                self._inodes = inodes
+            return self._arrays
+
+    def _grow(self, vectors, ids, df, meta):
+        """Double the index capacity by writing new files and swapping them in."""
+        rows = int(meta[META_ROWS])
+        with tempfile.TemporaryDirectory(dir=self.index_dir) as staging:
+            new = self._create_files(staging, max(len(ids) * 2, self.initial_capacity))
+            new[0][:rows] = vectors[:rows]
+            new[1][:rows] = ids[:rows]
+            new[2][:] = df
+            new[3][:] = meta
+            for array in new:
+                array.flush()
+            del new
+            for name in (VECTORS_FILE, IDS_FILE, DF_FILE, META_FILE):
+                os.replace(os.path.join(staging, name), self._path(name))
+        return self._open_for_write()
+
+    @staticmethod
+    def _find_row(ids, rows: int, key: np.ndarray) -> Optional[int]:
+        matches = np.flatnonzero((ids[:rows] == key).all(axis=1))
+        return int(matches[0]) if len(matches) else None
+
+    # Maintenance
+
+    def update_recipe(self, recipe: Recipe) -> None:
+        """Index a saved recipe, or drop it when it is no longer published."""
+        if not recipe.is_published:
+            self.remove_recipe(recipe.pk)
+            return
+        vector = self.vectorize(recipe)
+        key = np.frombuffer(uuid.UUID(str(recipe.pk)).bytes, dtype=np.uint8)
+
+        with self._write_lock():
+            vectors, ids, df, meta = self._open_for_write()
+            rows = int(meta[META_ROWS])
+            row = self._find_row(ids, rows, key)
+            if row is not None:
+                df -= vectors[row] > 0
+            else:
+                row = self._find_row(ids, rows, _EMPTY_ID)
+                if row is None:
+                    if rows == len(ids):
+                        vectors, ids, df, meta = self._grow(vectors, ids, df, meta)
+                    row = rows
+                    meta[META_ROWS] = rows + 1
+                meta[META_DOCUMENTS] += 1
+            vectors[row] = vector
+            ids[row] = key
+            df += vector > 0
+            for array in (vectors, ids, df, meta):
+                array.flush()
+
+    def schedule_update(self, recipe_id) -> None:
+        """
+        Re-index a recipe once the current transaction commits.
+
+        Saves and category changes within one transaction are coalesced into
+        a single update, and rolled back changes never reach the index.
+        """
+        pending = getattr(self._pending, 'ids', None)
+        if pending is None:
+            pending = self._pending.ids = set()
+        pending.add(recipe_id)
+        transaction.on_commit(lambda: self._apply_pending(recipe_id))
+
+    def _apply_pending(self, recipe_id) -> None:
+        pending = self._pending.ids
+        if recipe_id not in pending:
+            return
+        pending.discard(recipe_id)
+        try:
+            recipe = Recipe.objects.filter(pk=recipe_id).first()
+            if recipe is None:
+                self.remove_recipe(recipe_id)
+            else:
+                self.update_recipe(recipe)
+        except Exception as e:
+            logger.error(f"Error updating content index for recipe {recipe_id}: {e}")
+
+    def remove_recipe(self, recipe_id) -> None:
+        """Remove a recipe from the index, leaving its row free for reuse."""
+        if not os.path.exists(self._path(META_FILE)):
+            return
+        key = np.frombuffer(uuid.UUID(str(recipe_id)).bytes, dtype=np.uint8)
+        with self._write_lock():
+            vectors, ids, df, meta = self._open_for_write()
+            row = self._find_row(ids, int(meta[META_ROWS]), key)
+            if row is None:
+                return
+            df -= vectors[row] > 0
+            vectors[row] = 0
+            ids[row] = _EMPTY_ID
+            meta[META_DOCUMENTS] -= 1
+            for array in (vectors, ids, df, meta):
+                array.flush()
+
+    def rebuild(self, recipes: Optional[Iterable[Recipe]] = None) -> int:
+        """
+        Rebuild the whole index from published recipes and swap it in.
+
+        Returns:
+            Number of indexed recipes
+        """
+        if recipes is None:
+            recipes = Recipe.objects.filter(is_published=True).prefetch_related('categories')
+        recipes = list(recipes)
+        os.makedirs(self.index_dir, exist_ok=True)
+        with self._write_lock(), tempfile.TemporaryDirectory(dir=self.index_dir) as staging:
+            vectors, ids, df, meta = self._create_files(staging, max(len(recipes), self.initial_capacity))
+            for row, recipe in enumerate(recipes):
+                vectors[row] = self.vectorize(recipe)
+                ids[row] = np.frombuffer(uuid.UUID(str(recipe.pk)).bytes, dtype=np.uint8)
+            df[:] = (vectors[:len(recipes)] > 0).sum(axis=0)
+            meta[META_ROWS] = len(recipes)
+            meta[META_DOCUMENTS] = len(recipes)
+            for array in (vectors, ids, df, meta):
+                array.flush()
+            del vectors, ids, df, meta
+            for name in (VECTORS_FILE, IDS_FILE, DF_FILE, META_FILE):
+                os.replace(os.path.join(staging, name), self._path(name))
+        logger.info(f"Rebuilt content similarity index with {len(recipes)} recipes")
+        return len(recipes)
+
+    def clear(self) -> None:
+        """Delete the index files."""
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+        with self._open_lock:
+            self._arrays = None
+            self._inodes = None
+
+    # Queries
+
+    def similar(self, recipe_id, limit: int = 10, exclude: Iterable = ()) -> List[Tuple[str, float]]:
+        """
+        Recipes with the most similar content, as ``(recipe_id, cosine)`` pairs.
+
+        Args:
+            recipe_id: Recipe to find neighbors for
+            limit: Maximum number of neighbors
+            exclude: Recipe IDs to leave out of the results
+        """
+        arrays = self._open_for_read()
+        if arrays is None:
+            return []
+        vectors, ids, df, meta = arrays
+        rows = min(int(meta[META_ROWS]), len(ids), len(vectors))
+        key = np.frombuffer(uuid.UUID(str(recipe_id)).bytes, dtype=np.uint8)
+        row = self._find_row(ids, rows, key)
+        if row is None:
+            return []
+
+        documents = max(int(meta[META_DOCUMENTS]), 1)
+        idf = (np.log((1 + documents) / (1 + df.astype(np.float32))) + 1).astype(np.float32)
+        query = vectors[row].astype(np.float32) * idf
+        query_norm = np.linalg.norm(query)
+        if not query_norm:
+            return []
+        query /= query_norm
+
+        excluded = {uuid.UUID(str(value)).bytes for value in exclude}
+        excluded.add(key.tobytes())
+        wanted = limit + len(excluded)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, rows, self.block_size):
+            block = vectors[start:start + self.block_size].astype(np.float32) * idf
+            norms = np.linalg.norm(block, axis=1)
+            scores = (block @ query) / np.where(norms > 0, norms, 1)
+            if len(scores) > wanted:
+                top = np.argpartition(-scores, wanted)[:wanted]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+
+        results = []
+        for i in np.argsort(-best_scores, kind='stable'):
+            score = float(best_scores[i])
+            if score <= 0:
+                break
+            candidate = ids[best_rows[i]].tobytes()
+            if candidate in excluded or candidate == _EMPTY_ID.tobytes():
+                continue
+            results.append((str(uuid.UUID(bytes=candidate)), round(score, 6)))
+            if len(results) == limit:
+                break
+        return results
+
+
+# Service instance
+content_similarity_service = ContentSimilarityService()
@@ -0,0 +1,519 @@
+"""
+Synthetic dataset generation for load and benchmark work.
+
+Generates users, a category tree, recipes (with their category links),
+ratings, favorites and views at arbitrary scale. Activity is Zipfian, as in
+production: a few recipes draw most views, ratings and favorites, and a few
+users and authors account for most of the activity.
+
+Everything is derived from the seed: each kind of row has its own random
+stream, and primary keys are built from a seeded prefix and the row's
+index, so the same seed always yields the same rows (timestamps are
+relative to the time of the run) and ids never have to be kept in memory.
+
+Rows are generated as plain tuples and inserted in batches, one
+transaction per batch, with a single prepared statement per batch on
+SQLite (``executemany``) and multi-row ``INSERT`` statements elsewhere.
+Building model instances and compiling ``bulk_create`` SQL costs several
+times more than generating the rows, which matters at tens of millions of
+rows; columns a batch does not set get their model field defaults.
+"""
+import bisect
+import math
+import random
+import socket
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from ..models import Category, Rating, Recipe, RecipeView, UserFavorite
+
+User = get_user_model()
+
+# Generated users share this password, so load tests can log in as any of them
+DATASET_PASSWORD = 'dataset-password'
+DATASET_EMAIL_DOMAIN = 'dataset.example.com'
+
+ADJECTIVES = [
+    'Classic', 'Crispy', 'Creamy', 'Spicy', 'Smoky', 'Rustic', 'Zesty', 'Hearty', 'Golden', 'Tangy',
+    'Herbed', 'Roasted', 'Grilled', 'Slow-Cooked', 'Quick', 'Honey-Glazed', 'Garlic', 'Lemon', 'Sticky', 'Fresh',
+]
+INGREDIENTS = [
+    'Chicken', 'Beef', 'Salmon', 'Shrimp', 'Tofu', 'Mushroom', 'Lentil', 'Chickpea', 'Pork', 'Lamb',
+    'Eggplant', 'Spinach', 'Sweet Potato', 'Cauliflower', 'Halloumi', 'Cod', 'Turkey', 'Pumpkin', 'Black Bean', 'Duck',
+]
+DISHES = [
+    'Curry', 'Stew', 'Tacos', 'Pasta', 'Risotto', 'Salad', 'Soup', 'Stir-Fry', 'Pie', 'Burgers',
+    'Bowl', 'Skewers', 'Casserole', 'Flatbread', 'Noodles', 'Frittata', 'Wraps', 'Tagine', 'Dumplings', 'Bake',
+]
+UNITS = ['g', 'ml', 'tbsp', 'tsp', 'cup', 'pinch', 'clove', 'piece']
+STEPS = [
+    'Preheat the oven', 'Chop the vegetables', 'Season generously', 'Heat the oil in a large pan',
+    'Simmer gently', 'Stir in the sauce', 'Bake until golden', 'Rest before serving', 'Garnish and serve',
+    'Whisk until smooth', 'Bring to a boil', 'Fold in the herbs',
+]
+TAGS = [
+    'vegetarian', 'vegan', 'gluten-free', 'quick', 'family', 'spicy', 'healthy', 'comfort-food',
+    'weeknight', 'party', 'budget', 'high-protein', 'dairy-free', 'meal-prep', 'summer', 'winter',
+]
+CATEGORY_NAMES = [
+    ['Italian', 'Mexican', 'Indian', 'Japanese', 'French', 'Thai', 'Greek', 'Chinese', 'Moroccan', 'American',
+     'Korean', 'Spanish', 'Lebanese', 'Vietnamese', 'Ethiopian', 'Peruvian'],
+    ['Breakfast', 'Lunch', 'Dinner', 'Dessert', 'Snacks', 'Drinks', 'Sides', 'Baking'],
+    ['Quick', 'Vegetarian', 'Vegan', 'Festive', 'Light', 'Classic', 'Street Food', 'Slow'],
+]
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 Chrome/124.0 Mobile Safari/537.36',
+]
+# Ratings are J-shaped: mostly 4 and 5 stars
+RATING_WEIGHTS = [5, 7, 15, 33, 40]
+
+# Rows per multi-row INSERT on backends without executemany fast paths
+ROWS_PER_STATEMENT = 1000
+
+# SQLite page cache while loading, in KiB; index pages of random keys are
+# otherwise written out and read back on almost every insert
+SQLITE_CACHE_KIB = 512 * 1024
+
+# Field types every database driver accepts as Python values
+PLAIN_TYPES = {
+    'BigIntegerField', 'BooleanField', 'CharField', 'EmailField', 'GenericIPAddressField', 'IntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'SlugField', 'SmallIntegerField', 'TextField',
+}
+
+
+class ZipfSampler:
+    """
+    Samples indexes in ``range(n)`` with probability proportional to ``1 / rank ** s``.
+
+    Ranks are mapped to indexes by a seeded affine permutation, so popular
+    items are spread over the index range rather than being the oldest rows.
+    """
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.n = n
+        self.rng = rng
+        self.cum_weights = list(accumulate(1 / rank ** s for rank in range(1, n + 1)))
+        self.total = self.cum_weights[-1]
+        self.step = self._coprime_step(n, rng)
+        self.offset = rng.randrange(n)
+
+    @staticmethod
+    def _coprime_step(n: int, rng: random.Random) -> int:
+        if n == 1:
+            return 1
+        while True:
+            step = rng.randrange(1, n)
+            if math.gcd(step, n) == 1:
+                return step
+
+    def index(self, rank: int) -> int:
+        """Index of the item at a (zero-based) popularity rank."""
+        return (rank * self.step + self.offset) % self.n
+
+    def sample(self, k: int) -> List[int]:
+        """Draw ``k`` indexes with replacement."""
+        cum_weights, total, random_ = self.cum_weights, self.total, self.rng.random
+        hi = self.n - 1
+        return [self.index(bisect.bisect(cum_weights, random_() * total, 0, hi)) for _ in range(k)]
+
+    def sample_distinct(self, k: int) -> List[int]:
+        """Draw ``k`` distinct indexes (at most ``n``)."""
+        k = min(k, self.n)
+        chosen = set()
+        while len(chosen) < k:
+            chosen.update(self.sample(k - len(chosen)))
+        return list(chosen)
+
+
+class DatasetGenerator:
+    """Generates a reproducible synthetic dataset of the given size."""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        users: int = 1000,
+        recipes: int = 10000,
+        ratings: int = 50000,
+        favorites: int = 20000,
+        views: int = 100000,
+        category_roots: int = 12,
+        category_fanout: int = 4,
+        category_depth: int = 3,
+        days: int = 365,
+        zipf_exponent: float = 1.1,
+        anonymous_views: float = 0.3,
+        batch_size: int = 50000,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ):
+        self.seed = seed
+        self.counts = {
+            'users': users, 'recipes': recipes, 'ratings': ratings, 'favorites': favorites, 'views': views,
+        }
+        self.category_roots = category_roots
+        self.category_fanout = category_fanout
+        self.category_depth = min(category_depth, 3)  # Category.clean allows three levels
+        self.days = days
+        self.zipf_exponent = zipf_exponent
+        self.anonymous_views = anonymous_views
+        self.batch_size = batch_size
+        self.progress = progress or (lambda kind, count: None)
+        self.now = timezone.now().replace(microsecond=0)
+        self._samplers = {}
+        self._id_prefixes = {}
+        self._leaf_ids = []
+
+    # Seeded identity
+
+    def rng(self, stream: str) -> random.Random:
+        """Independent random stream, so resizing one kind of row leaves the others unchanged."""
+        return random.Random(f'{self.seed}:{stream}')
+
+    def row_id(self, kind: str, index: int) -> uuid.UUID:
+        """
+        Primary key of the ``index``-th generated row of a kind.
+
+        Keys of a kind increase with the index, so inserts append to the
+        primary key index instead of splitting pages all over it.
+        """
+        if kind not in self._id_prefixes:
+            # Version and variant bits sit above the 62 low bits holding the index
+            prefix = self.rng(f'id:{kind}').getrandbits(64) << 64
+            self._id_prefixes[kind] = uuid.UUID(int=prefix, version=4).int
+        return uuid.UUID(int=self._id_prefixes[kind] | index)
+
+    def sampler(self, kind: str, stream: str) -> ZipfSampler:
+        key = (kind, stream)
+        if key not in self._samplers:
+            self._samplers[key] = ZipfSampler(self.counts[kind], self.zipf_exponent, self.rng(f'zipf:{kind}:{stream}'))
+        return self._samplers[key]
+
+    def timestamp(self, rng: random.Random) -> datetime:
+        """A moment in the last ``days``, weighted towards recent ones."""
+        age = min(rng.expovariate(3 / self.days), self.days)
+        return self.now - timedelta(days=age)
+
+    @property
+    def username_prefix(self) -> str:
+        return f'ds{self.seed}-'
+
+
+    # Generation
+
+    def clear(self) -> int:
+        """
+        Delete rows generated with this seed; recipes, ratings, favorites and
+        views go with their users.
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted, _ = User.objects.filter(
+            username__startswith=self.username_prefix, email__endswith=f'@{DATASET_EMAIL_DOMAIN}',
+        ).delete()
+        categories, _ = Category.objects.filter(slug__startswith=self.username_prefix).delete()
+        return deleted + categories
+
+    def generate(self) -> Dict[str, int]:
+        """
+        Generate and insert the whole dataset.
+
+        Returns:
+            Number of rows inserted per kind
+        """
+        tables = [
+            ('users', User, (
+                'id', 'username', 'email', 'first_name', 'last_name', 'password', 'is_email_verified',
+                'date_joined', 'created_at', 'updated_at',
+            ), self.users()),
+            ('categories', Category, (
+                'id', 'name', 'slug', 'description', 'color', 'parent_id', 'order', 'created_at', 'updated_at',
+            ), self.categories()),
+            ('recipes', Recipe, (
+                'id', 'title', 'description', 'prep_time', 'cook_time', 'servings', 'difficulty',
+                'cooking_method', 'ingredients', 'instructions', 'nutrition_info', 'author_id', 'is_published',
+                'moderation_status', 'tags', 'created_at', 'updated_at',
+            ), self.recipes()),
+            ('recipe_categories', Recipe.categories.through, ('recipe_id', 'category_id'), self.recipe_categories()),
+            ('ratings', Rating, (
+                'id', 'recipe_id', 'user_id', 'rating', 'review', 'helpful_count', 'created_at', 'updated_at',
+            ), self.ratings()),
+            ('favorites', UserFavorite, ('id', 'recipe_id', 'user_id', 'created_at', 'updated_at'), self.favorites()),
+            ('views', RecipeView, (
+                'id', 'recipe_id', 'user_id', 'ip_address', 'user_agent', 'session_key', 'view_duration_seconds',
+                'created_at', 'updated_at',
+            ), self.views()),
+        ]
+        inserted = {}
+        with self._fast_inserts():
+            for kind, model, columns, rows in tables:
+                inserted[kind] = self._insert(model, columns, rows)
+        return inserted
+
+    def _insert(self, model, columns: Sequence[str], rows: Iterable[Tuple]) -> int:
+        """Insert tuples of ``columns`` values in batches; other columns get their field defaults."""
+        opts = model._meta
+        fields = [opts.get_field(column) for column in columns]
+        defaults = [
+            field for field in opts.concrete_fields
+            if field not in fields and field is not opts.auto_field
+        ]
+        adapters = [self._adapter(field) for field in fields]
+        default_values = tuple(
+            field.get_db_prep_save(field.get_default(), connection=connection) for field in defaults
+        )
+        convert = [(position, adapter) for position, adapter in enumerate(adapters) if adapter is not None]
+
+        qn = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES '.format(
+            qn(opts.db_table), ', '.join(qn(field.column) for field in [*fields, *defaults]),
+        )
+        placeholders = '({})'.format(', '.join(['%s'] * (len(fields) + len(defaults))))
+
+        name = opts.verbose_name_plural
+        inserted = 0
+        batch = []
+        for row in rows:
+            if convert:
+                row = list(row)
+                for position, adapter in convert:
+                    row[position] = adapter(row[position])
+            batch.append((*row, *default_values))
+            if len(batch) >= self.batch_size:
+                inserted += self._flush(sql, placeholders, batch)
+                self.progress(name, inserted)
+                batch = []
+        if batch:
+            inserted += self._flush(sql, placeholders, batch)
+            self.progress(name, inserted)
+        return inserted
+
+    def _flush(self, sql: str, placeholders: str, batch: List[Tuple]) -> int:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                # One prepared statement, stepped once per row
+                cursor.executemany(sql + placeholders, batch)
+            else:
+                for start in range(0, len(batch), ROWS_PER_STATEMENT):
+                    chunk = batch[start:start + ROWS_PER_STATEMENT]
+                    cursor.execute(
+                        sql + ', '.join([placeholders] * len(chunk)),
+                        [value for row in chunk for value in row],
+                    )
+        return len(batch)
+
+    @staticmethod
+    def _adapter(field) -> Optional[Callable]:
+        """Conversion of a column's values for the database, None where the driver takes them as they are."""
+        internal_type = (field.target_field if field.is_relation else field).get_internal_type()
+        if internal_type in PLAIN_TYPES:
+            return None
+        # Shortcuts for the two types on every row, equivalent to get_db_prep_save
+        if internal_type == 'UUIDField':
+            if connection.features.has_native_uuid_field:
+                return None
+            return lambda value: None if value is None else value.hex
+        if internal_type == 'DateTimeField' and connection.vendor == 'sqlite' and settings.USE_TZ:
+            tz = connection.timezone
+            last = [None, None]
+
+            def adapt_datetime(value):
+                # created_at and updated_at are usually the same object
+                if value is not last[0]:
+                    last[:] = value, str(value.astimezone(tz).replace(tzinfo=None))
+                return last[1]
+            return adapt_datetime
+        return partial(field.get_db_prep_save, connection=connection)
+
+    @contextmanager
+    def _fast_inserts(self):
+        """Relax durability for this connection while loading; the data is reproducible."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET synchronous_commit TO OFF')
+                restore = ['SET synchronous_commit TO DEFAULT']
+            elif connection.vendor == 'sqlite':
+                cursor.execute('PRAGMA cache_size')
+                restore = [f'PRAGMA cache_size = {cursor.fetchone()[0]}']
+                cursor.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_KIB}')
+                # SQLite refuses to change this inside a transaction
+                if not connection.in_atomic_block:
+                    cursor.execute('PRAGMA synchronous')
+                    restore.append(f'PRAGMA synchronous = {cursor.fetchone()[0]}')
+                    cursor.execute('PRAGMA synchronous = OFF')
+            else:
+                restore = []
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                for statement in restore:
+                    cursor.execute(statement)
+
+    # Rows
+
+    def users(self) -> Iterator[Tuple]:
+        rng = self.rng('users')
+        password = make_password(DATASET_PASSWORD)
+        for index in range(self.counts['users']):
+            joined = self.timestamp(rng)
+            username = f'{self.username_prefix}user{index}'
+            yield (
+                self.row_id('users', index), username, f'{username}@{DATASET_EMAIL_DOMAIN}',
+                rng.choice(INGREDIENTS).split()[0], rng.choice(DISHES), password, True,
+                joined, joined, joined,
+            )
+
+    def categories(self) -> Iterator[Tuple]:
+        """Category tree of ``category_roots`` roots, ``category_fanout`` children per node."""
+        rng = self.rng('categories')
+        index = 0
+        level = [(None, self.username_prefix)]
+        for depth in range(1, self.category_depth + 1):
+            names = CATEGORY_NAMES[depth - 1]
+            next_level = []
+            for parent_id, parent_slug in level:
+                for order in range(self.category_roots if parent_id is None else self.category_fanout):
+                    name = names[order % len(names)]
+                    if order >= len(names):
+                        name = f'{name} {order // len(names) + 1}'
+                    category_id = self.row_id('categories', index)
+                    slug = slugify(f'{parent_slug} {name}')
+                    index += 1
+                    next_level.append((category_id, slug))
+                    yield (
+                        category_id, name, slug, f'{name} recipes', '#%06x' % rng.randrange(1 << 24),
+                        parent_id, order, self.now, self.now,
+                    )
+            level = next_level
+        # Recipes are filed under leaf categories
+        self._leaf_ids = [category_id for category_id, _ in level if category_id is not None]
+
+    def recipes(self) -> Iterator[Tuple]:
+        rng = self.rng('recipes')
+        authors = self.sampler('users', 'authors')
+        difficulties = Recipe.DifficultyLevel.values
+        methods = Recipe.CookingMethod.values
+        approved = Recipe.ModerationStatus.APPROVED
+        for index in range(self.counts['recipes']):
+            created = self.timestamp(rng)
+            ingredient = rng.choice(INGREDIENTS)
+            title = f'{rng.choice(ADJECTIVES)} {ingredient} {rng.choice(DISHES)}'
+            yield (
+                self.row_id('recipes', index),
+                title,
+                f'{title}, a {rng.choice(TAGS)} favourite ready in no time.',
+                rng.randrange(5, 60, 5),
+                rng.randrange(0, 180, 5),
+                rng.randint(1, 8),
+                rng.choice(difficulties),
+                rng.choice(methods),
+                [
+                    {'name': name, 'amount': rng.randint(1, 500), 'unit': rng.choice(UNITS)}
+                    for name in [ingredient, *rng.sample(INGREDIENTS, rng.randint(2, 8))]
+                ],
+                rng.sample(STEPS, rng.randint(3, 8)),
+                {'calories': rng.randint(150, 1200), 'protein': rng.randint(2, 60)},
+                self.row_id('users', authors.sample(1)[0]),
+                rng.random() < 0.95,
+                approved,
+                rng.sample(TAGS, rng.randint(1, 4)),
+                created,
+                created,
+            )
+
+    def recipe_categories(self) -> Iterator[Tuple]:
+        if not self._leaf_ids:
+            return
+        rng = self.rng('recipe_categories')
+        leaves = ZipfSampler(len(self._leaf_ids), self.zipf_exponent, rng)
+        for index in range(self.counts['recipes']):
+            recipe_id = self.row_id('recipes', index)
+            for leaf in leaves.sample_distinct(rng.randint(1, 3)):
+                yield recipe_id, self._leaf_ids[leaf]
+
+    def _per_user(self, kind: str) -> Iterator:
+        """(user index, distinct recipe indexes) pairs adding up to ``counts[kind]`` rows."""
+        rng = self.rng(kind)
+        users = self.sampler('users', kind)
+        activity = {}
+        for start in range(0, self.counts[kind], self.batch_size):
+            for user in users.sample(min(self.batch_size, self.counts[kind] - start)):
+                activity[user] = activity.get(user, 0) + 1
+        popularity = self.sampler('recipes', kind)
+        for user in sorted(activity):
+            yield user, popularity.sample_distinct(activity[user]), rng
+
+    def ratings(self) -> Iterator[Tuple]:
+        if not (self.counts['users'] and self.counts['recipes']):
+            return
+        stars = list(range(1, 6))
+        index = 0
+        for user, recipes, rng in self._per_user('ratings'):
+            user_id = self.row_id('users', user)
+            for recipe in recipes:
+                created = self.timestamp(rng)
+                index += 1
+                yield (
+                    self.row_id('ratings', index),
+                    self.row_id('recipes', recipe),
+                    user_id,
+                    rng.choices(stars, weights=RATING_WEIGHTS)[0],
+                    '' if rng.random() < 0.7 else f'{rng.choice(ADJECTIVES)}! Would make again.',
+                    int(rng.paretovariate(2)) - 1,
+                    created,
+                    created,
+                )
+
+    def favorites(self) -> Iterator[Tuple]:
+        if not (self.counts['users'] and self.counts['recipes']):
+            return
+        index = 0
+        for user, recipes, rng in self._per_user('favorites'):
+            user_id = self.row_id('users', user)
+            for recipe in recipes:
+                created = self.timestamp(rng)
+                index += 1
+                yield self.row_id('favorites', index), self.row_id('recipes', recipe), user_id, created, created
+
+    def views(self) -> Iterator[Tuple]:
+        if not self.counts['recipes']:
+            return
+        rng = self.rng('views')
+        recipes = self.sampler('recipes', 'views')
+        viewers = self.sampler('users', 'views') if self.counts['users'] else None
+        row_id, timestamp, random_, getrandbits = self.row_id, self.timestamp, rng.random, rng.getrandbits
+        index = 0
+        remaining = self.counts['views']
+        while remaining:
+            chunk = min(remaining, self.batch_size)
+            remaining -= chunk
+            users = viewers.sample(chunk) if viewers else [None] * chunk
+            for recipe, user in zip(recipes.sample(chunk), users):
+                created = timestamp(rng)
+                anonymous = user is None or random_() < self.anonymous_views
+                index += 1
+                yield (
+                    row_id('views', index),
+                    row_id('recipes', recipe),
+                    None if anonymous else row_id('users', user),
+                    socket.inet_ntoa(getrandbits(32).to_bytes(4, 'big')),
+                    rng.choice(USER_AGENTS),
+                    '%032x' % getrandbits(128) if anonymous else '',
+                    int(rng.lognormvariate(3.5, 1)) if random_() < 0.8 else None,
+                    created,
+                    created,
+                )
@@ -0,0 +1,268 @@
+"""
+Personalized home feed built from precomputed candidate lists.
+
+Candidates for a user blend three sources, each normalized to ``[0, 1]``:
+
+* recipes from the categories the user engages with (favorites and 4-5 star
+  ratings),
+* precomputed neighbors of the recipes the user liked,
+* globally trending recipes.
+
+Candidate lists are computed in the background, reranked for category
+diversity and cached per user with a TTL. At request time the cached list is
+only paginated, so serving a page costs one cache read and one query for the
+page's recipes.
+"""
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Rating, Recipe, RecipeNeighbor, UserFavorite
+from .trending_service import trending_service
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_PREFIX = 'recipe_feed'
+GLOBAL_FEED_KEY = f'{FEED_CACHE_PREFIX}:global'
+
+
+class FeedService:
+    """Service precomputing, caching and serving personalized recipe feeds."""
+
+    CATEGORY = 'category'
+    SIMILAR = 'similar'
+    TRENDING = 'trending'
+
+    def __init__(self):
+        config = getattr(settings, 'RECIPE_FEED', {})
+        self.ttl = config.get('CANDIDATES_TTL_SECONDS', 1800)
+        self.max_candidates = config.get('MAX_CANDIDATES', 200)
+        self.per_source = config.get('CANDIDATES_PER_SOURCE', 100)
+        self.top_categories = config.get('TOP_CATEGORIES', 5)
+        self.diversity_penalty = config.get('DIVERSITY_PENALTY', 0.85)
+        self.background_build = config.get('BACKGROUND_BUILD', True)
+        self.weights = {
+            self.CATEGORY: 1.0,
+            self.SIMILAR: 1.5,
+            self.TRENDING: 0.5,
+            **config.get('WEIGHTS', {}),
+        }
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(user_id) -> str:
+        return f'{FEED_CACHE_PREFIX}:user:{user_id}'
+
+    # Candidate generation
+
+    def _visible_recipes(self):
+        return Recipe.objects.filter(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED)
+
+    def _trending_scores(self) -> Dict[str, float]:
+        ranked = list(trending_service.get_trending().values_list('id', flat=True)[:self.per_source])
+        return {str(recipe_id): 1 - rank / len(ranked) for rank, recipe_id in enumerate(ranked)}
+
+    def _liked_recipes(self, user) -> Dict[str, float]:
+        """Recipes the user favorited or rated highly, with engagement weights."""
+        liked = defaultdict(float)
+        favorites = UserFavorite.objects.filter(user=user).order_by('-created_at')
+        for recipe_id in favorites.values_list('recipe_id', flat=True)[:self.per_source]:
+            liked[str(recipe_id)] += 3.0
+        ratings = Rating.objects.filter(user=user, rating__gte=4).order_by('-created_at')
+        for recipe_id, stars in ratings.values_list('recipe_id', 'rating')[:self.per_source]:
+            liked[str(recipe_id)] += stars - 3.0
+        return liked
+
+    def _category_scores(self, liked: Dict[str, float], excluded: set) -> Dict[str, float]:
+        through = Recipe.categories.through
+        affinity = defaultdict(float)
+        for recipe_id, category_id in through.objects.filter(recipe_id__in=liked.keys()).values_list(
+            'recipe_id', 'category_id'
+        ):
+            affinity[category_id] += liked[str(recipe_id)]
+        top = sorted(affinity.items(), key=lambda item: -item[1])[:self.top_categories]
+        if not top:
+            return {}
+
+        scores = defaultdict(float)
+        max_affinity = top[0][1]
+        for category_id, weight in top:
+            ranked = (
+                self._visible_recipes()
+                .filter(categories=category_id)
+                .exclude(id__in=excluded)
+                .order_by(F('trending__score').desc(nulls_last=True), '-created_at')
+                .values_list('id', flat=True)[:self.per_source]
+            )
+            ranked = list(ranked)
+            for rank, recipe_id in enumerate(ranked):
+                scores[str(recipe_id)] += (weight / max_affinity) * (1 - rank / (2 * len(ranked)))
+        return scores
+
+    def _similar_scores(self, liked: Dict[str, float]) -> Dict[str, float]:
+        scores = defaultdict(float)
+        for neighbor_id, score in RecipeNeighbor.objects.filter(recipe_id__in=liked.keys()).values_list(
+            'neighbor_id', 'score'
+        ):
+            scores[str(neighbor_id)] += score
+        return scores
+
+    def build_candidates(self, user=None) -> Dict[str, Any]:
+        """
+        Compute a candidate list for ``user`` (global trending for anonymous users).
+
+        Returns:
+            ``{'generated_at', 'candidates': [{'id', 'score', 'reasons', 'categories'}]}``
+        """
+        sources = {self.TRENDING: self._trending_scores()}
+        excluded = set()
+        if user is not None:
+            liked = self._liked_recipes(user)
+            excluded = set(liked) | {
+                str(recipe_id) for recipe_id in Recipe.objects.filter(author=user).values_list('id', flat=True)
+            }
+            sources[self.CATEGORY] = self._category_scores(liked, excluded)
+            sources[self.SIMILAR] = self._similar_scores(liked)
+
+        combined = defaultdict(float)
+        reasons = defaultdict(list)
+        for source, scores in sources.items():
+            top = max(scores.values(), default=0)
+            if not top:
+                continue
+            for recipe_id, score in scores.items():
+                if recipe_id in excluded:
+                    continue
+                combined[recipe_id] += self.weights[source] * score / top
+                reasons[recipe_id].append(source)
+
+        ranked = sorted(combined.items(), key=lambda item: -item[1])
+        visible = set(
+            str(recipe_id) for recipe_id in
+            self._visible_recipes().filter(id__in=[recipe_id for recipe_id, _ in ranked]).values_list('id', flat=True)
+        )
+        ranked = [(recipe_id, score) for recipe_id, score in ranked if recipe_id in visible][:self.max_candidates]
+
+        categories = defaultdict(list)
+        for recipe_id, category_id in Recipe.categories.through.objects.filter(
+            recipe_id__in=[recipe_id for recipe_id, _ in ranked]
+        ).values_list('recipe_id', 'category_id'):
+            categories[str(recipe_id)].append(str(category_id))
+
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'candidates': [
+                {
+                    'id': recipe_id,
+                    'score': round(score, 6),
+                    'reasons': reasons[recipe_id],
+                    'categories': categories[recipe_id],
+                }
+                for recipe_id, score in ranked
+            ],
+        }
+
+    def refresh(self, user=None) -> Dict[str, Any]:
+        """Compute, rerank and cache the candidate list for ``user``."""
+        candidates = self.build_candidates(user)
+        candidates['candidates'] = self.rerank(candidates['candidates'])
+        cache.set(self.cache_key(user.pk) if user is not None else GLOBAL_FEED_KEY, candidates, self.ttl)
+        return candidates
+
+    def schedule_refresh(self, user) -> None:
+        """Recompute a user's candidates in the background, at most once at a time."""
+        if not self.background_build:
+            cache.delete(self.cache_key(user.pk))
+            return
+        if not cache.add(f'{self.cache_key(user.pk)}:building', True, 300):
+            return
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='recipe-feed')
+        self._executor.submit(self._refresh_in_background, user)
+
+    def _refresh_in_background(self, user) -> None:
+        try:
+            self.refresh(user)
+        except Exception as e:
+            logger.error(f"Error building feed candidates for user {user.pk}: {e}")
+        finally:
+            cache.delete(f'{self.cache_key(user.pk)}:building')
+            close_old_connections()
+
+    # Serving
+
+    def get_candidates(self, user=None) -> Dict[str, Any]:
+        """
+        Cached candidates for ``user``.
+
+        On a miss the user's list is built in the background and the cached
+        global list is served meanwhile; with background building disabled
+        the list is built inline.
+        """
+        if user is not None:
+            cached = cache.get(self.cache_key(user.pk))
+            if cached is not None:
+                return cached
+            if not self.background_build:
+                return self.refresh(user)
+            self.schedule_refresh(user)
+
+        cached = cache.get(GLOBAL_FEED_KEY)
+        if cached is None:
+            cached = self.refresh()
+        return cached
+
+    def rerank(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Greedy diversity rerank: each time a category is shown, later recipes
+        from it are penalized. Cost is bounded by ``MAX_CANDIDATES``.
+        """
+        remaining = list(candidates)
+        seen = defaultdict(int)
+        reranked = []
+        while remaining:
+            best_index, best_score = 0, None
+            for index, candidate in enumerate(remaining):
+                repeats = max((seen[category] for category in candidate['categories']), default=0)
+                score = candidate['score'] * self.diversity_penalty ** repeats
+                if best_score is None or score > best_score:
+                    best_index, best_score = index, score
+            chosen = remaining.pop(best_index)
+            for category in chosen['categories']:
+                seen[category] += 1
+            reranked.append(chosen)
+        return reranked
+
+    def get_feed_page(self, user=None, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """A page of the reranked feed with the recipes loaded in one query."""
+        feed = self.get_candidates(user)
+        ranked = feed['candidates']
+        start = (page - 1) * page_size
+        entries = ranked[start:start + page_size]
+        recipes = (
+            self._visible_recipes()
+            .select_related('author')
+            .prefetch_related('categories')
+            .in_bulk([entry['id'] for entry in entries])
+        )
+        recipes = {str(pk): recipe for pk, recipe in recipes.items()}
+        items = [(recipes[entry['id']], entry) for entry in entries if entry['id'] in recipes]
+        return {
+            'generated_at': feed['generated_at'],
+            'count': len(ranked),
+            'items': items,
+        }
+
+
+# Service instance
+feed_service = FeedService()
@@ -0,0 +1,140 @@
+"""
+Mark-and-sweep garbage collection of stored recipe images.
+
+Files can outlive every reference to them: deletes that failed or predate
+URL-to-name mapping, workers that died between storing variants and
+recording them, uploads whose job row was deleted. The collector marks every
+storage name still referenced, streaming ``Recipe.images``, ``ImageBlob``
+rows and unfinished ``RecipeImageJob`` rows from the database, then lists the
+image directories in storage and deletes what was not marked.
+
+Files younger than the grace period are never deleted, so uploads and jobs
+that land between the mark and the sweep are safe. On-demand resized
+variants are kept as long as their original is referenced.
+"""
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from core.models import ImageBlob
+from core.services.storage_service import get_storage_service
+
+from ..models import Recipe, RecipeImageJob
+
+logger = logging.getLogger(__name__)
+
+
+class ImageGarbageCollector:
+    """Service deleting stored recipe images that nothing references."""
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self):
+        self.images_path = get_storage_service().recipe_images_path
+        self.uploads_path = getattr(settings, 'IMAGE_JOBS', {}).get('UPLOADS_PATH', 'recipes/images/uploads/')
+        resize_config = getattr(settings, 'IMAGE_RESIZE', {})
+        self.resize_source_path = resize_config.get('SOURCE_PATH', 'recipes/images/originals/')
+        self.resize_storage_path = resize_config.get('STORAGE_PATH', 'recipes/images/resized/')
+
+    def referenced_names(self) -> Set[str]:
+        """Mark phase: storage names of every file still referenced."""
+        storage_service = get_storage_service()
+        referenced = set()
+        for images in Recipe.objects.exclude(images={}).values_list('images', flat=True).iterator(self.CHUNK_SIZE):
+            referenced |= storage_service.image_names(images or {})
+        for images in ImageBlob.objects.values_list('images', flat=True).iterator(self.CHUNK_SIZE):
+            referenced |= storage_service.image_names(images or {})
+
+        unfinished = RecipeImageJob.objects.filter(
+            status__in=[RecipeImageJob.Status.PENDING, RecipeImageJob.Status.PROCESSING]
+        )
+        for source_path, images in unfinished.values_list('source_path', 'images').iterator(self.CHUNK_SIZE):
+            if source_path:
+                referenced.add(source_path)
+            referenced |= storage_service.image_names(images or {})
+        return referenced
+
+    def stored_names(self) -> Iterator[str]:
+        """Names of every file under the image directories, as listed by storage."""
+        roots = sorted({self.images_path, self.uploads_path, self.resize_storage_path})
+        # Nested roots are listed with their parent
+        roots = [root for root in roots if not any(root != other and root.startswith(other) for other in roots)]
+        list_all = getattr(default_storage, 'list_all', None)
+        for root in roots:
+            if list_all is not None:
+                # Blob storage lists a whole prefix in one paged request,
+                # as names including the storage's location
+                location = getattr(default_storage, 'location', '')
+                prefix = f"{location.rstrip('/')}/" if location else ''
+                for name in list_all(root):
+                    yield name[len(prefix):] if name.startswith(prefix) else name
+            else:
+                yield from self._walk(root)
+
+    def _walk(self, path: str) -> Iterator[str]:
+        try:
+            directories, files = default_storage.listdir(path)
+        except FileNotFoundError:
+            return
+        for name in files:
+            yield os.path.join(path, name)
+        for directory in directories:
+            yield from self._walk(os.path.join(path, directory))
+
+    def is_referenced(self, name: str, referenced: Set[str], original_stems: Set[str]) -> bool:
+        """Whether a stored file is referenced, directly or through its original."""
+        if name in referenced:
+            return True
+        if name.startswith(self.resize_storage_path):
+            # Resized variants are named ``<original stem>_<width>w``
+            return Path(name).stem.rpartition('_')[0] in original_stems
+        return False
+
+    def collect(self, min_age: timedelta = timedelta(hours=24), dry_run: bool = False) -> Tuple[List[str], Dict[str, int]]:
+        """
+        Find and delete orphaned image files.
+
+        Args:
+            min_age: Files modified more recently than this are kept
+            dry_run: Only find orphans, deleting nothing
+
+        Returns:
+            Tuple of the orphans' storage names and counts of stored,
+            orphaned, recent (kept) and deleted files
+        """
+        referenced = self.referenced_names()
+        original_stems = {
+            Path(name).stem for name in referenced if name.startswith(self.resize_source_path)
+        }
+        logger.info(f"Marked {len(referenced)} referenced image files")
+
+        cutoff = timezone.now() - min_age
+        counts = {'stored': 0, 'orphaned': 0, 'recent': 0, 'deleted': 0}
+        orphans = []
+        for name in self.stored_names():
+            counts['stored'] += 1
+            if self.is_referenced(name, referenced, original_stems):
+                continue
+            try:
+                if default_storage.get_modified_time(name) > cutoff:
+                    counts['recent'] += 1
+                    continue
+            except FileNotFoundError:
+                continue
+            orphans.append(name)
+
+        counts['orphaned'] = len(orphans)
+        if orphans and not dry_run:
+            counts['deleted'] = get_storage_service().delete_files(orphans)
+        logger.info(f"Image garbage collection: {counts}")
+        return orphans, counts
+
+
+# Service instance
+image_gc_service = ImageGarbageCollector()
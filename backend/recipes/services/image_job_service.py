@@ -0,0 +1,341 @@
+"""
+Asynchronous processing of uploaded recipe images.
+
+An upload is validated, stored as-is and recorded as a ``RecipeImageJob``;
+the request returns ``202`` with the job ID. The ``process_image_jobs``
+worker claims due jobs under a lease (so a crashed worker's jobs are picked
+up again), renders and stores the variants on a process pool, and swaps
+``recipe.images`` in a transaction that locks the recipe.
+
+Only the newest job of a recipe may swap; an older job finishing later is
+marked superseded and its variants are released. The replaced variants and
+the raw upload are released only after the swap has committed, so a failure
+never leaves a recipe pointing at missing blobs.
+
+Uploads are deduplicated by content hash (see ``ImageBlobService``): a job
+for an image that is already stored completes without rendering, right at
+upload time if possible.
+
+Clients can also upload straight to storage through a signed URL
+(``issue_upload``) and report completion (``complete_upload``), which only
+checks the file's header before queueing the job, so the bytes never pass
+through a web worker.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import as_completed
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.services.direct_upload_service import direct_upload_service
+from core.services.image_blob_service import image_blob_service
+from core.services.storage_service import get_storage_service
+
+from ..models import Recipe, RecipeImageJob
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TICKET_SALT = 'recipes.image_upload'
+
+
+def render_job_images(source_path: str, original_name: str, recipe_id: str, content_hash: str = '') -> Dict:
+    """
+    Render and store the variants of an uploaded image.
+
+    Runs in pool worker processes, so it touches storage but not the database.
+    Direct uploads are hashed here, as the web process never reads them.
+
+    Returns:
+        Dictionary with image URLs
+    """
+    storage_service = get_storage_service()
+    with default_storage.open(source_path, 'rb') as source:
+        upload = File(source, name=original_name)
+        return storage_service.save_image_with_thumbnails(
+            upload, recipe_id, content_hash=content_hash or storage_service.content_hash(upload)
+        )
+
+
+class ImageJobService:
+    """Service queueing recipe image uploads and applying their results."""
+
+    def __init__(self):
+        config = getattr(settings, 'IMAGE_JOBS', {})
+        self.uploads_path = config.get('UPLOADS_PATH', 'recipes/images/uploads/')
+        self.workers = config.get('WORKERS', 2)
+        self.batch_size = config.get('BATCH_SIZE', 10)
+        self.max_attempts = config.get('MAX_ATTEMPTS', 3)
+        self.retry_delay = config.get('RETRY_DELAY_SECONDS', 30)
+        self.lease_seconds = config.get('LEASE_SECONDS', 600)
+        self.run_in_process = config.get('RUN_IN_PROCESS', False)
+
+    def submit(self, recipe: Recipe, image_file, user=None) -> RecipeImageJob:
+        """
+        Store an upload and queue a job to process it.
+
+        Raises:
+            ValidationError: If the file is not an acceptable image
+        """
+        storage_service = get_storage_service()
+        storage_service.validate_image_file(image_file)
+        content_hash = storage_service.content_hash(image_file)
+        images = image_blob_service.acquire(content_hash)
+        if images is not None:
+            # Already stored: nothing to render, so complete right away
+            job = RecipeImageJob.objects.create(
+                recipe=recipe,
+                requested_by=user,
+                status=RecipeImageJob.Status.PROCESSING,
+                original_name=image_file.name,
+                content_hash=content_hash,
+            )
+            self.complete(job, images)
+            job.refresh_from_db()
+            return job
+
+        filename = storage_service.generate_unique_filename(image_file.name, f"recipe_{recipe.id}")
+        source_path = default_storage.save(os.path.join(self.uploads_path, filename), image_file)
+        return self.enqueue(recipe, source_path, image_file.name, user, content_hash)
+
+    def enqueue(self, recipe: Recipe, source_path: str, original_name: str, user=None,
+                content_hash: str = '') -> RecipeImageJob:
+        """Queue a job for an upload already in storage."""
+        job = RecipeImageJob.objects.create(
+            recipe=recipe,
+            requested_by=user,
+            source_path=source_path,
+            original_name=original_name,
+            content_hash=content_hash,
+        )
+        if self.run_in_process:
+            # No worker in development: process in a thread once the job is visible
+            transaction.on_commit(lambda: threading.Thread(target=self._process_in_thread, daemon=True).start())
+        return job
+
+    # Direct uploads
+
+    def issue_upload(self, recipe: Recipe, content_type: str, filename: str = '', user=None) -> Dict:
+        """
+        Sign a URL the client uploads an image for the recipe to directly.
+
+        The returned ``upload_id`` is a signed ticket naming the recipe, the
+        user and the storage name; it is redeemed with ``complete_upload``.
+
+        Raises:
+            ValidationError: If the content type is not an accepted image type
+        """
+        upload = direct_upload_service.issue(self.uploads_path, content_type, f"recipe_{recipe.id}")
+        upload['upload_id'] = signing.dumps({
+            'recipe': str(recipe.id),
+            'user': str(user.pk) if user else None,
+            'name': upload.pop('name'),
+            'filename': filename,
+        }, salt=UPLOAD_TICKET_SALT)
+        return upload
+
+    def complete_upload(self, recipe: Recipe, upload_id: str, user=None) -> RecipeImageJob:
+        """
+        Queue a job for a finished direct upload after checking its header.
+
+        Completing the same upload again returns its existing job.
+
+        Raises:
+            ValidationError: If the ticket is invalid, expired or for another
+                recipe or user, or the uploaded file is not an acceptable image
+        """
+        try:
+            # Uploads may start just before the URL expires
+            ticket = signing.loads(
+                upload_id, salt=UPLOAD_TICKET_SALT, max_age=2 * direct_upload_service.expiry_seconds
+            )
+        except signing.BadSignature:
+            raise ValidationError('Invalid or expired upload')
+        if ticket['recipe'] != str(recipe.id) or ticket['user'] != (str(user.pk) if user else None):
+            raise ValidationError('Upload belongs to another recipe')
+
+        source_path = ticket['name']
+        existing = RecipeImageJob.objects.filter(recipe=recipe, source_path=source_path).first()
+        if existing is not None:
+            return existing
+        try:
+            direct_upload_service.validate_upload(source_path)
+        except ValidationError:
+            self._delete_source(source_path)
+            raise
+        # Hashed by the worker, which reads the bytes anyway
+        original_name = ticket['filename'] or os.path.basename(source_path)
+        return self.enqueue(recipe, source_path, original_name, user)
+
+    def latest_job(self, recipe: Recipe) -> Optional[RecipeImageJob]:
+        """The recipe's most recent image job, if any."""
+        return RecipeImageJob.objects.filter(recipe=recipe).order_by('-created_at').first()
+
+    # Processing
+
+    def claim_batch(self, batch_size: Optional[int] = None):
+        """Lease due pending jobs to this worker and count the attempt."""
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                RecipeImageJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status__in=[RecipeImageJob.Status.PENDING, RecipeImageJob.Status.PROCESSING],
+                    next_attempt_at__lte=now,
+                )
+                .order_by('next_attempt_at')
+                .values_list('id', flat=True)[:batch_size or self.batch_size]
+            )
+            RecipeImageJob.objects.filter(id__in=ids).update(
+                status=RecipeImageJob.Status.PROCESSING,
+                next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                attempts=F('attempts') + 1,
+            )
+        return list(RecipeImageJob.objects.filter(id__in=ids).order_by('created_at'))
+
+    def process_pending(self, executor=None, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process one batch of due jobs.
+
+        Args:
+            executor: Process pool to render on; jobs run inline without one
+            batch_size: Jobs claimed (defaults to IMAGE_JOBS BATCH_SIZE)
+
+        Returns:
+            Counts of ``succeeded``, ``superseded``, ``retried`` and ``failed`` jobs
+        """
+        counts = {'succeeded': 0, 'superseded': 0, 'retried': 0, 'failed': 0}
+        ready = []
+        renders = {}
+        duplicates = []
+        for job in self.claim_batch(batch_size):
+            # An identical upload may have been stored since this one was queued
+            images = image_blob_service.acquire(job.content_hash) if job.content_hash else None
+            if images is not None:
+                ready.append((job, images))
+            elif job.content_hash and job.content_hash in renders:
+                duplicates.append(job)
+            else:
+                renders[job.content_hash or job.id] = job
+
+        for job, images in self._render(list(renders.values()), executor, counts):
+            ready.append((job, self._register(job, images)))
+        # Identical uploads in the batch share the one render
+        for job in duplicates:
+            images = image_blob_service.acquire(job.content_hash)
+            if images is None:
+                counts[self.fail(job, RuntimeError('Identical upload failed to render'))] += 1
+            else:
+                ready.append((job, images))
+
+        # Oldest first, so only the newest job of a recipe swaps its images in
+        for job, images in sorted(ready, key=lambda item: item[0].created_at):
+            counts[self.complete(job, images)] += 1
+        return counts
+
+    def _render(self, jobs, executor, counts: Dict[str, int]):
+        """Render jobs inline or on the pool, yielding (job, images) and failing the rest."""
+        if executor is None:
+            for job in jobs:
+                try:
+                    images = render_job_images(job.source_path, job.original_name, str(job.recipe_id), job.content_hash)
+                except Exception as e:
+                    counts[self.fail(job, e)] += 1
+                else:
+                    yield job, images
+            return
+
+        futures = {
+            executor.submit(
+                render_job_images, job.source_path, job.original_name, str(job.recipe_id), job.content_hash
+            ): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                images = future.result()
+            except Exception as e:
+                counts[self.fail(job, e)] += 1
+            else:
+                yield job, images
+
+    def _register(self, job: RecipeImageJob, images: Dict) -> Dict:
+        """Record rendered images as a blob the job holds a reference to."""
+        content_hash = job.content_hash or images.get('sha256')
+        if not content_hash:
+            return images
+        return image_blob_service.register(content_hash, images, default_storage.size(job.source_path))
+
+    def complete(self, job: RecipeImageJob, images: Dict) -> str:
+        """Swap the job's variants into its recipe unless a newer upload exists."""
+        with transaction.atomic():
+            recipe = Recipe.objects.select_for_update().filter(pk=job.recipe_id).first()
+            latest = self.latest_job(recipe) if recipe is not None else None
+            if latest is not None and latest.id == job.id:
+                stale = recipe.images or {}
+                recipe.images = images
+                recipe.save(update_fields=['images'])
+                outcome = RecipeImageJob.Status.SUCCEEDED
+            else:
+                stale = images
+                outcome = RecipeImageJob.Status.SUPERSEDED
+            RecipeImageJob.objects.filter(id=job.id).update(
+                status=outcome, images=images, error='', finished_at=timezone.now(),
+            )
+            transaction.on_commit(lambda: self._cleanup(stale, job.source_path))
+        logger.info(f"Image job {job.id} for recipe {job.recipe_id}: {outcome}")
+        return 'succeeded' if outcome == RecipeImageJob.Status.SUCCEEDED else 'superseded'
+
+    def fail(self, job: RecipeImageJob, error: Exception) -> str:
+        """Schedule a retry with backoff, or give up after MAX_ATTEMPTS."""
+        logger.error(f"Image job {job.id} failed (attempt {job.attempts}): {error}")
+        # Undecodable images fail the same way on every attempt
+        if isinstance(error, ValidationError) or job.attempts >= self.max_attempts:
+            RecipeImageJob.objects.filter(id=job.id).update(
+                status=RecipeImageJob.Status.FAILED, error=str(error), finished_at=timezone.now(),
+            )
+            self._delete_source(job.source_path)
+            return 'failed'
+        RecipeImageJob.objects.filter(id=job.id).update(
+            status=RecipeImageJob.Status.PENDING,
+            error=str(error),
+            next_attempt_at=timezone.now() + timedelta(seconds=self.retry_delay * 2 ** (job.attempts - 1)),
+        )
+        return 'retried'
+
+    def _cleanup(self, stale_images: Dict, source_path: str) -> None:
+        try:
+            image_blob_service.release(stale_images)
+        except Exception as e:
+            logger.error(f"Failed to release replaced images: {e}")
+        self._delete_source(source_path)
+
+    def _delete_source(self, source_path: str) -> None:
+        if not source_path:
+            return
+        try:
+            default_storage.delete(source_path)
+        except Exception as e:
+            logger.error(f"Failed to delete image upload {source_path}: {e}")
+
+    def _process_in_thread(self) -> None:
+        try:
+            self.process_pending()
+        except Exception as e:
+            logger.error(f"Error processing image jobs in process: {e}")
+        finally:
+            close_old_connections()
+
+
+# Service instance
+image_job_service = ImageJobService()
@@ -0,0 +1,247 @@
+"""
+Item-to-item collaborative filtering ("similar recipes").
+
+A batch job builds a sparse user x recipe interaction matrix from favorites,
+ratings and logged-in views, computes cosine similarity between recipe
+columns block by block, and stores the top-K neighbors of every recipe in
+``RecipeNeighbor``. Serving similar recipes is then a single indexed read.
+
+Incremental runs only recompute the similarity columns of recipes whose
+interactions changed since the previous run, and patch the stored lists of
+recipes that co-occur with them. Deleted favorites are only picked up by a
+full rebuild, which should still run periodically.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models import BatchJobState, Rating, Recipe, RecipeNeighbor, RecipeView, UserFavorite
+from .view_stats_service import non_author_filter
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_JOB_NAME = 'recipe_neighbors'
+
+
+class InteractionMatrix:
+    """Column-normalized user x recipe matrix with its index mappings."""
+
+    def __init__(self, matrix: sparse.csc_matrix, recipe_ids: List):
+        self.matrix = matrix
+        self.recipe_ids = recipe_ids
+        self.recipe_index = {str(recipe_id): i for i, recipe_id in enumerate(recipe_ids)}
+
+
+class SimilarRecipesService:
+    """Service building and serving precomputed recipe neighbors."""
+
+    def __init__(self):
+        config = getattr(settings, 'RECIPE_RECOMMENDATIONS', {})
+        self.neighbors_per_recipe = config.get('NEIGHBORS_PER_RECIPE', 20)
+        self.min_similarity = config.get('MIN_SIMILARITY', 0.01)
+        self.block_size = config.get('BLOCK_SIZE', 1000)
+        self.weights = {
+            'favorite': 3.0,
+            'rating': 2.0,
+            'view': 1.0,
+            **config.get('WEIGHTS', {}),
+        }
+
+    # Matrix construction
+
+    def build_matrix(self) -> InteractionMatrix:
+        """Build the column-normalized interaction matrix from stored engagement."""
+        weights = defaultdict(float)
+        for user_id, recipe_id in UserFavorite.objects.values_list('user_id', 'recipe_id').iterator():
+            weights[(user_id, recipe_id)] += self.weights['favorite']
+        for user_id, recipe_id, stars in Rating.objects.values_list('user_id', 'recipe_id', 'rating').iterator():
+            weights[(user_id, recipe_id)] += self.weights['rating'] * stars / 5
+        views = (
+            RecipeView.objects.filter(non_author_filter(), user__isnull=False)
+            .values_list('user_id', 'recipe_id')
+            .annotate(views=Count('id'))
+        )
+        for user_id, recipe_id, count in views.iterator():
+            weights[(user_id, recipe_id)] += self.weights['view'] * float(np.log1p(count))
+
+        user_index, recipe_index, recipe_ids = {}, {}, []
+        rows, cols, data = [], [], []
+        for (user_id, recipe_id), weight in weights.items():
+            rows.append(user_index.setdefault(user_id, len(user_index)))
+            if recipe_id not in recipe_index:
+                recipe_index[recipe_id] = len(recipe_ids)
+                recipe_ids.append(recipe_id)
+            cols.append(recipe_index[recipe_id])
+            data.append(weight)
+
+        matrix = sparse.csc_matrix(
+            (np.asarray(data, dtype=np.float32), (rows, cols)),
+            shape=(len(user_index), len(recipe_ids)),
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+        norms[norms == 0] = 1
+        matrix = (matrix @ sparse.diags(1 / norms)).tocsc()
+        return InteractionMatrix(matrix, recipe_ids)
+
+    def _similarity_block(self, interactions: InteractionMatrix, columns: np.ndarray) -> sparse.csc_matrix:
+        """Cosine similarity of every recipe against the recipes in ``columns``."""
+        matrix = interactions.matrix
+        return (matrix.T @ matrix[:, columns]).tocsc()
+
+    def _top_neighbors(self, block: sparse.csc_matrix, columns: np.ndarray) -> Dict[int, List[Tuple[int, float]]]:
+        """Pick the top-K neighbors of each column of a similarity block."""
+        neighbors = {}
+        k = self.neighbors_per_recipe
+        for j, column in enumerate(columns):
+            start, end = block.indptr[j], block.indptr[j + 1]
+            rows = block.indices[start:end]
+            scores = block.data[start:end]
+            keep = (rows != column) & (scores >= self.min_similarity)
+            rows, scores = rows[keep], scores[keep]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k)[:k]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores, kind='stable')
+            neighbors[int(column)] = [(int(rows[i]), float(scores[i])) for i in order]
+        return neighbors
+
+    # Refresh
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """
+        Recompute recipe neighbors, incrementally unless ``full`` is set.
+
+        Returns:
+            Number of recipes whose neighbor lists were written
+        """
+        started_at = timezone.now()
+        watermark = BatchJobState.objects.filter(name=NEIGHBORS_JOB_NAME).first()
+        interactions = self.build_matrix()
+
+        if full or watermark is None:
+            lists = {}
+            all_columns = np.arange(len(interactions.recipe_ids))
+            for offset in range(0, len(all_columns), self.block_size):
+                columns = all_columns[offset:offset + self.block_size]
+                lists.update(self._top_neighbors(self._similarity_block(interactions, columns), columns))
+            written = self._write(interactions, lists, replace_all=True)
+        else:
+            changed = self._changed_recipes(watermark.processed_until)
+            written = self._refresh_changed(interactions, changed)
+
+        BatchJobState.objects.update_or_create(
+            name=NEIGHBORS_JOB_NAME,
+            defaults={'processed_until': started_at}
+        )
+        logger.info(f"Refreshed neighbors for {written} recipes ({'full' if full else 'incremental'})")
+        return {'recipes': written}
+
+    def _changed_recipes(self, since) -> set:
+        """Recipes with interactions recorded since ``since``."""
+        changed = set()
+        changed.update(UserFavorite.objects.filter(created_at__gte=since).values_list('recipe_id', flat=True))
+        changed.update(Rating.objects.filter(updated_at__gte=since).values_list('recipe_id', flat=True))
+        changed.update(
+            RecipeView.objects.filter(created_at__gte=since, user__isnull=False)
+            .values_list('recipe_id', flat=True).distinct()
+        )
+        return {str(recipe_id) for recipe_id in changed}
+
+    def _refresh_changed(self, interactions: InteractionMatrix, changed: set) -> int:
+        """Recompute changed recipes and patch the lists that reference them."""
+        columns = np.array(
+            sorted(interactions.recipe_index[recipe_id] for recipe_id in changed if recipe_id in interactions.recipe_index),
+            dtype=np.int64,
+        )
+        if not len(columns):
+            return 0
+
+        lists = {}
+        # Similarity is symmetric: each block column holds S[r, c] for every recipe r
+        new_scores = defaultdict(dict)
+        for offset in range(0, len(columns), self.block_size):
+            block_columns = columns[offset:offset + self.block_size]
+            block = self._similarity_block(interactions, block_columns)
+            lists.update(self._top_neighbors(block, block_columns))
+            coo = block.tocoo()
+            for row, j, score in zip(coo.row, coo.col, coo.data):
+                column = int(block_columns[j])
+                if row != column and score >= self.min_similarity:
+                    new_scores[int(row)][column] = float(score)
+
+        changed_columns = set(int(column) for column in columns)
+        changed_ids = [interactions.recipe_ids[column] for column in changed_columns]
+        affected_ids = {
+            str(recipe_id) for recipe_id in
+            RecipeNeighbor.objects.filter(neighbor_id__in=changed_ids).values_list('recipe_id', flat=True)
+        }
+        affected = {interactions.recipe_index[recipe_id] for recipe_id in affected_ids if recipe_id in interactions.recipe_index}
+        affected.update(new_scores)
+        affected -= changed_columns
+
+        stored = defaultdict(list)
+        for recipe_id, neighbor_id, score in RecipeNeighbor.objects.filter(
+            recipe_id__in=[interactions.recipe_ids[column] for column in affected]
+        ).values_list('recipe_id', 'neighbor_id', 'score'):
+            neighbor_column = interactions.recipe_index.get(str(neighbor_id))
+            if neighbor_column is not None and neighbor_column not in changed_columns:
+                stored[interactions.recipe_index[str(recipe_id)]].append((neighbor_column, score))
+
+        for column in affected:
+            merged = stored[column] + list(new_scores.get(column, {}).items())
+            merged.sort(key=lambda item: -item[1])
+            lists[column] = merged[:self.neighbors_per_recipe]
+        return self._write(interactions, lists)
+
+    def _write(self, interactions: InteractionMatrix, lists: Dict[int, List[Tuple[int, float]]],
+               replace_all: bool = False) -> int:
+        """Replace the stored neighbor lists of the given recipes."""
+        recipe_ids = interactions.recipe_ids
+        existing = set(Recipe.objects.filter(id__in=recipe_ids).values_list('id', flat=True))
+        rows = [
+            RecipeNeighbor(
+                recipe_id=recipe_ids[column],
+                neighbor_id=recipe_ids[neighbor],
+                score=score,
+                rank=rank,
+            )
+            for column, neighbors in lists.items() if recipe_ids[column] in existing
+            for rank, (neighbor, score) in enumerate(
+                (n for n in neighbors if recipe_ids[n[0]] in existing)
+            )
+        ]
+        with transaction.atomic():
+            if replace_all:
+                RecipeNeighbor.objects.all().delete()
+            else:
+                RecipeNeighbor.objects.filter(recipe_id__in=[recipe_ids[column] for column in lists]).delete()
+            RecipeNeighbor.objects.bulk_create(rows, batch_size=1000)
+        return len(lists)
+
+    # Serving
+
+    def get_similar(self, recipe: Recipe, limit: Optional[int] = None) -> List[RecipeNeighbor]:
+        """Visible neighbors of ``recipe`` in rank order, with the neighbor recipes loaded."""
+        neighbors = (
+            RecipeNeighbor.objects.filter(
+                recipe=recipe,
+                neighbor__is_published=True,
+                neighbor__moderation_status=Recipe.ModerationStatus.APPROVED,
+            )
+            .select_related('neighbor__author')
+            .prefetch_related('neighbor__categories')
+            .order_by('rank')
+        )
+        return list(neighbors[:limit or self.neighbors_per_recipe])
+
+
+# Service instance
+similar_recipes_service = SimilarRecipesService()
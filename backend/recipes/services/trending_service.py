@@ -0,0 +1,200 @@
+"""
+Trending recipes ranked by exponentially time-decayed engagement.
+
+Every view, favorite and rating adds ``weight * 2 ** (-age / half_life)`` to a
+recipe's score. Scores are stored as ``log2`` of the sum expressed relative to
+a fixed epoch, so an event at time ``t`` contributes
+``log2(weight) + (t - epoch) / half_life``. Decay then never has to be applied
+to stored rows: ordering by the stored value equals ordering by the decayed
+score at any moment, and updates are a single log-sum-exp per recipe.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from ..models import Category, Rating, Recipe, RecipeTrendingScore, RecipeView, UserFavorite
+from .view_stats_service import non_author_filter
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# log2 of a zero score; combines with any real score to leave it unchanged
+EMPTY_SCORE = -1e18
+
+
+def log2_add(a: float, b: float) -> float:
+    """Return ``log2(2 ** a + 2 ** b)`` without overflowing."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+class TrendingService:
+    """Service maintaining and querying time-decayed trending scores."""
+
+    VIEW = 'view'
+    FAVORITE = 'favorite'
+    RATING = 'rating'
+
+    def __init__(self):
+        config = getattr(settings, 'RECIPE_TRENDING', {})
+        self.half_life = timedelta(hours=config.get('HALF_LIFE_HOURS', 24))
+        self.weights = {
+            self.VIEW: 1.0,
+            self.FAVORITE: 5.0,
+            self.RATING: 3.0,
+            **config.get('WEIGHTS', {}),
+        }
+        self.prune_below = config.get('PRUNE_BELOW_SCORE', 0.01)
+        self.rebuild_days = config.get('REBUILD_DAYS', 14)
+
+    def _log_contribution(self, weight: float, at: datetime) -> float:
+        return math.log2(weight) + (at - EPOCH) / self.half_life
+
+    def decayed_score(self, stored_score: float, now: Optional[datetime] = None) -> float:
+        """Convert a stored score into the decayed score at ``now``."""
+        now = now or timezone.now()
+        exponent = stored_score - (now - EPOCH) / self.half_life
+        return 2 ** exponent if exponent > -1000 else 0.0
+
+    # Recording
+
+    def record_events(self, events: Iterable[Tuple[object, str, datetime, float]]) -> int:
+        """
+        Add engagement events to the trending scores.
+
+        Args:
+            events: ``(recipe_id, kind, occurred_at, multiplier)`` tuples, where
+                ``kind`` selects the configured weight
+
+        Returns:
+            Number of recipes whose score changed
+        """
+        increments = {}
+        last_event = {}
+        for recipe_id, kind, occurred_at, multiplier in events:
+            weight = self.weights.get(kind, 0) * multiplier
+            if weight <= 0:
+                continue
+            recipe_id = str(recipe_id)
+            contribution = self._log_contribution(weight, occurred_at)
+            increments[recipe_id] = log2_add(increments.get(recipe_id, EMPTY_SCORE), contribution)
+            last_event[recipe_id] = max(last_event.get(recipe_id, occurred_at), occurred_at)
+        if not increments:
+            return 0
+
+        with transaction.atomic():
+            # Create missing rows first so concurrent writers combine under the row lock
+            existing_recipes = Recipe.objects.filter(id__in=increments.keys()).values_list('id', flat=True)
+            RecipeTrendingScore.objects.bulk_create(
+                [
+                    RecipeTrendingScore(recipe_id=recipe_id, score=EMPTY_SCORE, last_event_at=last_event[str(recipe_id)])
+                    for recipe_id in existing_recipes
+                ],
+                ignore_conflicts=True,
+            )
+            rows = list(RecipeTrendingScore.objects.select_for_update().filter(recipe_id__in=increments.keys()))
+            now = timezone.now()
+            for row in rows:
+                recipe_id = str(row.recipe_id)
+                row.score = log2_add(row.score, increments[recipe_id])
+                row.last_event_at = max(row.last_event_at, last_event[recipe_id])
+                row.updated_at = now
+            RecipeTrendingScore.objects.bulk_update(rows, ['score', 'last_event_at', 'updated_at'], batch_size=500)
+        return len(rows)
+
+    def record_views(self, views: Iterable[RecipeView]) -> int:
+        """Add ingested views to the scores, ignoring authors viewing their own recipes."""
+        views = list(views)
+        authors = dict(
+            Recipe.objects.filter(id__in={view.recipe_id for view in views}).values_list('id', 'author_id')
+        )
+        authors = {str(recipe_id): str(author_id) for recipe_id, author_id in authors.items()}
+        now = timezone.now()
+        return self.record_events(
+            (view.recipe_id, self.VIEW, view.created_at or now, 1.0)
+            for view in views
+            if not (view.user_id and str(view.user_id) == authors.get(str(view.recipe_id)))
+        )
+
+    def record_favorite(self, favorite: UserFavorite) -> int:
+        """Add a new favorite to the recipe's score."""
+        return self.record_events([(favorite.recipe_id, self.FAVORITE, favorite.created_at, 1.0)])
+
+    def record_rating(self, rating: Rating) -> int:
+        """Add a new rating to the recipe's score, weighted by its stars."""
+        return self.record_events([(rating.recipe_id, self.RATING, rating.created_at, rating.rating / 5)])
+
+    # Maintenance
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Delete scores that have decayed below ``PRUNE_BELOW_SCORE``."""
+        now = now or timezone.now()
+        threshold = math.log2(self.prune_below) + (now - EPOCH) / self.half_life
+        deleted, _ = RecipeTrendingScore.objects.filter(score__lt=threshold).delete()
+        return deleted
+
+    def rebuild(self, days: Optional[int] = None, now: Optional[datetime] = None) -> int:
+        """
+        Recompute all scores from the last ``days`` of engagement.
+
+        Views are replayed per hour from the raw view log, so this is meant
+        for initial deployment or changed weights, not for regular runs.
+        """
+        now = now or timezone.now()
+        since = now - timedelta(days=days or self.rebuild_days)
+        events = []
+        hourly_views = (
+            RecipeView.objects.filter(non_author_filter(), created_at__gte=since)
+            .annotate(hour=TruncHour('created_at'))
+            .values_list('recipe_id', 'hour')
+            .annotate(views=Count('id'))
+        )
+        for recipe_id, hour, views in hourly_views.iterator():
+            events.append((recipe_id, self.VIEW, hour + timedelta(minutes=30), float(views)))
+        for recipe_id, created_at in UserFavorite.objects.filter(created_at__gte=since).values_list(
+            'recipe_id', 'created_at'
+        ).iterator():
+            events.append((recipe_id, self.FAVORITE, created_at, 1.0))
+        for recipe_id, created_at, stars in Rating.objects.filter(created_at__gte=since).values_list(
+            'recipe_id', 'created_at', 'rating'
+        ).iterator():
+            events.append((recipe_id, self.RATING, created_at, stars / 5))
+
+        with transaction.atomic():
+            RecipeTrendingScore.objects.all().delete()
+            return self.record_events(events)
+
+    # Queries
+
+    def get_trending(self, category: Optional[Category] = None, include_descendants: bool = False):
+        """
+        Published, approved recipes ordered by trending score.
+
+        Returns a lazy queryset so callers can paginate it with an indexed
+        ``ORDER BY score DESC LIMIT``.
+        """
+        queryset = Recipe.objects.filter(
+            trending__isnull=False,
+            is_published=True,
+            moderation_status=Recipe.ModerationStatus.APPROVED,
+        )
+        if category is not None:
+            categories = [category] + category.get_descendants() if include_descendants else [category]
+            queryset = queryset.filter(categories__in=categories).distinct()
+        return (
+            queryset.select_related('author', 'trending')
+            .prefetch_related('categories')
+            .order_by('-trending__score')
+        )
+
+
+# Service instance
+trending_service = TrendingService()
@@ -0,0 +1,580 @@
+"""
+Recipe view statistics backed by time-bucketed rollups.
+
+Raw ``RecipeView`` rows are aggregated into hourly and daily
+``RecipeViewRollup`` buckets up to a watermark. Statistics read the rollups
+plus the raw tail created after the watermark, so they stay exact while raw
+rows older than the retention window can be purged.
+
+Distinct viewers are counted with per-recipe, per-day HyperLogLog sketches
+(``RecipeViewSketch``) that are updated as views are ingested. Any recipe,
+author or date range is answered by merging sketches, within the relative
+standard error documented in ``core.utils.hyperloglog`` (1.6% at the default
+precision).
+
+View durations are summarized with DDSketch quantile sketches stored on each
+rollup bucket, so p50/p90/p99 dwell times are read by merging daily buckets.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncDate, TruncDay, TruncHour
+from django.utils import timezone
+
+from core.utils.ddsketch import DEFAULT_RELATIVE_ACCURACY, DDSketch
+from core.utils.hyperloglog import DEFAULT_PRECISION, HyperLogLog, standard_error
+from ..models import (
+    BatchJobState, Recipe, RecipeView, RecipeViewerRollup, RecipeViewRollup, RecipeViewSketch,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_JOB_NAME = 'recipe_views'
+
+
+def viewer_expression():
+    """Identify a viewer by user ID, or by IP address for anonymous views."""
+    return Coalesce(
+        Cast('user', models.CharField()),
+        Cast('ip_address', models.CharField()),
+        output_field=models.CharField(),
+    )
+
+
+def viewer_key(user_id, ip_address) -> str:
+    """Key identifying a viewer in HyperLogLog sketches."""
+    return f'user:{user_id}' if user_id else f'ip:{ip_address}'
+
+
+def non_author_filter(prefix: str = '') -> Q:
+    """Match views that were not made by the recipe's own author."""
+    return Q(**{f'{prefix}user__isnull': True}) | ~Q(**{f'{prefix}user': F(f'{prefix}recipe__author')})
+
+
+class RecipeViewStatsService:
+    """Service maintaining recipe view rollups and answering view statistics."""
+
+    def __init__(self):
+        config = getattr(settings, 'RECIPE_VIEW_ROLLUPS', {})
+        self.rollup_lag = timedelta(seconds=config.get('ROLLUP_LAG_SECONDS', 300))
+        self.retention_days = config.get('RAW_RETENTION_DAYS', 90)
+        self.purge_chunk_size = config.get('PURGE_CHUNK_SIZE', 5000)
+        self.hll_precision = config.get('HLL_PRECISION', DEFAULT_PRECISION)
+        self.duration_accuracy = config.get('DURATION_SKETCH_ACCURACY', DEFAULT_RELATIVE_ACCURACY)
+
+    @property
+    def unique_viewers_error(self) -> float:
+        """Relative standard error of unique viewer estimates."""
+        return standard_error(self.hll_precision)
+
+    # Rollup maintenance
+
+    def get_watermark(self) -> Optional[datetime]:
+        """Return the instant up to which raw views have been rolled up."""
+        state = BatchJobState.objects.filter(name=ROLLUP_JOB_NAME).first()
+        return state.processed_until if state else None
+
+    def rollup(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Roll raw views up to the last closed hour, incrementally.
+
+        Only hours that ended at least ``ROLLUP_LAG_SECONDS`` ago are processed,
+        leaving time for buffered views to be flushed. Rollups and the new
+        watermark are committed together, so an interrupted run is simply
+        repeated.
+
+        Returns:
+            Summary with the processed range and number of buckets written
+        """
+        now = now or timezone.now()
+        end = (now - self.rollup_lag).replace(minute=0, second=0, microsecond=0)
+
+        with transaction.atomic():
+            state = BatchJobState.objects.select_for_update().filter(name=ROLLUP_JOB_NAME).first()
+            if state:
+                start = state.processed_until
+            else:
+                first_view = RecipeView.objects.order_by('created_at').values_list('created_at', flat=True).first()
+                start = first_view.replace(minute=0, second=0, microsecond=0) if first_view else end
+
+            if start >= end:
+                return {'start': start, 'end': start, 'hourly_buckets': 0, 'daily_buckets': 0}
+
+            hourly = self._aggregate(start, end, TruncHour, RecipeViewRollup.Granularity.HOUR)
+            self._attach_duration_sketches(hourly, self._raw_duration_sketches(start, end))
+            self._upsert(hourly)
+
+            # Recompute the daily buckets touched by this range from the raw
+            # rows, and their duration sketches from the day's hourly buckets
+            day_start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+            daily = self._aggregate(day_start, end, TruncDay, RecipeViewRollup.Granularity.DAY)
+            self._attach_duration_sketches(daily, self._hourly_duration_sketches(day_start, end))
+            self._upsert(daily)
+            self._upsert_viewer_days(day_start, end)
+
+            # Fold the closed hours into the sketches as well, covering views
+            # that never passed through ingestion (adding a viewer twice is a no-op)
+            self._sketch_raw_views(start, end)
+
+            BatchJobState.objects.update_or_create(
+                name=ROLLUP_JOB_NAME,
+                defaults={'processed_until': end}
+            )
+
+        logger.info(f"Rolled up recipe views {start} -> {end}: {len(hourly)} hourly, {len(daily)} daily buckets")
+        return {'start': start, 'end': end, 'hourly_buckets': len(hourly), 'daily_buckets': len(daily)}
+
+    def _aggregate(self, start, end, trunc, granularity):
+        """Aggregate raw views in ``[start, end)`` into buckets of the given granularity."""
+        rows = (
+            RecipeView.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(bucket=trunc('created_at'))
+            .values('recipe_id', 'bucket')
+            .annotate(
+                views=Count('id'),
+                viewers=Count(viewer_expression(), distinct=True, filter=non_author_filter()),
+                duration_sum=Coalesce(Sum('view_duration_seconds'), 0),
+                duration_count=Count('view_duration_seconds'),
+            )
+        )
+        return [
+            RecipeViewRollup(
+                recipe_id=row['recipe_id'],
+                granularity=granularity,
+                bucket_start=row['bucket'],
+                view_count=row['views'],
+                unique_viewers=row['viewers'],
+                total_duration_seconds=row['duration_sum'],
+                duration_count=row['duration_count'],
+            )
+            for row in rows
+        ]
+
+    def _upsert(self, rollups):
+        """Insert rollup buckets, replacing the aggregates of existing ones."""
+        if not rollups:
+            return
+        RecipeViewRollup.objects.bulk_create(
+            rollups,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['recipe', 'granularity', 'bucket_start'],
+            update_fields=[
+                'view_count', 'unique_viewers', 'total_duration_seconds', 'duration_count',
+                'duration_sketch', 'updated_at',
+            ],
+        )
+
+    def _upsert_viewer_days(self, start, end) -> int:
+        """Recompute the per-user daily rollups of signed-in views in ``[start, end)``."""
+        rows = (
+            RecipeView.objects.filter(created_at__gte=start, created_at__lt=end, user__isnull=False)
+            .annotate(bucket=TruncDay('created_at'))
+            .values('user_id', 'recipe_id', 'bucket')
+            .annotate(
+                views=Count('id'),
+                duration_sum=Coalesce(Sum('view_duration_seconds'), 0),
+                duration_count=Count('view_duration_seconds'),
+            )
+        )
+        rollups = [
+            RecipeViewerRollup(
+                user_id=row['user_id'],
+                recipe_id=row['recipe_id'],
+                bucket_start=row['bucket'],
+                view_count=row['views'],
+                total_duration_seconds=row['duration_sum'],
+                duration_count=row['duration_count'],
+            )
+            for row in rows
+        ]
+        RecipeViewerRollup.objects.bulk_create(
+            rollups,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user', 'recipe', 'bucket_start'],
+            update_fields=['view_count', 'total_duration_seconds', 'duration_count', 'updated_at'],
+        )
+        return len(rollups)
+
+    def _raw_duration_sketches(self, start: datetime, end: datetime) -> Dict[tuple, DDSketch]:
+        """Build duration sketches per recipe and hour from raw views in ``[start, end)``."""
+        sketches = defaultdict(lambda: DDSketch(self.duration_accuracy))
+        rows = (
+            RecipeView.objects.filter(
+                created_at__gte=start, created_at__lt=end, view_duration_seconds__isnull=False
+            )
+            .annotate(bucket=TruncHour('created_at'))
+            .values_list('recipe_id', 'bucket', 'view_duration_seconds')
+        )
+        for recipe_id, bucket, duration in rows.iterator():
+            sketches[(recipe_id, bucket)].add(duration)
+        return sketches
+
+    def _hourly_duration_sketches(self, start: datetime, end: datetime) -> Dict[tuple, DDSketch]:
+        """Merge stored hourly duration sketches in ``[start, end)`` into daily ones."""
+        sketches = defaultdict(lambda: DDSketch(self.duration_accuracy))
+        rows = RecipeViewRollup.objects.filter(
+            granularity=RecipeViewRollup.Granularity.HOUR,
+            bucket_start__gte=start,
+            bucket_start__lt=end,
+            duration_sketch__isnull=False,
+        ).values_list('recipe_id', 'bucket_start', 'duration_sketch')
+        for recipe_id, bucket_start, data in rows.iterator():
+            day = timezone.localtime(bucket_start).replace(hour=0, minute=0, second=0, microsecond=0)
+            sketches[(recipe_id, day)].merge_bytes(data)
+        return sketches
+
+    @staticmethod
+    def _attach_duration_sketches(rollups, sketches: Dict[tuple, DDSketch]) -> None:
+        for rollup in rollups:
+            sketch = sketches.get((rollup.recipe_id, rollup.bucket_start))
+            rollup.duration_sketch = sketch.to_bytes() if sketch else None
+
+    # Unique viewer sketches
+
+    def add_views_to_sketches(self, views: Iterable[RecipeView]) -> int:
+        """
+        Add freshly ingested views to the per-day viewer sketches.
+
+        Views by the recipe's own author are ignored.
+
+        Returns:
+            Number of sketches updated
+        """
+        views = list(views)
+        recipe_ids = {str(view.recipe_id) for view in views}
+        authors = {
+            str(pk): str(author_id)
+            for pk, author_id in Recipe.objects.filter(id__in=recipe_ids).values_list('id', 'author_id')
+        }
+        viewers = []
+        for view in views:
+            recipe_id = str(view.recipe_id)
+            if recipe_id not in authors or (view.user_id and str(view.user_id) == authors[recipe_id]):
+                continue
+            created_at = view.created_at or timezone.now()
+            viewers.append((recipe_id, timezone.localtime(created_at).date(), viewer_key(view.user_id, view.ip_address)))
+        return self._merge_into_sketches(viewers)
+
+    def _sketch_raw_views(self, start: datetime, end: datetime) -> int:
+        """Add the distinct viewers of raw views in ``[start, end)`` to the sketches."""
+        rows = (
+            RecipeView.objects.filter(non_author_filter(), created_at__gte=start, created_at__lt=end)
+            .annotate(day=TruncDate('created_at'))
+            .values_list('recipe_id', 'day', 'user_id', 'ip_address')
+            .distinct()
+        )
+        viewers = [
+            (str(recipe_id), day, viewer_key(user_id, ip_address))
+            for recipe_id, day, user_id, ip_address in rows.iterator()
+        ]
+        return self._merge_into_sketches(viewers)
+
+    def _merge_into_sketches(self, viewers) -> int:
+        """Merge ``(recipe_id, day, viewer_key)`` triples into the stored sketches."""
+        grouped = defaultdict(lambda: HyperLogLog(self.hll_precision))
+        for recipe_id, day, key in viewers:
+            grouped[(recipe_id, day)].add(key)
+        if not grouped:
+            return 0
+
+        with transaction.atomic():
+            # Create missing rows first so concurrent writers merge under the row lock
+            empty = HyperLogLog(self.hll_precision).to_bytes()
+            RecipeViewSketch.objects.bulk_create(
+                [RecipeViewSketch(recipe_id=recipe_id, day=day, sketch=empty) for recipe_id, day in grouped],
+                ignore_conflicts=True,
+            )
+            rows = RecipeViewSketch.objects.select_for_update().filter(
+                recipe_id__in={recipe_id for recipe_id, _ in grouped},
+                day__in={day for _, day in grouped},
+            )
+            now = timezone.now()
+            changed = []
+            for row in rows:
+                sketch = grouped.get((str(row.recipe_id), row.day))
+                if sketch is None:
+                    continue
+                row.sketch = sketch.merge_bytes(row.sketch).to_bytes()
+                row.updated_at = now
+                changed.append(row)
+            RecipeViewSketch.objects.bulk_update(changed, ['sketch', 'updated_at'], batch_size=500)
+        return len(changed)
+
+    def unique_viewers(
+        self,
+        recipe_ids: Optional[Iterable] = None,
+        author=None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """
+        Estimate distinct viewers of recipes by merging daily sketches.
+
+        Args:
+            recipe_ids: Restrict to these recipes
+            author: Restrict to recipes written by this author
+            start_date: First day to include
+            end_date: Last day to include
+
+        Returns:
+            Estimated distinct viewers (author excluded), within
+            ``unique_viewers_error`` relative standard error
+        """
+        condition = Q()
+        if recipe_ids is not None:
+            condition &= Q(recipe_id__in=list(recipe_ids))
+        if author is not None:
+            condition &= Q(recipe__author=author)
+
+        merged = HyperLogLog(self.hll_precision)
+        sketches = RecipeViewSketch.objects.filter(condition)
+        tail = RecipeView.objects.filter(condition, non_author_filter())
+        if start_date:
+            sketches = sketches.filter(day__gte=start_date)
+            tail = tail.filter(created_at__date__gte=start_date)
+        if end_date:
+            sketches = sketches.filter(day__lte=end_date)
+            tail = tail.filter(created_at__date__lte=end_date)
+        for data in sketches.values_list('sketch', flat=True).iterator():
+            merged.merge_bytes(data)
+
+        # Views after the watermark may have been written without passing
+        # through ingestion; the rollup sketches them once their hour closes.
+        watermark = self.get_watermark()
+        if watermark is not None:
+            tail = tail.filter(created_at__gte=watermark)
+        for user_id, ip_address in tail.values_list('user_id', 'ip_address').distinct().iterator():
+            merged.add(viewer_key(user_id, ip_address))
+        return merged.count()
+
+    def purge_raw_views(
+        self,
+        days: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        pause_seconds: float = 0,
+    ) -> int:
+        """
+        Delete raw views older than the retention window in small chunks.
+
+        Rows that have not been rolled up yet, or that belong to the day still
+        being rolled up, are never deleted. Each chunk is its own short
+        transaction, so no long-held locks block ingestion.
+
+        Returns:
+            Number of rows deleted
+        """
+        days = self.retention_days if days is None else days
+        chunk_size = chunk_size or self.purge_chunk_size
+        watermark = self.get_watermark()
+        if watermark is None:
+            return 0
+
+        # Keep the watermark's day intact: its daily bucket is recomputed from raw rows
+        watermark_day = watermark.replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = min(timezone.now() - timedelta(days=days), watermark_day)
+        deleted = 0
+        while True:
+            pks = list(
+                RecipeView.objects.filter(created_at__lt=cutoff)
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                count, _ = RecipeView.objects.filter(pk__in=pks).delete()
+            deleted += count
+            if pause_seconds:
+                time.sleep(pause_seconds)
+        logger.info(f"Purged {deleted} raw recipe views older than {cutoff}")
+        return deleted
+
+    # Statistics
+
+    def _combined_totals(self, rollup_filter: Q, view_filter: Q) -> Dict[str, Any]:
+        """Sum daily rollups before the watermark with the raw tail after it."""
+        watermark = self.get_watermark()
+        totals = {'views': 0, 'duration_sum': 0, 'duration_count': 0}
+
+        tail = RecipeView.objects.filter(view_filter)
+        if watermark is not None:
+            rolled = RecipeViewRollup.objects.filter(
+                rollup_filter,
+                granularity=RecipeViewRollup.Granularity.DAY,
+                bucket_start__lt=watermark,
+            ).aggregate(
+                views=Coalesce(Sum('view_count'), 0),
+                duration_sum=Coalesce(Sum('total_duration_seconds'), 0),
+                duration_count=Coalesce(Sum('duration_count'), 0),
+            )
+            for key in totals:
+                totals[key] += rolled[key]
+            tail = tail.filter(created_at__gte=watermark)
+
+        recent = tail.aggregate(
+            views=Count('id'),
+            duration_sum=Coalesce(Sum('view_duration_seconds'), 0),
+            duration_count=Count('view_duration_seconds'),
+        )
+        for key in totals:
+            totals[key] += recent[key]
+
+        totals['average_duration'] = (
+            totals['duration_sum'] / totals['duration_count'] if totals['duration_count'] else None
+        )
+        return totals
+
+    def duration_percentiles(self, condition: Q) -> Dict[str, Optional[float]]:
+        """
+        p50/p90/p99 view durations in seconds for views matching ``condition``.
+
+        Merges the daily duration sketches before the watermark with the raw
+        tail after it; estimates are within ``DURATION_SKETCH_ACCURACY``
+        relative error.
+        """
+        merged = DDSketch(self.duration_accuracy)
+        tail = RecipeView.objects.filter(condition, view_duration_seconds__isnull=False)
+        watermark = self.get_watermark()
+        if watermark is not None:
+            sketches = RecipeViewRollup.objects.filter(
+                condition,
+                granularity=RecipeViewRollup.Granularity.DAY,
+                bucket_start__lt=watermark,
+                duration_sketch__isnull=False,
+            ).values_list('duration_sketch', flat=True)
+            for data in sketches.iterator():
+                merged.merge_bytes(data)
+            tail = tail.filter(created_at__gte=watermark)
+        merged.update(tail.values_list('view_duration_seconds', flat=True).iterator())
+
+        percentiles = {}
+        for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            value = merged.quantile(q)
+            percentiles[name] = round(value, 1) if value is not None else None
+        return percentiles
+
+    def recipe_stats(self, recipe: Recipe) -> Dict[str, Any]:
+        """
+        View statistics for a recipe.
+
+        ``unique_views`` is a sketch estimate of distinct viewers other than
+        the recipe's author (before the rollups, the author's own visits
+        were counted too).
+        """
+        totals = self._combined_totals(Q(recipe=recipe), Q(recipe=recipe))
+        return {
+            'total_views': totals['views'],
+            'unique_views': self.unique_viewers(recipe_ids=[recipe.id]),
+            'average_view_duration': totals['average_duration'],
+            'view_duration_percentiles': self.duration_percentiles(Q(recipe=recipe)),
+        }
+
+    def viewer_stats(self, user, limit: int = 5) -> Dict[str, Any]:
+        """
+        View statistics of what ``user`` has viewed.
+
+        Reads the per-user daily rollups before the watermark plus the raw
+        tail after it, so totals survive the purge of old raw views.
+        """
+        counts = defaultdict(int)
+        duration_sum = duration_count = 0
+        aggregates = {
+            'views': Sum('view_count'),
+            'duration_sum': Sum('total_duration_seconds'),
+            'duration_count': Sum('duration_count'),
+        }
+        watermark = self.get_watermark()
+        tail = RecipeView.objects.filter(user=user)
+        groups = []
+        if watermark is not None:
+            groups.append(
+                RecipeViewerRollup.objects.filter(user=user, bucket_start__lt=watermark)
+                .values('recipe_id').annotate(**aggregates)
+            )
+            tail = tail.filter(created_at__gte=watermark)
+        groups.append(tail.values('recipe_id').annotate(
+            views=Count('id'),
+            duration_sum=Coalesce(Sum('view_duration_seconds'), 0),
+            duration_count=Count('view_duration_seconds'),
+        ))
+        for rows in groups:
+            for row in rows:
+                counts[row['recipe_id']] += row['views']
+                duration_sum += row['duration_sum'] or 0
+                duration_count += row['duration_count'] or 0
+
+        return {
+            'total_views': sum(counts.values()),
+            'unique_recipes': len(counts),
+            'average_view_duration': duration_sum / duration_count if duration_count else None,
+            'most_viewed_recipe_ids': sorted(counts, key=counts.get, reverse=True)[:limit],
+        }
+
+    def author_stats(self, author) -> Dict[str, Any]:
+        """View statistics across all recipes written by ``author``."""
+        totals = self._combined_totals(Q(recipe__author=author), Q(recipe__author=author))
+        view_counts = self.view_counts(Recipe.objects.filter(author=author).values_list('id', flat=True))
+        most_viewed_id = max(view_counts, key=view_counts.get) if view_counts else None
+        return {
+            'total_views': totals['views'],
+            'unique_viewers': self.unique_viewers(author=author),
+            'average_view_duration': totals['average_duration'],
+            'view_duration_percentiles': self.duration_percentiles(Q(recipe__author=author)),
+            'most_viewed_recipe_id': most_viewed_id,
+        }
+
+    def view_counts(self, recipe_ids: Iterable) -> Dict[Any, int]:
+        """Total view counts keyed by recipe ID (recipes without views are omitted)."""
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return {}
+        return self._grouped_counts('recipe_id', Q(recipe_id__in=recipe_ids))
+
+    def view_counts_by_author(self, author_ids: Iterable) -> Dict[Any, int]:
+        """Total view counts across each author's recipes, keyed by author ID."""
+        author_ids = list(author_ids)
+        if not author_ids:
+            return {}
+        return self._grouped_counts('recipe__author_id', Q(recipe__author_id__in=author_ids))
+
+    def most_viewed(self, limit: int, condition: Q = Q()) -> List[Tuple[Any, int]]:
+        """The ``limit`` recipes with the most views as (recipe ID, views), most viewed first."""
+        counts = self._grouped_counts('recipe_id', condition)
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def total_views(self) -> int:
+        """Total number of recipe views recorded on the platform."""
+        return self._combined_totals(Q(), Q())['views']
+
+    def _grouped_counts(self, group_field: str, condition: Q) -> Dict[Any, int]:
+        watermark = self.get_watermark()
+        counts = {}
+        tail = RecipeView.objects.filter(condition)
+        if watermark is not None:
+            rolled = (
+                RecipeViewRollup.objects.filter(
+                    condition,
+                    granularity=RecipeViewRollup.Granularity.DAY,
+                    bucket_start__lt=watermark,
+                )
+                .values(group_field)
+                .annotate(views=Sum('view_count'))
+            )
+            for row in rolled:
+                counts[row[group_field]] = row['views']
+            tail = tail.filter(created_at__gte=watermark)
+
+        for row in tail.values(group_field).annotate(views=Count('id')):
+            counts[row[group_field]] = counts.get(row[group_field], 0) + row['views']
+        return counts
+
+
+# Service instance
+view_stats_service = RecipeViewStatsService()
@@ -0,0 +1,400 @@
+"""
+Write-behind ingestion pipeline for recipe view tracking.
+
+Views are accepted into a bounded buffer and persisted in batches by a
+background flusher, keeping the insert off the request path.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from core.events.bus import EventBus
+from ..models import Recipe, RecipeView
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Event published after each successfully persisted batch of views
+VIEWS_FLUSHED = 'recipe_views.flushed'
+
+
+class InMemoryViewBuffer:
+    """Bounded, thread-safe, process-local buffer of pending view events."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._events = deque()
+        self._lock = threading.Lock()
+
+    def push(self, event: Dict[str, Any]) -> bool:
+        """Append an event; returns False when the buffer is full."""
+        with self._lock:
+            if len(self._events) >= self.max_size:
+                return False
+            self._events.append(event)
+            return True
+
+    def pop_batch(self, size: int) -> List[Dict[str, Any]]:
+        """Remove and return up to ``size`` events from the head of the buffer."""
+        with self._lock:
+            count = min(size, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def requeue(self, events: List[Dict[str, Any]]) -> None:
+        """Put events back at the head of the buffer after a failed flush."""
+        with self._lock:
+            self._events.extendleft(reversed(events))
+
+    def ack(self, events: List[Dict[str, Any]]) -> None:
+        """Acknowledge a persisted batch (nothing to do for the local buffer)."""
+
+    def recover(self) -> int:
+        """Requeue abandoned in-flight batches (not applicable locally)."""
+        return 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class RedisViewBuffer:
+    """
+    Bounded buffer backed by a Redis list, shared by all workers.
+
+    Popped batches are moved to an in-flight list and only dropped once
+    acknowledged, so a worker dying mid-flush leaves its batch behind for
+    ``recover`` to requeue (at-least-once delivery).
+    """
+
+    BUFFER_KEY = 'recipe_views:buffer'
+    INFLIGHT_INDEX_KEY = 'recipe_views:inflight'
+    INFLIGHT_KEY_PREFIX = 'recipe_views:inflight:'
+
+    # Atomically append ARGV[2] unless the buffer already holds ARGV[1] items
+    PUSH_SCRIPT = """
+        if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+            return 0
+        end
+        redis.call('RPUSH', KEYS[1], ARGV[2])
+        return 1
+    """
+
+    # Atomically move up to ARGV[1] items from the buffer to a batch list
+    POP_SCRIPT = """
+        local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+        if #items > 0 then
+            redis.call('LTRIM', KEYS[1], #items, -1)
+            redis.call('RPUSH', KEYS[2], unpack(items))
+            redis.call('ZADD', KEYS[3], ARGV[2], KEYS[2])
+        end
+        return items
+    """
+
+    # Atomically push a batch list back to the head of the buffer
+    REQUEUE_SCRIPT = """
+        local items = redis.call('LRANGE', KEYS[2], 0, -1)
+        for i = #items, 1, -1 do
+            redis.call('LPUSH', KEYS[1], items[i])
+        end
+        redis.call('DEL', KEYS[2])
+        redis.call('ZREM', KEYS[3], KEYS[2])
+        return #items
+    """
+
+    def __init__(self, max_size: int, lease_seconds: int):
+        from django_redis import get_redis_connection
+
+        self.max_size = max_size
+        self.lease_seconds = lease_seconds
+        self._redis = get_redis_connection('default')
+        self._push = self._redis.register_script(self.PUSH_SCRIPT)
+        self._pop = self._redis.register_script(self.POP_SCRIPT)
+        self._requeue = self._redis.register_script(self.REQUEUE_SCRIPT)
+        self._batch_keys = {}
+        self._lock = threading.Lock()
+
+    def push(self, event: Dict[str, Any]) -> bool:
+        return bool(self._push(keys=[self.BUFFER_KEY], args=[self.max_size, json.dumps(event)]))
+
+    def pop_batch(self, size: int) -> List[Dict[str, Any]]:
+        batch_key = f'{self.INFLIGHT_KEY_PREFIX}{uuid.uuid4().hex}'
+        items = self._pop(
+            keys=[self.BUFFER_KEY, batch_key, self.INFLIGHT_INDEX_KEY],
+            args=[size, time.time()],
+        )
+        events = [json.loads(item) for item in items]
+        if events:
+            with self._lock:
+                self._batch_keys[events[0]['id']] = batch_key
+        return events
+
+    def _release(self, events: List[Dict[str, Any]]) -> Optional[str]:
+        if not events:
+            return None
+        with self._lock:
+            return self._batch_keys.pop(events[0]['id'], None)
+
+    def requeue(self, events: List[Dict[str, Any]]) -> None:
+        batch_key = self._release(events)
+        if batch_key:
+            self._requeue(keys=[self.BUFFER_KEY, batch_key, self.INFLIGHT_INDEX_KEY])
+
+    def ack(self, events: List[Dict[str, Any]]) -> None:
+        batch_key = self._release(events)
+        if batch_key:
+            pipe = self._redis.pipeline()
+            pipe.delete(batch_key)
+            pipe.zrem(self.INFLIGHT_INDEX_KEY, batch_key)
+            pipe.execute()
+
+    def recover(self) -> int:
+        """Requeue in-flight batches whose lease expired (their worker died)."""
+        cutoff = time.time() - self.lease_seconds
+        recovered = 0
+        for batch_key in self._redis.zrangebyscore(self.INFLIGHT_INDEX_KEY, 0, cutoff):
+            if isinstance(batch_key, bytes):
+                batch_key = batch_key.decode()
+            recovered += self._requeue(keys=[self.BUFFER_KEY, batch_key, self.INFLIGHT_INDEX_KEY])
+        if recovered:
+            logger.warning(f"Recovered {recovered} recipe views from abandoned flush batches")
+        return recovered
+
+    def __len__(self) -> int:
+        return self._redis.llen(self.BUFFER_KEY)
+
+
+class RecipeViewIngestionService:
+    """
+    Accepts recipe views without touching the database on the request path.
+
+    Duplicate views of the same recipe by the same user (or IP for anonymous
+    viewers) inside the dedupe window are dropped using short-TTL cache keys.
+    Accepted views are buffered and written with ``bulk_create`` whenever a
+    batch fills up or the flush interval elapses. When the buffer is full the
+    caller flushes inline (backpressure); if that cannot free space the view
+    is rejected rather than growing memory without bound.
+
+    Views carry client-generated primary keys and are inserted with
+    ``ignore_conflicts``, so replaying a batch after a partial failure never
+    duplicates rows. ``created_at`` is stamped at flush time, which lags the
+    actual view by at most the flush interval in normal operation.
+    """
+
+    RECORDED = 'recorded'
+    DUPLICATE = 'duplicate'
+    REJECTED = 'rejected'
+
+    def __init__(self):
+        config = getattr(settings, 'RECIPE_VIEW_TRACKING', {})
+        self.buffer_backend = config.get('BUFFER_BACKEND', 'auto')
+        self.max_buffer_size = config.get('MAX_BUFFER_SIZE', 10000)
+        self.batch_size = config.get('FLUSH_BATCH_SIZE', 500)
+        self.flush_interval = config.get('FLUSH_INTERVAL_SECONDS', 5)
+        self.dedupe_window = config.get('DEDUPE_WINDOW_SECONDS', 300)
+        self.inflight_lease = config.get('INFLIGHT_LEASE_SECONDS', 300)
+        self.background_flush = config.get('BACKGROUND_FLUSH', True)
+        self.recipe_cache_seconds = config.get('RECIPE_CACHE_SECONDS', 3600)
+
+        self._buffer = None
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flusher = None
+
+    @property
+    def buffer(self):
+        """Lazily create the configured buffer backend."""
+        if self._buffer is None:
+            self._buffer = self._create_buffer()
+        return self._buffer
+
+    def _create_buffer(self):
+        backend = self.buffer_backend
+        if backend == 'auto':
+            cache_backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+            backend = 'redis' if cache_backend.startswith('django_redis') else 'memory'
+
+        if backend == 'redis':
+            try:
+                return RedisViewBuffer(self.max_buffer_size, self.inflight_lease)
+            except Exception as e:
+                logger.warning(f"Redis view buffer unavailable, using in-memory buffer: {e}")
+        return InMemoryViewBuffer(self.max_buffer_size)
+
+    def dedupe_key(self, recipe_id, user_id=None, ip_address=None) -> str:
+        """Build the cache key identifying a viewer of a recipe."""
+        viewer = f"user:{user_id}" if user_id else f"ip:{ip_address}"
+        return f"recipe_view_seen:{recipe_id}:{viewer}"
+
+    def recipe_exists(self, recipe_id) -> bool:
+        """
+        Whether a recipe exists, cached so the request path rarely queries.
+
+        Misses are cached briefly, so a recipe created right after a lookup
+        is not rejected for long.
+        """
+        key = f"recipe_exists:{recipe_id}"
+        exists = cache.get(key)
+        if exists is None:
+            exists = Recipe.objects.filter(id=recipe_id).exists()
+            cache.set(key, exists, self.recipe_cache_seconds if exists else min(60, self.recipe_cache_seconds))
+        return exists
+
+    def record_view(
+        self,
+        recipe_id,
+        user_id=None,
+        ip_address: Optional[str] = None,
+        user_agent: str = '',
+        session_key: str = '',
+        view_duration_seconds: Optional[int] = None,
+    ) -> str:
+        """
+        Accept a view for asynchronous persistence.
+
+        Returns:
+            One of ``RECORDED``, ``DUPLICATE`` or ``REJECTED``.
+        """
+        key = self.dedupe_key(recipe_id, user_id, ip_address)
+        if not cache.add(key, 1, self.dedupe_window):
+            return self.DUPLICATE
+
+        event = {
+            'id': str(uuid.uuid4()),
+            'recipe_id': str(recipe_id),
+            'user_id': str(user_id) if user_id else None,
+            'ip_address': ip_address,
+            'user_agent': user_agent or '',
+            'session_key': session_key or '',
+            'view_duration_seconds': view_duration_seconds,
+            'timestamp': time.time(),
+        }
+
+        if not self.buffer.push(event):
+            # Backpressure: drain a batch inline before giving up on the view
+            self.flush(max_batches=1)
+            if not self.buffer.push(event):
+                cache.delete(key)
+                logger.warning("Recipe view buffer full, rejecting view")
+                return self.REJECTED
+
+        self._ensure_flusher()
+        if len(self.buffer) >= self.batch_size:
+            self._wakeup.set()
+        return self.RECORDED
+
+    def flush(self, max_batches: Optional[int] = None) -> int:
+        """
+        Persist buffered views in batches.
+
+        Args:
+            max_batches: Stop after this many batches (None drains the buffer)
+
+        Returns:
+            Number of view rows written
+        """
+        written = 0
+        batches = 0
+        with self._flush_lock:
+            while max_batches is None or batches < max_batches:
+                events = self.buffer.pop_batch(self.batch_size)
+                if not events:
+                    break
+                batches += 1
+                try:
+                    written += self._persist(events)
+                except Exception as e:
+                    # Keep the batch for the next attempt (at-least-once)
+                    logger.error(f"Failed to flush {len(events)} recipe views: {e}")
+                    self.buffer.requeue(events)
+                    break
+                self.buffer.ack(events)
+        return written
+
+    def _persist(self, events: List[Dict[str, Any]]) -> int:
+        """Write one batch of view events, skipping deleted recipes and users."""
+        recipe_ids = {event['recipe_id'] for event in events}
+        existing_recipes = {
+            str(pk) for pk in Recipe.objects.filter(id__in=recipe_ids).values_list('id', flat=True)
+        }
+        user_ids = {event['user_id'] for event in events if event['user_id']}
+        existing_users = set()
+        if user_ids:
+            existing_users = {
+                str(pk) for pk in User.objects.filter(id__in=user_ids).values_list('id', flat=True)
+            }
+
+        views = []
+        for event in events:
+            if event['recipe_id'] not in existing_recipes:
+                continue
+            user_id = event['user_id'] if event['user_id'] in existing_users else None
+            views.append(RecipeView(
+                id=event['id'],
+                recipe_id=event['recipe_id'],
+                user_id=user_id,
+                ip_address=event['ip_address'],
+                user_agent=event['user_agent'],
+                session_key=event['session_key'],
+                view_duration_seconds=event['view_duration_seconds'],
+            ))
+
+        if not views:
+            return 0
+
+        RecipeView.objects.bulk_create(views, batch_size=self.batch_size, ignore_conflicts=True)
+        EventBus.publish(VIEWS_FLUSHED, sender=RecipeView, views=views)
+        logger.debug(f"Flushed {len(views)} recipe views")
+        return len(views)
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher thread on first use."""
+        if not self.background_flush or (self._flusher and self._flusher.is_alive()):
+            return
+        with self._start_lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._stopping.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name='recipe-view-flusher', daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.shutdown)
+
+    def _flush_loop(self) -> None:
+        """Flush on size (wakeup event) or time (interval timeout)."""
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.buffer.recover()
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error in recipe view flusher: {e}")
+            finally:
+                close_old_connections()
+
+    def shutdown(self) -> None:
+        """Stop the flusher and drain whatever is still buffered."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._flusher and self._flusher.is_alive():
+            self._flusher.join(timeout=self.flush_interval)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to drain recipe view buffer on shutdown: {e}")
+
+
+# Service instance
+view_tracking_service = RecipeViewIngestionService()
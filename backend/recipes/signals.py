@@ -2,10 +2,23 @@
 Signal handlers for recipe management.
 """
 
-from django.db.models.signals import pre_save
+import logging
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import Recipe
+from core.events.bus import EventBus
+from core.services.image_blob_service import image_blob_service
+from .models import Category, Rating, Recipe, UserFavorite
+from .services.bootstrap_service import bootstrap_service
+from .services.content_similarity_service import content_similarity_service
+from .services.feed_service import feed_service
+from .services.trending_service import trending_service
+from .services.view_stats_service import view_stats_service
+from .services.view_tracking_service import VIEWS_FLUSHED
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(pre_save, sender=Recipe)
@@ -26,4 +39,114 @@ def handle_recipe_version(sender, instance, **kwargs):
                     instance.version += 1
                     break
         except Recipe.DoesNotExist:
-            pass  # New recipe, use default version=1 
\ No newline at end of file
+            pass  # New recipe, use default version=1 
+
+
+def update_view_sketches(sender, views, **kwargs):
+    """Add flushed views to the unique viewer sketches."""
+    try:
+        view_stats_service.add_views_to_sketches(views)
+    except Exception as e:
+        # The rollup re-sketches raw views, so a missed batch is healed later
+        logger.error(f"Error updating recipe view sketches: {e}")
+
+
+def update_trending_from_views(sender, views, **kwargs):
+    """Add flushed views to the trending scores."""
+    try:
+        trending_service.record_views(views)
+    except Exception as e:
+        logger.error(f"Error updating trending scores from views: {e}")
+
+
+EventBus.subscribe(VIEWS_FLUSHED, update_view_sketches)
+EventBus.subscribe(VIEWS_FLUSHED, update_trending_from_views)
+
+
+@receiver(post_save, sender=UserFavorite)
+def update_trending_from_favorite(sender, instance, created, **kwargs):
+    """Add new favorites to the trending scores."""
+    if not created:
+        return
+    try:
+        trending_service.record_favorite(instance)
+    except Exception as e:
+        logger.error(f"Error updating trending scores from favorite: {e}")
+
+
+@receiver(post_save, sender=Rating)
+def update_trending_from_rating(sender, instance, created, **kwargs):
+    """Add new ratings to the trending scores."""
+    if not created:
+        return
+    try:
+        trending_service.record_rating(instance)
+    except Exception as e:
+        logger.error(f"Error updating trending scores from rating: {e}")
+
+
+@receiver(post_save, sender=Recipe)
+def update_content_index(sender, instance, **kwargs):
+    """Re-index a recipe's content after the save commits."""
+    if content_similarity_service.update_on_save:
+        content_similarity_service.schedule_update(instance.pk)
+
+
+@receiver(m2m_changed, sender=Recipe.categories.through)
+def update_content_index_categories(sender, instance, action, **kwargs):
+    """Re-index a recipe when its categories change."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Recipe):
+        update_content_index(sender=Recipe, instance=instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_from_content_index(sender, instance, **kwargs):
+    """Drop deleted recipes from the content index after the delete commits."""
+    if content_similarity_service.update_on_save:
+        content_similarity_service.schedule_update(instance.pk)
+
+
+@receiver(post_delete, sender=Recipe)
+def release_recipe_images(sender, instance, **kwargs):
+    """Release a deleted recipe's image blobs once the delete commits."""
+    images = instance.images
+    if not images:
+        return
+
+    def release():
+        try:
+            image_blob_service.release(images)
+        except Exception as e:
+            logger.error(f"Error releasing images of deleted recipe {instance.pk}: {e}")
+
+    transaction.on_commit(release)
+
+
+@receiver(post_save, sender=UserFavorite)
+@receiver(post_save, sender=Rating)
+def refresh_user_feed(sender, instance, created, **kwargs):
+    """Recompute the user's feed candidates after they engage with a recipe."""
+    try:
+        feed_service.schedule_refresh(instance.user)
+    except Exception as e:
+        logger.error(f"Error scheduling feed refresh for user {instance.user_id}: {e}")
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_bootstrap_recipes(sender, instance, **kwargs):
+    """Rebuild the latest recipes section after a recipe changes."""
+    try:
+        bootstrap_service.invalidate(bootstrap_service.LATEST_RECIPES)
+    except Exception as e:
+        logger.error(f"Error invalidating bootstrap recipes: {e}")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_bootstrap_categories(sender, instance, **kwargs):
+    """Rebuild the category tree section after a category changes."""
+    try:
+        bootstrap_service.invalidate(bootstrap_service.CATEGORIES)
+    except Exception as e:
+        logger.error(f"Error invalidating bootstrap categories: {e}")
@@ -0,0 +1,99 @@
+"""
+Tests for the end-to-end API benchmark harness.
+
+The budget check against the recorded baseline is marked ``benchmark`` and
+only runs with ``pytest -m benchmark recipes``.
+"""
+
+import json
+
+import pytest
+
+from recipes.services.api_benchmark import SCENARIOS, ApiBenchmark
+
+pytestmark = pytest.mark.django_db
+
+RESULT = {'status': 200, 'p50_ms': 20.0, 'p95_ms': 30.0, 'p99_ms': 40.0, 'queries': 6, 'peak_kib': 400}
+
+
+@pytest.fixture
+def benchmark(settings, tmp_path):
+    settings.API_BENCHMARKS = {
+        **settings.API_BENCHMARKS,
+        'BASELINE_PATH': str(tmp_path / 'baseline.json'),
+        'DATASETS': {
+            'tiny': {
+                'users': 10, 'recipes': 40, 'ratings': 60, 'favorites': 20, 'views': 200,
+                'category_roots': 2, 'category_fanout': 2,
+            },
+        },
+    }
+    return ApiBenchmark(iterations=2)
+
+
+class TestBudgets:
+    """Results are checked against the baseline with tolerances."""
+
+    def test_within_tolerance_passes(self, benchmark):
+        result = {**RESULT, 'p50_ms': 34.0, 'p95_ms': 56.0, 'peak_kib': 500}
+
+        assert benchmark.compare({'recipes.list': result}, {'recipes.list': RESULT}) == []
+
+    def test_exceeded_budgets_are_reported(self, benchmark):
+        result = {**RESULT, 'p50_ms': 36.0, 'queries': 7, 'peak_kib': 501}
+
+        violations = benchmark.compare({'recipes.list': result}, {'recipes.list': RESULT})
+
+        assert len(violations) == 3
+        assert violations[0].startswith('recipes.list: p50_ms 36.0 over budget 35.0')
+        assert 'queries' in violations[1] and 'peak memory' in violations[2]
+
+    def test_failed_requests_are_reported_without_baseline(self, benchmark):
+        violations = benchmark.compare({'recipes.list': {**RESULT, 'status': 500}}, {})
+
+        assert violations == ['recipes.list: returned HTTP 500']
+
+    def test_baselines_are_kept_per_dataset(self, benchmark):
+        benchmark.save_baseline('tiny', {'recipes.list': RESULT})
+        with open(benchmark.baseline_path) as baseline_file:
+            baselines = json.load(baseline_file)
+        baselines['other'] = {'results': {}}
+        with open(benchmark.baseline_path, 'w') as baseline_file:
+            json.dump(baselines, baseline_file)
+
+        benchmark.save_baseline('tiny', {'recipes.search': RESULT})
+
+        assert benchmark.load_baseline('tiny') == {'recipes.search': RESULT}
+        with open(benchmark.baseline_path) as baseline_file:
+            assert set(json.load(baseline_file)) == {'tiny', 'other'}
+
+
+class TestRun:
+    """Scenarios run end to end against a generated dataset."""
+
+    def test_every_scenario_succeeds(self, benchmark):
+        benchmark.prepare_dataset('tiny')
+
+        results = benchmark.run()
+
+        assert list(results) == [scenario.name for scenario in SCENARIOS]
+        for name, result in results.items():
+            assert result['status'] == 200, name
+            assert result['queries'] > 0, name
+            assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+
+
+@pytest.mark.benchmark
+class TestApiBudgets:
+    """Endpoints stay within the budgets recorded in benchmarks/api_baseline.json."""
+
+    def test_small_dataset_within_budget(self):
+        benchmark = ApiBenchmark()
+        baseline = benchmark.load_baseline('small')
+        if not baseline:
+            pytest.skip('No baseline recorded; run manage.py benchmark_api --generate --update-baseline')
+        benchmark.prepare_dataset('small')
+
+        violations = benchmark.compare(benchmark.run(), baseline)
+
+        assert violations == []
@@ -0,0 +1,129 @@
+"""
+Tests for the aggregated bootstrap endpoint.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe, UserFavorite
+from recipes.services.bootstrap_service import BootstrapService, bootstrap_service
+from recipes.services.trending_service import trending_service
+from recipes.tests.factories import CategoryFactory, RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bootstrap-tests',
+    }
+}
+
+
+def published_recipe(**kwargs):
+    """Create a recipe visible to anonymous users."""
+    return RecipeFactory(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+class TestBootstrapService:
+    """Section caching and invalidation."""
+
+    def test_builds_all_sections_then_serves_from_cache(self):
+        published_recipe()
+        CategoryFactory()
+
+        first = bootstrap_service.get_sections()
+        assert set(first['sections']) == set(BootstrapService.SECTIONS)
+        assert set(first['cache'].values()) == {'miss'}
+        assert len(first['sections']['latest_recipes']) == 1
+
+        second = bootstrap_service.get_sections()
+        assert set(second['cache'].values()) == {'hit'}
+        assert second['sections']['latest_recipes'] == first['sections']['latest_recipes']
+
+    def test_recipe_change_only_invalidates_its_section(self):
+        bootstrap_service.get_sections()
+        published_recipe()
+
+        result = bootstrap_service.get_sections()
+        assert result['cache']['latest_recipes'] == 'miss'
+        assert result['cache']['categories'] == 'hit'
+        assert result['cache']['popular_searches'] == 'hit'
+        assert len(result['sections']['latest_recipes']) == 1
+
+    def test_category_change_only_invalidates_its_section(self):
+        bootstrap_service.get_sections()
+        CategoryFactory()
+
+        result = bootstrap_service.get_sections()
+        assert result['cache']['categories'] == 'miss'
+        assert result['cache']['latest_recipes'] == 'hit'
+
+    def test_failing_section_does_not_fail_others(self):
+        service = BootstrapService()
+
+        def broken():
+            raise RuntimeError('boom')
+
+        service._builders[service.POPULAR_SEARCHES] = broken
+        result = service.get_sections()
+        assert result['errors'] == ['popular_searches']
+        assert result['sections']['popular_searches'] is None
+        assert result['sections']['categories'] == []
+
+    def test_personalize_marks_favorites(self, user):
+        favorite = published_recipe()
+        published_recipe()
+        UserFavorite.objects.create(user=user, recipe=favorite)
+
+        sections = bootstrap_service.get_sections()['sections']
+        personalized = bootstrap_service.personalize(sections, user)
+        flags = {item['id']: item['is_favorited'] for item in personalized['latest_recipes']}
+        assert flags[str(favorite.id)] is True
+        assert sum(flags.values()) == 1
+
+
+class TestBootstrapEndpoint:
+    """Tests for /api/v1/bootstrap/."""
+
+    def test_anonymous_response(self, api_client):
+        recipe = published_recipe()
+        RecipeFactory(is_published=False)
+        trending_service.record_events([(recipe.id, trending_service.VIEW, timezone.now(), 1.0)])
+
+        response = api_client.get(reverse('bootstrap'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['latest_recipes']] == [str(recipe.id)]
+        assert [item['id'] for item in response.data['trending']] == [str(recipe.id)]
+        assert 'trending_score' in response.data['trending'][0]
+        assert response.data['meta']['errors'] == []
+
+    def test_section_subset(self, api_client):
+        response = api_client.get(reverse('bootstrap'), {'sections': 'categories,trending'})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'categories', 'trending', 'meta'}
+
+    def test_unknown_section(self, api_client):
+        response = api_client.get(reverse('bootstrap'), {'sections': 'categories,nope'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_favorites_are_per_user(self, auth_client, user):
+        recipe = published_recipe()
+        UserFavorite.objects.create(user=user, recipe=recipe)
+
+        assert auth_client.get(reverse('bootstrap')).data['latest_recipes'][0]['is_favorited'] is True
+        # The cached section is shared, the overlay is not
+        assert APIClient().get(reverse('bootstrap')).data['latest_recipes'][0]['is_favorited'] is False
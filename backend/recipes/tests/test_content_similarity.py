@@ -0,0 +1,163 @@
+"""
+Tests for the content-based recipe similarity index.
+"""
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from recipes.models import Recipe
+from recipes.services.content_similarity_service import ContentSimilarityService
+from recipes.tests.factories import CategoryFactory, RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def published_recipe(ingredients, tags=(), **kwargs):
+    """Create a visible recipe with the given ingredient names and tags."""
+    return RecipeFactory(
+        is_published=True,
+        moderation_status=Recipe.ModerationStatus.APPROVED,
+        ingredients=[{'name': name, 'amount': 1, 'unit': 'g'} for name in ingredients],
+        tags=list(tags),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Return a content similarity service writing to a temporary directory."""
+    service = ContentSimilarityService()
+    service.index_dir = str(tmp_path / 'content_index')
+    service.initial_capacity = 2
+    service.block_size = 2
+    return service
+
+
+@pytest.fixture
+def live_index(service, monkeypatch):
+    """Use ``service`` as the shared instance and index recipes on save."""
+    service.update_on_save = True
+    monkeypatch.setattr('recipes.signals.content_similarity_service', service)
+    monkeypatch.setattr('recipes.views.content_similarity_service', service)
+    return service
+
+
+class TestContentSimilarityService:
+    """Test ContentSimilarityService."""
+
+    def test_features_reuse_ingredient_cleaning(self, service):
+        """Test ingredients are cleaned like search suggestions, with tags and categories."""
+        category = CategoryFactory()
+        recipe = published_recipe(['2 cups Flour', 'chopped onion'], tags=['Baking'])
+        recipe.categories.add(category)
+
+        assert service.features(recipe) == {
+            'ingredient:flour': 1,
+            'ingredient:onion': 1,
+            'tag:baking': 1,
+            f'category:{category.id}': 1,
+        }
+
+    def test_rebuild_and_rank_neighbors(self, service):
+        """Test neighbors are ranked by shared weighted terms."""
+        pasta = published_recipe(['pasta', 'tomato', 'basil', 'garlic'], tags=['italian'])
+        lasagna = published_recipe(['pasta', 'tomato', 'basil', 'cheese'], tags=['italian'])
+        salad = published_recipe(['lettuce', 'tomato'])
+        published_recipe(['chocolate', 'sugar'])
+
+        assert service.rebuild() == 4
+        neighbors = service.similar(pasta.id, limit=5)
+
+        assert [recipe_id for recipe_id, _ in neighbors] == [str(lasagna.id), str(salad.id)]
+        assert 0 < neighbors[0][1] <= 1
+
+    def test_index_files_are_memory_mapped(self, service):
+        """Test readers get memory maps of the persisted files."""
+        recipe = published_recipe(['pasta'])
+        service.rebuild()
+        service.similar(recipe.id)
+
+        assert all(isinstance(array, np.memmap) for array in service._arrays)
+
+    def test_incremental_updates_grow_and_reuse_rows(self, service):
+        """Test saving recipes appends, updates and removes rows in place."""
+        first = published_recipe(['pasta', 'tomato'])
+        second = published_recipe(['rice', 'beans'])
+        third = published_recipe(['rice', 'beans', 'corn'])
+        for recipe in (first, second, third):
+            service.update_recipe(recipe)
+
+        assert [r for r, _ in service.similar(second.id)] == [str(third.id)]
+
+        first.ingredients = [{'name': 'rice'}, {'name': 'corn'}]
+        service.update_recipe(first)
+        assert str(first.id) in [r for r, _ in service.similar(third.id)]
+
+        service.remove_recipe(second.id)
+        assert service.similar(second.id) == []
+        fourth = published_recipe(['rice', 'corn'])
+        service.update_recipe(fourth)
+        _, _, _, meta = service._open_for_read()
+        assert meta[0] == 3
+
+    def test_unpublishing_removes_recipe(self, service):
+        """Test unpublished recipes are dropped from the index."""
+        first = published_recipe(['pasta'])
+        second = published_recipe(['pasta'])
+        service.rebuild()
+
+        second.is_published = False
+        service.update_recipe(second)
+        assert service.similar(first.id) == []
+
+    def test_recipe_save_updates_index(self, live_index, django_capture_on_commit_callbacks):
+        """Test the index follows recipe saves and category changes once they commit."""
+        category = CategoryFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            first = published_recipe(['quinoa'])
+            second = published_recipe(['millet'])
+        assert live_index.similar(first.id) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.categories.add(category)
+            second.categories.add(category)
+            assert live_index.similar(first.id) == []
+        assert [r for r, _ in live_index.similar(first.id)] == [str(second.id)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert live_index.similar(first.id) == []
+
+    def test_updates_in_one_transaction_are_coalesced(
+        self, live_index, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test several saves of a recipe re-index it once."""
+        updated = []
+        monkeypatch.setattr(live_index, 'update_recipe', updated.append)
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe = published_recipe(['quinoa'])
+            recipe.categories.add(CategoryFactory())
+            recipe.save()
+
+        assert [r.pk for r in updated] == [recipe.pk]
+
+
+class TestSimilarEndpointContentFallback:
+    """Test content neighbors fill the similar recipes endpoint."""
+
+    def test_new_recipe_gets_content_neighbors(self, api_client, live_index, django_capture_on_commit_callbacks):
+        """Test recipes without interactions are placed by content."""
+        with django_capture_on_commit_callbacks(execute=True):
+            base = published_recipe(['pasta', 'tomato'])
+            match = published_recipe(['pasta', 'tomato', 'basil'])
+            hidden = published_recipe(['pasta', 'tomato'])
+        Recipe.objects.filter(pk=hidden.pk).update(is_published=False)
+
+        url = reverse('recipes:recipe-similar', kwargs={'pk': base.id})
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [str(match.id)]
+        assert response.data['results'][0]['source'] == 'content'
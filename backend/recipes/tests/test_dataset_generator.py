@@ -0,0 +1,88 @@
+"""
+Tests for the synthetic dataset generator.
+"""
+
+import random
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from recipes.models import Category, Rating, Recipe, RecipeView, UserFavorite
+from recipes.services.dataset_generator import DatasetGenerator, ZipfSampler
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+SIZES = {'users': 40, 'recipes': 200, 'ratings': 600, 'favorites': 300, 'views': 3000}
+
+
+def generate(seed=7, **overrides):
+    generator = DatasetGenerator(seed=seed, batch_size=250, **{**SIZES, **overrides})
+    return generator, generator.generate()
+
+
+class TestDatasetGenerator:
+    """Generated rows match the requested sizes and distributions."""
+
+    def test_inserts_requested_counts(self):
+        _, inserted = generate(category_roots=3, category_fanout=2)
+
+        assert inserted['users'] == User.objects.count() == 40
+        assert inserted['recipes'] == Recipe.objects.count() == 200
+        assert inserted['ratings'] == Rating.objects.count() == 600
+        assert inserted['favorites'] == UserFavorite.objects.count() == 300
+        assert inserted['views'] == RecipeView.objects.count() == 3000
+        # 3 roots, 6 children, 12 leaves
+        assert inserted['categories'] == Category.objects.count() == 21
+        assert inserted['recipe_categories'] == Recipe.categories.through.objects.count()
+        assert not Recipe.objects.filter(categories__isnull=True).exists()
+        assert not Recipe.objects.filter(categories__children__isnull=False).exists()
+
+    def test_same_seed_reproduces_rows(self):
+        generator, _ = generate()
+        first = list(Recipe.objects.order_by('id').values_list('id', 'title', 'author_id'))
+        generator.clear()
+        assert not Recipe.objects.exists() and not Category.objects.exists()
+
+        generate()
+
+        assert list(Recipe.objects.order_by('id').values_list('id', 'title', 'author_id')) == first
+
+    def test_views_and_authors_are_skewed(self):
+        generate()
+
+        views = sorted(Counter(RecipeView.objects.values_list('recipe_id', flat=True)).values(), reverse=True)
+        assert views[0] > 10 * views[len(views) // 2]
+        authors = Counter(Recipe.objects.values_list('author_id', flat=True))
+        assert max(authors.values()) > 5 * SIZES['recipes'] / SIZES['users']
+
+    def test_timestamps_are_spread_over_days(self):
+        generate(days=90)
+
+        created = Recipe.objects.values_list('created_at', flat=True)
+        assert (max(created) - min(created)).days > 30
+
+    def test_zipf_sampler_distinct(self):
+        sampler = ZipfSampler(10, 1.1, random.Random(1))
+
+        assert sorted(sampler.sample_distinct(20)) == list(range(10))
+        assert all(0 <= index < 10 for index in sampler.sample(1000))
+
+
+class TestGenerateDatasetCommand:
+    """Command wrapper."""
+
+    def test_generates_and_clears(self):
+        out = StringIO()
+        call_command('generate_dataset', users=5, recipes=20, ratings=30, favorites=10, views=100, stdout=out)
+        call_command(
+            'generate_dataset', users=5, recipes=20, ratings=30, favorites=10, views=100, clear=True, stdout=out,
+        )
+
+        assert 'Inserted' in out.getvalue()
+        assert Recipe.objects.count() == 20
+        assert RecipeView.objects.count() == 100
@@ -0,0 +1,158 @@
+"""
+Tests for the personalized home feed.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from recipes.models import Recipe, RecipeNeighbor, UserFavorite
+from recipes.services.feed_service import FeedService, feed_service
+from recipes.services.trending_service import trending_service
+from recipes.tests.factories import CategoryFactory, RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'feed-tests',
+    }
+}
+
+
+def published_recipe(**kwargs):
+    """Create a recipe visible to anonymous users."""
+    return RecipeFactory(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def service():
+    service = FeedService()
+    service.background_build = False
+    return service
+
+
+@pytest.fixture
+def user_with_likes(user):
+    """A user who favorited a recipe in a category with a precomputed neighbor."""
+    category = CategoryFactory()
+    liked = published_recipe()
+    liked.categories.add(category)
+    UserFavorite.objects.create(user=user, recipe=liked)
+    return user, liked, category
+
+
+class TestFeedService:
+    """Test FeedService."""
+
+    def test_candidates_blend_sources(self, service, user_with_likes):
+        """Test category, similar and trending candidates are blended with reasons."""
+        user, liked, category = user_with_likes
+        same_category = published_recipe()
+        same_category.categories.add(category)
+        neighbor = published_recipe()
+        RecipeNeighbor.objects.create(recipe=liked, neighbor=neighbor, score=0.9, rank=0)
+        trending = published_recipe()
+        trending_service.record_events([(trending.id, 'favorite', timezone.now(), 1.0)])
+        published_recipe(author=user)
+
+        candidates = {c['id']: c for c in service.build_candidates(user)['candidates']}
+
+        assert candidates[str(same_category.id)]['reasons'] == ['category']
+        assert candidates[str(neighbor.id)]['reasons'] == ['similar']
+        assert candidates[str(trending.id)]['reasons'] == ['trending']
+        assert str(liked.id) not in candidates
+        assert len(candidates) == 3
+
+    def test_hidden_recipes_are_not_candidates(self, service, user_with_likes):
+        """Test unpublished recipes never enter candidate lists."""
+        user, liked, _ = user_with_likes
+        hidden = RecipeFactory(is_published=False)
+        RecipeNeighbor.objects.create(recipe=liked, neighbor=hidden, score=0.9, rank=0)
+
+        assert service.build_candidates(user)['candidates'] == []
+
+    def test_candidates_are_cached(self, service, user_with_likes, django_assert_max_num_queries):
+        """Test serving a cached feed needs only the page query."""
+        user, liked, _ = user_with_likes
+        neighbor = published_recipe()
+        RecipeNeighbor.objects.create(recipe=liked, neighbor=neighbor, score=0.9, rank=0)
+        service.refresh(user)
+
+        with django_assert_max_num_queries(2):
+            page = service.get_feed_page(user)
+        assert [recipe.id for recipe, _ in page['items']] == [neighbor.id]
+
+    def test_rerank_penalizes_repeated_categories(self, service):
+        """Test diversity reranking interleaves categories."""
+        candidates = [
+            {'id': 'a', 'score': 1.0, 'categories': ['x'], 'reasons': []},
+            {'id': 'b', 'score': 0.95, 'categories': ['x'], 'reasons': []},
+            {'id': 'c', 'score': 0.9, 'categories': ['y'], 'reasons': []},
+        ]
+        assert [c['id'] for c in service.rerank(candidates)] == ['a', 'c', 'b']
+
+    def test_cached_candidates_are_reranked(self, service, monkeypatch):
+        """Test candidates are reranked once when cached, not on every page."""
+        first, second, third = published_recipe(), published_recipe(), published_recipe()
+        category = CategoryFactory()
+        first.categories.add(category)
+        second.categories.add(category)
+        scores = {str(first.id): 1.0, str(second.id): 0.95, str(third.id): 0.9}
+        monkeypatch.setattr(service, '_trending_scores', lambda: scores)
+        service.refresh()
+
+        monkeypatch.setattr(service, 'rerank', lambda candidates: pytest.fail('reranked at request time'))
+        page = service.get_feed_page(user=None)
+
+        assert [recipe.id for recipe, _ in page['items']] == [first.id, third.id, second.id]
+
+    def test_engagement_invalidates_cached_candidates(self, user_with_likes):
+        """Test a new favorite drops the stale candidate list."""
+        user, _, _ = user_with_likes
+        feed_service.refresh(user)
+        assert cache.get(feed_service.cache_key(user.pk)) is not None
+
+        UserFavorite.objects.create(user=user, recipe=published_recipe())
+        assert cache.get(feed_service.cache_key(user.pk)) is None
+
+
+class TestFeedEndpoint:
+    """Test the feed endpoint."""
+
+    def test_feed_for_authenticated_user(self, auth_client, user_with_likes):
+        """Test the feed returns personalized, paginated results."""
+        _, liked, category = user_with_likes
+        recipes = [published_recipe() for _ in range(3)]
+        for recipe in recipes:
+            recipe.categories.add(category)
+
+        url = reverse('recipes:recipe-feed')
+        response = auth_client.get(url, {'page_size': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert len(response.data['results']) == 2
+        assert response.data['results'][0]['feed_reasons'] == ['category']
+
+    def test_feed_for_anonymous_user(self, api_client):
+        """Test anonymous users get the trending feed."""
+        recipe = published_recipe()
+        trending_service.record_events([(recipe.id, 'view', timezone.now(), 1.0)])
+
+        response = api_client.get(reverse('recipes:recipe-feed'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [str(recipe.id)]
@@ -0,0 +1,114 @@
+"""
+Tests for garbage collection of orphaned recipe images.
+"""
+
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from core.models import ImageBlob
+from recipes.models import RecipeImageJob
+from recipes.services.image_gc_service import ImageGarbageCollector
+from recipes.tests.factories import RecipeFactory
+
+pytestmark = pytest.mark.django_db
+
+DAY = 24 * 3600
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def collector():
+    return ImageGarbageCollector()
+
+
+def store(name, age=2 * DAY):
+    name = default_storage.save(name, ContentFile(b'image'))
+    mtime = time.time() - age
+    os.utime(default_storage.path(name), (mtime, mtime))
+    return name
+
+
+def url(name):
+    return f'/media/{name}'
+
+
+class TestImageGarbageCollector:
+    """Stored files nothing references are swept."""
+
+    def test_deletes_only_unreferenced_files(self, collector):
+        original = store('recipes/images/originals/kept.jpg')
+        variant = store('recipes/images/variants/kept_320w.webp')
+        orphan = store('recipes/images/thumbnails/gone_small.jpg')
+        RecipeFactory(images={
+            'original': url(original),
+            'variants': [{'url': url(variant), 'width': 320, 'height': 240, 'format': 'webp', 'bytes': 5}],
+        })
+
+        orphans, counts = collector.collect()
+
+        assert orphans == [orphan]
+        assert counts == {'stored': 3, 'orphaned': 1, 'recent': 0, 'deleted': 1}
+        assert default_storage.exists(original) and default_storage.exists(variant)
+        assert not default_storage.exists(orphan)
+
+    def test_blobs_and_unfinished_jobs_are_references(self, collector):
+        shared = store('recipes/images/originals/shared.jpg')
+        ImageBlob.objects.create(sha256='a' * 64, images={'original': url(shared)})
+        source = store('recipes/images/uploads/pending.jpg')
+        RecipeImageJob.objects.create(recipe=RecipeFactory(), source_path=source, original_name='pending.jpg')
+        finished = store('recipes/images/uploads/finished.jpg')
+        RecipeImageJob.objects.create(
+            recipe=RecipeFactory(), source_path=finished, original_name='finished.jpg',
+            status=RecipeImageJob.Status.FAILED,
+        )
+
+        orphans, _ = collector.collect()
+
+        assert orphans == [finished]
+
+    def test_resized_variants_follow_their_original(self, collector):
+        original = store('recipes/images/originals/abc.jpg')
+        RecipeFactory(images={'original': url(original)})
+        resized = store('recipes/images/resized/abc_320w.webp')
+        stale = store('recipes/images/resized/old_320w.webp')
+
+        orphans, _ = collector.collect()
+
+        assert orphans == [stale]
+        assert default_storage.exists(resized)
+
+    def test_recent_files_are_kept(self, collector):
+        recent = store('recipes/images/originals/uploading.jpg', age=60)
+
+        orphans, counts = collector.collect(min_age=timedelta(hours=1))
+
+        assert orphans == [] and counts['recent'] == 1
+        assert default_storage.exists(recent)
+
+
+class TestCollectOrphanImagesCommand:
+    """Command wrapper."""
+
+    def test_dry_run_lists_without_deleting(self):
+        orphan = store('recipes/images/originals/orphan.jpg')
+
+        out = StringIO()
+        call_command('collect_orphan_images', dry_run=True, stdout=out)
+
+        assert orphan in out.getvalue()
+        assert '1 orphaned (would delete)' in out.getvalue()
+        assert default_storage.exists(orphan)
+
+        call_command('collect_orphan_images', stdout=StringIO())
+        assert not default_storage.exists(orphan)
@@ -0,0 +1,331 @@
+"""
+Tests for asynchronous recipe image processing.
+"""
+
+import os
+import threading
+import tracemalloc
+from io import BytesIO
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import MULTIPART_CONTENT, RequestFactory, encode_multipart
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import force_authenticate
+
+from core.models import ImageBlob
+from core.services.storage_service import get_storage_service
+from recipes.models import RecipeImageJob
+from recipes.services import image_job_service as job_module
+from recipes.services.image_job_service import image_job_service
+from recipes.tests.factories import RecipeFactory
+from recipes.views import RecipeViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def recipe(user):
+    return RecipeFactory(author=user)
+
+
+@pytest.fixture
+def author_client(api_client, user):
+    api_client.force_authenticate(user)
+    return api_client
+
+
+@pytest.fixture
+def deleted_images(monkeypatch):
+    deleted = []
+    monkeypatch.setattr(get_storage_service(), 'delete_recipe_images', deleted.append)
+    return deleted
+
+
+def image_upload(name='photo.jpg', color='orange'):
+    buffer = BytesIO()
+    Image.new('RGB', (640, 480), color).save(buffer, format='JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def upload(client, recipe, file=None):
+    url = reverse('recipes:recipe-upload-image', kwargs={'pk': recipe.pk})
+    return client.post(url, {'image': file or image_upload()}, format='multipart')
+
+
+class TestUploadImage:
+    """Uploads are accepted and queued."""
+
+    def test_returns_accepted_with_job(self, author_client, recipe):
+        response = upload(author_client, recipe)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = RecipeImageJob.objects.get(id=response.data['job_id'])
+        assert job.status == RecipeImageJob.Status.PENDING
+        assert default_storage.exists(job.source_path)
+        recipe.refresh_from_db()
+        assert recipe.images == {}
+
+    def test_rejects_invalid_image(self, author_client, recipe):
+        fake = SimpleUploadedFile('photo.jpg', b'not an image', content_type='image/jpeg')
+
+        response = upload(author_client, recipe, fake)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not RecipeImageJob.objects.exists()
+
+    def test_status_is_pollable(self, author_client, recipe):
+        job_id = upload(author_client, recipe).data['job_id']
+        url = reverse('recipes:recipe-image-status', kwargs={'pk': recipe.pk})
+
+        assert author_client.get(url).data['status'] == RecipeImageJob.Status.PENDING
+        image_job_service.process_pending()
+        response = author_client.get(url)
+
+        assert response.data['job_id'] == job_id
+        assert response.data['status'] == RecipeImageJob.Status.SUCCEEDED
+        assert set(response.data['images']) >= {'original', 'small', 'medium', 'large'}
+
+    def test_status_requires_author(self, api_client, recipe):
+        api_client.force_authenticate(RecipeFactory().author)
+        url = reverse('recipes:recipe-image-status', kwargs={'pk': recipe.pk})
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestProcessing:
+    """The worker renders variants and swaps them in."""
+
+    def test_swaps_images_then_deletes_old_blobs(
+        self, author_client, recipe, deleted_images, django_capture_on_commit_callbacks
+    ):
+        old_images = {'original': '/media/old.jpg'}
+        recipe.images = old_images
+        recipe.save(update_fields=['images'])
+        job = RecipeImageJob.objects.get(id=upload(author_client, recipe).data['job_id'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            counts = image_job_service.process_pending()
+
+        assert counts['succeeded'] == 1
+        recipe.refresh_from_db()
+        job.refresh_from_db()
+        assert recipe.images == job.images
+        assert {'original', 'small', 'medium', 'large', 'variants', 'placeholder'} <= set(recipe.images)
+        assert deleted_images == [old_images]
+        assert not default_storage.exists(job.source_path)
+
+    def test_older_job_is_superseded(self, author_client, recipe, deleted_images, django_capture_on_commit_callbacks):
+        upload(author_client, recipe, image_upload(color='purple'))
+        newest_id = upload(author_client, recipe).data['job_id']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            counts = image_job_service.process_pending()
+
+        assert counts['succeeded'] == 1 and counts['superseded'] == 1
+        recipe.refresh_from_db()
+        assert recipe.images == RecipeImageJob.objects.get(id=newest_id).images
+        superseded = RecipeImageJob.objects.get(status=RecipeImageJob.Status.SUPERSEDED)
+        assert superseded.images in deleted_images
+
+    def test_failure_is_retried_later(self, author_client, recipe, monkeypatch):
+        upload(author_client, recipe)
+        monkeypatch.setattr(job_module, 'render_job_images', lambda *args: (_ for _ in ()).throw(OSError('down')))
+
+        assert image_job_service.process_pending()['retried'] == 1
+        job = RecipeImageJob.objects.get()
+        assert job.status == RecipeImageJob.Status.PENDING
+        assert job.attempts == 1
+        assert job.next_attempt_at > timezone.now()
+        recipe.refresh_from_db()
+        assert recipe.images == {}
+
+    def test_undecodable_image_fails_immediately(self, author_client, recipe, monkeypatch):
+        upload(author_client, recipe)
+        monkeypatch.setattr(
+            job_module, 'render_job_images', lambda *args: (_ for _ in ()).throw(ValidationError('Invalid image file'))
+        )
+
+        assert image_job_service.process_pending()['failed'] == 1
+        assert RecipeImageJob.objects.get().status == RecipeImageJob.Status.FAILED
+
+
+class TestDeduplication:
+    """Identical uploads are rendered and stored once."""
+
+    def test_duplicate_upload_completes_immediately(self, author_client, recipe, user, monkeypatch):
+        upload(author_client, recipe)
+        image_job_service.process_pending()
+        other = RecipeFactory(author=user)
+        monkeypatch.setattr(
+            job_module, 'render_job_images', lambda *args: (_ for _ in ()).throw(AssertionError('rendered'))
+        )
+
+        response = upload(author_client, other)
+
+        assert response.data['status'] == RecipeImageJob.Status.SUCCEEDED
+        recipe.refresh_from_db()
+        other.refresh_from_db()
+        assert other.images == recipe.images
+        assert ImageBlob.objects.get().ref_count == 2
+
+    def test_identical_uploads_in_a_batch_render_once(self, author_client, recipe, user, monkeypatch):
+        other = RecipeFactory(author=user)
+        upload(author_client, recipe)
+        upload(author_client, other)
+        renders = []
+        render = job_module.render_job_images
+        monkeypatch.setattr(job_module, 'render_job_images', lambda *args: renders.append(args) or render(*args))
+
+        assert image_job_service.process_pending()['succeeded'] == 2
+        assert len(renders) == 1
+        assert ImageBlob.objects.get().ref_count == 2
+
+    def test_replacing_shared_image_keeps_its_files(
+        self, author_client, recipe, user, deleted_images, django_capture_on_commit_callbacks
+    ):
+        other = RecipeFactory(author=user)
+        upload(author_client, recipe)
+        upload(author_client, other)
+        image_job_service.process_pending()
+        shared = ImageBlob.objects.get().images
+
+        upload(author_client, recipe, image_upload(color='purple'))
+        with django_capture_on_commit_callbacks(execute=True):
+            image_job_service.process_pending()
+        assert deleted_images == []
+        assert ImageBlob.objects.get(sha256=shared['sha256']).ref_count == 1
+
+        # Already stored, so this completes during the upload
+        with django_capture_on_commit_callbacks(execute=True):
+            upload(author_client, other, image_upload(color='purple'))
+        assert deleted_images == [shared]
+        assert not ImageBlob.objects.filter(sha256=shared['sha256']).exists()
+
+
+def request_upload_url(client, recipe, content_type='image/jpeg'):
+    url = reverse('recipes:recipe-image-upload-url', kwargs={'pk': recipe.pk})
+    return client.post(url, {'content_type': content_type, 'filename': 'photo.jpg'}, format='json')
+
+
+def complete_upload(client, recipe, upload_id):
+    url = reverse('recipes:recipe-complete-image-upload', kwargs={'pk': recipe.pk})
+    return client.post(url, {'upload_id': upload_id}, format='json')
+
+
+class TestDirectUpload:
+    """Uploads to signed URLs bypass the API and are queued on completion."""
+
+    def test_upload_to_signed_url_then_complete(self, author_client, recipe, client):
+        issued = request_upload_url(author_client, recipe).data
+        assert issued['method'] == 'PUT'
+
+        # The signed URL is the only credential
+        response = client.put(issued['url'], image_upload().read(), content_type=issued['headers']['Content-Type'])
+        assert response.status_code == 201
+
+        response = complete_upload(author_client, recipe, issued['upload_id'])
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = RecipeImageJob.objects.get(id=response.data['job_id'])
+        assert job.original_name == 'photo.jpg'
+        assert complete_upload(author_client, recipe, issued['upload_id']).data['job_id'] == str(job.id)
+
+        image_job_service.process_pending()
+        recipe.refresh_from_db()
+        assert recipe.images['sha256'] == ImageBlob.objects.get().sha256
+
+    def test_rejects_non_image_content_type(self, author_client, recipe):
+        response = request_upload_url(author_client, recipe, 'application/pdf')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_tampered_upload_url_is_forbidden(self, author_client, recipe, client):
+        issued = request_upload_url(author_client, recipe).data
+
+        response = client.put(issued['url'].rstrip('/') + 'x', b'data', content_type='image/jpeg')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_invalid_upload_is_rejected_and_deleted(self, author_client, recipe, client):
+        issued = request_upload_url(author_client, recipe).data
+        client.put(issued['url'], b'not an image', content_type='image/jpeg')
+
+        response = complete_upload(author_client, recipe, issued['upload_id'])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not RecipeImageJob.objects.exists()
+        assert default_storage.listdir(image_job_service.uploads_path)[1] == []
+
+    def test_upload_id_is_scoped_to_recipe(self, author_client, recipe, user, client):
+        issued = request_upload_url(author_client, recipe).data
+        client.put(issued['url'], image_upload().read(), content_type='image/jpeg')
+
+        response = complete_upload(author_client, RecipeFactory(author=user), issued['upload_id'])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def large_jpeg(size=4.6 * 1024 * 1024):
+    """A noise JPEG of roughly ``size`` bytes (noise barely compresses)."""
+    side = int((size / 1.25) ** 0.5)
+    buffer = BytesIO()
+    Image.frombytes('RGB', (side, side), os.urandom(side * side * 3)).save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUploadMemory:
+    """Concurrent large uploads are streamed, not buffered."""
+
+    CONCURRENT_UPLOADS = 4
+
+    def test_peak_memory_is_bounded(self, recipe, user):
+        data = large_jpeg()
+        assert 4 * 1024 * 1024 < len(data) <= 5 * 1024 * 1024
+        view = RecipeViewSet.as_view({'post': 'upload_image'})
+        url = reverse('recipes:recipe-upload-image', kwargs={'pk': recipe.pk})
+        # Request bodies are built before measuring; parsing them is what counts
+        requests = []
+        for index in range(self.CONCURRENT_UPLOADS):
+            body = encode_multipart('BoUnDaRy', {'image': SimpleUploadedFile(f'{index}.jpg', data)})
+            request = RequestFactory().post(url, body, content_type=f'{MULTIPART_CONTENT}; boundary=BoUnDaRy')
+            force_authenticate(request, user)
+            requests.append(request)
+        del body
+        responses = []
+        barrier = threading.Barrier(self.CONCURRENT_UPLOADS)
+        # The in-memory test database takes one writer at a time and fails the others at once
+        database_lock = threading.Lock()
+
+        def upload(request):
+            barrier.wait()
+            # Bodies are parsed concurrently; the view reuses the parsed files
+            request.FILES
+            with database_lock:
+                responses.append(view(request, pk=recipe.pk).status_code)
+            # Closes the uploaded temporary files, as the request handler would
+            request.close()
+
+        threads = [threading.Thread(target=upload, args=(request,)) for request in requests]
+        tracemalloc.start()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert responses == [status.HTTP_202_ACCEPTED] * self.CONCURRENT_UPLOADS
+        # Buffering in memory would hold every upload at once
+        assert peak < len(data)
@@ -0,0 +1,134 @@
+"""
+Tests for item-to-item similar recipe recommendations.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from recipes.models import Recipe, RecipeNeighbor, RecipeView, UserFavorite
+from recipes.services.recommendation_service import SimilarRecipesService
+from recipes.tests.factories import RecipeFactory
+from accounts.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def published_recipe(**kwargs):
+    """Create a recipe visible to anonymous users."""
+    return RecipeFactory(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED, **kwargs)
+
+
+def favorite(user, *recipes):
+    for recipe in recipes:
+        UserFavorite.objects.create(user=user, recipe=recipe)
+
+
+def neighbor_ids(recipe):
+    return list(RecipeNeighbor.objects.filter(recipe=recipe).order_by('rank').values_list('neighbor_id', flat=True))
+
+
+@pytest.fixture
+def service():
+    return SimilarRecipesService()
+
+
+@pytest.fixture
+def catalog():
+    """Two clusters of recipes liked by disjoint groups of users."""
+    pasta, pizza, salad, soup = (published_recipe() for _ in range(4))
+    for _ in range(3):
+        favorite(UserFactory(), pasta, pizza)
+    favorite(UserFactory(), pasta, salad)
+    for _ in range(2):
+        favorite(UserFactory(), salad, soup)
+    return pasta, pizza, salad, soup
+
+
+class TestSimilarRecipesService:
+    """Test SimilarRecipesService."""
+
+    def test_full_refresh_ranks_by_cosine_similarity(self, service, catalog):
+        """Test neighbors are ordered by co-interaction similarity."""
+        pasta, pizza, salad, soup = catalog
+
+        assert service.refresh(full=True) == {'recipes': 4}
+
+        assert neighbor_ids(pasta) == [pizza.id, salad.id]
+        assert neighbor_ids(soup) == [salad.id]
+        top = RecipeNeighbor.objects.get(recipe=pasta, rank=0)
+        assert 0 < top.score <= 1
+
+    def test_neighbors_limited_to_k(self, service, catalog):
+        """Test only the configured number of neighbors is stored."""
+        service.neighbors_per_recipe = 1
+        service.refresh(full=True)
+
+        assert RecipeNeighbor.objects.filter(rank__gt=0).count() == 0
+
+    def test_views_count_as_interactions(self, service):
+        """Test logged-in views contribute, while authors' own views do not."""
+        first, second = published_recipe(), published_recipe()
+        viewer = UserFactory()
+        RecipeView.objects.create(recipe=first, user=viewer)
+        RecipeView.objects.create(recipe=second, user=viewer)
+        RecipeView.objects.create(recipe=first, user=first.author)
+
+        service.refresh(full=True)
+        assert neighbor_ids(first) == [second.id]
+
+    def test_incremental_refresh_updates_changed_recipes(self, service, catalog):
+        """Test new interactions update changed recipes and the lists referencing them."""
+        pasta, pizza, salad, soup = catalog
+        service.refresh(full=True)
+        untouched_before = RecipeNeighbor.objects.filter(recipe=soup).values_list('updated_at', flat=True)[0]
+
+        dessert = published_recipe()
+        for _ in range(5):
+            favorite(UserFactory(), pizza, dessert)
+        result = service.refresh()
+
+        assert result['recipes'] >= 2
+        assert neighbor_ids(dessert) == [pizza.id]
+        assert neighbor_ids(pizza)[0] == dessert.id
+        assert RecipeNeighbor.objects.filter(recipe=soup).values_list('updated_at', flat=True)[0] == untouched_before
+
+    def test_incremental_refresh_matches_full_refresh(self, service, catalog):
+        """Test incremental results agree with a full recomputation."""
+        pasta, pizza, salad, soup = catalog
+        service.refresh(full=True)
+        favorite(UserFactory(), soup, pizza)
+        service.refresh()
+        incremental = {r.id: neighbor_ids(r) for r in catalog}
+
+        service.refresh(full=True)
+        assert {r.id: neighbor_ids(r) for r in catalog} == incremental
+
+    def test_refresh_without_changes(self, service, catalog):
+        """Test an incremental run with no new interactions writes nothing."""
+        service.refresh(full=True)
+        assert service.refresh() == {'recipes': 0}
+
+
+class TestSimilarEndpoint:
+    """Test the similar recipes endpoint."""
+
+    def test_similar_returns_visible_neighbors(self, api_client, service, catalog):
+        """Test neighbors are served in rank order, hiding unpublished recipes."""
+        pasta, pizza, salad, soup = catalog
+        service.refresh(full=True)
+        Recipe.objects.filter(pk=salad.pk).update(is_published=False)
+
+        url = reverse('recipes:recipe-similar', kwargs={'pk': pasta.id})
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [str(pizza.id)]
+        assert 0 < response.data['results'][0]['similarity'] <= 1
+
+    def test_similar_for_hidden_recipe(self, api_client):
+        """Test a recipe the user cannot see returns 404."""
+        recipe = RecipeFactory(is_published=False)
+        url = reverse('recipes:recipe-similar', kwargs={'pk': recipe.id})
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
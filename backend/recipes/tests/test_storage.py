@@ -1,6 +1,7 @@
 """
 Tests for content storage functionality.
 """
+import base64
 import os
 import tempfile
 from io import BytesIO
@@ -13,6 +14,7 @@ from PIL import Image
 
 from core.services.storage_service import StorageService, storage_service
 from ..models import Recipe
+from ..serializers import RecipeListSerializer, RecipeSerializer
 from .factories import RecipeFactory
 from accounts.tests.factories import UserFactory
 
@@ -88,6 +90,29 @@ class StorageServiceTest(TestCase):
         
         self.assertIn("Invalid image file", str(cm.exception))
 
+    def test_validate_image_file_reads_header_only(self):
+        """Test that validation parses the header without decoding pixels."""
+        image_file = self.create_test_image(width=1200, height=800)
+        truncated = SimpleUploadedFile("test.jpg", image_file.read()[:1024], content_type="image/jpeg")
+
+        header = self.service.validate_image_file(truncated)
+
+        self.assertEqual((header.format, header.width, header.height), ('JPEG', 1200, 800))
+        self.assertEqual(truncated.tell(), 0)
+
+    @override_settings(CONTENT_STORAGE={'MAX_IMAGE_PIXELS': 1000 * 1000})
+    def test_validate_image_file_too_many_pixels(self):
+        """Test that decompression bombs are rejected before decoding."""
+        image_file = self.create_test_image(width=1200, height=1000, format='PNG')
+
+        with self.assertRaises(ValidationError) as cm:
+            StorageService().validate_image_file(image_file)
+        with self.assertRaises(ValidationError), patch.object(Image.Image, 'load') as load:
+            StorageService().open_image(image_file)
+
+        self.assertIn("megapixels", str(cm.exception))
+        load.assert_not_called()
+
     def test_generate_unique_filename(self):
         """Test unique filename generation."""
         filename1 = self.service.generate_unique_filename("test.jpg")
@@ -144,26 +169,176 @@ class StorageServiceTest(TestCase):
         self.assertIn('medium', result)
         self.assertIn('large', result)
         
-        # Should have called storage save multiple times
-        self.assertEqual(mock_storage.save.call_count, 4)  # 1 original + 3 thumbnails
+        # 100px is under every breakpoint: one variant per format at full width,
+        # the JPEG one being the original itself
+        formats = self.service.image_formats
+        self.assertEqual(
+            [(variant['format'], variant['width'], variant['height']) for variant in result['variants']],
+            sorted((image_format, 100, 100) for image_format in formats),
+        )
+        self.assertTrue(all(variant['bytes'] > 0 for variant in result['variants']))
+        self.assertEqual(mock_storage.save.call_count, 4 + len(formats) - 1)
+
+    def test_summarize_image(self):
+        """Test the inline placeholder, dominant color and aspect ratio."""
+        image = Image.new('RGB', (640, 480), (200, 40, 40))
+        image.paste((10, 10, 200), (0, 0, 100, 100))
+        
+        summary = self.service.summarize_image(image, image)
+        
+        self.assertEqual(summary['dominant_color'][:3], '#c8')
+        self.assertEqual((summary['width'], summary['height'], summary['aspect_ratio']), (640, 480, 1.3333))
+        self.assertTrue(summary['placeholder'].startswith('data:image/webp;base64,'))
+        self.assertLess(len(summary['placeholder']), 300)
+        header, data = summary['placeholder'].split(',')
+        with Image.open(BytesIO(base64.b64decode(data))) as placeholder:
+            self.assertEqual(placeholder.size, (24, 18))
+
+    @patch('core.services.storage_service.default_storage')
+    def test_delete_recipe_images_skips_metadata(self, mock_storage):
+        """Test that the stored summary is not mistaken for image URLs."""
+        mock_storage.client = None
+        
+        self.service.delete_recipe_images({
+            'original': '/media/recipes/images/originals/original.jpg',
+            'placeholder': 'data:image/webp;base64,AAAA',
+            'dominant_color': '#c82828',
+            'width': 640,
+            'height': 480,
+            'aspect_ratio': 1.3333,
+        })
+        
+        mock_storage.delete.assert_called_once_with('recipes/images/originals/original.jpg')
+
+    @override_settings(CONTENT_STORAGE={
+        'RESPONSIVE_WIDTHS': [320, 640, 1024],
+        'IMAGE_FORMATS': ['avif', 'webp', 'jpeg', 'bmp'],
+    })
+    @patch('core.services.storage_service.Image.init')
+    @patch('core.services.storage_service.Image.SAVE', {'WEBP': None, 'JPEG': None})
+    def test_image_formats_skip_unsupported(self, mock_init):
+        """Test that formats unknown or missing from the Pillow build are skipped."""
+        self.assertEqual(StorageService().image_formats, ['webp', 'jpeg'])
+
+    @override_settings(CONTENT_STORAGE={'RESPONSIVE_WIDTHS': [320, 640, 1024], 'IMAGE_FORMATS': ['webp', 'jpeg']})
+    def test_render_image_variants_responsive_widths(self):
+        """Test that breakpoints narrower than the upload are rendered in each format."""
+        service = StorageService()
+        image_file = self.create_test_image(width=800, height=400, format='PNG')
+        
+        variants, _ = service.render_image_variants(image_file)
+        
+        responsive = {name: variant for name, variant in variants.items() if name.endswith(('_webp', '_jpeg'))}
+        self.assertEqual(set(responsive), {'800w_webp', '640w_webp', '640w_jpeg', '320w_webp', '320w_jpeg'})
+        self.assertEqual((responsive['320w_jpeg'].width, responsive['320w_jpeg'].height), (320, 160))
+        with Image.open(BytesIO(responsive['640w_webp'].data)) as webp:
+            self.assertEqual((webp.format, webp.size), ('WEBP', (640, 320)))
+
+    def test_open_image_applies_exif_orientation(self):
+        """Test that EXIF rotation is applied once at decode time."""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees clockwise
+        image_io = BytesIO()
+        Image.new('RGB', (200, 100), 'red').save(image_io, format='JPEG', exif=exif)
+        image_file = SimpleUploadedFile("rotated.jpg", image_io.getvalue(), content_type="image/jpeg")
+        
+        image = self.service.open_image(image_file)
+        
+        self.assertEqual(image.size, (100, 200))
+
+    def test_open_image_bounds_large_jpegs(self):
+        """Test that large JPEGs are decoded at reduced scale within the original bound."""
+        image_file = self.create_test_image(width=4096, height=3072)
+        
+        image = self.service.open_image(image_file, max_size=(1024, 1024))
+        
+        self.assertEqual(image.size, (1024, 768))
+
+    def test_create_thumbnails_cascade(self):
+        """Test that every configured thumbnail is produced at its exact size."""
+        image = Image.new('RGB', (2048, 1536), 'red')
+        
+        thumbnails = self.service.create_thumbnails(image)
+        
+        self.assertEqual(list(thumbnails), list(self.service.thumbnail_sizes))
+        for size_name, dimensions in self.service.thumbnail_sizes.items():
+            self.assertEqual(thumbnails[size_name].size, tuple(dimensions))
+
+    def test_render_image_variants_flattens_transparency(self):
+        """Test that PNG uploads with alpha are rendered as JPEG."""
+        image_file = self.create_test_image(format='PNG', mode='RGBA')
+        
+        variants, _ = self.service.render_image_variants(image_file)
+        
+        self.assertTrue({'original', *self.service.thumbnail_sizes} <= set(variants))
+        with Image.open(BytesIO(variants['original'].data)) as original:
+            self.assertEqual(original.format, 'JPEG')
+
+    @patch('core.services.storage_service.default_storage')
+    def test_save_image_with_thumbnails_invalid_content(self, mock_storage):
+        """Test that undecodable uploads are rejected before anything is stored."""
+        fake_image = SimpleUploadedFile("test.jpg", b"fake image content", content_type="image/jpeg")
+        
+        with self.assertRaises(ValidationError):
+            self.service.save_image_with_thumbnails(fake_image, "test-recipe-id")
+        
+        mock_storage.save.assert_not_called()
 
     @patch('core.services.storage_service.default_storage')
     def test_delete_recipe_images(self, mock_storage):
-        """Test deleting recipe images."""
-        mock_storage.exists.return_value = True
+        """Test deleting recipe images by storage name, without existence checks."""
+        mock_storage.client = None
         
         image_urls = {
-            'original': 'http://example.com/media/original.jpg',
-            'small': 'http://example.com/media/small.jpg',
-            'medium': 'http://example.com/media/medium.jpg',
-            'large': 'http://example.com/media/large.jpg'
+            'original': '/media/recipes/images/original.jpg',
+            'small': '/media/recipes/images/small.jpg',
+            'medium': '/media/recipes/images/medium.jpg',
+            'large': '/media/recipes/images/large.jpg'
         }
         
         self.service.delete_recipe_images(image_urls)
         
-        # Should check existence and delete each file
-        self.assertEqual(mock_storage.exists.call_count, 4)
-        self.assertEqual(mock_storage.delete.call_count, 4)
+        deleted = sorted(call.args[0] for call in mock_storage.delete.call_args_list)
+        self.assertEqual(deleted, [f'recipes/images/{size}.jpg' for size in ('large', 'medium', 'original', 'small')])
+        mock_storage.exists.assert_not_called()
+
+    @patch('core.services.storage_service.default_storage')
+    def test_delete_recipe_images_includes_variants(self, mock_storage):
+        """Test that responsive variants are deleted, the original only once."""
+        mock_storage.client = None
+        
+        self.service.delete_recipe_images({
+            'original': '/media/original.jpg',
+            'variants': [
+                {'url': '/media/original.jpg', 'width': 800, 'height': 600, 'format': 'jpeg', 'bytes': 1},
+                {'url': '/media/800w.webp', 'width': 800, 'height': 600, 'format': 'webp', 'bytes': 1},
+            ],
+        })
+        
+        deleted = [call.args[0] for call in mock_storage.delete.call_args_list]
+        self.assertEqual(sorted(deleted), ['800w.webp', 'original.jpg'])
+
+    @patch('core.services.storage_service.default_storage')
+    def test_delete_recipe_images_skips_foreign_urls(self, mock_storage):
+        """Test that URLs outside our storage are never passed to it."""
+        mock_storage.client = None
+        
+        self.service.delete_recipe_images({'original': 'https://cdn.example.com/original.jpg'})
+        
+        mock_storage.delete.assert_not_called()
+
+    @override_settings(CONTENT_STORAGE={'DELETE_BATCH_SIZE': 2})
+    @patch('core.services.storage_service.default_storage')
+    def test_delete_files_batches_on_blob_storage(self, mock_storage):
+        """Test that backends with batch deletes get one request per batch."""
+        mock_storage._get_valid_path.side_effect = lambda name: f'media/{name}'
+        
+        deleted = StorageService().delete_files(['a.jpg', 'b.jpg', 'c.jpg', 'a.jpg'])
+        
+        self.assertEqual(deleted, 3)
+        batches = sorted(call.args for call in mock_storage.client.delete_blobs.call_args_list)
+        self.assertEqual(batches, [('media/a.jpg', 'media/b.jpg'), ('media/c.jpg',)])
+        mock_storage.delete.assert_not_called()
 
     def test_get_supported_formats(self):
         """Test getting supported formats."""
@@ -252,6 +427,61 @@ class RecipeImageUploadTest(TestCase):
 
 
 @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class RecipeImageSerializerTest(TestCase):
+    """Test cases for responsive image serialization."""
+
+    def setUp(self):
+        """Set up test data."""
+        def variant(width, image_format):
+            return {
+                'url': f'http://example.com/media/{width}.{image_format}',
+                'width': width,
+                'height': width // 2,
+                'format': image_format,
+                'bytes': width,
+            }
+        self.recipe = RecipeFactory(images={
+            'original': 'http://example.com/media/1024.jpeg',
+            'medium': 'http://example.com/media/medium.jpg',
+            'placeholder': 'data:image/webp;base64,AAAA',
+            'dominant_color': '#c82828',
+            'width': 1024,
+            'height': 512,
+            'aspect_ratio': 2.0,
+            'variants': [variant(width, image_format) for image_format in ('jpeg', 'webp') for width in (320, 640, 1024)],
+        })
+
+    def test_list_serializer_caps_srcset_width(self):
+        """Test that cards get the medium thumbnail and variants up to the card width."""
+        image, = RecipeListSerializer(self.recipe).data['images']
+        
+        self.assertEqual(image['image'], 'http://example.com/media/medium.jpg')
+        self.assertEqual((image['width'], image['height'], image['aspect_ratio']), (1024, 512, 2.0))
+        self.assertEqual(image['placeholder'], 'data:image/webp;base64,AAAA')
+        self.assertEqual(image['dominant_color'], '#c82828')
+        self.assertEqual(image['sources'], [
+            {'type': 'image/webp', 'srcset': 'http://example.com/media/320.webp 320w, http://example.com/media/640.webp 640w'},
+            {'type': 'image/jpeg', 'srcset': 'http://example.com/media/320.jpeg 320w, http://example.com/media/640.jpeg 640w'},
+        ])
+
+    def test_detail_serializer_offers_every_width(self):
+        """Test that the detail view gets the original and all variants."""
+        image, = RecipeSerializer(self.recipe).data['images']
+        
+        self.assertEqual(image['image'], 'http://example.com/media/1024.jpeg')
+        self.assertTrue(image['sources'][0]['srcset'].endswith('1024.webp 1024w'))
+
+    def test_images_without_variants(self):
+        """Test that recipes stored before responsive variants still serialize."""
+        self.recipe.images = {'medium': 'http://example.com/media/medium.jpg'}
+        
+        image, = RecipeListSerializer(self.recipe).data['images']
+        
+        self.assertEqual(image['sources'], [])
+        self.assertIsNone(image['width'])
+        self.assertIsNone(image['placeholder'])
+
+
 class RecipeViewImageUploadTest(TestCase):
     """Test cases for recipe view image upload endpoints."""
 
@@ -280,11 +510,9 @@ class RecipeViewImageUploadTest(TestCase):
         
         response = self.client.post(url, {'image': image_file}, format='multipart')
         
-        self.assertEqual(response.status_code, 200)
-        
-        # Refresh recipe from DB
-        self.recipe.refresh_from_db()
-        self.assertTrue(self.recipe.has_images())
+        # Processing is queued for the image job worker
+        self.assertEqual(response.status_code, 202)
+        self.assertIn('job_id', response.data)
 
     def test_upload_image_no_permission(self):
         """Test upload image without permission."""
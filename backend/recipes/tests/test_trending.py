@@ -0,0 +1,167 @@
+"""
+Tests for the trending recipes engine.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from recipes.models import Recipe, RecipeTrendingScore, RecipeView, UserFavorite
+from recipes.services.trending_service import TrendingService, trending_service
+from recipes.tests.factories import CategoryFactory, RatingFactory, RecipeFactory
+from accounts.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def published_recipe(**kwargs):
+    """Create a recipe visible to anonymous users."""
+    return RecipeFactory(is_published=True, moderation_status=Recipe.ModerationStatus.APPROVED, **kwargs)
+
+
+@pytest.fixture
+def service():
+    """Return a trending service with a one-hour half-life."""
+    service = TrendingService()
+    service.half_life = timedelta(hours=1)
+    return service
+
+
+class TestTrendingService:
+    """Test TrendingService."""
+
+    def test_scores_decay_with_half_life(self, service):
+        """Test an event's contribution halves every half-life."""
+        recipe = published_recipe()
+        now = timezone.now()
+        service.record_events([(recipe.id, service.VIEW, now, 1.0)])
+
+        score = RecipeTrendingScore.objects.get(recipe=recipe).score
+        assert service.decayed_score(score, now) == pytest.approx(1.0)
+        assert service.decayed_score(score, now + timedelta(hours=2)) == pytest.approx(0.25)
+
+    def test_recent_engagement_outranks_older_engagement(self, service):
+        """Test fewer recent events beat more, older events."""
+        now = timezone.now()
+        old, fresh = published_recipe(), published_recipe()
+        service.record_events([(old.id, service.VIEW, now - timedelta(hours=5), 1.0)] * 10)
+        service.record_events([(fresh.id, service.VIEW, now, 1.0)] * 2)
+
+        assert list(service.get_trending()) == [fresh, old]
+
+    def test_incremental_updates_accumulate(self, service):
+        """Test batches recorded separately sum to the same score."""
+        recipe = published_recipe()
+        now = timezone.now()
+        service.record_events([(recipe.id, service.VIEW, now, 1.0)])
+        service.record_events([(recipe.id, service.FAVORITE, now, 1.0)])
+
+        score = RecipeTrendingScore.objects.get(recipe=recipe).score
+        assert service.decayed_score(score, now) == pytest.approx(6.0)
+
+    def test_events_for_deleted_recipes_are_ignored(self, service):
+        """Test events for missing recipes create no rows."""
+        recipe = published_recipe()
+        recipe_id = recipe.id
+        recipe.delete()
+
+        assert service.record_events([(recipe_id, service.VIEW, timezone.now(), 1.0)]) == 0
+        assert RecipeTrendingScore.objects.count() == 0
+
+    def test_prune_removes_decayed_scores(self, service):
+        """Test long-decayed scores are deleted."""
+        now = timezone.now()
+        stale, active = published_recipe(), published_recipe()
+        service.record_events([(stale.id, service.VIEW, now - timedelta(hours=20), 1.0)])
+        service.record_events([(active.id, service.VIEW, now, 1.0)])
+
+        assert service.prune(now) == 1
+        assert list(RecipeTrendingScore.objects.values_list('recipe_id', flat=True)) == [active.id]
+
+    def test_rebuild_replays_recent_engagement(self, service):
+        """Test rebuild recomputes scores from stored views, favorites and ratings."""
+        recipe = published_recipe()
+        RecipeView.objects.create(recipe=recipe, ip_address='10.0.0.1')
+        RecipeView.objects.create(recipe=recipe, user=recipe.author)
+        RecipeTrendingScore.objects.all().delete()
+
+        assert service.rebuild(days=1) == 1
+        assert RecipeTrendingScore.objects.filter(recipe=recipe).exists()
+
+    def test_favorites_and_ratings_update_scores(self):
+        """Test new favorites and ratings are recorded through signals."""
+        recipe = published_recipe()
+        UserFavorite.objects.create(user=UserFactory(), recipe=recipe)
+        RatingFactory(recipe=recipe, rating=5)
+
+        score = RecipeTrendingScore.objects.get(recipe=recipe).score
+        assert trending_service.decayed_score(score) == pytest.approx(8.0, rel=0.01)
+
+
+class TestTrendingEndpoint:
+    """Test the trending recipes endpoint."""
+
+    def test_trending_is_paginated_and_ordered(self, api_client, service):
+        """Test trending recipes are returned by score, hiding unpublished ones."""
+        now = timezone.now()
+        first, second = published_recipe(), published_recipe()
+        hidden = RecipeFactory(is_published=False)
+        trending_service.record_events([(first.id, service.FAVORITE, now, 1.0)])
+        trending_service.record_events([(second.id, service.VIEW, now, 1.0)])
+        trending_service.record_events([(hidden.id, service.FAVORITE, now, 5.0)])
+
+        url = reverse('recipes:recipe-trending')
+        response = api_client.get(url, {'page_size': 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        assert response.data['num_pages'] == 2
+        assert response.data['results'][0]['id'] == str(first.id)
+        assert response.data['results'][0]['trending_score'] == pytest.approx(5.0, rel=0.01)
+
+    def test_trending_by_category(self, api_client, service):
+        """Test trending can be restricted to a category and its descendants."""
+        parent = CategoryFactory()
+        child = CategoryFactory(parent=parent)
+        in_child, elsewhere = published_recipe(), published_recipe()
+        in_child.categories.add(child)
+        now = timezone.now()
+        trending_service.record_events([(in_child.id, service.VIEW, now, 1.0)])
+        trending_service.record_events([(elsewhere.id, service.VIEW, now, 1.0)])
+
+        url = reverse('recipes:recipe-trending')
+        response = api_client.get(url, {'category': parent.slug, 'include_descendants': 'true'})
+        assert [item['id'] for item in response.data['results']] == [str(in_child.id)]
+
+        response = api_client.get(url, {'category': parent.slug})
+        assert response.data['count'] == 0
+
+    def test_trending_unknown_category(self, api_client):
+        """Test an unknown category returns 404."""
+        url = reverse('recipes:recipe-trending')
+        response = api_client.get(url, {'category': 'missing'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestAdminTopRecipes:
+    """Test the top recipes of the admin analytics endpoint."""
+
+    def test_rating_and_favorite_counts_do_not_inflate_each_other(self, api_client):
+        """Test each recipe's favorites are counted once, whatever its number of ratings."""
+        recipe = published_recipe()
+        for rating in (4, 5, 3):
+            RatingFactory(recipe=recipe, rating=rating)
+        for _ in range(2):
+            UserFavorite.objects.create(user=UserFactory(), recipe=recipe)
+        api_client.force_authenticate(user=UserFactory(is_staff=True))
+
+        response = api_client.get('/api/v1/admin/analytics/')
+
+        assert response.status_code == status.HTTP_200_OK
+        top = response.data['top_recipes'][0]
+        assert top['id'] == str(recipe.id)
+        assert top['favorites'] == 2
+        assert top['average_rating'] == pytest.approx(4.0)
@@ -0,0 +1,283 @@
+"""
+Tests for recipe view rollups and retention.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from recipes.models import RecipeView, RecipeViewRollup, RecipeViewSketch
+from recipes.services.view_stats_service import RecipeViewStatsService, view_stats_service
+from recipes.tests.factories import RecipeFactory
+from accounts.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def create_view(recipe, created_at, **kwargs):
+    """Create a raw view with a fixed creation time."""
+    view = RecipeView.objects.create(recipe=recipe, **kwargs)
+    RecipeView.objects.filter(pk=view.pk).update(created_at=created_at)
+    return view
+
+
+@pytest.fixture
+def service():
+    """Return a rollup service without ingestion lag."""
+    service = RecipeViewStatsService()
+    service.rollup_lag = timedelta(0)
+    return service
+
+
+@pytest.fixture
+def now():
+    """Return a fixed point in time in the middle of an hour."""
+    return timezone.now().replace(minute=30, second=0, microsecond=0)
+
+
+class TestRecipeViewStatsService:
+    """Test RecipeViewStatsService."""
+
+    def test_rollup_builds_hourly_and_daily_buckets(self, service, now):
+        """Test closed hours are aggregated per recipe."""
+        recipe = RecipeFactory()
+        viewer = UserFactory()
+        two_hours_ago = now - timedelta(hours=2)
+        create_view(recipe, two_hours_ago, user=viewer, view_duration_seconds=30)
+        create_view(recipe, two_hours_ago, user=viewer, view_duration_seconds=90)
+        create_view(recipe, two_hours_ago, ip_address='10.0.0.1')
+
+        result = service.rollup(now=now)
+
+        assert result['end'] == now.replace(minute=0)
+        hourly = RecipeViewRollup.objects.get(recipe=recipe, granularity=RecipeViewRollup.Granularity.HOUR)
+        assert hourly.view_count == 3
+        assert hourly.unique_viewers == 2
+        assert hourly.total_duration_seconds == 120
+        assert hourly.average_view_duration == 60
+        daily = RecipeViewRollup.objects.get(recipe=recipe, granularity=RecipeViewRollup.Granularity.DAY)
+        assert daily.view_count == 3
+
+    def test_rollup_is_incremental(self, service, now):
+        """Test a second run only processes hours after the watermark."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(hours=3), ip_address='10.0.0.1')
+        service.rollup(now=now - timedelta(hours=2))
+
+        create_view(recipe, now - timedelta(hours=1), ip_address='10.0.0.2')
+        result = service.rollup(now=now)
+
+        assert result['start'] == (now - timedelta(hours=2)).replace(minute=0)
+        assert RecipeViewRollup.objects.filter(granularity=RecipeViewRollup.Granularity.HOUR).count() == 2
+        assert service.recipe_stats(recipe)['total_views'] == 2
+
+    def test_stats_combine_rollups_with_recent_tail(self, service, now):
+        """Test statistics include views created after the watermark."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.1', view_duration_seconds=10)
+        service.rollup(now=now)
+        create_view(recipe, now, ip_address='10.0.0.2', view_duration_seconds=30)
+
+        stats = service.recipe_stats(recipe)
+        assert stats['total_views'] == 2
+        assert stats['unique_views'] == 2
+        assert stats['average_view_duration'] == 20
+
+    def test_unique_viewers_exclude_author(self, service, now):
+        """Test the author's own views are not counted as unique viewers."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(hours=2), user=recipe.author)
+        create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.1')
+        service.rollup(now=now)
+
+        stats = service.author_stats(recipe.author)
+        assert stats['total_views'] == 2
+        assert stats['unique_viewers'] == 1
+        assert stats['most_viewed_recipe_id'] == recipe.id
+
+    def test_purge_keeps_stats_intact(self, service, now):
+        """Test purging rolled-up raw rows does not change statistics."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(days=10), ip_address='10.0.0.1')
+        create_view(recipe, now - timedelta(days=9), ip_address='10.0.0.2')
+        create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.3')
+        service.rollup(now=now)
+
+        deleted = service.purge_raw_views(days=5, chunk_size=1)
+
+        assert deleted == 2
+        assert RecipeView.objects.count() == 1
+        assert service.recipe_stats(recipe)['total_views'] == 3
+        assert service.view_counts([recipe.id]) == {recipe.id: 3}
+
+    def test_viewer_stats_survive_purge(self, service, now):
+        """Test a user's own view totals are read from rollups after the purge."""
+        viewer = UserFactory()
+        first, second = RecipeFactory(), RecipeFactory()
+        create_view(first, now - timedelta(days=10), user=viewer, view_duration_seconds=30)
+        create_view(first, now - timedelta(days=9), user=viewer, view_duration_seconds=60)
+        create_view(second, now - timedelta(days=8), user=viewer)
+        create_view(second, now - timedelta(hours=2), user=viewer, view_duration_seconds=90)
+        create_view(first, now - timedelta(days=10), ip_address='10.0.0.1')
+        service.rollup(now=now)
+        before = service.viewer_stats(viewer)
+
+        service.purge_raw_views(days=5)
+
+        assert RecipeView.objects.filter(user=viewer).count() == 1
+        assert service.viewer_stats(viewer) == before
+        assert before['total_views'] == 4
+        assert before['unique_recipes'] == 2
+        assert before['average_view_duration'] == 60
+        assert set(before['most_viewed_recipe_ids']) == {first.id, second.id}
+
+    def test_purge_never_deletes_unrolled_views(self, service, now):
+        """Test raw rows newer than the watermark survive the purge."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(days=10), ip_address='10.0.0.1')
+
+        assert service.purge_raw_views(days=0) == 0
+        service.rollup(now=now - timedelta(days=20))
+        assert service.purge_raw_views(days=0) == 0
+        assert RecipeView.objects.count() == 1
+
+
+    def test_duration_percentiles(self, service, now):
+        """Test percentiles merge rolled-up sketches with the raw tail."""
+        recipe = RecipeFactory()
+        for seconds in range(1, 100):
+            create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.1', view_duration_seconds=seconds)
+        service.rollup(now=now)
+        create_view(recipe, now, ip_address='10.0.0.1', view_duration_seconds=1000)
+
+        daily = RecipeViewRollup.objects.get(recipe=recipe, granularity=RecipeViewRollup.Granularity.DAY)
+        assert daily.duration_sketch is not None
+
+        percentiles = service.recipe_stats(recipe)['view_duration_percentiles']
+        assert percentiles['p50'] == pytest.approx(50, rel=0.02)
+        assert percentiles['p90'] == pytest.approx(90, rel=0.02)
+        assert percentiles['p99'] == pytest.approx(99, rel=0.02)
+
+    def test_duration_percentiles_without_durations(self, service, now):
+        """Test percentiles are empty when no durations were recorded."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.1')
+        service.rollup(now=now)
+
+        assert service.recipe_stats(recipe)['view_duration_percentiles'] == {'p50': None, 'p90': None, 'p99': None}
+
+
+class TestUniqueViewerSketches:
+    """Test HyperLogLog unique viewer sketches."""
+
+    def test_ingested_views_update_sketches(self, service):
+        """Test flushed views are added to the day's sketch, excluding the author."""
+        from recipes.services.view_tracking_service import InMemoryViewBuffer, RecipeViewIngestionService
+
+        ingestion = RecipeViewIngestionService()
+        ingestion.background_flush = False
+        ingestion._buffer = InMemoryViewBuffer(max_size=100)
+        recipe = RecipeFactory()
+        viewer = UserFactory()
+        ingestion.record_view(recipe.id, user_id=viewer.id)
+        ingestion.record_view(recipe.id, user_id=recipe.author.id)
+        ingestion.record_view(recipe.id, ip_address='10.0.0.1')
+        ingestion.flush()
+        RecipeView.objects.all().delete()
+
+        assert RecipeViewSketch.objects.filter(recipe=recipe).count() == 1
+        assert service.unique_viewers(recipe_ids=[recipe.id]) == 2
+
+    def test_viewers_merged_across_days_and_recipes(self, service, now):
+        """Test a viewer seen on several days and recipes is counted once."""
+        author = UserFactory()
+        first = RecipeFactory(author=author)
+        second = RecipeFactory(author=author)
+        viewer = UserFactory()
+        create_view(first, now - timedelta(days=3), user=viewer)
+        create_view(first, now - timedelta(days=1), user=viewer)
+        create_view(second, now - timedelta(days=1), user=viewer)
+        create_view(second, now - timedelta(days=1), ip_address='10.0.0.1')
+        service.rollup(now=now)
+        RecipeView.objects.all().delete()
+
+        assert RecipeViewSketch.objects.count() == 3
+        assert service.unique_viewers(recipe_ids=[first.id]) == 1
+        assert service.unique_viewers(author=author) == 2
+        assert service.author_stats(author)['unique_viewers'] == 2
+
+    def test_unique_viewers_for_date_range(self, service, now):
+        """Test sketches outside the requested days are ignored."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(days=5), ip_address='10.0.0.1')
+        create_view(recipe, now - timedelta(days=1), ip_address='10.0.0.2')
+        service.rollup(now=now)
+
+        since = (now - timedelta(days=2)).date()
+        assert service.unique_viewers(recipe_ids=[recipe.id], start_date=since) == 1
+        assert service.unique_viewers(recipe_ids=[recipe.id], end_date=since) == 1
+        assert service.unique_viewers(recipe_ids=[recipe.id]) == 2
+
+    def test_rollup_is_idempotent_for_sketches(self, service, now):
+        """Test re-sketching the same raw views does not inflate counts."""
+        recipe = RecipeFactory()
+        create_view(recipe, now - timedelta(hours=2), ip_address='10.0.0.1')
+        service.rollup(now=now)
+        service._sketch_raw_views(now - timedelta(days=1), now)
+
+        assert service.unique_viewers(recipe_ids=[recipe.id]) == 1
+
+
+class TestViewStatsEndpoints:
+    """Test view statistics endpoints."""
+
+    def test_recipe_stats(self, api_client, now):
+        """Test recipe_stats returns aggregated figures."""
+        recipe = RecipeFactory(is_published=True)
+        create_view(recipe, now, ip_address='10.0.0.1', view_duration_seconds=40)
+
+        url = reverse('recipes:view-recipe-stats')
+        response = api_client.get(url, {'recipe_id': str(recipe.id)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_views'] == 1
+        assert response.data['unique_views'] == 1
+        assert response.data['average_view_duration'] == 40
+        assert response.data['view_duration_percentiles']['p50'] == pytest.approx(40, rel=0.02)
+        assert response.data['recipe'] == str(recipe.id)
+
+    def test_user_stats_after_purge(self, api_client, user, now):
+        """Test user_stats keeps counting views whose raw rows were purged."""
+        recipe = RecipeFactory(is_published=True)
+        create_view(recipe, now - timedelta(days=10), user=user)
+        create_view(recipe, now - timedelta(hours=2), user=user)
+        service = RecipeViewStatsService()
+        service.rollup_lag = timedelta(0)
+        service.rollup(now=now)
+        service.purge_raw_views(days=5)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('recipes:view-user-stats'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_views'] == 2
+        assert response.data['unique_views'] == 1
+
+    def test_admin_recipe_list_reads_view_counts_once(self, api_client, now):
+        """Test the admin recipe list counts views for the whole page in one call."""
+        viewed, unviewed = RecipeFactory(), RecipeFactory()
+        create_view(viewed, now, ip_address='10.0.0.1')
+        create_view(viewed, now, ip_address='10.0.0.2')
+        api_client.force_authenticate(user=UserFactory(is_staff=True))
+
+        with patch.object(view_stats_service, 'view_counts', wraps=view_stats_service.view_counts) as view_counts:
+            response = api_client.get('/api/v1/admin/recipes/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert view_counts.call_count == 1
+        counts = {row['id']: row['view_count'] for row in response.data['results']}
+        assert counts == {str(viewed.id): 2, str(unviewed.id): 0}
@@ -0,0 +1,151 @@
+"""
+Tests for write-behind recipe view ingestion.
+"""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from recipes.models import RecipeView
+from recipes.services.view_tracking_service import (
+    InMemoryViewBuffer,
+    RecipeViewIngestionService,
+    view_tracking_service,
+)
+from recipes.tests.factories import RecipeFactory
+from accounts.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'view-tracking-tests',
+    }
+}
+
+
+@pytest.fixture
+def service():
+    """Return an ingestion service with an in-memory buffer and no flusher thread."""
+    service = RecipeViewIngestionService()
+    service.background_flush = False
+    service._buffer = InMemoryViewBuffer(max_size=5)
+    service.batch_size = 2
+    return service
+
+
+class TestRecipeViewIngestionService:
+    """Test RecipeViewIngestionService."""
+
+    def test_record_and_flush(self, service):
+        """Test buffered views are written in batches on flush."""
+        recipe = RecipeFactory()
+        user = UserFactory()
+
+        assert service.record_view(recipe.id, user_id=user.id) == service.RECORDED
+        assert service.record_view(recipe.id, ip_address='10.0.0.1') == service.RECORDED
+        assert service.record_view(recipe.id, ip_address='10.0.0.2') == service.RECORDED
+        assert RecipeView.objects.count() == 0
+
+        assert service.flush() == 3
+        assert len(service.buffer) == 0
+        assert RecipeView.objects.filter(recipe=recipe, user=user).count() == 1
+        assert RecipeView.objects.filter(recipe=recipe, user__isnull=True).count() == 2
+
+    def test_flush_skips_deleted_recipes(self, service):
+        """Test views of recipes deleted before the flush are dropped."""
+        recipe = RecipeFactory()
+        service.record_view(recipe.id, ip_address='10.0.0.1')
+        recipe.delete()
+
+        assert service.flush() == 0
+        assert RecipeView.objects.count() == 0
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_duplicate_views_are_deduplicated(self, service):
+        """Test repeat views inside the dedupe window are not buffered."""
+        cache.clear()
+        recipe = RecipeFactory()
+
+        assert service.record_view(recipe.id, ip_address='10.0.0.1') == service.RECORDED
+        assert service.record_view(recipe.id, ip_address='10.0.0.1') == service.DUPLICATE
+        assert service.record_view(recipe.id, ip_address='10.0.0.2') == service.RECORDED
+        assert len(service.buffer) == 2
+
+    def test_backpressure_flushes_inline(self, service):
+        """Test a full buffer drains a batch inline instead of growing."""
+        recipe = RecipeFactory()
+        for i in range(5):
+            service.record_view(recipe.id, ip_address=f'10.0.0.{i}')
+
+        assert service.record_view(recipe.id, ip_address='10.0.1.1') == service.RECORDED
+        assert RecipeView.objects.count() == 2
+        assert len(service.buffer) == 4
+
+    def test_rejects_when_flush_cannot_free_space(self, service):
+        """Test views are rejected when the buffer is full and the database is failing."""
+        recipe = RecipeFactory()
+        for i in range(5):
+            service.record_view(recipe.id, ip_address=f'10.0.0.{i}')
+
+        with patch.object(RecipeView.objects, 'bulk_create', side_effect=Exception('db down')):
+            assert service.record_view(recipe.id, ip_address='10.0.1.1') == service.REJECTED
+
+        assert len(service.buffer) == 5
+
+    def test_failed_flush_requeues_batch(self, service):
+        """Test a failed batch stays buffered and is written by the next flush."""
+        recipe = RecipeFactory()
+        service.record_view(recipe.id, ip_address='10.0.0.1')
+
+        with patch.object(RecipeView.objects, 'bulk_create', side_effect=Exception('db down')):
+            assert service.flush() == 0
+        assert len(service.buffer) == 1
+
+        assert service.flush() == 1
+        assert RecipeView.objects.count() == 1
+
+    def test_replayed_batch_does_not_duplicate_rows(self, service):
+        """Test replaying an already persisted batch is idempotent."""
+        recipe = RecipeFactory()
+        service.record_view(recipe.id, ip_address='10.0.0.1')
+        events = service.buffer.pop_batch(10)
+
+        service._persist(events)
+        service._persist(events)
+        assert RecipeView.objects.count() == 1
+
+
+class TestRecipeViewCreateEndpoint:
+    """Test the view tracking endpoint."""
+
+    def test_create_view_is_accepted(self, api_client):
+        """Test recording a view returns immediately without a database write."""
+        recipe = RecipeFactory(is_published=True)
+        url = reverse('recipes:view-list')
+
+        response = api_client.post(url, {'recipe_id': str(recipe.id)}, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert RecipeView.objects.count() == 0
+
+        view_tracking_service.flush()
+        assert RecipeView.objects.filter(recipe=recipe).count() == 1
+
+    def test_create_view_unknown_recipe(self, api_client):
+        """Test a view of a recipe that does not exist is rejected, not buffered."""
+        url = reverse('recipes:view-list')
+        response = api_client.post(url, {'recipe_id': str(uuid.uuid4())}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert len(view_tracking_service.buffer) == 0
+
+    def test_create_view_invalid_payload(self, api_client):
+        """Test an invalid recipe id is rejected by validation."""
+        url = reverse('recipes:view-list')
+        response = api_client.post(url, {'recipe_id': 'not-a-uuid'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
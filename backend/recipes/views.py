@@ -2,14 +2,20 @@
 Recipe views for API endpoints.
 """
 import time
+import uuid
 from rest_framework import viewsets, status, permissions, filters, renderers
 from rest_framework.decorators import action
+from rest_framework.reverse import reverse
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.utils.text import slugify
 
+from core.middleware.authentication import ClaimsJWTAuthentication
+from core.throttling import TokenBucketThrottle
 # Use service wrapper for graceful fallbacks
 from core.services.service_wrapper import service_wrapper
 
@@ -36,8 +42,16 @@ from .serializers import (
     FavoriteStatsSerializer,
     ViewStatsSerializer
 )
+from .services.bootstrap_service import bootstrap_service
+from .services.content_similarity_service import content_similarity_service
+from .services.feed_service import feed_service
+from .services.image_job_service import image_job_service
 from .services.recipe_service import recipe_service
+from .services.recommendation_service import similar_recipes_service
 from .services.search_service import search_service
+from .services.trending_service import trending_service
+from .services.view_stats_service import view_stats_service
+from .services.view_tracking_service import view_tracking_service
 # Storage service is now handled by service wrapper
 
 
@@ -50,6 +64,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = [ClaimsJWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['parent', 'is_active']
     search_fields = ['name', 'description']
@@ -183,7 +198,9 @@ class RecipeViewSet(viewsets.ViewSet):
     Search endpoints allow anonymous access to enable recipe discovery without authentication.
     """
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = [ClaimsJWTAuthentication]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    throttle_scope = None  # Set per action for TokenBucketThrottle
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['difficulty', 'cooking_method', 'is_published', 'author', 'categories']
     search_fields = ['title', 'description', 'tags', 'categories__name']
@@ -407,10 +424,7 @@ class RecipeViewSet(viewsets.ViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            # Delete associated images
-            if recipe.images:
-                service_wrapper.delete_images(recipe.images)
-            
+            # Images are released by the post_delete signal once this commits
             recipe.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Recipe.DoesNotExist:
@@ -421,7 +435,7 @@ class RecipeViewSet(viewsets.ViewSet):
 
     @action(detail=True, methods=['post'], parser_classes=[MultiPartParser])
     def upload_image(self, request, pk=None):
-        """Upload an image for a recipe."""
+        """Queue an uploaded image for processing; poll image-status for the result."""
         try:
             recipe = Recipe.objects.get(pk=pk)
             
@@ -440,36 +454,131 @@ class RecipeViewSet(viewsets.ViewSet):
                 )
             
             try:
-                # Delete existing images first
-                if recipe.images:
-                    service_wrapper.delete_images(recipe.images)
-                
-                # Save new image with thumbnails
-                image_urls = service_wrapper.save_image(image_file, str(recipe.id))
-                if image_urls:
-                    recipe.images = image_urls
-                    recipe.save(update_fields=['images'])
-                    
-                    return Response({
-                        'message': 'Image uploaded successfully',
-                        'images': image_urls
-                    })
-                else:
-                    return Response(
-                        {'error': 'Failed to process image'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            except Exception as e:
+                # Variants are rendered by the image job worker
+                job = image_job_service.submit(recipe, image_file, request.user)
+            except ValidationError as e:
                 return Response(
-                    {'error': f'Failed to process image: {str(e)}'},
+                    {'error': f'Failed to process image: {" ".join(e.messages)}'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            
+            return Response({
+                'message': 'Image accepted for processing',
+                'job_id': str(job.id),
+                'status': job.status,
+                'status_url': reverse('recipes:recipe-image-status', kwargs={'pk': recipe.pk}, request=request),
+            }, status=status.HTTP_202_ACCEPTED)
         except Recipe.DoesNotExist:
             return Response(
                 {'error': 'Recipe not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=True, methods=['post'], url_path='image-upload-url', parser_classes=[JSONParser])
+    def image_upload_url(self, request, pk=None):
+        """
+        Issue a short-lived signed URL to upload an image straight to storage.
+        
+        Request body:
+        - content_type: MIME type of the image (JPEG, PNG or WebP)
+        - filename: Optional original file name
+        
+        ``PUT`` the file to ``url`` with ``headers``, then post ``upload_id``
+        to image-upload-complete.
+        """
+        try:
+            recipe = Recipe.objects.get(pk=pk)
+        except Recipe.DoesNotExist:
+            return Response(
+                {'error': 'Recipe not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if recipe.author != request.user and not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            upload = image_job_service.issue_upload(
+                recipe, request.data.get('content_type', ''), request.data.get('filename', ''), request.user
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        upload['url'] = request.build_absolute_uri(upload['url'])
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], url_path='image-upload-complete', parser_classes=[JSONParser])
+    def complete_image_upload(self, request, pk=None):
+        """Queue a finished direct upload for processing; poll image-status for the result."""
+        try:
+            recipe = Recipe.objects.get(pk=pk)
+        except Recipe.DoesNotExist:
+            return Response(
+                {'error': 'Recipe not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if recipe.author != request.user and not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            job = image_job_service.complete_upload(recipe, request.data.get('upload_id', ''), request.user)
+        except ValidationError as e:
+            return Response(
+                {'error': f'Failed to process image: {" ".join(e.messages)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'message': 'Image accepted for processing',
+            'job_id': str(job.id),
+            'status': job.status,
+            'status_url': reverse('recipes:recipe-image-status', kwargs={'pk': recipe.pk}, request=request),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'], url_path='image-status')
+    def image_status(self, request, pk=None):
+        """Status of the recipe's latest image upload."""
+        try:
+            recipe = Recipe.objects.get(pk=pk)
+        except Recipe.DoesNotExist:
+            return Response(
+                {'error': 'Recipe not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if recipe.author != request.user and not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        job = image_job_service.latest_job(recipe)
+        if job is None:
+            return Response(
+                {'error': 'No image upload found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response({
+            'job_id': str(job.id),
+            'status': job.status,
+            'attempts': job.attempts,
+            'error': job.error or None,
+            'created_at': job.created_at,
+            'finished_at': job.finished_at,
+            'images': recipe.images,
+        })
+
     @action(detail=True, methods=['delete'])
     def remove_image(self, request, pk=None):
         """Remove the image from a recipe."""
@@ -495,6 +604,63 @@ class RecipeViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
+    def similar(self, request, pk=None):
+        """
+        Get recipes similar to this one, from precomputed item-to-item neighbors.
+        
+        Query Parameters:
+        - limit: Maximum number of recipes (default: 10, max: 50)
+        """
+        if not self.get_queryset().filter(pk=pk).exists():
+            return Response(
+                {'error': 'Recipe not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        neighbors = similar_recipes_service.get_similar(pk, limit)
+        recipes = [neighbor.neighbor for neighbor in neighbors]
+        scores = [(round(neighbor.score, 4), 'collaborative') for neighbor in neighbors]
+
+        # New recipes have no interactions yet: fill up with content neighbors
+        if len(recipes) < limit:
+            content = content_similarity_service.similar(
+                pk, limit=limit * 2, exclude=[recipe.id for recipe in recipes]
+            )
+            content_scores = dict(content)
+            visible = Recipe.objects.filter(
+                id__in=content_scores.keys(),
+                is_published=True,
+                moderation_status=Recipe.ModerationStatus.APPROVED,
+            ).select_related('author').prefetch_related('categories').in_bulk()
+            for recipe_id, score in content:
+                recipe = visible.get(uuid.UUID(recipe_id))
+                if recipe is None:
+                    continue
+                recipes.append(recipe)
+                scores.append((round(score, 4), 'content'))
+                if len(recipes) == limit:
+                    break
+
+        serializer = RecipeListSerializer(recipes, many=True, context={'request': request})
+        results = serializer.data
+        for item, (score, source) in zip(results, scores):
+            item['similarity'] = score
+            item['source'] = source
+
+        return Response({
+            'recipe': str(pk),
+            'results': results
+        })
+
     @action(detail=False, methods=['get'])
     def supported_formats(self, request):
         """Get supported image formats and limits."""
@@ -580,7 +746,8 @@ class RecipeViewSet(viewsets.ViewSet):
             'results': serializer.data
         })
     
-    @action(detail=False, methods=['get'], url_path='search', permission_classes=[permissions.AllowAny])
+    @action(detail=False, methods=['get'], url_path='search', permission_classes=[permissions.AllowAny],
+            throttle_classes=[TokenBucketThrottle], throttle_scope='search')
     @service_wrapper.monitor_performance
     def search(self, request):
         """
@@ -637,7 +804,8 @@ class RecipeViewSet(viewsets.ViewSet):
                 'error': f'Search failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    @action(detail=False, methods=['post'], url_path='advanced-search', permission_classes=[permissions.AllowAny])
+    @action(detail=False, methods=['post'], url_path='advanced-search', permission_classes=[permissions.AllowAny],
+            throttle_classes=[TokenBucketThrottle], throttle_scope='search')
     @service_wrapper.monitor_performance
     def advanced_search(self, request):
         """
@@ -689,7 +857,8 @@ class RecipeViewSet(viewsets.ViewSet):
                 'error': f'Advanced search failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    @action(detail=False, methods=['get'], url_path='search-suggestions', permission_classes=[permissions.AllowAny])
+    @action(detail=False, methods=['get'], url_path='search-suggestions', permission_classes=[permissions.AllowAny],
+            throttle_classes=[TokenBucketThrottle], throttle_scope='search_suggestions')
     @service_wrapper.monitor_performance
     def search_suggestions(self, request):
         """
@@ -745,6 +914,103 @@ class RecipeViewSet(viewsets.ViewSet):
                 'error': f'Failed to get popular searches: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    @service_wrapper.monitor_performance
+    def feed(self, request):
+        """
+        Get the personalized home feed.
+        
+        Blends recipes from the user's favorite categories, recipes similar to
+        ones they liked and trending recipes, from precomputed candidates.
+        Anonymous users get the trending feed.
+        
+        Query Parameters:
+        - page: Page number (default: 1)
+        - page_size: Results per page (default: 20, max: 50)
+        """
+        query_params = getattr(request, 'query_params', request.GET)
+        try:
+            page_size = min(max(int(query_params.get('page_size', 20)), 1), 50)
+            page_number = max(int(query_params.get('page', 1)), 1)
+        except ValueError:
+            return Response(
+                {'error': 'page and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user if request.user.is_authenticated else None
+        page = feed_service.get_feed_page(user, page_number, page_size)
+
+        serializer = RecipeListSerializer(
+            [recipe for recipe, _ in page['items']], many=True, context={'request': request}
+        )
+        results = serializer.data
+        for item, (_, entry) in zip(results, page['items']):
+            item['feed_reasons'] = entry['reasons']
+
+        return Response({
+            'generated_at': page['generated_at'],
+            'count': page['count'],
+            'current_page': page_number,
+            'page_size': page_size,
+            'results': results
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    @service_wrapper.monitor_performance
+    def trending(self, request):
+        """
+        Get recipes ranked by time-decayed engagement (views, favorites, ratings).
+        
+        Query Parameters:
+        - category: Optional category slug to restrict the ranking
+        - include_descendants: Include recipes from subcategories (default: false)
+        - page: Page number (default: 1)
+        - page_size: Results per page (default: 20, max: 100)
+        """
+        query_params = getattr(request, 'query_params', request.GET)
+        category = None
+        category_slug = query_params.get('category')
+        include_descendants = query_params.get('include_descendants', 'false').lower() == 'true'
+        if category_slug:
+            try:
+                category = Category.objects.get(slug=category_slug, is_active=True)
+            except Category.DoesNotExist:
+                return Response(
+                    {'error': 'Category not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+        recipes = trending_service.get_trending(category, include_descendants)
+
+        from django.core.paginator import Paginator
+        try:
+            page_size = min(int(query_params.get('page_size', 20)), 100)
+            page_number = int(query_params.get('page', 1))
+        except ValueError:
+            return Response(
+                {'error': 'page and page_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        paginator = Paginator(recipes, max(page_size, 1))
+        page_obj = paginator.get_page(page_number)
+
+        serializer = RecipeListSerializer(page_obj, many=True, context={'request': request})
+        results = serializer.data
+        for item, recipe in zip(results, page_obj):
+            item['trending_score'] = round(trending_service.decayed_score(recipe.trending.score), 4)
+
+        return Response({
+            'category': category.slug if category else None,
+            'include_descendants': include_descendants,
+            'count': paginator.count,
+            'num_pages': paginator.num_pages,
+            'current_page': page_obj.number,
+            'page_size': page_size,
+            'results': results
+        })
+
 
 class RatingViewSet(viewsets.ModelViewSet):
     """
@@ -755,6 +1021,7 @@ class RatingViewSet(viewsets.ModelViewSet):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = [ClaimsJWTAuthentication]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['recipe', 'rating', 'is_verified_purchase']
     search_fields = ['review']
@@ -884,6 +1151,7 @@ class UserFavoriteViewSet(viewsets.ModelViewSet):
     """
     serializer_class = UserFavoriteSerializer
     permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at']
     ordering = ['-created_at']
@@ -1001,48 +1269,49 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
         return RecipeView.objects.all().select_related('recipe', 'user')
 
     def create(self, request, *args, **kwargs):
-        """Create a new recipe view record."""
+        """
+        Record a recipe view.
+        
+        The view is deduplicated and buffered for write-behind persistence,
+        so the request returns without touching the database.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Check if this is a duplicate view within a short time window
         recipe_id = serializer.validated_data.get('recipe_id')
+        if not view_tracking_service.recipe_exists(recipe_id):
+            return Response(
+                {'recipe_id': ['Recipe not found.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         user = request.user if request.user.is_authenticated else None
-        ip_address = serializer.get_client_ip(request)
-        
-        # Don't create duplicate views within 5 minutes
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        recent_view_exists = False
-        time_threshold = timezone.now() - timedelta(minutes=5)
-        
-        if user:
-            recent_view_exists = RecipeView.objects.filter(
-                recipe_id=recipe_id,
-                user=user,
-                created_at__gte=time_threshold
-            ).exists()
-        else:
-            recent_view_exists = RecipeView.objects.filter(
-                recipe_id=recipe_id,
-                ip_address=ip_address,
-                created_at__gte=time_threshold
-            ).exists()
+        session = getattr(request, 'session', None)
+        
+        result = view_tracking_service.record_view(
+            recipe_id=recipe_id,
+            user_id=user.id if user else None,
+            ip_address=serializer.get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            session_key='' if user or session is None else (session.session_key or ''),
+            view_duration_seconds=serializer.validated_data.get('view_duration_seconds'),
+        )
         
-        if recent_view_exists:
+        if result == view_tracking_service.DUPLICATE:
             return Response(
                 {'message': 'View already recorded recently'},
                 status=status.HTTP_200_OK
             )
-
-        view = serializer.save()
+        
+        if result == view_tracking_service.REJECTED:
+            return Response(
+                {'error': 'View tracking is temporarily overloaded'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(view_tracking_service.flush_interval)}
+            )
+        
         return Response(
-            {
-                'message': 'View recorded successfully',
-                'view': RecipeViewSerializer(view, context={'request': request}).data
-            },
-            status=status.HTTP_201_CREATED
+            {'message': 'View accepted for recording'},
+            status=status.HTTP_202_ACCEPTED
         )
 
     @action(detail=False, methods=['get'])
@@ -1065,7 +1334,12 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def recipe_stats(self, request):
-        """Get view statistics for a specific recipe."""
+        """
+        Get view statistics for a specific recipe.
+
+        ``unique_views`` counts distinct viewers other than the recipe's
+        author, estimated from HyperLogLog sketches.
+        """
         recipe_id = request.query_params.get('recipe_id')
         if not recipe_id:
             return Response(
@@ -1081,23 +1355,8 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        views = RecipeView.objects.filter(recipe=recipe)
-        total_views = views.count()
-        unique_views = views.values('user', 'ip_address').distinct().count()
-        
-        # Calculate average view duration (excluding None values)
-        view_durations = views.exclude(view_duration_seconds__isnull=True)
-        avg_duration = None
-        if view_durations.exists():
-            from django.db.models import Avg
-            avg_duration = view_durations.aggregate(Avg('view_duration_seconds'))['view_duration_seconds__avg']
-
-        stats_data = {
-            'recipe': recipe,
-            'total_views': total_views,
-            'unique_views': unique_views,
-            'average_view_duration': avg_duration
-        }
+        stats_data = view_stats_service.recipe_stats(recipe)
+        stats_data['recipe'] = str(recipe.id)
 
         return Response(stats_data)
 
@@ -1110,37 +1369,16 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        user_views = RecipeView.objects.filter(user=request.user)
-        total_views = user_views.count()
-        unique_recipes = user_views.values('recipe').distinct().count()
-        
-        # Get most viewed recipes by this user
-        from django.db.models import Count
-        most_viewed = (
-            user_views.values('recipe')
-            .annotate(view_count=Count('id'))
-            .order_by('-view_count')[:5]
-        )
-        
-        most_viewed_recipes = []
-        for item in most_viewed:
-            try:
-                recipe = Recipe.objects.get(id=item['recipe'])
-                most_viewed_recipes.append(recipe)
-            except Recipe.DoesNotExist:
-                continue
-
-        # Calculate average view duration
-        view_durations = user_views.exclude(view_duration_seconds__isnull=True)
-        avg_duration = None
-        if view_durations.exists():
-            from django.db.models import Avg
-            avg_duration = view_durations.aggregate(Avg('view_duration_seconds'))['view_duration_seconds__avg']
+        stats = view_stats_service.viewer_stats(request.user)
+        recipes_by_id = Recipe.objects.in_bulk(stats['most_viewed_recipe_ids'])
+        most_viewed_recipes = [
+            recipes_by_id[recipe_id] for recipe_id in stats['most_viewed_recipe_ids'] if recipe_id in recipes_by_id
+        ]
 
         stats_data = {
-            'total_views': total_views,
-            'unique_views': unique_recipes,
-            'average_view_duration': avg_duration,
+            'total_views': stats['total_views'],
+            'unique_views': stats['unique_recipes'],
+            'average_view_duration': stats['average_view_duration'],
             'most_viewed_recipes': most_viewed_recipes
         }
 
@@ -1156,45 +1394,18 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Get all recipes created by the current user
-        user_recipes = Recipe.objects.filter(author=request.user)
-        
-        # Get total views for all user's recipes
-        from django.db.models import Sum, Count
-        recipe_views = RecipeView.objects.filter(recipe__author=request.user)
-        total_views = recipe_views.count()
-        
-        # Get unique viewers (excluding the author's own views)
-        unique_viewers = recipe_views.exclude(user=request.user).values('user', 'ip_address').distinct().count()
-        
-        # Get most viewed recipe by the user
+        stats = view_stats_service.author_stats(request.user)
         most_viewed_recipe = None
-        if user_recipes.exists():
-            most_viewed = (
-                recipe_views.values('recipe')
-                .annotate(view_count=Count('id'))
-                .order_by('-view_count')
-                .first()
-            )
-            if most_viewed:
-                try:
-                    most_viewed_recipe = Recipe.objects.get(id=most_viewed['recipe'])
-                except Recipe.DoesNotExist:
-                    pass
-
-        # Calculate average view duration (excluding None values)
-        view_durations = recipe_views.exclude(view_duration_seconds__isnull=True)
-        avg_duration = None
-        if view_durations.exists():
-            from django.db.models import Avg
-            avg_duration = view_durations.aggregate(Avg('view_duration_seconds'))['view_duration_seconds__avg']
+        if stats['most_viewed_recipe_id']:
+            most_viewed_recipe = Recipe.objects.filter(id=stats['most_viewed_recipe_id']).first()
 
         stats_data = {
-            'total_views': total_views,
-            'unique_viewers': unique_viewers,
-            'average_view_duration': avg_duration,
+            'total_views': stats['total_views'],
+            'unique_viewers': stats['unique_viewers'],
+            'average_view_duration': stats['average_view_duration'],
+            'view_duration_percentiles': stats['view_duration_percentiles'],
             'most_viewed_recipe': most_viewed_recipe,
-            'total_recipes': user_recipes.count()
+            'total_recipes': Recipe.objects.filter(author=request.user).count()
         }
 
         # Serialize the most viewed recipe if it exists
@@ -1203,3 +1414,37 @@ class RecipeViewViewSet(viewsets.ModelViewSet):
             stats_data['most_viewed_recipe'] = RecipeSerializer(most_viewed_recipe).data
 
         return Response(stats_data)
+
+
+class BootstrapView(APIView):
+    """
+    Everything the first screen needs in one response.
+    
+    Sections are cached independently and missing ones are rebuilt
+    concurrently; ``is_favorited`` is filled in for the requesting user.
+    
+    Query Parameters:
+    - sections: Comma-separated subset of latest_recipes, categories,
+      popular_searches, trending (default: all)
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    @service_wrapper.monitor_performance
+    def get(self, request):
+        requested = request.query_params.get('sections')
+        sections = None
+        if requested:
+            sections = [section.strip() for section in requested.split(',') if section.strip()]
+            unknown = sorted(set(sections) - set(bootstrap_service.SECTIONS))
+            if unknown:
+                return Response(
+                    {'error': f'Unknown sections: {", ".join(unknown)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        result = bootstrap_service.get_sections(sections)
+        user = request.user if request.user.is_authenticated else None
+        data = bootstrap_service.personalize(result['sections'], user)
+        data['meta'] = {'cache': result['cache'], 'errors': result['errors']}
+        return Response(data)
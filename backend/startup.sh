@@ -29,6 +29,32 @@ python manage.py create_admin --settings=config.settings.production
 echo "📦 Collecting static files..."
 python manage.py collectstatic --settings=config.settings.production --noinput
 
+# Background workers (they claim work under leases, so every instance may run them)
+echo "📬 Starting outbox email worker..."
+python manage.py send_outbox_emails --settings=config.settings.production --loop &
+
+echo "🖼️ Starting image job worker..."
+python manage.py process_image_jobs --settings=config.settings.production --loop &
+
+echo "📊 Starting recipe view rollup and purge jobs..."
+python manage.py rollup_recipe_views --settings=config.settings.production --loop &
+python manage.py purge_recipe_views --settings=config.settings.production --loop &
+
+echo "🔥 Starting trending score pruning..."
+python manage.py update_trending_scores --settings=config.settings.production --loop &
+
+echo "🧭 Starting similar recipe refresh..."
+python manage.py build_recipe_neighbors --settings=config.settings.production --loop &
+
+echo "🔎 Starting content similarity index rebuilds..."
+python manage.py build_content_index --settings=config.settings.production --loop &
+
+echo "🔑 Starting expired token pruning..."
+python manage.py prune_outstanding_tokens --settings=config.settings.production --loop --pause 0.1 &
+
+echo "🧹 Starting orphaned image collection..."
+python manage.py collect_orphan_images --settings=config.settings.production --loop &
+
 echo "✅ Startup complete. Starting Gunicorn server..."
 
 # Start Gunicorn server
@@ -6,6 +6,8 @@ from django.utils import timezone
 from django.contrib.auth import authenticate, get_user_model
 from django.core.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.tokens import PrincipalRefreshToken
 from core.interfaces.service import BaseService
 from core.events.bus import EventBus
 from user_management.repositories.base import UserRepository
@@ -50,7 +52,7 @@ class AuthService(BaseService):
             raise ValidationError("Account is deactivated")
         
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = PrincipalRefreshToken.for_user(user)
         
         # Publish login event
         EventBus.publish('user.login', {
@@ -72,7 +74,7 @@ class AuthService(BaseService):
     def logout_user(self, refresh_token: str) -> bool:
         """Logout user by blacklisting refresh token."""
         try:
-            token = RefreshToken(refresh_token)
+            token = PrincipalRefreshToken(refresh_token)
             token.blacklist()
             return True
         except Exception:
@@ -81,7 +83,7 @@ class AuthService(BaseService):
     def refresh_token(self, refresh_token: str) -> dict:
         """Get new access token using refresh token"""
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = PrincipalRefreshToken(refresh_token)
             
             return {
                 'access': str(refresh.access_token)
@@ -93,7 +95,7 @@ class AuthService(BaseService):
     def verify_token(self, token: str) -> bool:
         """Verify if a token is valid"""
         try:
-            RefreshToken(token)
+            PrincipalRefreshToken(token)
             return True
         except Exception:
             return False
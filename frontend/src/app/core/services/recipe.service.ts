@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
-import { Observable, BehaviorSubject, of } from 'rxjs';
-import { map, catchError, tap } from 'rxjs/operators';
+import { Observable, BehaviorSubject, of, timer, throwError } from 'rxjs';
+import { map, catchError, tap, switchMap, exhaustMap, takeWhile, last } from 'rxjs/operators';
 import { ApiService } from './api.service';
 import { 
   Recipe, 
@@ -14,7 +14,10 @@ import {
   RatingCreate,
   RatingUpdate,
   RatingListItem,
-  RatingStats
+  RatingStats,
+  ImageJobStatus,
+  ImageUploadAccepted,
+  ImageUploadStatus
 } from '../../shared/models/recipe.models';
 
 @Injectable({
@@ -363,12 +366,38 @@ export class RecipeService extends ApiService {
   }
 
   /**
-   * Upload image for a recipe
+   * Upload image for a recipe.
+   * The backend accepts the upload (202) and renders it in a background job,
+   * so this polls image-status and emits the job once it has finished.
    */
-  uploadRecipeImage(id: string | number, imageFile: File): Observable<{ image_url: string }> {
+  uploadRecipeImage(id: string | number, imageFile: File, pollIntervalMs = 2000): Observable<ImageUploadStatus> {
     const formData = new FormData();
     formData.append('image', imageFile);
-    return this.post<{ image_url: string }>(`/recipes/${id}/upload_image/`, formData);
+    return this.post<ImageUploadAccepted>(`/recipes/${id}/upload_image/`, formData).pipe(
+      switchMap(() => this.waitForImageUpload(id, pollIntervalMs))
+    );
+  }
+
+  /**
+   * Get the status of a recipe's latest image upload
+   */
+  getImageUploadStatus(id: string | number): Observable<ImageUploadStatus> {
+    return this.get<ImageUploadStatus>(`/recipes/${id}/image-status/`);
+  }
+
+  /**
+   * Poll a recipe's latest image upload until it finishes; errors if it failed
+   */
+  waitForImageUpload(id: string | number, pollIntervalMs = 2000): Observable<ImageUploadStatus> {
+    const finished: ImageJobStatus[] = ['succeeded', 'superseded', 'failed'];
+    return timer(0, pollIntervalMs).pipe(
+      exhaustMap(() => this.getImageUploadStatus(id)),
+      takeWhile(job => !finished.includes(job.status), true),
+      last(),
+      switchMap(job => job.status === 'failed'
+        ? throwError(() => new Error(job.error || 'Image processing failed'))
+        : of(job))
+    );
   }
 
   /**
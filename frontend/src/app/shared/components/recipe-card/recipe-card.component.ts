@@ -2,7 +2,7 @@ import { Component, Input, Output, EventEmitter, ChangeDetectionStrategy, inject
 import { CommonModule } from '@angular/common';
 import { RouterModule } from '@angular/router';
 import { MaterialModule } from '../../material.module';
-import { RecipeListItem } from '../../models/recipe.models';
+import { RecipeImageSource, RecipeListItem } from '../../models/recipe.models';
 import { AuthService } from '../../../core/services/auth.service';
 import { Observable } from 'rxjs';
 
@@ -22,6 +22,9 @@ export class RecipeCardComponent {
   @Output() favoriteToggle = new EventEmitter<string>();
   @Output() share = new EventEmitter<RecipeListItem>();
 
+  // Rendered card width, for picking a srcset candidate
+  readonly imageSizes = '(max-width: 600px) 100vw, 350px';
+
   // Authentication state
   private authService = inject(AuthService);
   isAuthenticated$ = this.authService.isAuthenticated$;
@@ -97,6 +100,15 @@ export class RecipeCardComponent {
     return this.recipe.thumbnail_url || this.getPlaceholderImage();
   }
 
+  getImageSources(): RecipeImageSource[] {
+    return this.recipe.images?.[0]?.sources ?? [];
+  }
+
+  getPlaceholderBackground(): string | null {
+    const placeholder = this.recipe.images?.[0]?.placeholder;
+    return placeholder ? `url("${placeholder}")` : null;
+  }
+
   private getPlaceholderImage(): string {
     // Create a data URL for a clean placeholder
     const svg = `
@@ -120,6 +132,8 @@ export class RecipeCardComponent {
 
   onImageError(event: Event): void {
     const img = event.target as HTMLImageElement;
+    // A matching <source> would keep taking precedence over src
+    img.parentElement?.querySelectorAll('source').forEach(source => source.remove());
     img.src = this.getPlaceholderImage();
   }
 }
\ No newline at end of file
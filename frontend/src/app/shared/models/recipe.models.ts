@@ -12,12 +12,23 @@ export interface Category {
   ordering: number;
 }
 
+export interface RecipeImageSource {
+  type: string; // MIME type, e.g. image/webp
+  srcset: string; // Width descriptors, narrowest first
+}
+
 export interface RecipeImage {
   id: number;
   image: string;
   alt_text?: string;
   is_primary: boolean;
   ordering: number;
+  width?: number | null;
+  height?: number | null;
+  aspect_ratio?: number | null;
+  placeholder?: string | null; // Tiny inline data URI to show while loading
+  dominant_color?: string | null; // Hex color, e.g. #c82828
+  sources?: RecipeImageSource[]; // Responsive variants, most compact format first
 }
 
 export interface Rating {
@@ -131,6 +142,7 @@ export interface RecipeListItem {
   difficulty: 'easy' | 'medium' | 'hard';
   cooking_method: string;
   thumbnail_url?: string;
+  images?: RecipeImage[];
   
   // Author information (backend returns author_name as string)
   author_name: string;
@@ -186,6 +198,27 @@ export interface RecipeListResponse {
   results: RecipeListItem[];
 }
 
+export type ImageJobStatus = 'pending' | 'processing' | 'succeeded' | 'superseded' | 'failed';
+
+// Response of upload_image (202 Accepted): the image is rendered by a background job
+export interface ImageUploadAccepted {
+  message: string;
+  job_id: string;
+  status: ImageJobStatus;
+  status_url: string;
+}
+
+// Response of image-status: the recipe's latest image upload job
+export interface ImageUploadStatus {
+  job_id: string;
+  status: ImageJobStatus;
+  attempts: number;
+  error: string | null;
+  created_at: string;
+  finished_at: string | null;
+  images: any; // Recipe images as stored on the backend
+}
+
 export interface PaginatedResponse<T> {
   count: number;
   next: string | null;